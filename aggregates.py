@@ -0,0 +1,216 @@
+"""
+Incrementally maintained headline aggregates
+Running sums, counters and the visited-system set behind the headline
+cards. Each event is folded in with O(1) work, partial results from
+ingestion workers merge associatively, and the history total is persisted
+next to the event store so startup and new events never trigger a full
+recompute.
+
+No Qt imports here.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from queries import VISITED_EVENTS, format_count, format_credits
+
+
+AGGREGATES_FILE = "AGGREGATES.json"
+
+SYSTEM_EVENTS = ("FSDJump", "Location", "CarrierJump")
+MINING_EVENTS = ("SupercruiseExit", "ProspectedAsteroid", "MiningRefined", "MarketSell")
+COMBAT_EVENTS = (*SYSTEM_EVENTS, "Bounty", "FactionKillBond", "ShipTargeted", "HullDamage", "Died",
+                 "Interdicted", "RepairAll")
+# "Market" is a new Market.json, which the GUI reads into its PriceStore
+COLONIZATION_EVENTS = (*SYSTEM_EVENTS, "Docked", "Undocked", "Loadout", "Market", "CargoTransfer",
+                       "ColonisationConstructionDepot", "ColonisationContribution")
+
+# Events that add to wealth between Statistics snapshots, with the field
+# holding the amount (market trades are handled via their profit)
+CREDIT_DELTAS = {
+    "RedeemVoucher": ("Amount", 1),
+    "MissionCompleted": ("Reward", 1),
+    "SellExplorationData": ("TotalEarnings", 1),
+    "MultiSellExplorationData": ("TotalEarnings", 1),
+    "SellOrganicData": ("TotalEarnings", 1),
+}
+
+
+@dataclass
+class RunningAggregates:
+    events: int = 0
+    last_timestamp: str = ""
+    wealth: int | None = None
+    wealth_start: int | None = None
+    time_played: int | None = None
+    systems: set = field(default_factory=set)
+    mined: int = 0
+    trade_profit: int = 0
+    units_traded: int = 0
+    bounties: int = 0
+    bounty_profit: int = 0
+
+    def update(self, event: dict):
+        """Fold in one event in O(1)"""
+        self.events += 1
+        timestamp = event.get("timestamp", "")
+        if timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+
+        name = event.get("event")
+        if name in VISITED_EVENTS:
+            system = event.get("SystemAddress")
+            if isinstance(system, int) and system:
+                self.systems.add(system)
+        elif name == "MiningRefined":
+            self.mined += 1
+        elif name == "MarketSell":
+            count = event.get("Count", 0)
+            profit = event.get("TotalSale", 0) - event.get("AvgPricePaid", 0) * count
+            self.trade_profit += profit
+            self.units_traded += count
+            if self.wealth is not None:
+                self.wealth += profit
+        elif name == "MarketBuy":
+            self.units_traded += event.get("Count", 0)
+        elif name == "Bounty":
+            self.bounties += 1
+            self.bounty_profit += event.get("TotalReward", 0)
+        elif name == "Statistics":
+            wealth = event.get("Bank_Account", {}).get("Current_Wealth")
+            if wealth is not None:
+                self._set_wealth(wealth)
+            played = event.get("Exploration", {}).get("Time_Played")
+            if played is not None:
+                self.time_played = played
+        elif name == "LoadGame" and "Credits" in event and self.wealth is None:
+            self._set_wealth(event["Credits"])
+
+        delta = CREDIT_DELTAS.get(name)
+        if delta and self.wealth is not None:
+            key, sign = delta
+            self.wealth += sign * event.get(key, 0)
+
+    def _set_wealth(self, wealth: int):
+        self.wealth = wealth
+        if self.wealth_start is None:
+            self.wealth_start = wealth
+
+    def merge(self, other: "RunningAggregates"):
+        """Fold in aggregates of events that come after ours"""
+        self.events += other.events
+        self.last_timestamp = max(self.last_timestamp, other.last_timestamp)
+        if other.wealth is not None:
+            self.wealth = other.wealth
+        if self.wealth_start is None:
+            self.wealth_start = other.wealth_start
+        if other.time_played is not None:
+            self.time_played = other.time_played
+        self.systems |= other.systems
+        self.mined += other.mined
+        self.trade_profit += other.trade_profit
+        self.units_traded += other.units_traded
+        self.bounties += other.bounties
+        self.bounty_profit += other.bounty_profit
+
+    def copy(self) -> "RunningAggregates":
+        return RunningAggregates.from_dict(self.to_dict())
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        data = dict(self.__dict__)
+        data["systems"] = sorted(self.systems)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunningAggregates":
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        # Older files could hold system names too; keep addresses only
+        known["systems"] = {s for s in known.get("systems", ()) if isinstance(s, int)}
+        return cls(**known)
+
+    @classmethod
+    def load(cls, store_root) -> "RunningAggregates":
+        try:
+            with open(Path(store_root) / AGGREGATES_FILE, encoding="utf-8") as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            return cls()
+
+    def save(self, store_root):
+        path = Path(store_root) / AGGREGATES_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+
+# =============================================================================
+# CARD METRICS
+# =============================================================================
+
+@dataclass(frozen=True)
+class LiveMetric:
+    """A card value read straight off the running aggregates.
+
+    ``value`` reads the all-time total; ``session`` reads the same quantity
+    from the current session's aggregates for the "↑ N this session" line.
+    Metrics without a session component may ``describe`` the total instead.
+    ``events`` are the journal events that can change the value, which is
+    what the GUI routes live updates to the card by.
+    """
+
+    value: Callable[[RunningAggregates], object]
+    format: Callable[[object], str]
+    session: Callable[[RunningAggregates], object] | None = None
+    session_format: Callable[[object], str] = format_count
+    describe: Callable[[object], str] | None = None
+    events: tuple[str, ...] = ()
+
+    def subtitle(self, total: RunningAggregates, session: RunningAggregates) -> str | None:
+        if self.session is not None:
+            amount = self.session(session) or 0
+            return f"↑ {self.session_format(amount)} this session"
+        if self.describe is not None:
+            return self.describe(self.value(total))
+        return None
+
+
+def _wealth_gain(aggs: RunningAggregates):
+    if aggs.wealth is None or aggs.wealth_start is None:
+        return 0
+    return aggs.wealth - aggs.wealth_start
+
+
+WEALTH_EVENTS = ("Statistics", "LoadGame", "MarketSell", *CREDIT_DELTAS)
+
+LIVE_METRICS = {
+    "analysis.total_wealth": LiveMetric(
+        lambda a: a.wealth, format_credits,
+        _wealth_gain, lambda v: format_credits(v).removesuffix(" CR"), events=WEALTH_EVENTS),
+    "analysis.play_time": LiveMetric(
+        lambda a: a.time_played, lambda v: f"{v / 3600:,.1f} hrs",
+        describe=lambda v: f"{v / 86400:.1f} days total", events=("Statistics",)),
+    "analysis.systems_visited": LiveMetric(
+        lambda a: len(a.systems), format_count, lambda a: len(a.systems), events=VISITED_EVENTS),
+    "mining.total_mined": LiveMetric(
+        lambda a: a.mined, lambda v: f"{v:,} units", lambda a: a.mined, events=("MiningRefined",)),
+    "hauling.trade_profit": LiveMetric(
+        lambda a: a.trade_profit, format_credits,
+        lambda a: a.trade_profit, lambda v: format_credits(v).removesuffix(" CR"),
+        events=("MarketSell",)),
+    "hauling.commodities": LiveMetric(
+        lambda a: a.units_traded, format_count, lambda a: a.units_traded,
+        events=("MarketBuy", "MarketSell")),
+    "combat.bounties": LiveMetric(
+        lambda a: a.bounties, format_count, lambda a: a.bounties, events=("Bounty",)),
+    "combat.bounty_profit": LiveMetric(
+        lambda a: a.bounty_profit, format_credits, events=("Bounty",)),
+}
@@ -1,23 +1,48 @@
 
 """
 Elite Dangerous Advanced Analytics Platform
-UI Structure - No Logic Implementation
+The PySide6 desktop UI: the main window, its panels, and the services
+that feed them from the event store, the live journal tail and INARA.
+All Qt code lives here; aggregates are computed off the GUI thread in
+QRunnable jobs over the Qt-free modules.
 Author: Data Science PhD Assistant
 Python 3.12+ / PySide6
 
-Run with: python elite_analytics_ui.py
+Run with: python app_ui.py
 """
 
+import json
 import sys
+import time
+from functools import partial
+from pathlib import Path
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTabWidget, QLabel, QFrame, QSplitter, QTreeWidget, QTreeWidgetItem,
     QStackedWidget, QListWidget, QListWidgetItem, QGroupBox, QGridLayout,
     QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView, QScrollArea,
-    QSizePolicy, QSpacerItem
+    QSizePolicy, QSpacerItem, QListView, QSpinBox, QDoubleSpinBox, QComboBox, QPushButton
 )
-from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QFont, QColor, QPalette, QIcon
+from PySide6.QtCore import (
+    Qt, QSize, QTimer, QAbstractListModel, QEvent, QModelIndex, QObject, QPointF, QProcess,
+    QRunnable, QThreadPool, Signal
+)
+from PySide6.QtGui import QFont, QColor, QPalette, QIcon, QPainter, QPen, QPolygonF
+
+from aggregates import (
+    COLONIZATION_EVENTS, COMBAT_EVENTS, LIVE_METRICS, MINING_EVENTS, SYSTEM_EVENTS, RunningAggregates,
+)
+from event_store import STORED_EVENTS, EventStore, default_data_dir, parse_timestamp
+from forecasts import FORECASTS, ForecastCache
+from inara import InaraClient
+from journal import JournalTailer, default_journal_dir, format_event
+from manifest import DedupKeys
+from postgres_sink import PostgresSink, default_dsn
+from prices import PriceStore
+from queries import QUERIES, ResultCache, format_credits, watermark_key
+from snapshot import DashboardSnapshot, series_head
+from status import StatusWatcher
+from theme import PALETTE, accent_name, apply_theme
 
 
 class PlaceholderWidget(QFrame):
@@ -27,28 +52,54 @@ class PlaceholderWidget(QFrame):
         super().__init__()
         self.setFrameStyle(QFrame.StyledPanel | QFrame.Raised)
         self.setMinimumHeight(height)
-        self.setStyleSheet("""
-            PlaceholderWidget {
-                background-color: #1a1a2e;
-                border: 1px solid #4a4a6a;
-                border-radius: 8px;
-            }
-        """)
 
         layout = QVBoxLayout(self)
         layout.setAlignment(Qt.AlignCenter)
 
         title_label = QLabel(title)
         title_label.setFont(QFont("Segoe UI", 12, QFont.Bold))
-        title_label.setStyleSheet("color: #00d4ff; background: transparent; border: none;")
+        title_label.setObjectName("placeholderTitle")
         title_label.setAlignment(Qt.AlignCenter)
 
-        desc_label = QLabel(description or "Chart/Data will be rendered here")
-        desc_label.setStyleSheet("color: #888; background: transparent; border: none;")
-        desc_label.setAlignment(Qt.AlignCenter)
+        self.desc_label = QLabel(description or "Chart/Data will be rendered here")
+        self.desc_label.setObjectName("placeholderDesc")
+        self.desc_label.setAlignment(Qt.AlignCenter)
 
         layout.addWidget(title_label)
-        layout.addWidget(desc_label)
+        layout.addWidget(self.desc_label)
+
+
+class ModelOutput(PlaceholderWidget):
+    """One headline prediction from the model trainer (see models.ModelSet.predict)"""
+
+    def __init__(self, title: str, prediction: str, description: str = "", height: int = 200):
+        super().__init__(title, description, height)
+        self.prediction = prediction
+        self.desc_label.setWordWrap(True)
+
+    def show_predictions(self, predictions: dict):
+        value = predictions.get(self.prediction)
+        if value is None:
+            return
+        if self.prediction == "session_mining":
+            tons, spread = value
+            hours = predictions.get("session_hours", 0)
+            text = f"Next session estimated: {tons:,.0f} t refined (± {spread:,.0f} t) over {hours:.1f} hrs"
+        elif self.prediction == "elite_trade":
+            days, low, high = value.get("days"), value.get("low"), value.get("high")
+            if days is None:
+                text = f"Trade rank {value.get('score', 0):.2f}: no upward trend in recent progress"
+            elif days == 0:
+                text = "Elite trade rank reached"
+            else:
+                spread = f"{low:,.0f}–{high:,.0f}" if high is not None else f"{low:,.0f}+"
+                text = f"Estimated days to Elite rank: {days:,.1f} days ({spread} days, 95%)"
+        elif self.prediction == "best_hours":
+            hours = " · ".join(f"{hour:02d}:00 UTC {format_credits(rate)}/hr" for hour, rate in value)
+            text = f"Best session start times: {hours}" if value else "Not enough sessions yet"
+        else:
+            text = str(value)
+        self.desc_label.setText(text)
 
 
 class StatusIndicator(QFrame):
@@ -56,58 +107,1980 @@ class StatusIndicator(QFrame):
 
     def __init__(self, label: str, value: str = "---"):
         super().__init__()
-        self.setStyleSheet("""
-            StatusIndicator {
-                background-color: #252540;
-                border: 1px solid #3a3a5a;
-                border-radius: 6px;
-                padding: 8px;
-            }
-        """)
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10, 8, 10, 8)
         layout.setSpacing(4)
 
         self.label = QLabel(label)
-        self.label.setStyleSheet("color: #888; font-size: 10px; background: transparent; border: none;")
+        self.label.setObjectName("statusLabel")
 
         self.value = QLabel(value)
-        self.value.setStyleSheet("color: #00ff88; font-size: 16px; font-weight: bold; background: transparent; border: none;")
+        self.value.setObjectName("statusValue")
+        # False while the indicator still shows its constructor placeholder
+        self.has_value = False
 
         layout.addWidget(self.label)
         layout.addWidget(self.value)
 
+    def set_value(self, value: str):
+        self.has_value = True
+        if self.value.text() != value:
+            self.value.setText(value)
+
+
+class GaugeWidget(QFrame):
+    """Horizontal level gauge with a caption, e.g. fuel or cargo"""
+
+    def __init__(self, title: str, height: int = 150):
+        super().__init__()
+        self.setMinimumHeight(height)
+
+        layout = QVBoxLayout(self)
+        layout.setAlignment(Qt.AlignCenter)
+
+        title_label = QLabel(title)
+        title_label.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        title_label.setObjectName("placeholderTitle")
+        title_label.setAlignment(Qt.AlignCenter)
+
+        self.bar = QProgressBar()
+        self.bar.setObjectName("gauge")
+        self.bar.setTextVisible(False)
+        self.bar.setRange(0, 1000)
+
+        self.caption = QLabel("---")
+        self.caption.setObjectName("placeholderDesc")
+        self.caption.setAlignment(Qt.AlignCenter)
+
+        layout.addWidget(title_label)
+        layout.addWidget(self.bar)
+        layout.addWidget(self.caption)
+
+    def set_level(self, value: float, capacity: float | None, caption: str):
+        if capacity:
+            level = int(max(0.0, min(value / capacity, 1.0)) * 1000)
+            if self.bar.value() != level:
+                self.bar.setValue(level)
+        if self.caption.text() != caption:
+            self.caption.setText(caption)
+
 
 class MetricCard(QFrame):
     """Card widget for displaying metrics"""
 
-    def __init__(self, title: str, value: str, subtitle: str = "", color: str = "#00d4ff"):
+    def __init__(self, title: str, value: str, subtitle: str = "", color: str = "#00d4ff",
+                 query: str | None = None):
         super().__init__()
         self.setFixedHeight(100)
-        self.setStyleSheet(f"""
-            MetricCard {{
-                background-color: #1e1e3a;
-                border-left: 4px solid {color};
-                border-radius: 8px;
-            }}
-        """)
+        # Name of the queries.QUERIES entry that computes this card's value
+        self.query = query
+        # False while the card still shows its constructor placeholder
+        self.has_value = False
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(15, 10, 15, 10)
 
         title_lbl = QLabel(title)
-        title_lbl.setStyleSheet("color: #aaa; font-size: 11px; background: transparent; border: none;")
+        title_lbl.setObjectName("cardTitle")
 
-        value_lbl = QLabel(value)
-        value_lbl.setStyleSheet(f"color: {color}; font-size: 24px; font-weight: bold; background: transparent; border: none;")
+        self.value_lbl = QLabel(value)
+        self.value_lbl.setObjectName("cardValue")
 
-        subtitle_lbl = QLabel(subtitle)
-        subtitle_lbl.setStyleSheet("color: #666; font-size: 10px; background: transparent; border: none;")
+        self.subtitle_lbl = QLabel(subtitle)
+        self.subtitle_lbl.setObjectName("cardSubtitle")
+
+        accent = accent_name(color)
+        if accent:
+            self.setProperty("accent", accent)
+            self.value_lbl.setProperty("accent", accent)
+        else:
+            # Colours outside the theme palette still need their own sheet
+            self.setStyleSheet(f"MetricCard {{ border-left: 4px solid {color}; }}")
+            self.value_lbl.setStyleSheet(f"color: {color};")
 
         layout.addWidget(title_lbl)
-        layout.addWidget(value_lbl)
-        layout.addWidget(subtitle_lbl)
+        layout.addWidget(self.value_lbl)
+        layout.addWidget(self.subtitle_lbl)
+
+    def set_value(self, value: str, subtitle: str | None = None):
+        self.has_value = True
+        if self.value_lbl.text() != value:
+            self.value_lbl.setText(value)
+        if subtitle is not None and self.subtitle_lbl.text() != subtitle:
+            self.subtitle_lbl.setText(subtitle)
+
+
+class ChartCanvas(QWidget):
+    """Line plot over a timeseries.DecimationPyramid with wheel zoom and drag pan.
+
+    Only the visible x range is decimated, to about two points per pixel
+    column, and the resulting polygon is cached until the range or the
+    widget width changes. Double-click resets to the full series.
+    """
+
+    ZOOM_STEP = 1.25
+    MIN_SPAN = 60.0  # seconds
+    MARGIN = 8
+
+    def __init__(self, color: str, format=format_credits):
+        super().__init__()
+        self.setMinimumHeight(120)
+        self.setCursor(Qt.OpenHandCursor)
+        self.color = QColor(color)
+        self.format = format
+        self.pyramid = None
+        self.x_range = None
+        self._polygon = None
+        self._y_range = (0.0, 1.0)
+        self._drag_x = None
+
+    def set_pyramid(self, pyramid):
+        self.pyramid = pyramid
+        self.x_range = None
+        self._polygon = None
+        self.reset_view()
+        self.update()
+
+    def reset_view(self):
+        if self.pyramid is not None and len(self.pyramid):
+            x0, x1, _, _ = self.pyramid.extent
+            self.set_range(x0, x1)
+
+    def set_range(self, x0: float, x1: float):
+        lo, hi, _, _ = self.pyramid.extent
+        span = min(max(x1 - x0, self.MIN_SPAN), max(hi - lo, self.MIN_SPAN))
+        x0 = min(max(x0, lo), max(hi - span, lo))
+        if self.x_range != (x0, x0 + span):
+            self.x_range = (x0, x0 + span)
+            self._polygon = None
+            self.update()
+
+    # -------------------------------------------------------------------------
+    # Rendering
+    # -------------------------------------------------------------------------
+
+    def _plot_rect(self):
+        m = self.MARGIN
+        return self.rect().adjusted(m, m, -m, -m - 14)
+
+    def _build_polygon(self):
+        rect = self._plot_rect()
+        x0, x1 = self.x_range
+        xs, ys = self.pyramid.view(x0, x1, max(rect.width(), 1))
+        if not len(xs):
+            return QPolygonF()
+        if not isinstance(xs, list):
+            # Pyramid views are NumPy arrays, snapshot.SeriesHead views plain lists
+            xs, ys = xs.tolist(), ys.tolist()
+        y0, y1 = min(ys), max(ys)
+        if y1 == y0:
+            y0, y1 = y0 - 1, y1 + 1
+        self._y_range = (y0, y1)
+        left, sx = rect.left(), rect.width() / (x1 - x0)
+        bottom, sy = rect.bottom(), rect.height() / (y1 - y0)
+        return QPolygonF([QPointF(left + (x - x0) * sx, bottom - (y - y0) * sy) for x, y in zip(xs, ys)])
+
+    def resizeEvent(self, event):
+        self._polygon = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self._plot_rect()
+        painter.setPen(QPen(QColor(PALETTE["border_nav"]), 1))
+        for i in range(4):
+            y = rect.top() + rect.height() * i / 3
+            painter.drawLine(QPointF(rect.left(), y), QPointF(rect.right(), y))
+
+        painter.setPen(QColor(PALETTE["text_dim"]))
+        if self.x_range is None:
+            painter.drawText(self.rect(), Qt.AlignCenter, "No history yet")
+            return
+        if self._polygon is None:
+            self._polygon = self._build_polygon()
+        painter.setPen(QPen(self.color, 1.5))
+        painter.drawPolyline(self._polygon)
+
+        painter.setPen(QColor(PALETTE["text_dim"]))
+        y0, y1 = self._y_range
+        painter.drawText(rect.adjusted(4, 2, 0, 0), Qt.AlignLeft | Qt.AlignTop, self.format(y1))
+        painter.drawText(rect.adjusted(4, 0, 0, -2), Qt.AlignLeft | Qt.AlignBottom, self.format(y0))
+        x0, x1 = self.x_range
+        axis = self.rect().adjusted(self.MARGIN, 0, -self.MARGIN, 0)
+        painter.drawText(axis, Qt.AlignLeft | Qt.AlignBottom, time.strftime("%Y-%m-%d", time.gmtime(x0)))
+        painter.drawText(axis, Qt.AlignRight | Qt.AlignBottom, time.strftime("%Y-%m-%d", time.gmtime(x1)))
+
+    # -------------------------------------------------------------------------
+    # Zoom and pan
+    # -------------------------------------------------------------------------
+
+    def _x_at(self, pixel: float) -> float:
+        rect = self._plot_rect()
+        x0, x1 = self.x_range
+        return x0 + (pixel - rect.left()) / max(rect.width(), 1) * (x1 - x0)
+
+    def wheelEvent(self, event):
+        if self.x_range is None:
+            return
+        factor = self.ZOOM_STEP if event.angleDelta().y() < 0 else 1 / self.ZOOM_STEP
+        anchor = self._x_at(event.position().x())
+        x0, x1 = self.x_range
+        self.set_range(anchor - (anchor - x0) * factor, anchor + (x1 - anchor) * factor)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self.x_range is not None:
+            self._drag_x = event.position().x()
+            self.setCursor(Qt.ClosedHandCursor)
+
+    def mouseMoveEvent(self, event):
+        if self._drag_x is None:
+            return
+        shift = self._x_at(self._drag_x) - self._x_at(event.position().x())
+        self._drag_x = event.position().x()
+        x0, x1 = self.x_range
+        self.set_range(x0 + shift, x1 + shift)
+
+    def mouseReleaseEvent(self, event):
+        self._drag_x = None
+        self.setCursor(Qt.OpenHandCursor)
+
+    def mouseDoubleClickEvent(self, event):
+        self.reset_view()
+
+
+class TimeSeriesChart(QFrame):
+    """Titled history chart bound to a timeseries.SERIES entry"""
+
+    def __init__(self, title: str, series: str, color: str = "#00d4ff", height: int = 200):
+        super().__init__()
+        self.setFrameStyle(QFrame.StyledPanel | QFrame.Raised)
+        self.setMinimumHeight(height)
+        # Name of the timeseries.SERIES loader that feeds this chart
+        self.series = series
+
+        layout = QVBoxLayout(self)
+
+        title_label = QLabel(title)
+        title_label.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        title_label.setObjectName("placeholderTitle")
+        title_label.setAlignment(Qt.AlignCenter)
+
+        self.canvas = ChartCanvas(color)
+
+        layout.addWidget(title_label)
+        layout.addWidget(self.canvas, 1)
+
+    def set_pyramid(self, pyramid):
+        self.canvas.set_pyramid(pyramid)
+
+
+class ForecastCanvas(QWidget):
+    """Recent history, forecast mean (dashed) and its prediction band"""
+
+    MARGIN = 8
+
+    def __init__(self, color: str, format=format_credits):
+        super().__init__()
+        self.setMinimumHeight(120)
+        self.color = QColor(color)
+        self.format = format
+        self.forecast = None
+
+    def set_forecast(self, forecast):
+        self.forecast = forecast
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        m = self.MARGIN
+        rect = self.rect().adjusted(m, m, -m, -m - 14)
+        painter.setPen(QPen(QColor(PALETTE["border_nav"]), 1))
+        for i in range(4):
+            y = rect.top() + rect.height() * i / 3
+            painter.drawLine(QPointF(rect.left(), y), QPointF(rect.right(), y))
+
+        painter.setPen(QColor(PALETTE["text_dim"]))
+        forecast = self.forecast
+        if forecast is None or not (forecast.history or forecast.points):
+            painter.drawText(self.rect(), Qt.AlignCenter, "No forecast yet")
+            return
+        xs = [p[0] for p in forecast.history] + [p[0] for p in forecast.points]
+        ys = [p[1] for p in forecast.history] + [v for p in forecast.points for v in p[1:]]
+        x0, x1 = min(xs), max(xs)
+        y0, y1 = min(ys), max(ys)
+        if x1 == x0:
+            x1 = x0 + 1
+        if y1 == y0:
+            y0, y1 = y0 - 1, y1 + 1
+
+        def at(x, y):
+            return QPointF(rect.left() + (x - x0) * rect.width() / (x1 - x0),
+                           rect.bottom() - (y - y0) * rect.height() / (y1 - y0))
+
+        if forecast.points:
+            band = [at(p[0], p[3]) for p in forecast.points] + [at(p[0], p[2]) for p in reversed(forecast.points)]
+            fill = QColor(self.color)
+            fill.setAlpha(50)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(fill)
+            painter.drawPolygon(QPolygonF(band))
+            painter.setBrush(Qt.NoBrush)
+        painter.setPen(QPen(self.color, 1.5))
+        painter.drawPolyline(QPolygonF([at(x, y) for x, y in forecast.history]))
+        if forecast.points:
+            pen = QPen(self.color, 1.5, Qt.DashLine)
+            painter.setPen(pen)
+            start = forecast.history[-1:] + [p[:2] for p in forecast.points]
+            painter.drawPolyline(QPolygonF([at(x, y) for x, y in start]))
+
+        painter.setPen(QColor(PALETTE["text_dim"]))
+        painter.drawText(rect.adjusted(4, 2, 0, 0), Qt.AlignLeft | Qt.AlignTop, self.format(y1))
+        painter.drawText(rect.adjusted(4, 0, 0, -2), Qt.AlignLeft | Qt.AlignBottom, self.format(y0))
+        axis = self.rect().adjusted(m, 0, -m, 0)
+        painter.drawText(axis, Qt.AlignLeft | Qt.AlignBottom, time.strftime("%Y-%m-%d", time.gmtime(x0)))
+        painter.drawText(axis, Qt.AlignRight | Qt.AlignBottom, time.strftime("%Y-%m-%d", time.gmtime(x1)))
+
+
+class ForecastChart(QFrame):
+    """Titled chart of one cached forecasts.FORECASTS entry"""
+
+    def __init__(self, title: str, model: str, color: str = "#00d4ff", height: int = 200):
+        super().__init__()
+        self.setFrameStyle(QFrame.StyledPanel | QFrame.Raised)
+        self.setMinimumHeight(height)
+        # Name of the forecasts.FORECASTS entry shown here
+        self.model = model
+
+        layout = QVBoxLayout(self)
+
+        title_label = QLabel(title)
+        title_label.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        title_label.setObjectName("placeholderTitle")
+        title_label.setAlignment(Qt.AlignCenter)
+
+        self.canvas = ForecastCanvas(color)
+
+        self.caption = QLabel("Waiting for the first model training")
+        self.caption.setObjectName("placeholderDesc")
+        self.caption.setAlignment(Qt.AlignCenter)
+
+        layout.addWidget(title_label)
+        layout.addWidget(self.canvas, 1)
+        layout.addWidget(self.caption)
+
+    def set_forecast(self, forecast, stale: bool = False):
+        self.canvas.set_forecast(forecast)
+        if forecast is None or not forecast.points:
+            return
+        last = forecast.points[-1]
+        confidence = {1.96: "95%", 1.64: "90%", 2.58: "99%"}.get(forecast.params.get("z"), "")
+        fitted = time.strftime("%Y-%m-%d", time.gmtime(forecast.through))
+        self.caption.setText(
+            f"{len(forecast.points)} days: {format_credits(last[1])} "
+            f"({format_credits(last[2])} – {format_credits(last[3])}, {confidence}) · data to {fitted}"
+            + (" · updating…" if stale else "")
+        )
+
+
+class SystemMapCanvas(QWidget):
+    """Top-down (X/Z) map of a spatial.SystemIndex with wheel zoom and drag pan.
+
+    Dots come from the index's level-of-detail walk for the visible
+    rectangle, at most one per few pixels, and are cached until the view
+    or the index changes. With ``follow`` the view stays centred on the
+    current system until the user pans; double-click resets.
+    """
+
+    ZOOM_STEP = 1.25
+    CELL_PX = 3
+    MIN_SPAN = 1.0  # light years
+
+    def __init__(self, span: float | None = None, center=None, follow: bool = False,
+                 color: str = "#00d4ff"):
+        super().__init__()
+        self.setMinimumHeight(120)
+        self.setCursor(Qt.OpenHandCursor)
+        self.color = QColor(color)
+        self.default_span = span
+        self.default_center = center
+        self.follow = follow
+        self.index = None
+        self.span = span or 1000.0
+        self.center = center or (0.0, 0.0)
+        self._dots = None
+        self._drag = None
+        self._panned = False
+
+    def set_index(self, index):
+        self.index = index
+        self.reset_view()
+
+    def reset_view(self):
+        self._panned = False
+        if self.index is not None and self.default_span is None and len(self.index):
+            x0, x1, z0, z1 = self.index.extent()
+            self.span = max(x1 - x0, (z1 - z0) * self.width() / max(self.height(), 1), self.MIN_SPAN) * 1.1
+            self.center = ((x0 + x1) / 2, (z0 + z1) / 2)
+        else:
+            self.span = self.default_span or self.span
+            self.center = self.default_center or self.center
+        self.index_changed()
+
+    def index_changed(self):
+        """The index gained systems or moved its current one"""
+        if self.follow and not self._panned and self.index is not None and self.index.current is not None:
+            pos = self.index.position(self.index.current)
+            self.center = (float(pos[0]), float(pos[2]))
+        self._dots = None
+        self.update()
+
+    # -------------------------------------------------------------------------
+    # Rendering
+    # -------------------------------------------------------------------------
+
+    def _ly_per_px(self) -> float:
+        return self.span / max(self.width(), 1)
+
+    def _to_screen(self, x: float, z: float) -> QPointF:
+        scale = self._ly_per_px()
+        return QPointF(self.width() / 2 + (x - self.center[0]) / scale,
+                       self.height() / 2 - (z - self.center[1]) / scale)
+
+    def _build_dots(self):
+        scale = self._ly_per_px()
+        half_w, half_h = self.width() / 2 * scale, self.height() / 2 * scale
+        cx, cz = self.center
+        xs, zs, counts = self.index.clusters((cx - half_w, cx + half_w, cz - half_h, cz + half_h),
+                                             self.CELL_PX * scale)
+        px = (self.width() / 2 + (xs - cx) / scale).tolist()
+        pz = (self.height() / 2 - (zs - cz) / scale).tolist()
+        # Three dot sizes: single systems, small clusters, dense clusters
+        tiers = ([], [], [])
+        for x, z, n in zip(px, pz, counts.tolist()):
+            tiers[0 if n <= 1 else 1 if n < 16 else 2].append(QPointF(x, z))
+        return [QPolygonF(points) for points in tiers]
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._panned:
+            self._dots = None
+        else:
+            self.reset_view()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        if self.index is None or not len(self.index):
+            painter.setPen(QColor(PALETTE["text_dim"]))
+            painter.drawText(self.rect(), Qt.AlignCenter, "No visited systems yet")
+            return
+        if self._dots is None:
+            self._dots = self._build_dots()
+        dim = QColor(self.color)
+        dim.setAlpha(180)
+        for width, points in zip((3, 4, 6), self._dots):
+            pen = QPen(dim, width)
+            pen.setCapStyle(Qt.RoundCap)
+            painter.setPen(pen)
+            painter.drawPoints(points)
+
+        if self.index.current is not None:
+            pos = self.index.position(self.index.current)
+            here = self._to_screen(float(pos[0]), float(pos[2]))
+            painter.setPen(QPen(QColor(PALETTE["tab_selected"]), 2))
+            painter.drawEllipse(here, 5, 5)
+            painter.drawText(here + QPointF(8, -6), self.index.names[self.index.current])
+
+        painter.setPen(QColor(PALETTE["text_dim"]))
+        painter.drawText(self.rect().adjusted(6, 0, 0, -4), Qt.AlignLeft | Qt.AlignBottom,
+                         f"{self.span:,.0f} ly across")
+
+    # -------------------------------------------------------------------------
+    # Zoom and pan
+    # -------------------------------------------------------------------------
+
+    def wheelEvent(self, event):
+        factor = self.ZOOM_STEP if event.angleDelta().y() < 0 else 1 / self.ZOOM_STEP
+        scale = self._ly_per_px()
+        pos = event.position()
+        # Keep the point under the cursor fixed
+        ax = self.center[0] + (pos.x() - self.width() / 2) * scale
+        az = self.center[1] - (pos.y() - self.height() / 2) * scale
+        self.span = max(self.span * factor, self.MIN_SPAN)
+        new_scale = self._ly_per_px()
+        self.center = (ax - (pos.x() - self.width() / 2) * new_scale,
+                       az + (pos.y() - self.height() / 2) * new_scale)
+        self._dots = None
+        self.update()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._drag = event.position()
+            self.setCursor(Qt.ClosedHandCursor)
+
+    def mouseMoveEvent(self, event):
+        if self._drag is None:
+            return
+        scale = self._ly_per_px()
+        delta = event.position() - self._drag
+        self._drag = event.position()
+        self.center = (self.center[0] - delta.x() * scale, self.center[1] + delta.y() * scale)
+        self._panned = True
+        self._dots = None
+        self.update()
+
+    def mouseReleaseEvent(self, event):
+        self._drag = None
+        self.setCursor(Qt.OpenHandCursor)
+
+    def mouseDoubleClickEvent(self, event):
+        self.reset_view()
+
+
+class SystemMap(QFrame):
+    """Titled map of visited systems fed by AggregationService.
+
+    ``radius`` makes the caption describe the neighbourhood of the current
+    system; ``landmarks`` makes it give the distance to Sol and Sgr A*.
+    """
+
+    def __init__(self, title: str, span: float | None = None, center=None, follow: bool = False,
+                 radius: float | None = None, landmarks: bool = False, height: int = 200):
+        super().__init__()
+        self.setFrameStyle(QFrame.StyledPanel | QFrame.Raised)
+        self.setMinimumHeight(height)
+        self.radius = radius
+        self.landmarks = landmarks
+
+        layout = QVBoxLayout(self)
+
+        title_label = QLabel(title)
+        title_label.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        title_label.setObjectName("placeholderTitle")
+        title_label.setAlignment(Qt.AlignCenter)
+
+        self.canvas = SystemMapCanvas(span, center, follow)
+
+        self.caption = QLabel("---")
+        self.caption.setObjectName("placeholderDesc")
+        self.caption.setAlignment(Qt.AlignCenter)
+
+        layout.addWidget(title_label)
+        layout.addWidget(self.canvas, 1)
+        layout.addWidget(self.caption)
+
+    def set_index(self, index):
+        self.canvas.set_index(index)
+        self.update_caption()
+
+    def index_changed(self):
+        self.canvas.index_changed()
+        self.update_caption()
+
+    def update_caption(self):
+        index = self.canvas.index
+        if index is None:
+            return
+        text = f"{len(index):,} visited systems"
+        if self.radius is not None:
+            count, nearest = index.neighbours(self.radius)
+            text = f"{count:,} visited within {self.radius:,.0f} ly"
+            if nearest:
+                text += f" · nearest {nearest[1]} ({nearest[0]:,.1f} ly)"
+        elif self.landmarks and index.current is not None:
+            distances = index.landmark_distances()
+            text = " · ".join(f"{dist:,.0f} ly from {name}" for name, dist in distances.items())
+        if self.caption.text() != text:
+            self.caption.setText(text)
+
+
+class RouteOptimizer(QFrame):
+    """Ship constraints in, best trade routes out (see routes.find_routes)"""
+
+    requested = Signal(dict)
+
+    COLUMNS = ("Route", "Commodities", "Profit", "CR/hr", "Jumps")
+    PADS = (("Small pad", 1), ("Medium pad", 2), ("Large pad", 3))
+
+    def __init__(self, title: str, height: int = 180):
+        super().__init__()
+        self.setFrameStyle(QFrame.StyledPanel | QFrame.Raised)
+        self.setMinimumHeight(height)
+
+        layout = QVBoxLayout(self)
+
+        title_label = QLabel(title)
+        title_label.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        title_label.setObjectName("placeholderTitle")
+        title_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title_label)
+
+        controls = QHBoxLayout()
+        self.cargo = QSpinBox()
+        self.cargo.setRange(1, 2000)
+        self.cargo.setValue(256)
+        self.cargo.setSuffix(" t")
+        self.jump_range = QDoubleSpinBox()
+        self.jump_range.setRange(1.0, 200.0)
+        self.jump_range.setValue(25.0)
+        self.jump_range.setSuffix(" ly")
+        self.pad = QComboBox()
+        for label, size in self.PADS:
+            self.pad.addItem(label, size)
+        self.pad.setCurrentIndex(2)
+        self.find_button = QPushButton("Find Routes")
+        self.find_button.clicked.connect(self.request)
+        for widget in (self.cargo, self.jump_range, self.pad, self.find_button):
+            widget.setObjectName("control")
+            controls.addWidget(widget)
+        layout.addLayout(controls)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setObjectName("resultTable")
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setAlternatingRowColors(True)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table, 1)
+
+        self.caption = QLabel("Dock or press Find Routes")
+        self.caption.setObjectName("placeholderDesc")
+        self.caption.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.caption)
+
+    def params(self) -> dict:
+        return {
+            "cargo": self.cargo.value(),
+            "jump_range": self.jump_range.value(),
+            "pad": self.pad.currentData(),
+        }
+
+    def request(self):
+        self.caption.setText("Searching…")
+        self.requested.emit(self.params())
+
+    def set_ship(self, cargo: int | None, jump_range: float | None):
+        """Take cargo capacity and jump range from the current loadout"""
+        if cargo:
+            self.cargo.setValue(int(cargo))
+        if jump_range:
+            self.jump_range.setValue(float(jump_range))
+
+    def show_routes(self, routes: list, info: dict):
+        self.table.setRowCount(len(routes))
+        for row, route in enumerate(routes):
+            cells = (
+                route.describe() + (" ↺" if route.is_loop else ""),
+                ", ".join(dict.fromkeys(leg.commodity.title() for leg in route.legs)),
+                format_credits(route.profit),
+                format_credits(route.credits_per_hour),
+                f"{route.jumps:,}",
+            )
+            for column, text in enumerate(cells):
+                self.table.setItem(row, column, QTableWidgetItem(text))
+        self.caption.setText(
+            f"{len(routes)} routes from {info['stations']:,} stations in {info['elapsed']:.2f}s"
+            if routes else f"No profitable routes among {info['stations']:,} known stations"
+        )
+
+
+class ResultTable(QFrame):
+    """Titled read-only table of computed results with a caption line"""
+
+    COLUMNS: tuple[str, ...] = ()
+
+    def __init__(self, title: str, height: int = 180, caption: str = ""):
+        super().__init__()
+        self.setFrameStyle(QFrame.StyledPanel | QFrame.Raised)
+        self.setMinimumHeight(height)
+
+        layout = QVBoxLayout(self)
+
+        title_label = QLabel(title)
+        title_label.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        title_label.setObjectName("placeholderTitle")
+        title_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title_label)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setObjectName("resultTable")
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setAlternatingRowColors(True)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table, 1)
+
+        self.caption = QLabel(caption)
+        self.caption.setObjectName("placeholderDesc")
+        self.caption.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.caption)
+
+    def set_rows(self, rows: list[tuple[str, ...]], caption: str | None = None):
+        self.table.setRowCount(len(rows))
+        for row, cells in enumerate(rows):
+            for column, text in enumerate(cells):
+                self.table.setItem(row, column, QTableWidgetItem(text))
+        if caption is not None:
+            self.caption.setText(caption)
+
+
+class MarketPrices(ResultTable):
+    """Latest prices at a station with the change since the previous visit"""
+
+    COLUMNS = ("Commodity", "Buy", "Sell", "Stock", "Demand", "Δ Last Visit")
+
+    def __init__(self, title: str, height: int = 200):
+        super().__init__(title, height, "Open a station market to record its prices")
+
+    def show_prices(self, station: str, latest: dict, previous: dict, visits: int):
+        rows = []
+        for commodity, price in sorted(latest.items(), key=lambda item: -max(item[1].buy, item[1].sell)):
+            # Change in the price that matters here: buy where it is sold, sell where it is wanted
+            before = previous.get(commodity)
+            field = 0 if price.stock else 1
+            delta = f"{price[field] - before[field]:+,}" if before and before[field] else ""
+            rows.append((
+                commodity.title(),
+                f"{price.buy:,}" if price.stock else "",
+                f"{price.sell:,}" if price.demand else "",
+                f"{price.stock:,}", f"{price.demand:,}", delta,
+            ))
+        self.set_rows(rows, f"{station} · {visits:,} recorded visits")
+
+
+def _ring_name(ring: str) -> str:
+    return ring or "Unknown ring"
+
+
+class MiningView(ResultTable):
+    """A ResultTable fed from mining.MiningStats by the AggregationService"""
+
+    def show_stats(self, stats):
+        """Redraw from ``stats``; each subclass shows its own slice of them"""
+
+
+class ProspectorResults(MiningView):
+    """Composition of the last prospected asteroid against its hotspot's history"""
+
+    COLUMNS = ("Material", "Proportion", "Hotspot Median", "Hotspot P90", "Value/t")
+
+    def __init__(self, title: str, height: int = 150):
+        super().__init__(title, height, "Fire a prospector limpet")
+
+    def show_stats(self, stats):
+        prospect = stats.last_prospect
+        if prospect is None:
+            return
+        rows = []
+        for material, proportion in prospect.materials:
+            spot = stats.hotspots.get((prospect.ring, material))
+            rows.append((
+                material.title(), f"{proportion:.1f}%",
+                f"{spot.sketch.quantile(0.5):.1f}%" if spot else "",
+                f"{spot.sketch.quantile(0.9):.1f}%" if spot else "",
+                format_credits(stats.value_per_ton(material)) if stats.value_per_ton(material) else "",
+            ))
+        parts = [f"{prospect.content} content" if prospect.content else "",
+                 f"Motherlode: {prospect.motherlode.title()}" if prospect.motherlode else "",
+                 f"{prospect.remaining:.0f}% remaining", _ring_name(prospect.ring)]
+        self.set_rows(rows, " · ".join(part for part in parts if part))
+
+
+class MineralDistribution(MiningView):
+    """Tons refined and their value per mineral, with the content-level mix"""
+
+    COLUMNS = ("Mineral", "Refined", "Value", "Share")
+
+    def __init__(self, title: str, height: int = 180):
+        super().__init__(title, height, "No minerals refined yet")
+
+    def show_stats(self, stats):
+        minerals = stats.minerals()
+        total = sum(value for _, _, value in minerals) or 1
+        rows = [(material.title(), f"{tons:,} t", format_credits(value), f"{value / total:.1%}")
+                for material, tons, value in minerals]
+        shares = stats.content_shares()
+        caption = " · ".join(f"{level} {share:.0%}" for level, share in shares.items())
+        self.set_rows(rows, f"Asteroid content: {caption}" if sum(stats.content.values()) else None)
+
+
+class HotspotRanking(MiningView):
+    """Hotspots ranked by credits per hour (see mining.MiningStats.ranking)"""
+
+    COLUMNS = ("Ring", "Material", "Rocks", "Refined", "t/hr", "CR/hr", "Median", "P90")
+
+    def __init__(self, title: str, height: int = 180):
+        super().__init__(title, height, "No hotspots prospected yet")
+
+    def show_stats(self, stats):
+        ranks = stats.ranking()
+        rows = [
+            (_ring_name(r.ring), r.material.title(), f"{r.prospected:,}", f"{r.refined:,} t",
+             f"{r.tons_per_hour:.1f}", format_credits(r.credits_per_hour),
+             f"{r.median:.1f}%", f"{r.p90:.1f}%")
+            for r in ranks
+        ]
+        self.set_rows(rows, f"{len(stats.hotspots):,} hotspots, {stats.seconds / 3600:,.1f} hrs mining"
+                      if ranks else None)
+
+
+def _date(ts: int) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(ts)) if ts else ""
+
+
+def _system_name(system: str) -> str:
+    return system or "Unknown system"
+
+
+def _hulls(damage: float) -> str:
+    """Hull lost, e.g. 40% or 3.2 hulls"""
+    return f"{damage:.0%}" if damage < 1 else f"{damage:,.1f} hulls"
+
+
+class CombatView(ResultTable):
+    """A ResultTable fed from combat.CombatStats by the AggregationService"""
+
+    def show_stats(self, stats):
+        """Redraw from ``stats``; each subclass shows its own slice of them"""
+
+
+class BountyHunting(CombatView):
+    """Favourite hunting grounds by bounty credits, with the all-time kill rate"""
+
+    COLUMNS = ("System", "Kills", "Bounties", "CR/Kill", "Last")
+
+    def __init__(self, title: str, height: int = 180):
+        super().__init__(title, height, "No bounties claimed yet")
+
+    def show_stats(self, stats):
+        rows = [(_system_name(s.system), f"{s.kills:,}", format_credits(s.bounty_credits),
+                 format_credits(s.bounty_credits / s.kills), _date(s.last_seen))
+                for s in stats.hunting_grounds()]
+        total = stats.total
+        self.set_rows(rows, f"{total.kills:,} kills · {format_credits(total.credits_per_kill)}/kill · "
+                            f"{total.kills_per_hour:,.1f} kills/hr in combat" if rows else None)
+
+
+class CombatZones(CombatView):
+    """Systems where conflict zone kill bonds were earned"""
+
+    COLUMNS = ("System", "Bonds", "Credits", "CR/Bond", "Last")
+
+    def __init__(self, title: str, height: int = 180):
+        super().__init__(title, height, "No conflict zone kill bonds yet")
+
+    def show_stats(self, stats):
+        zones = stats.combat_zones()
+        rows = [(_system_name(s.system), f"{s.bonds:,}", format_credits(s.bond_credits),
+                 format_credits(s.bond_credits / s.bonds), _date(s.last_seen))
+                for s in zones]
+        self.set_rows(rows, f"{len(zones):,} systems fought over" if rows else None)
+
+
+class ThargoidEncounters(CombatView):
+    """Systems where Thargoids were killed"""
+
+    COLUMNS = ("System", "Kills", "Bonds", "Deaths", "Last")
+
+    def __init__(self, title: str, height: int = 150):
+        super().__init__(title, height, "No Thargoid kills yet")
+
+    def show_stats(self, stats):
+        systems = stats.thargoid_systems()
+        rows = [(_system_name(s.system), f"{s.thargoid_kills:,}", format_credits(s.thargoid_credits),
+                 f"{s.deaths:,}", _date(s.last_seen))
+                for s in systems]
+        kills = sum(s.thargoid_kills for s in stats.systems.values())
+        self.set_rows(rows, f"{kills:,} Thargoids killed" if rows else None)
+
+
+class CombatEfficiency(CombatView):
+    """Kill rate, earnings and damage over the last hour against all time"""
+
+    COLUMNS = ("Metric", "Last Hour", "All Time")
+
+    def __init__(self, title: str, height: int = 180):
+        super().__init__(title, height, "No combat recorded yet")
+
+    def show_stats(self, stats):
+        recent, total = stats.recent(), stats.total
+        if not (total.kills or total.damage or total.deaths or total.interdictions):
+            return
+        rows = [("Kills/hour", *(f"{t.kills_per_hour:,.1f}" for t in (recent, total))),
+                ("Credits/kill", *(format_credits(t.credits_per_kill) for t in (recent, total))),
+                ("Kills", *(f"{t.kills:,}" for t in (recent, total))),
+                ("Hull lost", *(_hulls(t.damage) for t in (recent, total))),
+                ("Deaths", *(f"{t.deaths:,}" for t in (recent, total))),
+                ("Interdictions", *(f"{t.interdictions:,}" for t in (recent, total))),
+                ("Wanted ships scanned", *(f"{t.scans:,}" for t in (recent, total))),
+                ("Time in combat", *(f"{t.seconds / 3600:,.1f} hrs" for t in (recent, total)))]
+        self.set_rows(rows, f"Hull now {stats.hull:.0%} · {_system_name(stats.system)}")
+
+
+class ThreatPrediction(CombatView):
+    """Systems by decayed danger score (see combat.SystemCombat)"""
+
+    COLUMNS = ("System", "Danger", "Interdictions", "Deaths", "Hull Lost", "Visits")
+
+    def __init__(self, title: str, height: int = 180):
+        super().__init__(title, height, "No hostile encounters recorded yet")
+
+    def show_stats(self, stats):
+        from combat import DANGER_HALF_LIFE
+
+        rows = [(_system_name(s.system), f"{danger:,.1f}", f"{s.interdictions:,}", f"{s.deaths:,}",
+                 _hulls(s.damage), f"{s.visits:,}")
+                for s, danger in stats.threats()]
+        self.set_rows(rows, f"Interdictions, damage and deaths, halving every {DANGER_HALF_LIFE // 86400} days"
+                      if rows else None)
+
+
+class ColonizationView(ResultTable):
+    """A ResultTable fed from colonization.ColonizationTracker by the AggregationService"""
+
+    def show_tracker(self, tracker):
+        """Redraw from ``tracker``; each subclass shows its own slice of it"""
+
+
+class ColonizationProjects(ColonizationView):
+    """Construction sites still being built, with what they still need"""
+
+    COLUMNS = ("Project", "System", "Progress", "Remaining", "Required", "You Delivered", "Updated")
+
+    def __init__(self, title: str, height: int = 180):
+        super().__init__(title, height, "Dock at a construction site to track its project")
+
+    def show_tracker(self, tracker):
+        projects = tracker.active_projects()
+        rows = [(p.station or f"Construction site {p.market_id}", _system_name(p.system), f"{p.progress:.1%}",
+                 f"{p.remaining:,} t", f"{p.required:,} t", f"{p.contributed:,} t", _date(p.updated))
+                for p in projects]
+        remaining = sum(p.remaining for p in projects)
+        self.set_rows(rows, f"{len(projects):,} active projects · {remaining:,} t still needed"
+                      if rows else None)
+
+
+class HaulPlan(ColonizationView):
+    """What to haul next for the active projects (see colonization.ColonizationTracker.plan)"""
+
+    COLUMNS = ("Commodity", "Next", "Needed", "In Hold", "On Carrier", "To Buy", "Nearest Source", "Price")
+
+    def __init__(self, title: str, height: int = 180):
+        super().__init__(title, height, "No resources needed by tracked projects")
+
+    def show_tracker(self, tracker):
+        plan = tracker.plan()
+        rows = []
+        for h in plan:
+            source = h.source
+            rows.append((h.label, f"{h.action} {h.amount:,} t", f"{h.needed:,} t", f"{h.in_hold:,} t",
+                         f"{h.on_carrier:,} t", f"{h.to_buy:,} t",
+                         f"{source.station} · {source.distance:,.1f} ly · {source.stock:,} t" if source else "",
+                         format_credits(source.price) if source else ""))
+        if not plan:
+            self.set_rows(rows, None)
+            return
+        first = plan[0]
+        where = f" at {first.source.station}" if first.action == "Buy" else ""
+        hold = sum(tracker.cargo.values())
+        capacity = f" / {tracker.capacity:,}" if tracker.capacity else ""
+        self.set_rows(rows, f"Next: {first.action} {first.amount:,} t {first.label}{where} · "
+                            f"hold {hold:,}{capacity} t")
+
+
+class InaraProfile(ResultTable):
+    """Commander profile as INARA reports it"""
+
+    COLUMNS = ("Field", "Value")
+
+    def __init__(self, title: str, height: int = 150):
+        super().__init__(title, height, "Set EDXDC_INARA_API_KEY to link an INARA account")
+
+    def show_profile(self, profile: dict | None):
+        if not profile:
+            self.set_rows([], "No INARA profile for this commander yet")
+            return
+        rows = [("Commander", profile.get("commanderName", ""))]
+        for rank in profile.get("commanderRanksPilot") or []:
+            rows.append((rank.get("rankName", "").title(),
+                         f"{rank.get('rankValue', 0)} · {rank.get('rankProgress', 0):.0%}"))
+        squadron = profile.get("commanderSquadron") or {}
+        for field, value in (("Allegiance", profile.get("preferredAllegianceName")),
+                             ("Power", profile.get("preferredPowerName")),
+                             ("Squadron", squadron.get("squadronName")),
+                             ("Role", profile.get("preferredGameRole"))):
+            if value:
+                rows.append((field, value))
+        self.set_rows(rows, profile.get("inaraURL", ""))
+
+
+class CommunityGoals(ResultTable):
+    """Community goals that are still running"""
+
+    COLUMNS = ("Community Goal", "System", "Tier", "Contributors", "Ends")
+
+    def __init__(self, title: str, height: int = 200):
+        super().__init__(title, height, "Community goals load from INARA")
+
+    def show_goals(self, goals: list | None):
+        goals = goals if isinstance(goals, list) else []
+        active = [goal for goal in goals if not goal.get("isCompleted")]
+        rows = [
+            (goal.get("communitygoalName", ""), goal.get("starsystemName", ""),
+             f"{goal.get('tierReached', 0)}/{goal.get('tierMax', 0)}",
+             f"{goal.get('contributorsNum', 0):,}", (goal.get("goalExpiry") or "")[:10])
+            for goal in active
+        ]
+        self.set_rows(rows, f"{len(active):,} active community goals")
+
+
+# =============================================================================
+# LIVE EVENT ROUTING
+# =============================================================================
+
+class EventBus(QObject):
+    """Routes live journal events to the views that depend on them.
+
+    Views subscribe with the event types that change what they show and a
+    callback that redraws them from current state. Subscribing fills a
+    table from event type to views, so publishing a batch is one dict
+    lookup per event, and each affected view is redrawn once per batch.
+    Views that are not on screen (another stack page, an unselected
+    sub-tab, a window not shown yet) are only marked; they redraw once
+    when they are next shown, however many batches arrived meanwhile.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.routes = {}  # journal event type -> views subscribed to it
+        self.refreshers = {}  # view -> redraw callback
+        self.deferred = {}  # hidden views owed a redraw, in the order they were marked
+
+    def subscribe(self, view: QWidget, events, refresh):
+        if view not in self.refreshers:
+            view.installEventFilter(self)
+        self.refreshers[view] = refresh
+        for name in events:
+            views = self.routes.setdefault(name, [])
+            if view not in views:
+                views.append(view)
+
+    def publish(self, events: list[dict]):
+        dirty = {}
+        routes = self.routes
+        for event in events:
+            for view in routes.get(event.get("event"), ()):
+                dirty[view] = None
+        for view in dirty:
+            self.update(view)
+
+    def update(self, view: QWidget):
+        """Redraw ``view`` now if it is on screen, otherwise once it is shown"""
+        if view.isVisible():
+            self.deferred.pop(view, None)
+            self.refreshers[view]()
+        else:
+            self.deferred[view] = None
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Show and watched in self.deferred:
+            del self.deferred[watched]
+            self.refreshers[watched]()
+        return False
+
+
+# =============================================================================
+# BACKGROUND AGGREGATION
+# =============================================================================
+
+class AggregateSignals(QObject):
+    finished = Signal(str, object, object)  # query name, watermark, value
+    series_ready = Signal(str, object, object)  # series name, watermark, pyramid
+    systems_ready = Signal(object, object)  # watermark, spatial.SystemIndex
+    routes_ready = Signal(object, object, object)  # routes.MarketData, routes, info
+    mining_ready = Signal(object, object)  # watermark, mining.MiningStats
+    combat_ready = Signal(object, object)  # watermark, combat.CombatStats
+    colonization_ready = Signal(object, object)  # watermark, colonization.ColonizationTracker
+    ingest_ready = Signal(object)  # ingest.IngestResult, None if the import failed
+
+
+class AggregateJob(QRunnable):
+    """Runs one historical query on the worker pool"""
+
+    def __init__(self, store: EventStore, name: str, mark: dict, signals: AggregateSignals):
+        super().__init__()
+        self.store = store
+        self.name = name
+        self.mark = mark
+        self.signals = signals
+
+    def run(self):
+        try:
+            value = QUERIES[self.name].compute(self.store)
+        except Exception:
+            value = None
+        self.signals.finished.emit(self.name, self.mark, value)
+
+
+class SeriesJob(AggregateJob):
+    """Loads one chart series and builds its decimation pyramid on the worker pool"""
+
+    def run(self):
+        try:
+            # NumPy is only needed once a chart has something to draw
+            from timeseries import load_pyramid
+            pyramid = load_pyramid(self.store, self.name)
+        except Exception:
+            pyramid = None
+        self.signals.series_ready.emit(self.name, self.mark, pyramid)
+
+
+class SystemIndexJob(AggregateJob):
+    """Builds the visited-systems spatial index on the worker pool"""
+
+    def run(self):
+        try:
+            from spatial import load_index
+            index = load_index(self.store)
+        except Exception:
+            index = None
+        self.signals.systems_ready.emit(self.mark, index)
+
+
+class MiningJob(AggregateJob):
+    """Loads the mining statistics on the worker pool"""
+
+    def run(self):
+        try:
+            from mining import load_mining
+            stats = load_mining(self.store)
+        except Exception:
+            stats = None
+        self.signals.mining_ready.emit(self.mark, stats)
+
+
+class CombatJob(AggregateJob):
+    """Loads the combat statistics on the worker pool"""
+
+    def run(self):
+        try:
+            from combat import load_combat
+            stats = load_combat(self.store)
+        except Exception:
+            stats = None
+        self.signals.combat_ready.emit(self.mark, stats)
+
+
+class ColonizationJob(AggregateJob):
+    """Replays the colonization history and indexes market stock on the worker pool"""
+
+    def __init__(self, store: EventStore, mark: dict, prices: PriceStore, signals: AggregateSignals):
+        super().__init__(store, "colonization", mark, signals)
+        self.prices = prices
+
+    def run(self):
+        try:
+            from colonization import load_colonization
+            tracker = load_colonization(self.store, self.prices)
+        except Exception:
+            tracker = None
+        self.signals.colonization_ready.emit(self.mark, tracker)
+
+
+class IngestJob(QRunnable):
+    """Imports journal data the store does not have yet on the worker pool"""
+
+    def __init__(self, store: EventStore, journal_dir: Path, signals: AggregateSignals):
+        super().__init__()
+        self.store = store
+        self.journal_dir = journal_dir
+        self.signals = signals
+
+    def run(self):
+        try:
+            from ingest import ingest_directory
+            result = ingest_directory(self.journal_dir, store=self.store)
+        except Exception:
+            result = None
+        self.signals.ingest_ready.emit(result)
+
+
+class RouteJob(QRunnable):
+    """Loads local market data if needed and runs the route search on the worker pool"""
+
+    def __init__(self, store: EventStore, params: dict, start_market: int | None, markets,
+                 systems, prices: PriceStore, docked: list[dict], signals: AggregateSignals):
+        super().__init__()
+        self.store = store
+        self.params = params
+        self.start_market = start_market
+        self.markets = markets
+        self.systems = systems
+        self.prices = prices
+        self.docked = docked
+        self.signals = signals
+
+    def run(self):
+        started = time.perf_counter()
+        markets, found = self.markets, []
+        try:
+            from routes import RouteOptions, find_routes, load_markets
+            if markets is None:
+                markets = load_markets(self.store, self.prices, self.systems, self.docked)
+            found = find_routes(markets, RouteOptions(**self.params), self.start_market)
+        except Exception:
+            pass
+        info = {
+            "stations": len(markets) if markets is not None else 0,
+            "elapsed": time.perf_counter() - started,
+        }
+        self.signals.routes_ready.emit(markets, found, info)
+
+
+class AggregationService(QObject):
+    """Keeps MetricCards bound to historical queries without blocking the GUI.
+
+    Headline metrics come from the running aggregates persisted with the
+    store and are advanced in O(1) per live event. Other cards show their
+    last cached value immediately; their query is only re-run on the thread
+    pool when the store watermark has moved past the one the cached value
+    was computed at. TimeSeriesCharts and SystemMaps are fed the same way,
+    with their pyramids and the systems index kept in memory until the
+    watermark moves; live jumps are added to the index as they happen.
+    Live events always advance the in-memory state, but views are redrawn
+    through the EventBus, so only the ones on screen redraw straight away.
+    Until any of that has happened, cards and charts show what they showed
+    last time, from the DashboardSnapshot.
+    """
+
+    REFRESH_INTERVAL_MS = 30_000
+    MINING_EFFICIENCY = "mining.efficiency"
+    MODELS_SCRIPT = Path(__file__).with_name("models.py")
+
+    def __init__(self, store: EventStore | None = None, cache: ResultCache | None = None,
+                 bus: EventBus | None = None, snapshot: DashboardSnapshot | None = None, parent=None):
+        super().__init__(parent)
+        self.store = store or EventStore()
+        self.bus = bus or EventBus(self)
+        self.cache = cache or ResultCache()
+        self.snapshot = snapshot or DashboardSnapshot()
+        self.bound_cards = []  # every query-backed MetricCard, for the snapshot
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, min(4, QThreadPool.globalInstance().maxThreadCount() - 1)))
+        self.cards = {}
+        self.pending = set()
+
+        # History as of the last ingest, plus this session's live events
+        self.history = RunningAggregates.load(self.store.root)
+        self.total = self.history.copy()
+        self.session = RunningAggregates()
+        self.dedup = DedupKeys(self.store.root)
+        self.live_keys = set()  # dedup keys of the live events folded in
+        self.ingesting = False
+        self.held = []  # (event, key) folded into the total while the startup import runs
+
+        self.charts = {}
+        self.pyramids = {}  # series name -> (watermark key, pyramid)
+        self.maps = []
+        self.systems = None
+        self.systems_mark = None
+        self.live_systems = []  # (address, name, position) seen this session
+
+        self.optimizers = []
+        self.markets = None  # routes.MarketData, dropped when prices may have changed
+        self.docked_market = None
+        self.shown_market = None  # market the price views show
+        self.live_docks = []  # Docked events this session, not yet in the store
+        self.journal_dir = default_journal_dir()
+        self.prices = PriceStore()
+        self.price_views = []
+
+        self.mining = None  # mining.MiningStats
+        self.mining_mark = None
+        self.mining_views = []
+        self.mining_cards = []
+        self.live_mining = []  # (event, dedup key) mined this session, replayed onto reloaded stats
+
+        self.combat = None  # combat.CombatStats
+        self.combat_mark = None
+        self.combat_views = []
+        self.live_combat = []  # (event, dedup key) of combat this session, replayed onto reloaded stats
+
+        self.colonization = None  # colonization.ColonizationTracker
+        self.colonization_mark = None
+        self.colonization_views = []
+        self.live_colonization = []  # (event, dedup key) of colonization this session, replayed onto a reloaded tracker
+        self.cargo = {}  # ship's hold from Cargo.json, commodity -> tons
+
+        self.model_labels = []
+        self.model_outputs = []
+        self.model_status = None  # last status printed by models.py
+        self.trainer = None  # QProcess while models.py runs
+        self.forecast_charts = []
+        self.forecasts = ForecastCache()
+
+        self.signals = AggregateSignals()
+        self.signals.finished.connect(self.on_finished)
+        self.signals.series_ready.connect(self.on_series_ready)
+        self.signals.systems_ready.connect(self.on_systems_ready)
+        self.signals.routes_ready.connect(self.on_routes_ready)
+        self.signals.mining_ready.connect(self.on_mining_ready)
+        self.signals.combat_ready.connect(self.on_combat_ready)
+        self.signals.colonization_ready.connect(self.on_colonization_ready)
+        self.signals.ingest_ready.connect(self.on_ingest_ready)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(self.REFRESH_INTERVAL_MS)
+
+    def bind(self, widget: QWidget):
+        """Attach every query-backed MetricCard inside ``widget``"""
+        mark = self.store.watermark()
+        for card in widget.findChildren(MetricCard):
+            if card.query is None:
+                continue
+            self.bound_cards.append(card)
+            saved = self.snapshot.cards.get(card.query)
+            if saved:
+                card.set_value(*saved)
+            if card.query in LIVE_METRICS:
+                # Subscribed even with no history yet; show_live skips values still unknown
+                self.show_live(card.query, card)
+                self.bus.subscribe(card, LIVE_METRICS[card.query].events,
+                                   partial(self.show_live, card.query, card))
+                continue
+            if card.query == self.MINING_EFFICIENCY:
+                self.mining_cards.append(card)
+                cached = self.cache.get(card.query)
+                if cached is not None:
+                    card.set_value(*self.format_efficiency(*cached))
+                self.bus.subscribe(card, MINING_EVENTS, partial(self.show_efficiency, card))
+                self.request_mining(mark)
+                continue
+            query = QUERIES.get(card.query)
+            if query is None:
+                continue
+            self.cards.setdefault(query.name, []).append(card)
+            cached = self.cache.get(query.name)
+            if cached is not None:
+                card.set_value(query.format(cached))
+            self.request(query.name, mark)
+        for chart in widget.findChildren(TimeSeriesChart):
+            self.charts.setdefault(chart.series, []).append(chart)
+            if chart.series in self.pyramids:
+                chart.set_pyramid(self.pyramids[chart.series][1])
+            elif (head := self.snapshot.head(chart.series)) is not None:
+                chart.set_pyramid(head)
+            self.request_series(chart.series, mark)
+        for system_map in widget.findChildren(SystemMap):
+            self.maps.append(system_map)
+            if self.systems is not None:
+                system_map.set_index(self.systems)
+            self.bus.subscribe(system_map, SYSTEM_EVENTS, system_map.index_changed)
+            self.request_systems(mark)
+        for optimizer in widget.findChildren(RouteOptimizer):
+            self.optimizers.append(optimizer)
+            optimizer.requested.connect(self.request_routes)
+        views = widget.findChildren(MarketPrices)
+        if views and not self.price_views:
+            # Pick up the market last opened while EDxDC was not running
+            self.prices.add_market_file(self.journal_dir / "Market.json")
+        if views:
+            self.shown_market = self.shown_market or self.docked_market or self.prices.last_market()
+        for view in views:
+            self.price_views.append(view)
+            self.show_market(view)
+            self.bus.subscribe(view, ("Market",), partial(self.show_market, view))
+        labels = widget.findChildren(QLabel, "modelStatus")
+        outputs = widget.findChildren(ModelOutput)
+        charts = widget.findChildren(ForecastChart)
+        if labels or outputs or charts:
+            self.model_labels.extend(labels)
+            self.model_outputs.extend(outputs)
+            self.forecast_charts.extend(charts)
+            # Whatever was forecast last time shows straight away, fresh or not
+            self.show_forecasts(mark)
+            self.show_model_status()
+            self.request_training(mark)
+        for view in widget.findChildren(MiningView):
+            self.mining_views.append(view)
+            if self.mining is not None:
+                view.show_stats(self.mining)
+            self.bus.subscribe(view, MINING_EVENTS, partial(self.show_mining_view, view))
+            self.request_mining(mark)
+        for view in widget.findChildren(CombatView):
+            self.combat_views.append(view)
+            if self.combat is not None:
+                view.show_stats(self.combat)
+            self.bus.subscribe(view, COMBAT_EVENTS, partial(self.show_combat_view, view))
+            self.request_combat(mark)
+        for view in widget.findChildren(ColonizationView):
+            self.colonization_views.append(view)
+            if self.colonization is not None:
+                view.show_tracker(self.colonization)
+            self.bus.subscribe(view, COLONIZATION_EVENTS, partial(self.show_colonization_view, view))
+            self.request_colonization(mark)
+
+    def start_ingest(self):
+        """Import whatever the journals hold that the store does not, off the GUI thread"""
+        if self.ingesting or not self.journal_dir.is_dir():
+            return
+        self.ingesting = True
+        self.pool.start(IngestJob(self.store, self.journal_dir, self.signals))
+
+    def on_ingest_ready(self, result):
+        self.ingesting = False
+        held, self.held = self.held, []
+        if result is None or not result.files:
+            return
+        # Rebase the total on the grown history; live events the import also
+        # read are in it now, the rest are folded in again
+        self.history = RunningAggregates.load(self.store.root)
+        self.dedup = DedupKeys(self.store.root)
+        self.total = self.history.copy()
+        for event, key in held:
+            if key not in self.dedup.month(event.get("timestamp", "")[:7] or "unknown"):
+                self.total.update(event)
+        for card in self.bound_cards:
+            if card.query in LIVE_METRICS:
+                self.bus.update(card)
+        self.refresh()
+
+    def refresh(self):
+        mark = self.store.watermark()
+        for name in self.cards:
+            self.request(name, mark)
+        for name in self.charts:
+            self.request_series(name, mark)
+        if self.maps:
+            self.request_systems(mark)
+        if self.mining_views or self.mining_cards:
+            self.request_mining(mark)
+        if self.combat_views:
+            self.request_combat(mark)
+        if self.colonization_views:
+            self.request_colonization(mark)
+        if self.model_labels or self.model_outputs or self.forecast_charts:
+            self.request_training(mark)
+
+    def capture(self):
+        """Copy what the bound cards show into the snapshot; charts are copied as they load"""
+        for card in self.bound_cards:
+            if card.has_value:
+                self.snapshot.cards[card.query] = [card.value_lbl.text(), card.subtitle_lbl.text()]
+
+    def request(self, name: str, mark: dict):
+        if not mark["rows"] or name in self.pending or self.cache.is_fresh(name, mark):
+            return
+        self.pending.add(name)
+        self.pool.start(AggregateJob(self.store, name, mark, self.signals))
+
+    def on_finished(self, name: str, mark: dict, value):
+        self.pending.discard(name)
+        if value is None:
+            return
+        self.cache.put(name, mark, value)
+        self.cache.save()
+        text = QUERIES[name].format(value)
+        for card in self.cards.get(name, ()):
+            card.set_value(text)
+
+    def request_series(self, name: str, mark: dict):
+        key = ("series", name)
+        cached = self.pyramids.get(name)
+        if not mark["rows"] or key in self.pending or (cached and cached[0] == watermark_key(mark)):
+            return
+        self.pending.add(key)
+        self.pool.start(SeriesJob(self.store, name, mark, self.signals))
+
+    def on_series_ready(self, name: str, mark: dict, pyramid):
+        self.pending.discard(("series", name))
+        if pyramid is None:
+            return
+        self.pyramids[name] = (watermark_key(mark), pyramid)
+        self.snapshot.series[name] = series_head(pyramid)
+        for chart in self.charts.get(name, ()):
+            chart.set_pyramid(pyramid)
+
+    def request_systems(self, mark: dict):
+        key = ("systems",)
+        if not mark["rows"] or key in self.pending or self.systems_mark == watermark_key(mark):
+            return
+        self.pending.add(key)
+        self.pool.start(SystemIndexJob(self.store, "systems", mark, self.signals))
+
+    def on_systems_ready(self, mark: dict, index):
+        self.pending.discard(("systems",))
+        if index is None:
+            return
+        # Jumps made this session may not have been ingested yet
+        for address, name, position in self.live_systems:
+            index.add(address, name, position)
+        self.systems = index
+        self.systems_mark = watermark_key(mark)
+        self.markets = None
+        for system_map in self.maps:
+            system_map.set_index(index)
+
+    def track_system(self, event: dict):
+        position = event.get("StarPos")
+        address = event.get("SystemAddress")
+        if not address or not isinstance(position, list) or len(position) != 3:
+            return
+        visit = (address, event.get("StarSystem", ""), position)
+        self.live_systems.append(visit)
+        if self.systems is None:
+            # No history to load it from; start an empty index for this session
+            from spatial import SystemIndex
+            self.systems = SystemIndex()
+            for system_map in self.maps:
+                system_map.set_index(self.systems)
+        self.systems.add(*visit)
+
+    def request_routes(self, params: dict):
+        key = ("routes",)
+        if key in self.pending:
+            return
+        self.pending.add(key)
+        self.pool.start(RouteJob(self.store, params, self.docked_market, self.markets, self.systems,
+                                 self.prices, list(self.live_docks), self.signals))
+
+    def on_routes_ready(self, markets, routes: list, info: dict):
+        self.pending.discard(("routes",))
+        self.markets = markets
+        for optimizer in self.optimizers:
+            optimizer.show_routes(routes, info)
+
+    def unstored(self, live: list[tuple[dict, int]]) -> list[dict]:
+        """Events of the live (event, dedup key) pairs that the store does not hold.
+
+        A concurrent ingest may have stored some of them since they arrived;
+        at whole-second timestamps only the keys can tell which.
+        """
+        dedup = DedupKeys(self.store.root)
+        return [event for event, key in live
+                if event.get("event") not in STORED_EVENTS
+                or key not in dedup.month(event.get("timestamp", "")[:7] or "unknown")]
+
+    def request_mining(self, mark: dict):
+        key = ("mining",)
+        if not mark["rows"] or key in self.pending or self.mining_mark == watermark_key(mark):
+            return
+        self.pending.add(key)
+        self.pool.start(MiningJob(self.store, "mining", mark, self.signals))
+
+    def on_mining_ready(self, mark: dict, stats):
+        self.pending.discard(("mining",))
+        if stats is None:
+            return
+        # Carry on with whatever this session mined that the store does not have yet
+        for event in self.unstored(self.live_mining):
+            stats.update(event)
+        self.mining = stats
+        self.mining_mark = watermark_key(mark)
+        self.cache.put(self.MINING_EFFICIENCY, mark, (stats.credits_per_hour(), stats.seconds))
+        self.cache.save()
+        self.show_mining()
+
+    def track_mining(self, event: dict, key: int):
+        """Fold a live mining event into the stats"""
+        self.live_mining.append((event, key))
+        if self.mining is None:
+            if not (self.mining_views or self.mining_cards):
+                return
+            from mining import MiningStats
+            self.mining = MiningStats()
+        self.mining.update(event)
+
+    def show_mining(self):
+        for view in self.mining_views + self.mining_cards:
+            self.bus.update(view)
+
+    def show_mining_view(self, view: MiningView):
+        if self.mining is not None:
+            view.show_stats(self.mining)
+
+    def show_efficiency(self, card: MetricCard):
+        if self.mining is not None:
+            card.set_value(*self.format_efficiency(self.mining.credits_per_hour(), self.mining.seconds))
+
+    def request_combat(self, mark: dict):
+        key = ("combat",)
+        if not mark["rows"] or key in self.pending or self.combat_mark == watermark_key(mark):
+            return
+        self.pending.add(key)
+        self.pool.start(CombatJob(self.store, "combat", mark, self.signals))
+
+    def on_combat_ready(self, mark: dict, stats):
+        self.pending.discard(("combat",))
+        if stats is None:
+            return
+        for event in self.unstored(self.live_combat):
+            stats.update(event)
+        self.combat = stats
+        self.combat_mark = watermark_key(mark)
+        for view in self.combat_views:
+            self.bus.update(view)
+
+    def track_combat(self, event: dict, key: int):
+        """Fold a live combat event into the stats"""
+        self.live_combat.append((event, key))
+        if self.combat is None:
+            if not self.combat_views:
+                return
+            from combat import CombatStats
+            self.combat = CombatStats()
+        self.combat.update(event)
+
+    def show_combat_view(self, view: CombatView):
+        if self.combat is not None:
+            view.show_stats(self.combat)
+
+    def request_colonization(self, mark: dict):
+        key = ("colonization",)
+        if key in self.pending or self.colonization_mark == watermark_key(mark):
+            return
+        self.pending.add(key)
+        self.pool.start(ColonizationJob(self.store, mark, self.prices, self.signals))
+
+    def on_colonization_ready(self, mark: dict, tracker):
+        self.pending.discard(("colonization",))
+        if tracker is None:
+            return
+        # load_colonization forgets where the commander is docked, so docking
+        # this session replays even when stored (it only sets state); undocking,
+        # the ship and Market.json are not in the store; everything else counts
+        # once, from the store or from this session
+        unstored = {id(event) for event in self.unstored(self.live_colonization)}
+        for event, _ in self.live_colonization:
+            if event.get("event") == "Docked" or id(event) in unstored:
+                self.fold_colonization(tracker, event)
+        tracker.set_cargo(self.cargo)
+        self.colonization = tracker
+        self.colonization_mark = watermark_key(mark)
+        self.show_colonization()
+
+    def track_colonization(self, event: dict, key: int):
+        """Fold a live event into the project requirements and market stock"""
+        self.live_colonization.append((event, key))
+        if self.colonization is None:
+            if not self.colonization_views:
+                return
+            from colonization import ColonizationTracker
+            self.colonization = ColonizationTracker()
+            self.colonization.set_cargo(self.cargo)
+        self.fold_colonization(self.colonization, event)
+
+    def fold_colonization(self, tracker, event: dict):
+        if event.get("event") == "Market":
+            # track_market has already read the new Market.json
+            market_id = event.get("MarketID")
+            names = self.prices.stations.get(market_id, {})
+            tracker.set_market(market_id, self.prices.latest(market_id), names.get("station", ""),
+                               names.get("system", ""))
+        else:
+            tracker.update(event)
+
+    def on_cargo(self, cargo: dict):
+        """Cargo.json changed: re-match the hold against the projects"""
+        self.cargo = cargo
+        if self.colonization is not None:
+            self.colonization.set_cargo(cargo)
+            self.show_colonization()
+
+    def show_colonization(self):
+        for view in self.colonization_views:
+            self.bus.update(view)
+
+    def show_colonization_view(self, view: ColonizationView):
+        if self.colonization is not None:
+            view.show_tracker(self.colonization)
+
+    @staticmethod
+    def format_efficiency(rate: float, seconds: float) -> tuple[str, str]:
+        return f"{format_credits(rate).removesuffix(' CR')}/hr", f"Over {seconds / 3600:,.1f} hrs mining"
+
+    def request_training(self, mark: dict):
+        """Bring the feature store and models up to date in a models.py subprocess"""
+        if not mark["rows"] or self.trainer is not None:
+            return
+        if self.model_status and self.model_status.get("watermark") == watermark_key(mark):
+            return
+        self.trainer = QProcess(self)
+        self.trainer.finished.connect(self.on_training_finished)
+        self.trainer.start(sys.executable, [str(self.MODELS_SCRIPT), "--data-dir", str(default_data_dir()),
+                                            "--store", str(self.store.root)])
+        self.show_model_status()
+
+    def on_training_finished(self, exit_code: int, exit_status):
+        output = bytes(self.trainer.readAllStandardOutput()).decode("utf-8", "replace").strip()
+        self.trainer.deleteLater()
+        self.trainer = None
+        try:
+            status = json.loads(output.splitlines()[-1]) if exit_code == 0 else None
+        except (ValueError, IndexError):
+            status = None
+        if isinstance(status, dict):
+            self.model_status = status
+            for output_widget in self.model_outputs:
+                output_widget.show_predictions(status.get("predictions") or {})
+        # The trainer has refitted anything that was stale
+        self.forecasts = ForecastCache()
+        self.show_forecasts(self.store.watermark())
+        self.show_model_status()
+
+    def show_forecasts(self, mark: dict):
+        latest = {name: self.forecasts.latest(name, params) for name, params in FORECASTS.items()}
+        summaries = {name: forecast.summary for name, forecast in latest.items() if forecast is not None}
+        for output_widget in self.model_outputs:
+            output_widget.show_predictions(summaries)
+        for chart in self.forecast_charts:
+            forecast = latest.get(chart.model)
+            chart.set_forecast(forecast, stale=bool(forecast) and forecast.through < mark["last_timestamp"])
+
+    def show_model_status(self):
+        status = self.model_status or {}
+        trained_at = status.get("trained_at")
+        if self.trainer is not None:
+            state, text = "training", "● Training Models…"
+        elif not trained_at:
+            state, text = "empty", "○ No Models Trained" if status else "○ Checking Models…"
+        else:
+            when = time.strftime("%H:%M", time.localtime(trained_at))
+            rows = status.get("rows", {})
+            if status.get("watermark") == watermark_key(self.store.watermark()):
+                state, text = "fresh", f"● Models Trained {when} · {rows.get('daily', 0):,} days"
+            else:
+                state, text = "stale", f"● Models Stale · trained {when}"
+        for label in self.model_labels:
+            label.setText(text)
+            if label.property("state") != state:
+                label.setProperty("state", state)
+                label.style().unpolish(label)
+                label.style().polish(label)
+
+    def track_market(self, event: dict):
+        """Docking and trading change what the route search should see"""
+        name = event.get("event")
+        if name == "Loadout":
+            for optimizer in self.optimizers:
+                optimizer.set_ship(event.get("CargoCapacity"), event.get("MaxJumpRange"))
+        elif name in ("Docked", "Market", "MarketBuy", "MarketSell"):
+            self.markets = None
+        if name == "Docked":
+            self.docked_market = event.get("MarketID")
+            self.live_docks.append(event)
+        elif name == "Market" and self.prices.add_market_file(self.journal_dir / "Market.json"):
+            self.shown_market = event.get("MarketID")
+        if name in ("Docked", "Market") and self.optimizers:
+            # Market.json for the new station is only complete by the Market event
+            self.request_routes(self.optimizers[0].params())
+
+    def show_market(self, view: "MarketPrices"):
+        market_id = self.shown_market
+        if market_id is None or not self.prices.snapshot_times(market_id):
+            return
+        names = self.prices.stations.get(market_id, {})
+        view.show_prices(names.get("station") or str(market_id), self.prices.latest(market_id),
+                         self.prices.previous(market_id), len(self.prices.snapshot_times(market_id)))
+
+    def on_live_events(self, events: list[dict], keys: list[int]):
+        """Advance the running aggregates with freshly tailed events and their dedup keys"""
+        fresh = []
+        for event, key in zip(events, keys):
+            # Events up to the history watermark may already be ingested; same-second
+            # ones may not, so ask the store's dedup keys rather than the clock
+            timestamp = event.get("timestamp", "")
+            if timestamp <= self.history.last_timestamp and key in self.dedup.month(timestamp[:7] or "unknown"):
+                continue
+            if key in self.live_keys:
+                continue
+            self.live_keys.add(key)
+            if self.ingesting:
+                self.held.append((event, key))
+            self.total.update(event)
+            self.session.update(event)
+            if event.get("event") in SYSTEM_EVENTS:
+                self.track_system(event)
+            if event.get("event") in MINING_EVENTS:
+                self.track_mining(event, key)
+            if event.get("event") in COMBAT_EVENTS:
+                self.track_combat(event, key)
+            self.track_market(event)
+            if event.get("event") in COLONIZATION_EVENTS:
+                self.track_colonization(event, key)
+            fresh.append(event)
+        self.bus.publish(fresh)
+
+    def show_live(self, name: str, card: MetricCard):
+        metric = LIVE_METRICS[name]
+        value = metric.value(self.total)
+        if value is None:
+            return
+        card.set_value(metric.format(value), metric.subtitle(self.total, self.session))
+
+
+class InaraService(QObject):
+    """Keeps the INARA tab current from an inara.InaraClient.
+
+    The client batches, rate-limits and caches on its own thread. Views
+    show the last cached lookup straight away and are refreshed when a
+    lookup future completes; live journal events are queued for upload.
+    """
+
+    PROFILE = "getCommanderProfile"
+    COMMUNITY = "getCommunityGoalsRecent"
+    REFRESH_INTERVAL_MS = 60_000
+
+    looked_up = Signal(str, object)  # lookup name, eventData or None if it failed
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.client = InaraClient.from_env(default_journal_dir())
+        if self.client is not None:
+            self.client.start()
+        self.labels = []
+        self.profiles = []
+        self.goals = []
+        self.pending = set()
+        self.looked_up.connect(self.on_looked_up)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(self.REFRESH_INTERVAL_MS)
+
+    def bind(self, widget: QWidget):
+        labels = widget.findChildren(QLabel, "syncStatus")
+        profiles = widget.findChildren(InaraProfile)
+        goals = widget.findChildren(CommunityGoals)
+        self.labels.extend(labels)
+        self.profiles.extend(profiles)
+        self.goals.extend(goals)
+        if self.client is not None and (profiles or goals):
+            for view in profiles:
+                cached = self.client.cached(self.PROFILE, self.profile_query())
+                if cached is not None:
+                    view.show_profile(cached)
+            for view in goals:
+                cached = self.client.cached(self.COMMUNITY)
+                if cached is not None:
+                    view.show_goals(cached)
+            self.refresh()
+        if labels:
+            self.show_status()
+
+    def profile_query(self) -> dict:
+        commander = self.client.commander
+        return {"searchName": commander} if commander else {}
+
+    def refresh(self):
+        if self.client is None:
+            return
+        if self.profiles:
+            self.lookup(self.PROFILE, self.profile_query())
+        if self.goals:
+            self.lookup(self.COMMUNITY)
+        self.show_status()
+
+    def lookup(self, name: str, data: dict | None = None):
+        if name in self.pending:
+            return
+        self.pending.add(name)
+
+        def done(future):
+            failed = future.cancelled() or future.exception() is not None
+            self.looked_up.emit(name, None if failed else future.result())
+
+        self.client.lookup(name, data).add_done_callback(done)
+
+    def on_looked_up(self, name: str, data):
+        self.pending.discard(name)
+        if data is not None or self.client.online:
+            if name == self.PROFILE:
+                for view in self.profiles:
+                    view.show_profile(data)
+            elif name == self.COMMUNITY:
+                for view in self.goals:
+                    view.show_goals(data)
+        self.show_status()
+
+    def on_live_events(self, events: list[dict], keys: list[int]):
+        if self.client is not None and self.client.upload(events, keys):
+            self.show_status()
+
+    def show_status(self):
+        if self.client is None:
+            state, text = "off", "○ Not Linked"
+        else:
+            status = self.client.status()
+            queued = f" · {status['queued']:,} queued" if status["queued"] else ""
+            if not status["online"]:
+                state, text = "offline", f"● Offline{queued}"
+            elif status["last_sync"] is None:
+                state, text = "syncing", f"● Connecting…{queued}"
+            else:
+                minutes = int(time.time() - status["last_sync"]) // 60
+                when = f"{minutes} min ago" if minutes else "just now"
+                state, text = "synced", f"● Synced {when}{queued}"
+        for label in self.labels:
+            label.setText(text)
+            if label.property("state") != state:
+                label.setProperty("state", state)
+                label.style().unpolish(label)
+                label.style().polish(label)
+
+    def stop(self):
+        if self.client is not None:
+            self.client.stop()
+
+
+class EventFeedModel(QAbstractListModel):
+    """Newest-first list model over a fixed-capacity ring buffer of events.
+
+    Appends are O(1) per event and memory is bounded by ``capacity``; the
+    oldest events fall off the bottom. Events are kept as parsed dicts and
+    only formatted when the view asks for a visible row.
+    """
+
+    def __init__(self, capacity: int = 5000, parent=None):
+        super().__init__(parent)
+        self.capacity = capacity
+        self._ring = [None] * capacity
+        self._head = 0  # next slot to write
+        self._size = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._size
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid() or index.row() >= self._size:
+            return None
+        return format_event(self._ring[(self._head - 1 - index.row()) % self.capacity])
+
+    def append_events(self, events: list[dict]):
+        """Append a batch of events with a single insert notification"""
+        events = events[-self.capacity:]
+        count = len(events)
+        if not count:
+            return
+
+        overflow = self._size + count - self.capacity
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), self._size - overflow, self._size - 1)
+            self._size -= overflow
+            self.endRemoveRows()
+
+        self.beginInsertRows(QModelIndex(), 0, count - 1)
+        for event in events:
+            self._ring[self._head] = event
+            self._head = (self._head + 1) % self.capacity
+        self._size += count
+        self.endInsertRows()
 
 
 # =============================================================================
@@ -117,9 +2090,32 @@ class MetricCard(QFrame):
 class RealTimePanel(QWidget):
     """Real-Time monitoring panel - shows live game data"""
 
-    def __init__(self):
+    # Emitted with each batch of newly tailed journal events
+    events_received = Signal(list)
+    # Emitted with the ship's hold, commodity -> tons, whenever Cargo.json changes it
+    cargo_changed = Signal(dict)
+    # Emitted with "CONNECTED" or "OFFLINE" as Status.json or the journal report it
+    game_status_changed = Signal(str)
+    # The events of events_received with their manifest.event_key dedup keys
+    # (object: the keys are unsigned 64-bit, which a Qt list of ints cannot carry)
+    keyed_events_received = Signal(object, object)
+
+    POLL_INTERVAL_MS = 500
+    FEED_CAPACITY = 5000
+    STATUS_FPS = 10
+    SYSTEM_EVENTS = ("FSDJump", "Location", "CarrierJump")
+    # Indicators worth showing from the last run until the journal catches up
+    SNAPSHOT_INDICATORS = ("ship", "location")
+
+    def __init__(self, journal_dir=None):
         super().__init__()
+        self.fuel_capacity = None
+        self.cargo_capacity = None
+        self.session_start = None
         self.setup_ui()
+        journal_dir = journal_dir or default_journal_dir()
+        self.setup_tailer(journal_dir)
+        self.setup_status_watcher(journal_dir)
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -127,11 +2123,15 @@ class RealTimePanel(QWidget):
 
         # Top status bar with live indicators
         status_row = QHBoxLayout()
-        status_row.addWidget(StatusIndicator("GAME STATUS", "CONNECTED"))
-        status_row.addWidget(StatusIndicator("CURRENT SHIP", "Alliance Chieftain"))
-        status_row.addWidget(StatusIndicator("LOCATION", "Col 359 Sector CE-N b9-1"))
-        status_row.addWidget(StatusIndicator("ACTIVITY", "Supercruise"))
-        status_row.addWidget(StatusIndicator("SESSION TIME", "02:34:15"))
+        self.indicators = {
+            "game_status": StatusIndicator("GAME STATUS"),
+            "ship": StatusIndicator("CURRENT SHIP"),
+            "location": StatusIndicator("LOCATION"),
+            "activity": StatusIndicator("ACTIVITY"),
+            "session_time": StatusIndicator("SESSION TIME"),
+        }
+        for indicator in self.indicators.values():
+            status_row.addWidget(indicator)
         layout.addLayout(status_row)
 
         # Main content splitter
@@ -139,39 +2139,20 @@ class RealTimePanel(QWidget):
 
         # Left: Live event feed
         left_panel = QFrame()
-        left_panel.setStyleSheet("background-color: #12122a; border-radius: 8px;")
+        left_panel.setObjectName("feedPanel")
         left_layout = QVBoxLayout(left_panel)
 
         feed_label = QLabel("📡 LIVE EVENT FEED")
-        feed_label.setStyleSheet("color: #00d4ff; font-weight: bold; padding: 10px;")
+        feed_label.setObjectName("feedTitle")
         left_layout.addWidget(feed_label)
 
-        self.event_list = QListWidget()
-        self.event_list.setStyleSheet("""
-            QListWidget {
-                background-color: #0a0a1a;
-                border: none;
-                color: #ccc;
-                font-family: 'Consolas';
-            }
-            QListWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #222;
-            }
-            QListWidget::item:hover {
-                background-color: #1a1a3a;
-            }
-        """)
-        # Sample events
-        sample_events = [
-            "🚀 [13:56:41] FSDJump → Col 359 Sector CE-N b9-1",
-            "⚡ [13:56:32] NavRouteClear",
-            "🔊 [13:55:51] Music → Supercruise",
-            "🌟 [13:55:51] Scan → Star M8 (AutoScan)",
-            "🎯 [13:55:41] FSDTarget → Col 359 Sector CE-N b9-1",
-        ]
-        for event in sample_events:
-            self.event_list.addItem(event)
+        self.event_model = EventFeedModel(self.FEED_CAPACITY, self)
+        self.event_list = QListView()
+        self.event_list.setModel(self.event_model)
+        # All rows share one height, so the view lays out and paints only
+        # the visible rows without measuring the rest
+        self.event_list.setUniformItemSizes(True)
+        self.event_list.setObjectName("eventFeed")
         left_layout.addWidget(self.event_list)
 
         splitter.addWidget(left_panel)
@@ -183,21 +2164,113 @@ class RealTimePanel(QWidget):
 
         # Top row: Fuel and Cargo
         top_charts = QHBoxLayout()
-        top_charts.addWidget(PlaceholderWidget("⛽ FUEL LEVEL", "Real-time fuel gauge", 150))
-        top_charts.addWidget(PlaceholderWidget("📦 CARGO HOLD", "Cargo capacity visualization", 150))
+        self.fuel_gauge = GaugeWidget("⛽ FUEL LEVEL", 150)
+        self.cargo_gauge = GaugeWidget("📦 CARGO HOLD", 150)
+        top_charts.addWidget(self.fuel_gauge)
+        top_charts.addWidget(self.cargo_gauge)
         right_layout.addLayout(top_charts)
 
         # Middle: Session performance
         right_layout.addWidget(PlaceholderWidget("📈 SESSION PERFORMANCE", "Credits/hour, distance traveled, events/minute", 180))
 
         # Bottom: System map
-        right_layout.addWidget(PlaceholderWidget("🗺️ CURRENT SYSTEM MAP", "3D visualization of current system bodies", 200))
+        right_layout.addWidget(SystemMap("🗺️ CURRENT SYSTEM MAP", span=200, follow=True, radius=50, height=200))
 
         splitter.addWidget(right_panel)
         splitter.setSizes([350, 650])
 
         layout.addWidget(splitter)
 
+    def setup_tailer(self, journal_dir):
+        self.tailer = JournalTailer(journal_dir)
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_journal)
+        self.poll_timer.start(self.POLL_INTERVAL_MS)
+
+    def setup_status_watcher(self, journal_dir):
+        self.status_watcher = StatusWatcher(journal_dir)
+        self.status_timer = QTimer(self)
+        self.status_timer.timeout.connect(self.refresh_status)
+        self.status_timer.start(1000 // self.STATUS_FPS)
+
+    def poll_journal(self):
+        """Pull newly appended journal events into the live feed (newest first)"""
+        events = self.tailer.poll()
+        if not events:
+            return
+        self.event_model.append_events(events)
+        for event in events:
+            self.track_event(event)
+        self.events_received.emit(events)
+        self.keyed_events_received.emit(events, self.tailer.keys)
+
+    def track_event(self, event: dict):
+        """Keep the journal-derived indicators (ship, location, session) current"""
+        name = event["event"]
+        if name in self.SYSTEM_EVENTS and event.get("StarSystem"):
+            self.indicators["location"].set_value(event["StarSystem"])
+        elif name == "LoadGame":
+            self.session_start = parse_timestamp(event.get("timestamp", "")) or None
+            ship = event.get("Ship_Localised") or event.get("Ship", "")
+            if ship:
+                self.indicators["ship"].set_value(ship.title())
+            self.set_game_status("CONNECTED")
+        elif name == "Loadout":
+            fuel = event.get("FuelCapacity") or {}
+            self.fuel_capacity = fuel.get("Main") or self.fuel_capacity
+            self.cargo_capacity = event.get("CargoCapacity", self.cargo_capacity)
+            self.refresh_gauges(self.status_watcher.state)
+        elif name == "Shutdown":
+            self.set_game_status("OFFLINE")
+            self.session_start = None
+
+    def refresh_status(self):
+        """Frame tick: apply whatever changed in the status files since the last one"""
+        changes = self.status_watcher.poll()
+        if changes:
+            if "game_status" in changes:
+                self.set_game_status(changes["game_status"])
+            if "activity" in changes:
+                self.indicators["activity"].set_value(changes["activity"])
+            if {"fuel_main", "cargo_tons"} & changes.keys():
+                self.refresh_gauges(self.status_watcher.state)
+            if "cargo_commodities" in changes:
+                self.cargo_changed.emit(dict(changes["cargo_commodities"]))
+
+        if self.session_start:
+            elapsed = max(int(time.time()) - self.session_start, 0)
+            hours, rest = divmod(elapsed, 3600)
+            self.indicators["session_time"].set_value(f"{hours:02d}:{rest // 60:02d}:{rest % 60:02d}")
+
+    def set_game_status(self, status: str):
+        indicator = self.indicators["game_status"]
+        if indicator.has_value and indicator.value.text() == status:
+            return
+        indicator.set_value(status)
+        self.game_status_changed.emit(status)
+
+    def restore(self, status: dict):
+        """Show the last known ship and location from a DashboardSnapshot"""
+        for key in self.SNAPSHOT_INDICATORS:
+            if status.get(key):
+                self.indicators[key].set_value(status[key])
+
+    def capture(self, status: dict):
+        for key in self.SNAPSHOT_INDICATORS:
+            indicator = self.indicators[key]
+            if indicator.has_value:
+                status[key] = indicator.value.text()
+
+    def refresh_gauges(self, state: dict):
+        if "fuel_main" in state:
+            fuel = state["fuel_main"]
+            caption = f"{fuel:.2f} / {self.fuel_capacity:g} T" if self.fuel_capacity else f"{fuel:.2f} T"
+            self.fuel_gauge.set_level(fuel, self.fuel_capacity, caption)
+        if "cargo_tons" in state:
+            cargo = state["cargo_tons"]
+            caption = f"{cargo} / {self.cargo_capacity} T" if self.cargo_capacity else f"{cargo} T"
+            self.cargo_gauge.set_level(cargo, self.cargo_capacity, caption)
+
 
 class AnalysisPanel(QWidget):
     """General data analysis panel"""
@@ -212,9 +2285,15 @@ class AnalysisPanel(QWidget):
 
         # Metric cards row
         metrics_row = QHBoxLayout()
-        metrics_row.addWidget(MetricCard("TOTAL WEALTH", "5.16B CR", "↑ 130M this session", "#00ff88"))
-        metrics_row.addWidget(MetricCard("PLAY TIME", "554.7 hrs", "23.1 days total", "#00d4ff"))
-        metrics_row.addWidget(MetricCard("SYSTEMS VISITED", "1,314", "↑ 31 this session", "#ff9f00"))
+        self.wealth_card = MetricCard("TOTAL WEALTH", "---", "", "#00ff88",
+                                      query="analysis.total_wealth")
+        self.play_time_card = MetricCard("PLAY TIME", "---", "", "#00d4ff",
+                                         query="analysis.play_time")
+        self.systems_card = MetricCard("SYSTEMS VISITED", "---", "", "#ff9f00",
+                                       query="analysis.systems_visited")
+        metrics_row.addWidget(self.wealth_card)
+        metrics_row.addWidget(self.play_time_card)
+        metrics_row.addWidget(self.systems_card)
         metrics_row.addWidget(MetricCard("TRADE RANK", "TYCOON", "86% to Elite", "#bf00ff"))
         layout.addLayout(metrics_row)
 
@@ -224,7 +2303,7 @@ class AnalysisPanel(QWidget):
         # Left column
         left_charts = QWidget()
         left_layout = QVBoxLayout(left_charts)
-        left_layout.addWidget(PlaceholderWidget("💰 WEALTH PROGRESSION", "Historical credit accumulation over time", 200))
+        left_layout.addWidget(TimeSeriesChart("💰 WEALTH PROGRESSION", "analysis.wealth", "#00ff88", 200))
         left_layout.addWidget(PlaceholderWidget("📊 ACTIVITY BREAKDOWN", "Pie chart: Mining, Trading, Combat, Exploration", 200))
 
         charts_splitter.addWidget(left_charts)
@@ -253,25 +2332,25 @@ class PredictionPanel(QWidget):
 
         # AI Status header
         ai_status = QFrame()
-        ai_status.setStyleSheet("background-color: #1a1a2e; border-radius: 8px; padding: 10px;")
+        ai_status.setObjectName("aiHeader")
         ai_layout = QHBoxLayout(ai_status)
 
         ai_icon = QLabel("🤖")
-        ai_icon.setStyleSheet("font-size: 24px;")
+        ai_icon.setObjectName("aiIcon")
         ai_layout.addWidget(ai_icon)
 
         ai_info = QVBoxLayout()
         ai_title = QLabel("AI PREDICTION ENGINE")
-        ai_title.setStyleSheet("color: #00d4ff; font-weight: bold; font-size: 14px;")
-        ai_subtitle = QLabel("Models: Prophet (Time Series) • Random Forest (Classification) • LSTM (Sequence)")
-        ai_subtitle.setStyleSheet("color: #888; font-size: 11px;")
+        ai_title.setObjectName("aiTitle")
+        ai_subtitle = QLabel("Models: Ridge Trend + Weekly Seasonality (Time Series) • Ridge Session Regression (Yield)")
+        ai_subtitle.setObjectName("headerSubtitle")
         ai_info.addWidget(ai_title)
         ai_info.addWidget(ai_subtitle)
         ai_layout.addLayout(ai_info)
         ai_layout.addStretch()
 
-        model_status = QLabel("● Models Trained")
-        model_status.setStyleSheet("color: #00ff88; font-weight: bold;")
+        model_status = QLabel("○ Checking Models…")
+        model_status.setObjectName("modelStatus")
         ai_layout.addWidget(model_status)
 
         layout.addWidget(ai_status)
@@ -280,15 +2359,15 @@ class PredictionPanel(QWidget):
         grid = QGridLayout()
         grid.setSpacing(15)
 
-        grid.addWidget(PlaceholderWidget("📈 ELITE TRADE PREDICTION", "Estimated days to Elite rank: 12.5 days", 180), 0, 0)
-        grid.addWidget(PlaceholderWidget("💎 MINING YIELD FORECAST", "Next session estimated: 45M CR", 180), 0, 1)
-        grid.addWidget(PlaceholderWidget("⚡ OPTIMAL PLAY TIMES", "Best efficiency hours based on history", 180), 1, 0)
+        grid.addWidget(ModelOutput("📈 ELITE TRADE PREDICTION", "elite_trade", "Estimated days to Elite rank: 12.5 days", 180), 0, 0)
+        grid.addWidget(ModelOutput("💎 MINING YIELD FORECAST", "session_mining", "Next session estimated: 45M CR", 180), 0, 1)
+        grid.addWidget(ModelOutput("⚡ OPTIMAL PLAY TIMES", "best_hours", "Best efficiency hours based on history", 180), 1, 0)
         grid.addWidget(PlaceholderWidget("🎯 MATERIAL NEEDS", "Predicted engineering material shortages", 180), 1, 1)
 
         layout.addLayout(grid)
 
         # Forecast chart
-        layout.addWidget(PlaceholderWidget("📊 30-DAY WEALTH FORECAST", "Prophet model prediction with confidence intervals", 200))
+        layout.addWidget(ForecastChart("📊 30-DAY WEALTH FORECAST", "wealth", "#00ff88", 200))
 
 
 # =============================================================================
@@ -308,20 +2387,24 @@ class MiningPanel(QWidget):
 
         # Mining stats header
         stats_row = QHBoxLayout()
-        stats_row.addWidget(MetricCard("TOTAL MINED", "9,731 units", "↑ 247 this session", "#ffd700"))
-        stats_row.addWidget(MetricCard("MINING PROFIT", "2.79B CR", "All time earnings", "#00ff88"))
-        stats_row.addWidget(MetricCard("BEST MINERAL", "Platinum", "Highest value mined", "#e5e4e2"))
-        stats_row.addWidget(MetricCard("EFFICIENCY", "12.4M/hr", "Average rate", "#00d4ff"))
+        stats_row.addWidget(MetricCard("TOTAL MINED", "---", "", "#ffd700",
+                                       query="mining.total_mined"))
+        stats_row.addWidget(MetricCard("MINING PROFIT", "---", "All time earnings", "#00ff88",
+                                       query="mining.profit"))
+        stats_row.addWidget(MetricCard("BEST MINERAL", "---", "Highest value mined", "#e5e4e2",
+                                       query="mining.best_mineral"))
+        stats_row.addWidget(MetricCard("EFFICIENCY", "---", "Average rate", "#00d4ff",
+                                       query="mining.efficiency"))
         layout.addLayout(stats_row)
 
         # Sub-tabs for mining
         mining_tabs = QTabWidget()
-        mining_tabs.setStyleSheet(self._get_subtab_style())
+        mining_tabs.setObjectName("subTabs")
 
         # Real-time mining tab
         realtime = QWidget()
         rt_layout = QVBoxLayout(realtime)
-        rt_layout.addWidget(PlaceholderWidget("⛏️ LIVE PROSPECTOR RESULTS", "Current asteroid composition and content level", 150))
+        rt_layout.addWidget(ProspectorResults("⛏️ LIVE PROSPECTOR RESULTS", 150))
 
         rt_split = QHBoxLayout()
         rt_split.addWidget(PlaceholderWidget("🎯 ASTEROID SCANNER", "Visual representation of prospected asteroids", 200))
@@ -333,8 +2416,8 @@ class MiningPanel(QWidget):
         # Analysis tab
         analysis = QWidget()
         an_layout = QVBoxLayout(analysis)
-        an_layout.addWidget(PlaceholderWidget("📊 MINERAL DISTRIBUTION", "Breakdown of all minerals mined by type and value", 180))
-        an_layout.addWidget(PlaceholderWidget("🗺️ HOTSPOT PERFORMANCE", "Mining locations ranked by efficiency", 180))
+        an_layout.addWidget(MineralDistribution("📊 MINERAL DISTRIBUTION", 180))
+        an_layout.addWidget(HotspotRanking("🗺️ HOTSPOT PERFORMANCE", 180))
 
         mining_tabs.addTab(analysis, "📈 Analysis")
 
@@ -348,30 +2431,6 @@ class MiningPanel(QWidget):
 
         layout.addWidget(mining_tabs)
 
-    def _get_subtab_style(self):
-        return """
-            QTabWidget::pane {
-                border: 1px solid #3a3a5a;
-                border-radius: 8px;
-                background-color: #12122a;
-            }
-            QTabBar::tab {
-                background-color: #1a1a2e;
-                color: #888;
-                padding: 8px 20px;
-                margin-right: 2px;
-                border-top-left-radius: 6px;
-                border-top-right-radius: 6px;
-            }
-            QTabBar::tab:selected {
-                background-color: #252550;
-                color: #ffd700;
-            }
-            QTabBar::tab:hover:!selected {
-                background-color: #202040;
-            }
-        """
-
 
 class HaulingPanel(QWidget):
     """Trading/Hauling specialized panel"""
@@ -386,22 +2445,26 @@ class HaulingPanel(QWidget):
 
         # Trading stats
         stats_row = QHBoxLayout()
-        stats_row.addWidget(MetricCard("TRADE PROFIT", "6.47B CR", "All time market profits", "#00ff88"))
-        stats_row.addWidget(MetricCard("COMMODITIES", "136,944", "Total units traded", "#00d4ff"))
-        stats_row.addWidget(MetricCard("MARKETS", "18", "Unique markets visited", "#ff9f00"))
-        stats_row.addWidget(MetricCard("BEST TRADE", "319.8M CR", "Single transaction record", "#bf00ff"))
+        stats_row.addWidget(MetricCard("TRADE PROFIT", "---", "All time market profits", "#00ff88",
+                                       query="hauling.trade_profit"))
+        stats_row.addWidget(MetricCard("COMMODITIES", "---", "Total units traded", "#00d4ff",
+                                       query="hauling.commodities"))
+        stats_row.addWidget(MetricCard("MARKETS", "---", "Unique markets visited", "#ff9f00",
+                                       query="hauling.markets"))
+        stats_row.addWidget(MetricCard("BEST TRADE", "---", "Single transaction record", "#bf00ff",
+                                       query="hauling.best_trade"))
         layout.addLayout(stats_row)
 
         # Sub-tabs
         hauling_tabs = QTabWidget()
-        hauling_tabs.setStyleSheet(self._get_subtab_style())
+        hauling_tabs.setObjectName("subTabs")
 
         # Real-time
         realtime = QWidget()
         rt_layout = QVBoxLayout(realtime)
         rt_layout.addWidget(PlaceholderWidget("📦 CURRENT CARGO", "Live cargo hold contents and values", 150))
         rt_split = QHBoxLayout()
-        rt_split.addWidget(PlaceholderWidget("🛒 MARKET PRICES", "Current station buy/sell prices", 200))
+        rt_split.addWidget(MarketPrices("🛒 MARKET PRICES", 200))
         rt_split.addWidget(PlaceholderWidget("🚚 TRADE ROUTE", "Active route with profit calculations", 200))
         rt_layout.addLayout(rt_split)
         hauling_tabs.addTab(realtime, "⚡ Real-Time")
@@ -409,14 +2472,14 @@ class HaulingPanel(QWidget):
         # Analysis
         analysis = QWidget()
         an_layout = QVBoxLayout(analysis)
-        an_layout.addWidget(PlaceholderWidget("📈 PROFIT HISTORY", "Trade profit over time with trend lines", 180))
+        an_layout.addWidget(TimeSeriesChart("📈 PROFIT HISTORY", "hauling.profit", "#00ff88", 180))
         an_layout.addWidget(PlaceholderWidget("🏪 TOP COMMODITIES", "Most profitable commodities traded", 180))
         hauling_tabs.addTab(analysis, "📈 Analysis")
 
         # Prediction
         prediction = QWidget()
         pr_layout = QVBoxLayout(prediction)
-        pr_layout.addWidget(PlaceholderWidget("🤖 ROUTE OPTIMIZER", "AI-suggested optimal trade routes", 180))
+        pr_layout.addWidget(RouteOptimizer("🤖 ROUTE OPTIMIZER", 180))
         pr_layout.addWidget(PlaceholderWidget("📊 MARKET FORECAST", "Commodity price predictions (INARA data)", 180))
         hauling_tabs.addTab(prediction, "🔮 Prediction")
 
@@ -432,9 +2495,6 @@ class HaulingPanel(QWidget):
 
         layout.addWidget(hauling_tabs)
 
-    def _get_subtab_style(self):
-        return MiningPanel._get_subtab_style(self)
-
 
 class CombatPanel(QWidget):
     """Combat specialized panel with sub-categories"""
@@ -449,21 +2509,23 @@ class CombatPanel(QWidget):
 
         # Combat stats
         stats_row = QHBoxLayout()
-        stats_row.addWidget(MetricCard("BOUNTY PROFIT", "35.9M CR", "Total bounty earnings", "#ff4444"))
-        stats_row.addWidget(MetricCard("BOUNTIES CLAIMED", "115", "Ships destroyed for bounty", "#ff9f00"))
+        stats_row.addWidget(MetricCard("BOUNTY PROFIT", "---", "Total bounty earnings", "#ff4444",
+                                       query="combat.bounty_profit"))
+        stats_row.addWidget(MetricCard("BOUNTIES CLAIMED", "---", "Ships destroyed for bounty", "#ff9f00",
+                                       query="combat.bounties"))
         stats_row.addWidget(MetricCard("COMBAT RANK", "MOSTLY HARMLESS", "75% to next rank", "#00d4ff"))
         stats_row.addWidget(MetricCard("THARGOID ENCOUNTERS", "1", "Last: HIP 22557", "#00ff88"))
         layout.addLayout(stats_row)
 
         # Sub-tabs for combat types
         combat_tabs = QTabWidget()
-        combat_tabs.setStyleSheet(self._get_subtab_style())
+        combat_tabs.setObjectName("subTabs")
 
         # PVE Tab
         pve = QWidget()
         pve_layout = QVBoxLayout(pve)
-        pve_layout.addWidget(PlaceholderWidget("🎯 BOUNTY HUNTING STATS", "NPC kills, profit per kill, favorite hunting grounds", 180))
-        pve_layout.addWidget(PlaceholderWidget("⚔️ COMBAT ZONES", "Conflict zone participation history", 180))
+        pve_layout.addWidget(BountyHunting("🎯 BOUNTY HUNTING STATS", 180))
+        pve_layout.addWidget(CombatZones("⚔️ COMBAT ZONES", 180))
         combat_tabs.addTab(pve, "👾 PVE (NPCs)")
 
         # PVP Tab
@@ -476,7 +2538,7 @@ class CombatPanel(QWidget):
         # Thargoid Tab
         thargoid = QWidget()
         tg_layout = QVBoxLayout(thargoid)
-        tg_layout.addWidget(PlaceholderWidget("👽 THARGOID ENCOUNTERS", "Encounter history and outcomes", 150))
+        tg_layout.addWidget(ThargoidEncounters("👽 THARGOID ENCOUNTERS", 150))
         tg_split = QHBoxLayout()
         tg_split.addWidget(PlaceholderWidget("🔬 AX LOADOUT", "Current Anti-Xeno ship configuration", 180))
         tg_split.addWidget(PlaceholderWidget("🗺️ THREAT MAP", "Known Thargoid activity zones", 180))
@@ -486,15 +2548,12 @@ class CombatPanel(QWidget):
         # Analysis/Prediction
         analysis = QWidget()
         an_layout = QVBoxLayout(analysis)
-        an_layout.addWidget(PlaceholderWidget("📈 COMBAT EFFICIENCY", "Damage dealt, accuracy, survival rate", 180))
-        an_layout.addWidget(PlaceholderWidget("🤖 THREAT PREDICTION", "AI analysis of dangerous systems", 180))
+        an_layout.addWidget(CombatEfficiency("📈 COMBAT EFFICIENCY", 180))
+        an_layout.addWidget(ThreatPrediction("🤖 THREAT PREDICTION", 180))
         combat_tabs.addTab(analysis, "📊 Analysis")
 
         layout.addWidget(combat_tabs)
 
-    def _get_subtab_style(self):
-        return MiningPanel._get_subtab_style(self)
-
 
 class ColonizationPanel(QWidget):
     """System Colonization specialized panel"""
@@ -509,14 +2568,14 @@ class ColonizationPanel(QWidget):
 
         # Squadron/Colonization header
         header = QFrame()
-        header.setStyleSheet("background-color: #1a1a2e; border-radius: 8px; padding: 15px;")
+        header.setObjectName("panelHeader")
         header_layout = QHBoxLayout(header)
 
         squad_info = QVBoxLayout()
         squad_name = QLabel("🏛️ SYSTEM COLONIZATION")
-        squad_name.setStyleSheet("color: #00d4ff; font-size: 18px; font-weight: bold;")
+        squad_name.setObjectName("sectionTitle")
         squad_role = QLabel("Squadron Leader • ID: 109124")
-        squad_role.setStyleSheet("color: #888; font-size: 12px;")
+        squad_role.setObjectName("headerId")
         squad_info.addWidget(squad_name)
         squad_info.addWidget(squad_role)
         header_layout.addLayout(squad_info)
@@ -524,9 +2583,9 @@ class ColonizationPanel(QWidget):
 
         contrib = QVBoxLayout()
         contrib_label = QLabel("YOUR CONTRIBUTION")
-        contrib_label.setStyleSheet("color: #888; font-size: 10px;")
+        contrib_label.setObjectName("fieldLabel")
         contrib_value = QLabel("89,872 pts")
-        contrib_value.setStyleSheet("color: #00ff88; font-size: 20px; font-weight: bold;")
+        contrib_value.setObjectName("contribValue")
         contrib.addWidget(contrib_label)
         contrib.addWidget(contrib_value)
         header_layout.addLayout(contrib)
@@ -543,13 +2602,13 @@ class ColonizationPanel(QWidget):
 
         # Sub-tabs
         col_tabs = QTabWidget()
-        col_tabs.setStyleSheet(self._get_subtab_style())
+        col_tabs.setObjectName("subTabs")
 
         # Active Projects
         projects = QWidget()
         pr_layout = QVBoxLayout(projects)
-        pr_layout.addWidget(PlaceholderWidget("🏗️ ACTIVE COLONIZATION PROJECTS", "Current system colonization efforts and progress", 180))
-        pr_layout.addWidget(PlaceholderWidget("📋 RESOURCE REQUIREMENTS", "Materials needed for current projects", 180))
+        pr_layout.addWidget(ColonizationProjects("🏗️ ACTIVE COLONIZATION PROJECTS", 180))
+        pr_layout.addWidget(HaulPlan("📋 RESOURCE REQUIREMENTS", 180))
         col_tabs.addTab(projects, "🏗️ Projects")
 
         # Leaderboards
@@ -568,9 +2627,6 @@ class ColonizationPanel(QWidget):
 
         layout.addWidget(col_tabs)
 
-    def _get_subtab_style(self):
-        return MiningPanel._get_subtab_style(self)
-
 
 class CommanderPanel(QWidget):
     """Commander, Ship, and System information panel"""
@@ -585,7 +2641,7 @@ class CommanderPanel(QWidget):
 
         # Sub-tabs for Commander/Ship/System
         info_tabs = QTabWidget()
-        info_tabs.setStyleSheet(self._get_subtab_style())
+        info_tabs.setObjectName("infoTabs")
 
         # Commander Tab
         commander = QWidget()
@@ -593,18 +2649,18 @@ class CommanderPanel(QWidget):
 
         # Commander header
         cmd_header = QFrame()
-        cmd_header.setStyleSheet("background-color: #1a1a2e; border-radius: 8px; padding: 15px;")
+        cmd_header.setObjectName("panelHeader")
         cmd_header_layout = QHBoxLayout(cmd_header)
 
         avatar = QLabel("👨‍🚀")
-        avatar.setStyleSheet("font-size: 48px;")
+        avatar.setObjectName("headerIcon")
         cmd_header_layout.addWidget(avatar)
 
         cmd_info = QVBoxLayout()
         cmd_name = QLabel("CMDR FILIPE79")
-        cmd_name.setStyleSheet("color: #00d4ff; font-size: 20px; font-weight: bold;")
+        cmd_name.setObjectName("headerTitle")
         cmd_id = QLabel("FID: F12543193")
-        cmd_id.setStyleSheet("color: #888; font-size: 12px;")
+        cmd_id.setObjectName("headerId")
         cmd_info.addWidget(cmd_name)
         cmd_info.addWidget(cmd_id)
         cmd_header_layout.addLayout(cmd_info)
@@ -613,15 +2669,16 @@ class CommanderPanel(QWidget):
         # Reputation summary
         rep_box = QVBoxLayout()
         rep_label = QLabel("FACTION REPUTATION")
-        rep_label.setStyleSheet("color: #888; font-size: 10px;")
+        rep_label.setObjectName("fieldLabel")
         rep_box.addWidget(rep_label)
 
-        for faction, rep, color in [("Federation", "97%", "#00aaff"), ("Empire", "33%", "#ffaa00"), ("Alliance", "75%", "#00ff88")]:
+        for faction, rep, accent in [("Federation", "97%", "blue"), ("Empire", "33%", "amber"), ("Alliance", "75%", "green")]:
             rep_row = QHBoxLayout()
             f_label = QLabel(faction)
-            f_label.setStyleSheet(f"color: {color}; font-size: 11px;")
+            f_label.setObjectName("repFaction")
+            f_label.setProperty("accent", accent)
             r_label = QLabel(rep)
-            r_label.setStyleSheet("color: #fff; font-size: 11px; font-weight: bold;")
+            r_label.setObjectName("repValue")
             rep_row.addWidget(f_label)
             rep_row.addWidget(r_label)
             rep_box.addLayout(rep_row)
@@ -643,18 +2700,18 @@ class CommanderPanel(QWidget):
 
         # Ship header
         ship_header = QFrame()
-        ship_header.setStyleSheet("background-color: #1a1a2e; border-radius: 8px; padding: 15px;")
+        ship_header.setObjectName("panelHeader")
         ship_header_layout = QHBoxLayout(ship_header)
 
         ship_icon = QLabel("🚀")
-        ship_icon.setStyleSheet("font-size: 48px;")
+        ship_icon.setObjectName("headerIcon")
         ship_header_layout.addWidget(ship_icon)
 
         ship_info = QVBoxLayout()
         ship_name = QLabel("ALLIANCE CHIEFTAIN")
-        ship_name.setStyleSheet("color: #00d4ff; font-size: 20px; font-weight: bold;")
+        ship_name.setObjectName("headerTitle")
         ship_id = QLabel("Ship ID: 34 • TypeX")
-        ship_id.setStyleSheet("color: #888; font-size: 12px;")
+        ship_id.setObjectName("headerId")
         ship_info.addWidget(ship_name)
         ship_info.addWidget(ship_id)
         ship_header_layout.addLayout(ship_info)
@@ -664,9 +2721,9 @@ class CommanderPanel(QWidget):
         quick_stats = QGridLayout()
         for i, (label, value) in enumerate([("Fuel", "14.5/16T"), ("Jump Range", "~25 LY"), ("Power", "24.9 MW")]):
             l = QLabel(label)
-            l.setStyleSheet("color: #888; font-size: 10px;")
+            l.setObjectName("fieldLabel")
             v = QLabel(value)
-            v.setStyleSheet("color: #00ff88; font-size: 14px; font-weight: bold;")
+            v.setObjectName("fieldValue")
             quick_stats.addWidget(l, 0, i)
             quick_stats.addWidget(v, 1, i)
         ship_header_layout.addLayout(quick_stats)
@@ -686,8 +2743,9 @@ class CommanderPanel(QWidget):
         sys_layout = QVBoxLayout(system)
 
         sys_layout.addWidget(PlaceholderWidget("🌟 CURRENT SYSTEM", "Col 359 Sector CE-N b9-1 - System info and bodies", 150))
-        sys_layout.addWidget(PlaceholderWidget("🗺️ GALAXY POSITION", "3D map showing current position in galaxy", 200))
-        sys_layout.addWidget(PlaceholderWidget("📍 VISITED SYSTEMS", "Map of all 1,314 visited systems", 150))
+        sys_layout.addWidget(SystemMap("🗺️ GALAXY POSITION", span=100_000, center=(0.0, 25_000.0),
+                                       landmarks=True, height=200))
+        sys_layout.addWidget(SystemMap("📍 VISITED SYSTEMS", height=150))
 
         info_tabs.addTab(system, "🌌 System")
 
@@ -696,50 +2754,26 @@ class CommanderPanel(QWidget):
         inara_layout = QVBoxLayout(inara)
 
         inara_header = QFrame()
-        inara_header.setStyleSheet("background-color: #1a1a2e; border-radius: 8px; padding: 15px;")
+        inara_header.setObjectName("panelHeader")
         ih_layout = QHBoxLayout(inara_header)
 
         inara_logo = QLabel("🌐 INARA")
-        inara_logo.setStyleSheet("color: #00d4ff; font-size: 18px; font-weight: bold;")
+        inara_logo.setObjectName("sectionTitle")
         ih_layout.addWidget(inara_logo)
         ih_layout.addStretch()
 
-        sync_status = QLabel("● Synced 5 min ago")
-        sync_status.setStyleSheet("color: #00ff88;")
+        sync_status = QLabel("○ Not Linked")
+        sync_status.setObjectName("syncStatus")
         ih_layout.addWidget(sync_status)
 
         inara_layout.addWidget(inara_header)
-        inara_layout.addWidget(PlaceholderWidget("👤 INARA PROFILE", "Commander profile data from INARA API", 150))
-        inara_layout.addWidget(PlaceholderWidget("📊 COMMUNITY DATA", "BGS data, market prices, and community goals", 200))
+        inara_layout.addWidget(InaraProfile("👤 INARA PROFILE", 150))
+        inara_layout.addWidget(CommunityGoals("📊 COMMUNITY DATA", 200))
 
         info_tabs.addTab(inara, "🌐 INARA")
 
         layout.addWidget(info_tabs)
 
-    def _get_subtab_style(self):
-        return """
-            QTabWidget::pane {
-                border: 1px solid #3a3a5a;
-                border-radius: 8px;
-                background-color: #12122a;
-            }
-            QTabBar::tab {
-                background-color: #1a1a2e;
-                color: #888;
-                padding: 10px 25px;
-                margin-right: 2px;
-                border-top-left-radius: 6px;
-                border-top-right-radius: 6px;
-            }
-            QTabBar::tab:selected {
-                background-color: #252550;
-                color: #00d4ff;
-            }
-            QTabBar::tab:hover:!selected {
-                background-color: #202040;
-            }
-        """
-
 
 # =============================================================================
 # MAIN WINDOW
@@ -748,12 +2782,38 @@ class CommanderPanel(QWidget):
 class EliteAnalyticsMainWindow(QMainWindow):
     """Main application window with hierarchical navigation"""
 
-    def __init__(self):
+    # Panel classes in navigation / stack order. Only the first one is built
+    # before the window is shown; the rest are built on first selection or
+    # pre-warmed one per idle tick after the first paint.
+    PANEL_CLASSES = {
+        "realtime": RealTimePanel,
+        "analysis": AnalysisPanel,
+        "prediction": PredictionPanel,
+        "mining": MiningPanel,
+        "hauling": HaulingPanel,
+        "combat": CombatPanel,
+        "colonization": ColonizationPanel,
+        "commander": CommanderPanel,
+    }
+    PREWARM_DELAY_MS = 1500
+    SNAPSHOT_INTERVAL_MS = 60_000
+
+    def __init__(self, prewarm: bool = True):
         super().__init__()
         self.setWindowTitle("Elite Dangerous Advanced Analytics Platform")
         self.setMinimumSize(1400, 900)
+        self.prewarm = prewarm
+        self._prewarm_started = False
+        self.bus = EventBus(self)
+        # Read before anything else so the first frame already shows the last session
+        self.snapshot = DashboardSnapshot()
+        self.aggregator = AggregationService(bus=self.bus, snapshot=self.snapshot, parent=self)
+        self.inara = InaraService(parent=self)
+        self.sink, self.sink_status = self.open_sink()
         self.setup_ui()
         self.apply_dark_theme()
+        # First launch imports the journal history; later ones only what is new
+        self.aggregator.start_ingest()
 
     def setup_ui(self):
         # Central widget
@@ -766,27 +2826,22 @@ class EliteAnalyticsMainWindow(QMainWindow):
         # Left navigation panel
         nav_panel = QFrame()
         nav_panel.setFixedWidth(220)
-        nav_panel.setStyleSheet("""
-            QFrame {
-                background-color: #0d0d1a;
-                border-right: 1px solid #2a2a4a;
-            }
-        """)
+        nav_panel.setObjectName("navPanel")
         nav_layout = QVBoxLayout(nav_panel)
         nav_layout.setContentsMargins(0, 0, 0, 0)
         nav_layout.setSpacing(0)
 
         # App header
         header = QFrame()
-        header.setStyleSheet("background-color: #12122a; padding: 15px;")
+        header.setObjectName("navHeader")
         header_layout = QVBoxLayout(header)
 
         app_title = QLabel("ELITE ANALYTICS")
-        app_title.setStyleSheet("color: #00d4ff; font-size: 16px; font-weight: bold; letter-spacing: 2px;")
+        app_title.setObjectName("appTitle")
         app_title.setAlignment(Qt.AlignCenter)
 
         app_subtitle = QLabel("Advanced Data Platform")
-        app_subtitle.setStyleSheet("color: #666; font-size: 10px;")
+        app_subtitle.setObjectName("appSubtitle")
         app_subtitle.setAlignment(Qt.AlignCenter)
 
         header_layout.addWidget(app_title)
@@ -797,29 +2852,7 @@ class EliteAnalyticsMainWindow(QMainWindow):
         self.nav_tree = QTreeWidget()
         self.nav_tree.setHeaderHidden(True)
         self.nav_tree.setIndentation(20)
-        self.nav_tree.setStyleSheet("""
-            QTreeWidget {
-                background-color: transparent;
-                border: none;
-                color: #aaa;
-                font-size: 12px;
-            }
-            QTreeWidget::item {
-                padding: 12px 15px;
-                border-radius: 0;
-            }
-            QTreeWidget::item:hover {
-                background-color: #1a1a3a;
-            }
-            QTreeWidget::item:selected {
-                background-color: #252550;
-                color: #00d4ff;
-                border-left: 3px solid #00d4ff;
-            }
-            QTreeWidget::branch {
-                background-color: transparent;
-            }
-        """)
+        self.nav_tree.setObjectName("navTree")
 
         # Navigation structure
         nav_items = [
@@ -868,23 +2901,28 @@ class EliteAnalyticsMainWindow(QMainWindow):
 
         # Status footer
         footer = QFrame()
-        footer.setStyleSheet("background-color: #12122a; padding: 10px;")
+        footer.setObjectName("navFooter")
         footer_layout = QVBoxLayout(footer)
 
         status_indicator = QHBoxLayout()
-        status_dot = QLabel("●")
-        status_dot.setStyleSheet("color: #00ff88; font-size: 8px;")
-        status_text = QLabel("Game Connected")
-        status_text.setStyleSheet("color: #888; font-size: 10px;")
-        status_indicator.addWidget(status_dot)
-        status_indicator.addWidget(status_text)
+        self.game_dot = QLabel("●")
+        self.game_dot.setObjectName("statusDot")
+        self.game_text = QLabel()
+        self.game_text.setObjectName("statusText")
+        self.show_game_status("")
+        status_indicator.addWidget(self.game_dot)
+        status_indicator.addWidget(self.game_text)
         status_indicator.addStretch()
 
         footer_layout.addLayout(status_indicator)
 
-        db_status = QLabel("PostgreSQL: Connected")
-        db_status.setStyleSheet("color: #666; font-size: 9px;")
-        footer_layout.addWidget(db_status)
+        self.db_status = QLabel(self.sink_status)
+        self.db_status.setObjectName("dbStatus")
+        footer_layout.addWidget(self.db_status)
+        if self.sink is not None:
+            self.db_timer = QTimer(self)
+            self.db_timer.timeout.connect(self.show_sink_status)
+            self.db_timer.start(1000)
 
         nav_layout.addWidget(footer)
 
@@ -892,26 +2930,26 @@ class EliteAnalyticsMainWindow(QMainWindow):
 
         # Content area (stacked widget)
         self.content_stack = QStackedWidget()
-        self.content_stack.setStyleSheet("background-color: #0a0a1a;")
-
-        # Add all panels to stack
-        self.panels = {
-            "realtime": RealTimePanel(),
-            "analysis": AnalysisPanel(),
-            "prediction": PredictionPanel(),
-            "mining": MiningPanel(),
-            "hauling": HaulingPanel(),
-            "combat": CombatPanel(),
-            "colonization": ColonizationPanel(),
-            "commander": CommanderPanel(),
-        }
+        self.content_stack.setObjectName("contentStack")
 
-        for key, panel in self.panels.items():
+        # One empty scroll area per panel keeps stack indices stable; the
+        # panels themselves are created lazily by ensure_panel()
+        self.panels = {}
+        self.panel_scrolls = {}
+        for key in self.PANEL_CLASSES:
             scroll = QScrollArea()
-            scroll.setWidget(panel)
             scroll.setWidgetResizable(True)
-            scroll.setStyleSheet("QScrollArea { border: none; background-color: #0a0a1a; }")
+            scroll.setObjectName("panelScroll")
+            self.panel_scrolls[key] = scroll
             self.content_stack.addWidget(scroll)
+        realtime = self.ensure_panel("realtime")
+        realtime.restore(self.snapshot.status)
+        realtime.keyed_events_received.connect(self.aggregator.on_live_events)
+        realtime.keyed_events_received.connect(self.inara.on_live_events)
+        realtime.cargo_changed.connect(self.aggregator.on_cargo)
+        realtime.game_status_changed.connect(self.show_game_status)
+        if self.sink is not None:
+            realtime.events_received.connect(self.sink.offer)
 
         main_layout.addWidget(self.content_stack)
 
@@ -923,51 +2961,90 @@ class EliteAnalyticsMainWindow(QMainWindow):
         self.nav_tree.setCurrentItem(first_child)
         self.content_stack.setCurrentIndex(0)
 
+        self.snapshot_timer = QTimer(self)
+        self.snapshot_timer.timeout.connect(self.save_snapshot)
+        self.snapshot_timer.start(self.SNAPSHOT_INTERVAL_MS)
+
+    def open_sink(self) -> tuple[PostgresSink | None, str]:
+        """Live events go to PostgreSQL only when a DSN is configured"""
+        dsn = default_dsn()
+        if not dsn:
+            return None, "PostgreSQL: Off"
+        try:
+            return PostgresSink(dsn), "PostgreSQL: Connecting…"
+        except RuntimeError:
+            return None, "PostgreSQL: psycopg not installed"
+
+    def show_game_status(self, status: str):
+        """Nav footer: what the status files or journal last said about the game"""
+        text, state = {"CONNECTED": ("Game Connected", "connected"),
+                       "OFFLINE": ("Game Offline", "offline")}.get(status, ("Game Not Detected", "offline"))
+        self.game_text.setText(text)
+        if self.game_dot.property("state") != state:
+            self.game_dot.setProperty("state", state)
+            self.game_dot.style().unpolish(self.game_dot)
+            self.game_dot.style().polish(self.game_dot)
+
+    def show_sink_status(self):
+        self.db_status.setText(self.sink.status())
+
+    def save_snapshot(self):
+        self.aggregator.capture()
+        self.panels["realtime"].capture(self.snapshot.status)
+        try:
+            self.snapshot.save()
+        except OSError:
+            pass  # only costs the next cold start its head start
+
+    def closeEvent(self, event):
+        self.save_snapshot()
+        self.inara.stop()
+        if self.sink is not None:
+            # Give queued live events a moment to land, but never hang on exit
+            self.sink.close(timeout=3.0)
+        super().closeEvent(event)
+
+    def ensure_panel(self, key: str) -> QWidget:
+        """Return the panel for ``key``, constructing it on first use"""
+        panel = self.panels.get(key)
+        if panel is None:
+            panel = self.PANEL_CLASSES[key]()
+            self.panels[key] = panel
+            self.panel_scrolls[key].setWidget(panel)
+            self.aggregator.bind(panel)
+            self.inara.bind(panel)
+        return panel
+
     def on_nav_clicked(self, item, column):
         key = item.data(0, Qt.UserRole)
-        if key and key in self.panels:
-            index = list(self.panels.keys()).index(key)
-            self.content_stack.setCurrentIndex(index)
+        if key and key in self.panel_scrolls:
+            self.ensure_panel(key)
+            self.content_stack.setCurrentWidget(self.panel_scrolls[key])
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.prewarm and not self._prewarm_started:
+            self._prewarm_started = True
+            QTimer.singleShot(self.PREWARM_DELAY_MS, self._prewarm_next)
+
+    def _prewarm_next(self):
+        """Build one pending panel, then yield back to the event loop"""
+        pending = [key for key in self.PANEL_CLASSES if key not in self.panels]
+        if not pending:
+            return
+        self.ensure_panel(pending[0])
+        if len(pending) > 1:
+            QTimer.singleShot(0, self._prewarm_next)
 
     def apply_dark_theme(self):
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #0a0a1a;
-            }
-            QWidget {
-                font-family: 'Segoe UI', sans-serif;
-            }
-            QScrollBar:vertical {
-                background-color: #1a1a2e;
-                width: 10px;
-                border-radius: 5px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #3a3a5a;
-                border-radius: 5px;
-                min-height: 30px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #4a4a7a;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0;
-            }
-            QScrollBar:horizontal {
-                background-color: #1a1a2e;
-                height: 10px;
-                border-radius: 5px;
-            }
-            QScrollBar::handle:horizontal {
-                background-color: #3a3a5a;
-                border-radius: 5px;
-                min-width: 30px;
-            }
-        """)
+        # The theme lives on the application so it is parsed once for every
+        # widget instead of once per widget
+        apply_theme(QApplication.instance())
 
 
 def main():
     app = QApplication(sys.argv)
+    apply_theme(app)
 
     # Set application-wide font
     font = QFont("Segoe UI", 10)
@@ -0,0 +1,72 @@
+"""
+Headless startup benchmark
+Times fresh interpreter runs of the headless edxdc.py commands against an
+existing data directory and checks none of them loaded a Qt module.
+
+Run with: python benchmarks/bench_headless.py [--data-dir DIR] [--repeat N]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs one command in a fresh interpreter and reports whether Qt got imported
+PROBE = """
+import contextlib, io, sys
+sys.path.insert(0, {root!r})
+import edxdc
+with contextlib.redirect_stdout(io.StringIO()):
+    edxdc.main({argv!r})
+print(any(name.split(".")[0] in ("PySide6", "PyQt5", "PyQt6", "shiboken6") for name in sys.modules))
+"""
+
+COMMANDS = {
+    "help": None,
+    "aggregate": ["aggregate"],
+    "ingest_unchanged": ["ingest"],
+}
+
+
+def time_command(argv, data_dir, repeat: int) -> dict:
+    if argv is None:
+        command = [sys.executable, str(ROOT / "edxdc.py"), "--help"]
+    else:
+        argv = (["--data-dir", data_dir] if data_dir else []) + argv
+        command = [sys.executable, "-c", PROBE.format(root=str(ROOT), argv=argv)]
+    runs, qt = [], False
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        runs.append(time.perf_counter() - started)
+        qt = qt or output.strip().endswith("True")
+    return {"best_s": min(runs), "mean_s": sum(runs) / len(runs), "imported_qt": qt}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", default=None, help="data directory with an ingested store")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    baseline = min(_time([sys.executable, "-c", "pass"]) for _ in range(args.repeat))
+    results = {"python_s": baseline}
+    for name, command in COMMANDS.items():
+        results[name] = time_command(command, args.data_dir, args.repeat)
+    json.dump(results, sys.stdout, indent=2)
+    print()
+    return 1 if any(result["imported_qt"] for result in results.values() if isinstance(result, dict)) else 0
+
+
+def _time(command) -> float:
+    started = time.perf_counter()
+    subprocess.run(command, check=True)
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+INARA client benchmark
+Runs InaraClient against a mock INARA API on localhost and reports how
+many requests a burst of journal events and lookups took, how long lookups
+waited and whether uploads queued while the server was down arrive once
+it is back. Nothing is sent to inara.cz.
+
+Run with: python benchmarks/bench_inara.py [--jumps N] [--lookups N]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from inara import InaraClient, TokenBucket
+
+
+class MockInara(BaseHTTPRequestHandler):
+    """Answers every event with 200 and records what was sent"""
+
+    received = []  # one list of event names per request
+    lookups = {
+        "getCommanderProfile": {"commanderName": "Bench", "commanderRanksPilot": [
+            {"rankName": "trade", "rankValue": 8, "rankProgress": 0.42}]},
+        "getCommunityGoalsRecent": [
+            {"communitygoalName": "Bench Goal", "starsystemName": "Sol", "tierReached": 2,
+             "tierMax": 5, "contributorsNum": 1200, "goalExpiry": "3300-02-01T00:00:00Z",
+             "isCompleted": False}],
+    }
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        names = [event["eventName"] for event in body["events"]]
+        self.received.append(names)
+        events = [{"eventStatus": 200, "eventData": self.lookups[name]} if name in self.lookups
+                  else {"eventStatus": 200} for name in names]
+        reply = json.dumps({"header": {"eventStatus": 200}, "events": events}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port: int = 0) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockInara)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def jumps(count: int, start: int = 0) -> list[dict]:
+    return [{"timestamp": f"3300-01-01T00:{(start + i) // 60 % 60:02d}:{(start + i) % 60:02d}Z",
+             "event": "FSDJump", "StarSystem": f"Bench {start + i}", "JumpDist": 12.5,
+             "StarPos": [0.0, 0.0, float(start + i)]}
+            for i in range(count)]
+
+
+def wait_for(condition, timeout: float = 10.0) -> float:
+    started = time.perf_counter()
+    while not condition():
+        if time.perf_counter() - started > timeout:
+            raise TimeoutError("mock INARA did not receive the expected events")
+        time.sleep(0.01)
+    return time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jumps", type=int, default=250)
+    parser.add_argument("--lookups", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    server = serve()
+    url = f"http://127.0.0.1:{server.server_port}/"
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        client = InaraClient("bench-key", commander="Bench", url=url, root=root,
+                             bucket=TokenBucket(rate=20.0, capacity=2),
+                             upload_delay=0.2, retry_delay=0.2)
+        client.start()
+
+        # A burst of uploads plus a few lookups rides in as few requests as the batch size allows
+        started = time.perf_counter()
+        client.upload(jumps(args.jumps))
+        futures = [client.lookup("getCommanderProfile", {"searchName": f"Bench {i}"})
+                   for i in range(args.lookups)]
+        profiles = [future.result(10) for future in futures]
+        lookup_s = time.perf_counter() - started
+        wait_for(lambda: not client.outbox)
+        sent = sum(len(names) for names in MockInara.received)
+        results["batched"] = {"events": sent, "requests": len(MockInara.received),
+                              "lookup_s": lookup_s, "profiles": len([p for p in profiles if p])}
+
+        cached_started = time.perf_counter()
+        client.lookup("getCommanderProfile", {"searchName": "Bench 0"}).result(1)
+        results["cached_lookup_ms"] = (time.perf_counter() - cached_started) * 1000
+
+        # Take the server away, queue uploads, bring it back on the same port
+        port = server.server_port
+        server.shutdown()
+        server.server_close()
+        client.upload(jumps(20, start=args.jumps))
+        wait_for(lambda: not client.online)
+        queued = len(client.outbox)
+        server = serve(port)
+        client.reconnect()
+        flush_s = wait_for(lambda: not client.outbox)
+        results["offline"] = {"queued": queued, "flushed_s": flush_s, "online": client.online}
+        client.stop()
+
+    server.shutdown()
+    json.dump(results, sys.stdout, indent=2)
+    print()
+    return 0 if results["offline"]["queued"] == 20 and results["offline"]["online"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
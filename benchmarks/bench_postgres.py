@@ -0,0 +1,91 @@
+"""
+PostgreSQL sink benchmark
+Writes synthetic journal events through PostgresSink into a scratch table
+on a local server, checks every row arrived, and compares the throughput
+with one INSERT and commit per event.
+
+Run with: python benchmarks/bench_postgres.py DSN [--events N] [--writers N]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import postgres_sink
+from postgres_sink import PostgresSink, psycopg
+
+
+# Kept apart from the table the application writes to
+SCRATCH_TABLE = "edxdc_events_bench"
+
+
+def synthetic_events(count: int):
+    base = 1_700_000_000
+    for i in range(count):
+        ts = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(base + i))
+        yield {"timestamp": ts, "event": "FSDJump", "StarSystem": f"Bench {i % 500}",
+               "JumpDist": 10.0 + i % 40, "SystemAddress": i}
+
+
+def reset_table(dsn: str):
+    with psycopg.connect(dsn) as conn:
+        conn.execute(f"DROP TABLE IF EXISTS {SCRATCH_TABLE}")
+
+
+def count_rows(dsn: str) -> int:
+    with psycopg.connect(dsn) as conn:
+        return conn.execute(f"SELECT count(*) FROM {SCRATCH_TABLE}").fetchone()[0]
+
+
+def time_sink(dsn: str, events: int, writers: int) -> dict:
+    reset_table(dsn)
+    started = time.perf_counter()
+    sink = PostgresSink(dsn, writers=writers, table=SCRATCH_TABLE)
+    sink.put(synthetic_events(events))
+    sink.close()
+    elapsed = time.perf_counter() - started
+    return {"events": events, "rows": count_rows(dsn), "batches": sink.batches,
+            "elapsed_s": elapsed, "events_per_s": events / elapsed}
+
+
+def time_inserts(dsn: str, events: int) -> dict:
+    reset_table(dsn)
+    with psycopg.connect(dsn) as conn:
+        conn.execute(postgres_sink.SCHEMA_SQL.format(table=SCRATCH_TABLE))
+        conn.commit()
+        started = time.perf_counter()
+        for event in synthetic_events(events):
+            conn.execute(f"INSERT INTO {SCRATCH_TABLE} (timestamp, event, data) VALUES (%s, %s, %s)",
+                         (event["timestamp"], event["event"], json.dumps(event)))
+            conn.commit()
+        elapsed = time.perf_counter() - started
+    return {"events": events, "elapsed_s": elapsed, "events_per_s": events / elapsed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("dsn", help="libpq connection string of a scratch database")
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--writers", type=int, default=postgres_sink.POOL_SIZE)
+    parser.add_argument("--insert-events", type=int, default=5_000,
+                        help="events for the one-INSERT-per-event baseline")
+    args = parser.parse_args(argv)
+    if psycopg is None:
+        parser.error('psycopg 3 is not installed: pip install "psycopg[binary]"')
+
+    results = {"copy": time_sink(args.dsn, args.events, args.writers),
+               "insert": time_inserts(args.dsn, args.insert_events)}
+    results["speedup"] = results["copy"]["events_per_s"] / results["insert"]["events_per_s"]
+    reset_table(args.dsn)
+
+    json.dump(results, sys.stdout, indent=2)
+    print()
+    return 0 if results["copy"]["rows"] == args.events else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Headless startup and memory benchmark for the UI shell
+Measures cold import time of PySide6 and app_ui, main window construction,
+per-panel construction and peak RSS under the offscreen Qt platform, and
+writes the results as JSON so runs can be compared.
+
+Run with: python benchmarks/bench_startup.py [-o results.json] [--compare old.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process in MiB"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def time_cold_import(module: str, repeat: int) -> float:
+    """Best-of-N import time in a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET.format(module=module)],
+            capture_output=True, text=True, env=env, check=True,
+        )
+        runs.append(float(out.stdout.strip().splitlines()[-1]))
+    return min(runs)
+
+
+def best_of(fn, repeat: int) -> float:
+    from PySide6.QtWidgets import QApplication
+
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        widget = fn()
+        runs.append(time.perf_counter() - started)
+        widget.deleteLater()
+        QApplication.processEvents()
+    return min(runs)
+
+
+def run(repeat: int) -> dict:
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "qpa": os.environ["QT_QPA_PLATFORM"],
+        "import_s": {
+            "PySide6.QtWidgets": time_cold_import("PySide6.QtWidgets", repeat),
+            "app_ui": time_cold_import("app_ui", repeat),
+        },
+    }
+
+    from PySide6.QtWidgets import QApplication
+    import app_ui
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    app_ui.apply_theme(app)
+    results["rss_after_import_mb"] = peak_rss_mb()
+
+    # Time to first window: what the user waits for before anything shows
+    def first_window():
+        window = app_ui.EliteAnalyticsMainWindow(prewarm=False)
+        window.show()
+        QApplication.processEvents()
+        return window
+
+    # Everything built, as when every panel has been visited or pre-warmed
+    def full_window():
+        window = app_ui.EliteAnalyticsMainWindow(prewarm=False)
+        for key in window.PANEL_CLASSES:
+            window.ensure_panel(key)
+        window.show()
+        QApplication.processEvents()
+        return window
+
+    results["window_s"] = {
+        "first_window": best_of(first_window, repeat),
+        "all_panels": best_of(full_window, repeat),
+    }
+    results["panel_s"] = {
+        cls.__name__: best_of(cls, repeat)
+        for cls in app_ui.EliteAnalyticsMainWindow.PANEL_CLASSES.values()
+    }
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+
+def compare(current: dict, previous: dict, prefix: str = "") -> list[str]:
+    """Human readable deltas for every numeric field present in both runs"""
+    lines = []
+    for key, value in current.items():
+        old = previous.get(key)
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and isinstance(old, dict):
+            lines.extend(compare(value, old, f"{name}."))
+        elif isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+            change = (value - old) / old * 100
+            lines.append(f"{name:40s} {old:10.4f} -> {value:10.4f}  ({change:+.1f}%)")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless UI startup benchmark")
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--compare", help="previous results JSON to diff against")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        print("\n".join(compare(results, previous)), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Theme polish benchmark
+Builds the main window with every panel and times showing and polishing
+it under the single application stylesheet against the old approach of
+giving every widget its own stylesheet.
+
+For the per-widget run each rule of the compiled theme is copied onto
+the widgets its leftmost selector names (by class, objectName and
+property), and rules for plain Qt types onto the window, so both runs
+draw the same window.
+
+Run with: python benchmarks/bench_theme.py [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PySide6.QtWidgets import QApplication, QWidget
+
+from app_ui import EliteAnalyticsMainWindow
+from theme import apply_theme, compile_stylesheet
+
+
+COMPOUND = re.compile(r'(\w+)?(?:#(\w+))?((?:\[\w+="[^"]*"\])*)')
+ATTRIBUTE = re.compile(r'\[(\w+)="([^"]*)"\]')
+
+
+def theme_rules() -> list[tuple[str, str]]:
+    """(selector, body) for every selector of the compiled theme"""
+    sheet = re.sub(r"/\*.*?\*/", "", compile_stylesheet(), flags=re.S)
+    rules = []
+    for block in sheet.split("}"):
+        if "{" not in block:
+            continue
+        selectors, body = block.split("{")
+        rules.extend((selector.strip(), body.strip()) for selector in selectors.split(","))
+    return rules
+
+
+def matches(widget: QWidget, compound: str) -> bool:
+    type_name, object_name, attributes = COMPOUND.match(compound).groups()
+    return ((not type_name or widget.inherits(type_name))
+            and (not object_name or widget.objectName() == object_name)
+            and all(str(widget.property(key)) == value for key, value in ATTRIBUTE.findall(attributes)))
+
+
+def per_widget_sheets(window: QWidget) -> dict[QWidget, str]:
+    """The theme split into one stylesheet per widget it styles"""
+    widgets = window.findChildren(QWidget)
+    sheets = defaultdict(list)
+    for selector, body in theme_rules():
+        compound = re.split(r"[\s>:]", selector, maxsplit=1)[0]
+        targets = [window]
+        if "#" in compound or "[" in compound or not compound.startswith("Q"):
+            targets = [widget for widget in widgets if matches(widget, compound)]
+        for widget in targets:
+            sheets[widget].append(f"{selector} {{ {body} }}")
+    return {widget: "\n".join(rules) for widget, rules in sheets.items()}
+
+
+def polish(root: QWidget):
+    root.show()
+    for widget in root.findChildren(QWidget):
+        widget.ensurePolished()
+    QApplication.processEvents()
+
+
+def time_window(app, mode: str) -> dict:
+    app.setStyleSheet("")
+    if mode == "themed":
+        apply_theme(app)
+    started = time.perf_counter()
+    window = EliteAnalyticsMainWindow(prewarm=False)
+    for key in window.PANEL_CLASSES:
+        window.ensure_panel(key)
+    built = time.perf_counter()
+    if mode == "per-widget":
+        for widget, sheet in per_widget_sheets(window).items():
+            widget.setStyleSheet(sheet)
+    styled = time.perf_counter()
+    polish(window)
+    polished = time.perf_counter()
+    result = {
+        "widgets": len(window.findChildren(QWidget)),
+        "build_s": built - started,
+        "sheets_s": styled - built,
+        "polish_s": polished - styled,
+    }
+    window.close()
+    window.deleteLater()
+    QApplication.processEvents()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = {}
+    for mode in ("per-widget", "themed"):
+        runs = [time_window(app, mode) for _ in range(args.repeat)]
+        results[mode] = {
+            "widgets": runs[0]["widgets"],
+            **{key: min(run[key] for run in runs) for key in ("build_s", "sheets_s", "polish_s")},
+            "styled_s": min(run["sheets_s"] + run["polish_s"] for run in runs),
+        }
+    results["saved_s"] = results["per-widget"]["styled_s"] - results["themed"]["styled_s"]
+
+    json.dump(results, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,398 @@
+"""
+Colonization project tracker
+Construction depot snapshots and the commander's contributions, folded
+into the remaining requirements of every project, and matched against
+what could fill them:
+
+    projects  construction sites by MarketID, each with its required,
+              provided and remaining amount per commodity
+    needed    commodity -> {project: tons remaining}, over active projects
+    cargo     the ship's hold, from Cargo.json
+    carrier   fleet carrier cargo, as moved by CargoTransfer events
+    stock     commodity -> {market: (stock, buy price)}, from Market.json
+
+A depot event replaces its project's requirements and a contribution
+lowers them; either way only the commodities it names are re-indexed.
+The haul plan looks each needed commodity up in the indexes, so docking,
+a new Market.json or a Cargo.json rewrite costs one lookup per needed
+commodity however many projects and markets are known. Sales from the
+carrier's own market are not in the journal, so carrier cargo is only
+what was transferred.
+
+No Qt imports here.
+"""
+
+import math
+import time
+from dataclasses import dataclass, field
+
+from aggregates import SYSTEM_EVENTS
+from event_store import EventStore, parse_timestamp
+from prices import commodity_key
+
+
+NEARBY_LY = 40.0  # how far a market may be to count as a source
+
+# Haul actions, most urgent first
+DELIVER, TRANSFER, BUY, FIND = "Deliver", "Transfer", "Buy", "Find"
+ACTION_ORDER = {DELIVER: 0, TRANSFER: 1, BUY: 2, FIND: 3}
+
+
+@dataclass
+class Requirement:
+    commodity: str
+    label: str
+    required: int = 0
+    provided: int = 0
+    payment: int = 0  # credits per ton delivered
+
+    @property
+    def remaining(self) -> int:
+        return max(self.required - self.provided, 0)
+
+
+@dataclass
+class Project:
+    market_id: int
+    station: str = ""
+    system: str = ""
+    progress: float = 0.0  # 0..1, as the depot reports it
+    complete: bool = False
+    failed: bool = False
+    updated: int = 0  # timestamp of the last depot or contribution event
+    contributed: int = 0  # tons delivered by the commander
+    requirements: dict[str, Requirement] = field(default_factory=dict)
+
+    @property
+    def active(self) -> bool:
+        return not (self.complete or self.failed)
+
+    @property
+    def required(self) -> int:
+        return sum(r.required for r in self.requirements.values())
+
+    @property
+    def remaining(self) -> int:
+        return sum(r.remaining for r in self.requirements.values())
+
+
+@dataclass
+class Source:
+    market_id: int
+    station: str
+    system: str
+    distance: float  # light years from the commander
+    stock: int
+    price: int
+
+
+@dataclass
+class Haul:
+    """One line of the haul plan: what to do next about one commodity"""
+    commodity: str
+    label: str
+    action: str
+    amount: int  # tons the action moves
+    needed: int  # tons still required over all active projects
+    in_hold: int
+    on_carrier: int
+    source: Source | None  # nearest market selling it
+
+    @property
+    def to_buy(self) -> int:
+        return max(self.needed - self.in_hold - self.on_carrier, 0)
+
+
+# =============================================================================
+# TRACKER
+# =============================================================================
+
+class ColonizationTracker:
+    """Remaining project requirements, indexed by commodity, and where to get them"""
+
+    def __init__(self):
+        self.projects: dict[int, Project] = {}
+        self.needed: dict[str, dict[int, int]] = {}
+        self.labels: dict[str, str] = {}
+        self.cargo: dict[str, int] = {}
+        self.carrier: dict[str, int] = {}
+        self.stock: dict[str, dict[int, tuple[int, int]]] = {}
+        self.stocked: dict[int, list[str]] = {}  # market -> commodities it has in self.stock
+        self.markets: dict[int, tuple[str, str]] = {}  # market -> (station, system)
+        self.positions: dict[str, tuple] = {}  # system name -> StarPos
+        self.system = ""
+        self.position = None
+        self.docked = None  # MarketID while docked
+        self.capacity = 0  # cargo capacity of the current ship, 0 if unknown
+
+    # -------------------------------------------------------------------------
+    # Folding in
+    # -------------------------------------------------------------------------
+
+    def update(self, event: dict):
+        name = event.get("event")
+        if name == "ColonisationConstructionDepot":
+            self._depot(event)
+        elif name == "ColonisationContribution":
+            self._contribution(event)
+        elif name == "CargoTransfer":
+            self._transfer(event)
+        elif name in SYSTEM_EVENTS:
+            self.system = event.get("StarSystem", self.system)
+            position = event.get("StarPos")
+            if isinstance(position, (list, tuple)) and len(position) == 3:
+                self.position = tuple(position)
+                self.positions[self.system] = self.position
+        elif name == "Docked":
+            self.docked = event.get("MarketID")
+            station = event.get("StationName_Localised") or event.get("StationName", "")
+            self.markets[self.docked] = (station, event.get("StarSystem", self.system))
+            project = self.projects.get(self.docked)
+            if project is not None:
+                project.station, project.system = self.markets[self.docked]
+        elif name == "Undocked":
+            self.docked = None
+        elif name == "Loadout":
+            self.capacity = int(event.get("CargoCapacity") or 0)
+
+    def _project(self, market_id: int) -> Project:
+        project = self.projects.get(market_id)
+        if project is None:
+            station, system = self.markets.get(market_id, ("", ""))
+            project = self.projects[market_id] = Project(market_id, station, system)
+        return project
+
+    def _reindex(self, project: Project, commodity: str):
+        requirement = project.requirements.get(commodity)
+        remaining = requirement.remaining if requirement is not None and project.active else 0
+        needs = self.needed.get(commodity)
+        if remaining:
+            if needs is None:
+                needs = self.needed[commodity] = {}
+            needs[project.market_id] = remaining
+        elif needs is not None:
+            needs.pop(project.market_id, None)
+            if not needs:
+                del self.needed[commodity]
+
+    def _depot(self, event: dict):
+        market_id = event.get("MarketID")
+        if not market_id:
+            return
+        project = self._project(market_id)
+        previous = set(project.requirements)
+        project.requirements = {}
+        for item in event.get("ResourcesRequired") or []:
+            commodity = commodity_key(item.get("Name", ""))
+            if not commodity:
+                continue
+            label = self._label(commodity, item.get("Name_Localised"))
+            project.requirements[commodity] = Requirement(
+                commodity, label, int(item.get("RequiredAmount", 0)),
+                int(item.get("ProvidedAmount", 0)), int(item.get("Payment", 0)))
+        project.progress = float(event.get("ConstructionProgress", project.progress))
+        project.complete = bool(event.get("ConstructionComplete"))
+        project.failed = bool(event.get("ConstructionFailed"))
+        project.updated = parse_timestamp(event.get("timestamp", "")) or project.updated
+        for commodity in previous | set(project.requirements):
+            self._reindex(project, commodity)
+
+    def _contribution(self, event: dict):
+        market_id = event.get("MarketID")
+        if not market_id:
+            return
+        project = self._project(market_id)
+        for item in event.get("Contributions") or []:
+            commodity = commodity_key(item.get("Name", ""))
+            amount = int(item.get("Amount", 0))
+            project.contributed += amount
+            self._label(commodity, item.get("Name_Localised"))
+            requirement = project.requirements.get(commodity)
+            if requirement is not None:
+                requirement.provided += amount
+                self._reindex(project, commodity)
+        project.updated = parse_timestamp(event.get("timestamp", "")) or project.updated
+
+    def _transfer(self, event: dict):
+        for item in event.get("Transfers") or []:
+            commodity = commodity_key(item.get("Type", ""))
+            if not commodity:
+                continue
+            self._label(commodity, item.get("Type_Localised"))
+            count = int(item.get("Count", 0))
+            if item.get("Direction") == "tocarrier":
+                self.carrier[commodity] = self.carrier.get(commodity, 0) + count
+            elif item.get("Direction") == "toship":
+                left = self.carrier.get(commodity, 0) - count
+                if left > 0:
+                    self.carrier[commodity] = left
+                else:
+                    self.carrier.pop(commodity, None)
+
+    def _label(self, commodity: str, label: str | None) -> str:
+        if label:
+            self.labels[commodity] = label
+        return self.labels.get(commodity) or commodity.title()
+
+    def set_cargo(self, cargo: dict[str, int]):
+        """The ship's hold as Cargo.json lists it, commodity symbol -> tons"""
+        self.cargo = {commodity_key(name): count for name, count in cargo.items() if count > 0}
+
+    def set_market(self, market_id: int, prices: dict, station: str = "", system: str = ""):
+        """Replace what ``market_id`` has in stock with a PriceStore snapshot"""
+        for commodity in self.stocked.pop(market_id, ()):
+            sellers = self.stock.get(commodity)
+            if sellers is not None:
+                sellers.pop(market_id, None)
+                if not sellers:
+                    del self.stock[commodity]
+        if station or system:
+            self.markets[market_id] = (station, system)
+        stocked = []
+        for commodity, price in prices.items():
+            if price.stock > 0 and price.buy > 0:
+                self.stock.setdefault(commodity, {})[market_id] = (price.stock, price.buy)
+                stocked.append(commodity)
+        if stocked:
+            self.stocked[market_id] = stocked
+
+    # -------------------------------------------------------------------------
+    # Results
+    # -------------------------------------------------------------------------
+
+    def active_projects(self) -> list[Project]:
+        """Projects still under construction, most recently updated first"""
+        return sorted((p for p in self.projects.values() if p.active and p.requirements),
+                      key=lambda p: p.updated, reverse=True)
+
+    def distance(self, system: str) -> float | None:
+        if system and system == self.system:
+            return 0.0
+        position = self.positions.get(system)
+        if position is None or self.position is None:
+            return None
+        return math.dist(position, self.position)
+
+    def nearest_source(self, commodity: str) -> Source | None:
+        """Closest market within NEARBY_LY with ``commodity`` in stock, the larger stock on a tie"""
+        best, best_key = None, None
+        for market_id, (stock, price) in self.stock.get(commodity, {}).items():
+            if market_id in self.projects:
+                continue  # construction depots list what they take, not what they sell
+            station, system = self.markets.get(market_id, ("", ""))
+            distance = self.distance(system)
+            if distance is None or distance > NEARBY_LY:
+                continue
+            key = (distance, -stock)
+            if best_key is None or key < best_key:
+                best_key = key
+                best = Source(market_id, station, system, distance, stock, price)
+        return best
+
+    def plan(self, limit: int | None = None) -> list[Haul]:
+        """What to haul next, one line per commodity still needed, most urgent first"""
+        free = max(self.capacity - sum(self.cargo.values()), 0) if self.capacity else None
+        here = self.docked if self.docked in self.projects else None
+        plan = []
+        for commodity, needs in self.needed.items():
+            needed = sum(needs.values())
+            hold, carrier = self.cargo.get(commodity, 0), self.carrier.get(commodity, 0)
+            source = self.nearest_source(commodity)
+            if hold:
+                action, amount = DELIVER, min(hold, needs.get(here) or needed)
+            elif carrier:
+                action, amount = TRANSFER, min(carrier, needed)
+            elif source is not None:
+                action, amount = BUY, min(needed, source.stock, needed if free is None else free)
+            else:
+                action, amount = FIND, needed
+            plan.append(Haul(commodity, self._label(commodity, None), action, amount, needed,
+                             hold, carrier, source))
+        # Deliveries the current depot takes come first, then the rest by action
+        plan.sort(key=lambda h: (h.action != DELIVER or here not in self.needed[h.commodity],
+                                 ACTION_ORDER[h.action],
+                                 h.source.distance if h.action == BUY else 0.0,
+                                 -h.amount))
+        return plan[:limit] if limit is not None else plan
+
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+def _rows(store: EventStore, table: str, *columns: str):
+    """Rows of ``table`` as tuples of plain values, partition by partition"""
+    for part in store.partitions(table):
+        values = [part.strings(name) if part.types[name] == "str" else part.column(name).tolist()
+                  for name in columns]
+        yield from zip(*values)
+
+
+def _timestamp(ts: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+def _events(store: EventStore):
+    """Journal events rebuilt from the store, as (timestamp, order, event) in any order.
+
+    The store keeps whole seconds and no order across tables, so ``order``
+    breaks ties: the game writes a depot snapshot after the contribution it
+    already counts, so within a second contributions replay first and the
+    snapshot has the last word.
+    """
+    for table in SYSTEM_EVENTS:
+        for ts, system, x, y, z in _rows(store, table, "timestamp", "StarSystem", "StarPosX", "StarPosY", "StarPosZ"):
+            yield ts, 0, {"event": table, "StarSystem": system, "StarPos": (x, y, z)}
+    for ts, market_id, station, system in _rows(store, "Docked", "timestamp", "MarketID", "StationName", "StarSystem"):
+        yield ts, 1, {"event": "Docked", "MarketID": market_id, "StationName": station, "StarSystem": system}
+
+    # Row tables hold one row per list item; consecutive rows of one event share its timestamp
+    depots = {}
+    for ts, market_id, progress, complete, failed, name, label, required, provided, payment in _rows(
+            store, "ColonisationConstructionDepot", "timestamp", "MarketID", "Progress", "Complete",
+            "Failed", "Commodity", "Label", "Required", "Provided", "Payment"):
+        event = depots.get((ts, market_id))
+        if event is None:
+            event = depots[(ts, market_id)] = {
+                "timestamp": _timestamp(ts), "event": "ColonisationConstructionDepot", "MarketID": market_id,
+                "ConstructionProgress": progress, "ConstructionComplete": complete,
+                "ConstructionFailed": failed, "ResourcesRequired": []}
+        event["ResourcesRequired"].append({"Name": name, "Name_Localised": label, "RequiredAmount": required,
+                                           "ProvidedAmount": provided, "Payment": payment})
+    for (ts, _), event in depots.items():
+        yield ts, 3, event
+
+    contributions = {}
+    for ts, market_id, name, amount in _rows(store, "ColonisationContribution", "timestamp", "MarketID",
+                                             "Commodity", "Amount"):
+        event = contributions.get((ts, market_id))
+        if event is None:
+            event = contributions[(ts, market_id)] = {
+                "timestamp": _timestamp(ts), "event": "ColonisationContribution", "MarketID": market_id,
+                "Contributions": []}
+        event["Contributions"].append({"Name": name, "Amount": amount})
+    for (ts, _), event in contributions.items():
+        yield ts, 2, event
+
+    transfers = {}
+    for ts, name, count, direction in _rows(store, "CargoTransfer", "timestamp", "Commodity", "Count", "Direction"):
+        event = transfers.setdefault(ts, {"event": "CargoTransfer", "Transfers": []})
+        event["Transfers"].append({"Type": name, "Count": count, "Direction": direction})
+    for ts, event in transfers.items():
+        yield ts, 4, event
+
+
+def load_colonization(store: EventStore, prices=None) -> ColonizationTracker:
+    """ColonizationTracker over the whole store, with stock from a prices.PriceStore"""
+    tracker = ColonizationTracker()
+    # Depot snapshots only mean something in order, so the history is replayed
+    # through update(); colonisation events are few next to the jumps and docks
+    for _, _, event in sorted(_events(store), key=lambda row: row[:2]):
+        tracker.update(event)
+    tracker.docked = None
+    if prices is not None:
+        for market_id in prices.markets():
+            names = prices.stations.get(market_id, {})
+            tracker.set_market(market_id, prices.latest(market_id), names.get("station", ""),
+                               names.get("system", ""))
+    return tracker
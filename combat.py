@@ -0,0 +1,394 @@
+"""
+Combat analytics
+Bounty, kill bond, scan, hull damage, death and interdiction events folded
+into two kinds of state that never need the combat history rescanned:
+
+    window   totals of the last WINDOW_SECONDS of play in a fixed ring of
+             per-minute buckets, for kills/hour, credits/kill and damage taken
+    systems  per-system rollups (bounties, conflict zone bonds, Thargoid
+             kills, damage, deaths, interdictions) and a danger score that
+             decays with DANGER_HALF_LIFE, for the PvE, Thargoid and threat views
+
+Every event is charged to the system the commander was last in. Bulk
+loading finds that system with one searchsorted over the arrival times and
+does the per-system sums with bincount; live events are then folded in
+one at a time, in O(1) each.
+
+Requires NumPy; the GUI imports this lazily off the GUI thread.
+"""
+
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from aggregates import COMBAT_EVENTS, SYSTEM_EVENTS
+from event_store import EventStore, parse_timestamp
+
+
+WINDOW_SECONDS = 3600
+BUCKET_SECONDS = 60
+BUCKETS = WINDOW_SECONDS // BUCKET_SECONDS
+MAX_GAP = 300                   # seconds between combat events still counted as time in combat
+DANGER_HALF_LIFE = 30 * 86400   # seconds for a system's danger score to halve
+DAMAGE_WEIGHT = 10.0            # danger per whole hull lost
+DEATH_WEIGHT = 20.0
+INTERDICTION_WEIGHT = 1.0       # doubled when the interdictor is a player
+UNKNOWN_SYSTEM = ""
+
+
+def is_thargoid(faction: str) -> bool:
+    """"$faction_Thargoid;" is the victim faction of every Thargoid kill bond"""
+    return "thargoid" in faction.lower()
+
+
+def _decay(seconds) -> float:
+    return 0.5 ** (seconds / DANGER_HALF_LIFE)
+
+
+@dataclass
+class CombatTotals:
+    kills: int = 0         # bounties and kill bonds
+    credits: int = 0
+    damage: float = 0.0    # hull lost, in whole hulls
+    deaths: int = 0
+    interdictions: int = 0
+    scans: int = 0         # wanted ships fully scanned
+    seconds: float = 0.0   # time in combat
+
+    @property
+    def kills_per_hour(self) -> float:
+        return self.kills * 3600 / self.seconds if self.seconds else 0.0
+
+    @property
+    def credits_per_kill(self) -> float:
+        return self.credits / self.kills if self.kills else 0.0
+
+
+TOTAL_FIELDS = tuple(f.name for f in fields(CombatTotals))
+FIELD_INDEX = {name: i for i, name in enumerate(TOTAL_FIELDS)}
+
+
+class SlidingWindow:
+    """CombatTotals of the last WINDOW_SECONDS as a fixed ring of per-minute buckets"""
+
+    __slots__ = ("buckets", "head")
+
+    def __init__(self):
+        self.buckets = [[0] * len(TOTAL_FIELDS) for _ in range(BUCKETS)]
+        self.head = None  # number of the newest bucket, ts // BUCKET_SECONDS
+
+    def advance(self, ts: int):
+        """Slide the window forward so it ends at ``ts``"""
+        bucket = ts // BUCKET_SECONDS
+        if self.head is not None and bucket <= self.head:
+            return
+        if self.head is not None:
+            for stale in range(max(self.head + 1, bucket - BUCKETS + 1), bucket + 1):
+                values = self.buckets[stale % BUCKETS]
+                values[:] = [0] * len(values)
+        self.head = bucket
+
+    def add(self, ts: int, name: str, amount=1):
+        self.advance(ts)
+        bucket = ts // BUCKET_SECONDS
+        if bucket > self.head - BUCKETS:
+            self.buckets[bucket % BUCKETS][FIELD_INDEX[name]] += amount
+
+    def totals(self) -> CombatTotals:
+        return CombatTotals(*map(sum, zip(*self.buckets)))
+
+
+@dataclass
+class SystemCombat:
+    system: str
+    visits: int = 0
+    kills: int = 0            # bounties
+    bounty_credits: int = 0
+    bonds: int = 0            # conflict zone kill bonds
+    bond_credits: int = 0
+    thargoid_kills: int = 0
+    thargoid_credits: int = 0
+    damage: float = 0.0
+    deaths: int = 0
+    interdictions: int = 0
+    danger: float = 0.0       # decayed danger score as of ``danger_at``
+    danger_at: int = 0
+    last_seen: int = 0        # last combat event here
+
+    def add_danger(self, ts: int, weight: float):
+        if ts >= self.danger_at:
+            self.danger = self.danger_now(ts) + weight
+            self.danger_at = ts
+        else:
+            self.danger += weight * _decay(self.danger_at - ts)
+
+    def danger_now(self, ts: int) -> float:
+        return self.danger * _decay(max(ts - self.danger_at, 0))
+
+
+class CombatStats:
+    """Sliding-window and per-system combat statistics over all combat events"""
+
+    def __init__(self):
+        self.systems: dict[str, SystemCombat] = {}
+        self.total = CombatTotals()
+        self.window = SlidingWindow()
+        self.system = UNKNOWN_SYSTEM
+        self.hull = 1.0
+        self.last_combat = 0
+        self.last_timestamp = 0
+
+    def rollup(self, system: str) -> SystemCombat:
+        spot = self.systems.get(system)
+        if spot is None:
+            spot = self.systems[system] = SystemCombat(system)
+        return spot
+
+    # -------------------------------------------------------------------------
+    # Live updates
+    # -------------------------------------------------------------------------
+
+    def update(self, event: dict):
+        """Fold in one journal event; anything outside COMBAT_EVENTS is ignored"""
+        name = event.get("event")
+        if name not in COMBAT_EVENTS:
+            return
+        ts = parse_timestamp(event.get("timestamp", ""))
+        self.last_timestamp = max(self.last_timestamp, ts)
+        self.window.advance(ts)
+        if name in SYSTEM_EVENTS:
+            self.system = event.get("StarSystem") or UNKNOWN_SYSTEM
+            self.rollup(self.system).visits += 1
+            return
+        if name == "RepairAll":
+            self.hull = 1.0
+            return
+        spot = self.rollup(self.system)
+        if name == "Bounty":
+            reward = int(event.get("TotalReward", 0) or 0)
+            spot.kills += 1
+            spot.bounty_credits += reward
+            self._kill(spot, ts, reward)
+        elif name == "FactionKillBond":
+            reward = int(event.get("Reward", 0) or 0)
+            if is_thargoid(event.get("VictimFaction", "")):
+                spot.thargoid_kills += 1
+                spot.thargoid_credits += reward
+            else:
+                spot.bonds += 1
+                spot.bond_credits += reward
+            self._kill(spot, ts, reward)
+        elif name == "ShipTargeted":
+            self._advance(ts)
+            if event.get("ScanStage", 0) >= 3 and event.get("LegalStatus") == "Wanted":
+                self._count(ts, "scans")
+        elif name == "HullDamage":
+            if event.get("Fighter"):
+                return
+            health = float(event.get("Health", 1.0))
+            damage = max(self.hull - health, 0.0)
+            self.hull = health
+            if damage:
+                self._advance(ts)
+                self._count(ts, "damage", damage)
+                spot.damage += damage
+                self._hostile(spot, ts, DAMAGE_WEIGHT * damage)
+        elif name == "Died":
+            self.hull = 1.0
+            self._count(ts, "deaths")
+            spot.deaths += 1
+            self._hostile(spot, ts, DEATH_WEIGHT)
+        elif name == "Interdicted":
+            self._count(ts, "interdictions")
+            spot.interdictions += 1
+            self._hostile(spot, ts, INTERDICTION_WEIGHT * (2 if event.get("IsPlayer") else 1))
+
+    def _hostile(self, spot: SystemCombat, ts: int, weight: float):
+        spot.add_danger(ts, weight)
+        spot.last_seen = max(spot.last_seen, ts)
+
+    def _kill(self, spot: SystemCombat, ts: int, reward: int):
+        spot.last_seen = max(spot.last_seen, ts)
+        self._advance(ts)
+        self._count(ts, "kills")
+        self._count(ts, "credits", reward)
+
+    def _count(self, ts: int, name: str, amount=1):
+        setattr(self.total, name, getattr(self.total, name) + amount)
+        self.window.add(ts, name, amount)
+
+    def _advance(self, ts: int):
+        gap = ts - self.last_combat
+        if 0 < gap <= MAX_GAP:
+            self._count(ts, "seconds", gap)
+        self.last_combat = max(self.last_combat, ts)
+
+    # -------------------------------------------------------------------------
+    # Results
+    # -------------------------------------------------------------------------
+
+    def recent(self) -> CombatTotals:
+        """Totals over the last WINDOW_SECONDS of play"""
+        return self.window.totals()
+
+    def _ranked(self, key, keep, limit: int | None) -> list[SystemCombat]:
+        ranked = sorted((spot for spot in self.systems.values() if keep(spot)), key=key)
+        return ranked[:limit] if limit is not None else ranked
+
+    def hunting_grounds(self, limit: int | None = 10) -> list[SystemCombat]:
+        """Systems by bounty credits earned there"""
+        return self._ranked(lambda s: (-s.bounty_credits, -s.kills), lambda s: s.kills, limit)
+
+    def combat_zones(self, limit: int | None = 10) -> list[SystemCombat]:
+        """Systems by conflict zone bond credits earned there"""
+        return self._ranked(lambda s: (-s.bond_credits, -s.bonds), lambda s: s.bonds, limit)
+
+    def thargoid_systems(self, limit: int | None = 10) -> list[SystemCombat]:
+        return self._ranked(lambda s: (-s.thargoid_kills, -s.last_seen), lambda s: s.thargoid_kills, limit)
+
+    def threats(self, limit: int | None = 10) -> list[tuple[SystemCombat, float]]:
+        """Systems by danger score as of the latest event, with that score"""
+        now = self.last_timestamp
+        ranked = [(spot, spot.danger_now(now)) for spot in self.systems.values() if spot.danger > 0]
+        ranked.sort(key=lambda item: -item[1])
+        return ranked[:limit] if limit is not None else ranked
+
+
+# =============================================================================
+# BULK LOADING
+# =============================================================================
+
+def _columns(store: EventStore, event_type: str, *columns: str) -> list[np.ndarray]:
+    parts = list(store.partitions(event_type))
+    if not parts:
+        return [np.empty(0, np.int64) for _ in columns]
+    return [np.concatenate([np.asarray(p.column(c)) for p in parts]) for c in columns]
+
+
+def _codes(store: EventStore, event_type: str, column: str, vocab: dict) -> np.ndarray:
+    """String column as codes into ``vocab`` (name -> code, extended in place)"""
+    codes = []
+    for part in store.partitions(event_type):
+        remap = np.array([vocab.setdefault(name, len(vocab)) for name in part.dictionary(column)] or [0],
+                         np.int64)
+        codes.append(remap[np.asarray(part.column(column), np.int64)])
+    return np.concatenate(codes) if codes else np.empty(0, np.int64)
+
+
+def _group_sum(codes: np.ndarray, size: int, weights=None) -> np.ndarray:
+    return np.bincount(codes, weights=weights, minlength=size)[:size]
+
+
+def load_combat(store: EventStore) -> CombatStats:
+    """CombatStats over every combat event in the store"""
+    stats = CombatStats()
+    systems = {UNKNOWN_SYSTEM: 0}
+
+    # System the commander arrived in at each jump, carrier jump or login, in time order
+    arrival_ts = np.concatenate([_columns(store, table, "timestamp")[0] for table in SYSTEM_EVENTS])
+    arrivals = np.concatenate([_codes(store, table, "StarSystem", systems) for table in SYSTEM_EVENTS])
+    order = np.argsort(arrival_ts, kind="stable")
+    arrival_ts, arrivals = arrival_ts[order], arrivals[order]
+
+    def system_at(ts: np.ndarray) -> np.ndarray:
+        if not len(arrival_ts):
+            return np.zeros(len(ts), np.int64)
+        position = np.searchsorted(arrival_ts, ts, side="right") - 1
+        return np.where(position >= 0, arrivals[np.maximum(position, 0)], systems[UNKNOWN_SYSTEM])
+
+    bounty_ts, bounty_reward = _columns(store, "Bounty", "timestamp", "TotalReward")
+    bond_ts, bond_reward = _columns(store, "FactionKillBond", "timestamp", "Reward")
+    factions = {}
+    victims = _codes(store, "FactionKillBond", "VictimFaction", factions)
+    thargoid = np.isin(victims, [code for name, code in factions.items() if is_thargoid(name)])
+    scan_ts, stage = _columns(store, "ShipTargeted", "timestamp", "ScanStage")
+    statuses = {}
+    legal = _codes(store, "ShipTargeted", "LegalStatus", statuses)
+    scanned = (stage >= 3) & (legal == statuses.get("Wanted", -1))
+    hull_ts, health, fighter = _columns(store, "HullDamage", "timestamp", "Health", "Fighter")
+    died_ts, = _columns(store, "Died", "timestamp")
+    interdicted_ts, by_player = _columns(store, "Interdicted", "timestamp", "IsPlayer")
+    repair_ts, = _columns(store, "RepairAll", "timestamp")
+
+    # Hull lost at each damage event: the drop from the previous reading,
+    # or from a full hull when a death or repair came in between
+    keep = fighter == 0
+    hull_ts, health = hull_ts[keep], health[keep].astype(np.float64)
+    order = np.argsort(hull_ts, kind="stable")
+    hull_ts, health = hull_ts[order], health[order]
+    resets = np.sort(np.concatenate((died_ts, repair_ts)))
+    reset_count = np.searchsorted(resets, hull_ts, side="right")
+    previous = np.concatenate(([1.0], health[:-1]))
+    previous[1:][reset_count[1:] > reset_count[:-1]] = 1.0
+    if len(hull_ts) and reset_count[0]:
+        previous[0] = 1.0
+    damage = np.maximum(previous - health, 0.0)
+    damaged = damage > 0
+    damage_ts, damage = hull_ts[damaged], damage[damaged]
+
+    names = list(systems)
+    n = len(names)
+    bounty_sys, bond_sys = system_at(bounty_ts), system_at(bond_ts)
+    damage_sys, died_sys, interdicted_sys = system_at(damage_ts), system_at(died_ts), system_at(interdicted_ts)
+
+    # Per-system rollups
+    visits = _group_sum(arrivals, n)
+    kills, bounty_credits = _group_sum(bounty_sys, n), _group_sum(bounty_sys, n, bounty_reward)
+    bonds, bond_credits = _group_sum(bond_sys[~thargoid], n), _group_sum(bond_sys[~thargoid], n, bond_reward[~thargoid])
+    tg_kills, tg_credits = _group_sum(bond_sys[thargoid], n), _group_sum(bond_sys[thargoid], n, bond_reward[thargoid])
+    lost = _group_sum(damage_sys, n, damage)
+    deaths, interdictions = _group_sum(died_sys, n), _group_sum(interdicted_sys, n)
+
+    # Danger: every hostile event decayed to the system's latest one
+    hostile_ts = np.concatenate((damage_ts, died_ts, interdicted_ts)).astype(np.int64)
+    hostile_sys = np.concatenate((damage_sys, died_sys, interdicted_sys))
+    weight = np.concatenate((DAMAGE_WEIGHT * damage, np.full(len(died_ts), DEATH_WEIGHT),
+                             INTERDICTION_WEIGHT * np.where(by_player != 0, 2.0, 1.0)))
+    danger_at = np.zeros(n, np.int64)
+    np.maximum.at(danger_at, hostile_sys, hostile_ts)
+    danger = _group_sum(hostile_sys, n, weight * _decay(danger_at[hostile_sys] - hostile_ts))
+    last_seen = np.zeros(n, np.int64)
+    for ts, sys_codes in ((bounty_ts, bounty_sys), (bond_ts, bond_sys), (hostile_ts, hostile_sys)):
+        np.maximum.at(last_seen, sys_codes, ts.astype(np.int64))
+
+    for code in np.flatnonzero(visits + kills + bonds + tg_kills + deaths + interdictions + (lost > 0)).tolist():
+        stats.systems[names[code]] = SystemCombat(
+            names[code], int(visits[code]), int(kills[code]), int(bounty_credits[code]),
+            int(bonds[code]), int(bond_credits[code]), int(tg_kills[code]), int(tg_credits[code]),
+            float(lost[code]), int(deaths[code]), int(interdictions[code]),
+            float(danger[code]), int(danger_at[code]), int(last_seen[code]),
+        )
+
+    # Time in combat: gaps between consecutive combat events, charged to the later one
+    combat_ts = np.sort(np.concatenate((bounty_ts, bond_ts, scan_ts, damage_ts)).astype(np.int64))
+    gaps = np.diff(combat_ts)
+    counted = (gaps > 0) & (gaps <= MAX_GAP)
+    stats.total = CombatTotals(
+        len(bounty_ts) + len(bond_ts), int(bounty_reward.sum() + bond_reward.sum()), float(damage.sum()),
+        len(died_ts), len(interdicted_ts), int(scanned.sum()), float(gaps[counted].sum()),
+    )
+
+    # The window only ever holds the last hour, so fill it event by event
+    everything = [arrival_ts, bounty_ts, bond_ts, scan_ts, hull_ts, died_ts, interdicted_ts, repair_ts]
+    stats.last_timestamp = int(max((ts.max() for ts in everything if len(ts)), default=0))
+    if len(combat_ts):
+        stats.last_combat = int(combat_ts[-1])
+    since = stats.last_timestamp - WINDOW_SECONDS
+    recent = [
+        (bounty_ts, "kills", None), (bounty_ts, "credits", bounty_reward),
+        (bond_ts, "kills", None), (bond_ts, "credits", bond_reward),
+        (damage_ts, "damage", damage), (died_ts, "deaths", None),
+        (interdicted_ts, "interdictions", None), (scan_ts[scanned], "scans", None),
+        (combat_ts[1:][counted], "seconds", gaps[counted]),
+    ]
+    stats.window.advance(stats.last_timestamp)
+    for ts, name, amounts in recent:
+        for i in np.flatnonzero(ts > since).tolist():
+            stats.window.add(int(ts[i]), name, 1 if amounts is None else amounts[i].item())
+
+    # Where things stand, so live events carry on from here
+    if len(arrivals):
+        stats.system = names[arrivals[-1]]
+    if len(hull_ts) and not (len(resets) and resets[-1] >= hull_ts[-1]):
+        stats.hull = float(health[-1])
+    return stats
@@ -0,0 +1,264 @@
+"""
+Headless EDxDC
+Runs the data compiler without the GUI, for servers and scheduled jobs
+against synced journal directories:
+
+    ingest     read new journal data into the event store
+    aggregate  recompute stale card queries into the cache the GUI reads
+    export     write event store tables as JSON lines, CSV or Parquet
+    daemon     ingest and aggregate whenever the journals change
+
+Nothing here imports Qt, and each command imports only the modules it
+uses, so a run starts in a fraction of a second. The GUI pointed at the
+same data directory starts from whatever a headless run compiled. Each
+command prints one JSON line describing what it did.
+
+Run with: python edxdc.py [--data-dir DIR] COMMAND [options]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+
+EXPORT_FORMATS = ("json", "csv", "parquet")
+EXPORT_SUFFIX = {"json": ".jsonl", "csv": ".csv", "parquet": ".parquet"}
+
+
+def _print(status: dict):
+    print(json.dumps(status), flush=True)
+
+
+# =============================================================================
+# COMMANDS
+# =============================================================================
+
+def _open_sink(args):
+    if not args.postgres:
+        return None
+    from postgres_sink import PostgresSink
+    return PostgresSink(args.postgres)
+
+
+def ingest(args, sink=None) -> dict:
+    from event_store import EventStore
+    from ingest import ingest_directory
+
+    store = EventStore()
+    result = ingest_directory(args.journal_dir, workers=args.workers, store=store, sink=sink)
+    return {
+        "command": "ingest", "files": result.files, "skipped_files": result.skipped_files,
+        "events": result.events, "duplicates": result.duplicates, "backfilled": result.backfilled,
+        "bad_lines": result.bad_lines,
+        "elapsed": round(result.elapsed, 3), "watermark": store.watermark(),
+    }
+
+
+def aggregate(args) -> dict:
+    """Recompute every card query whose cached value predates the store watermark"""
+    from event_store import EventStore
+    from queries import QUERIES, ResultCache
+
+    store = EventStore()
+    cache = ResultCache()
+    mark = store.watermark()
+    started = time.perf_counter()
+    updated = []
+    for name, query in QUERIES.items():
+        if mark["rows"] and (args.force or not cache.is_fresh(name, mark)):
+            cache.put(name, mark, query.compute(store))
+            updated.append(name)
+    if updated:
+        cache.save()
+    status = {
+        "command": "aggregate", "updated": updated, "elapsed": round(time.perf_counter() - started, 3),
+        "values": {name: QUERIES[name].format(value) for name in QUERIES
+                   if (value := cache.get(name)) is not None},
+    }
+    if args.train:
+        status["models"] = _train(store)
+    return status
+
+
+def _train(store) -> dict:
+    """Bring the feature store, models and forecasts up to date (needs NumPy)"""
+    try:
+        import models
+    except ImportError as exc:
+        return {"error": f"model training needs NumPy ({exc})"}
+    return models.train(store)
+
+
+def export(args) -> dict:
+    from event_store import SCHEMA, EventStore
+
+    store = EventStore()
+    tables = args.tables or [table for table in SCHEMA if store.months(table)]
+    unknown = sorted(set(tables) - set(SCHEMA))
+    if unknown:
+        raise SystemExit(f"unknown table(s): {', '.join(unknown)}; known: {', '.join(SCHEMA)}")
+    writer = {"json": _write_json, "csv": _write_csv, "parquet": _write_parquet}[args.format]
+    os.makedirs(args.out, exist_ok=True)
+    started = time.perf_counter()
+    written = {}
+    for table in tables:
+        path = os.path.join(args.out, table + EXPORT_SUFFIX[args.format])
+        parts = list(store.partitions(table, start=args.start, end=args.end))
+        written[table] = writer(path, parts)
+    return {"command": "export", "format": args.format, "out": os.path.abspath(args.out),
+            "rows": written, "elapsed": round(time.perf_counter() - started, 3)}
+
+
+def _rows(part):
+    """Decoded rows of a partition, column by column as plain lists"""
+    names = list(part.types)
+    columns = [part.strings(name) if part.types[name] == "str" else part.column(name).tolist()
+               for name in names]
+    return names, columns
+
+
+def _write_json(path: str, parts) -> int:
+    rows = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for part in parts:
+            names, columns = _rows(part)
+            for values in zip(*columns):
+                f.write(json.dumps(dict(zip(names, values)), ensure_ascii=False))
+                f.write("\n")
+            rows += part.rows
+    return rows
+
+
+def _write_csv(path: str, parts) -> int:
+    import csv
+
+    rows = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        for i, part in enumerate(parts):
+            names, columns = _rows(part)
+            if i == 0:
+                writer.writerow(names)
+            writer.writerows(zip(*columns))
+            rows += part.rows
+    return rows
+
+
+def _write_parquet(path: str, parts) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet export needs pyarrow: pip install pyarrow")
+
+    kinds = {"i64": pa.int64(), "f64": pa.float64(), "str": pa.string()}
+    writer = None
+    rows = 0
+    try:
+        for part in parts:
+            names, columns = _rows(part)
+            schema = pa.schema([(name, kinds[part.types[name]]) for name in names])
+            batch = pa.table(columns, schema=schema)
+            if writer is None:
+                writer = pq.ParquetWriter(path, schema)
+            # One row group per month keeps reads of a date range cheap
+            writer.write_table(batch)
+            rows += part.rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def daemon(args):
+    """Ingest and aggregate whenever the journals change, until interrupted"""
+    first = True
+    sink = _open_sink(args)
+    try:
+        while True:
+            # Unchanged journals cost one stat each (see manifest.py)
+            status = ingest(args, sink)
+            if status["events"] or status["backfilled"] or first:
+                status["aggregate"] = aggregate(args)
+            if status["files"] or first:
+                status["time"] = int(time.time())
+                _print(status)
+            first = args.force = False
+            if args.once:
+                return
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if sink is not None:
+            sink.close(timeout=10.0)
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="edxdc", description="Headless Elite Dangerous data compiler")
+    parser.add_argument("--data-dir", default=None,
+                        help="where the store, caches and models live (default: $EDXDC_DATA_DIR or ~/.edxdc)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def journal_options(command):
+        command.add_argument("journal_dir", nargs="?", default=None,
+                             help="journal directory (default: $EDXDC_JOURNAL_DIR or the game's)")
+        command.add_argument("-j", "--workers", type=int, default=None,
+                             help="worker processes (default: CPU count, 1 = in-process)")
+        command.add_argument("--postgres", metavar="DSN", default=None,
+                             help="also write new events to PostgreSQL")
+
+    def aggregate_options(command):
+        command.add_argument("--force", action="store_true", help="recompute queries even if fresh")
+        command.add_argument("--train", action="store_true",
+                             help="also update features, models and forecasts (needs NumPy)")
+
+    journal_options(commands.add_parser("ingest", help="read new journal data into the event store"))
+
+    aggregate_options(commands.add_parser("aggregate", help="recompute stale card queries"))
+
+    export_cmd = commands.add_parser("export", help="write event store tables to files")
+    export_cmd.add_argument("tables", nargs="*", help="tables to export (default: all with data)")
+    export_cmd.add_argument("-f", "--format", choices=EXPORT_FORMATS, default="json")
+    export_cmd.add_argument("-o", "--out", default=".", help="output directory")
+    export_cmd.add_argument("--start", metavar="YYYY-MM", default=None)
+    export_cmd.add_argument("--end", metavar="YYYY-MM", default=None)
+
+    daemon_cmd = commands.add_parser("daemon", help="keep the store and caches current")
+    journal_options(daemon_cmd)
+    aggregate_options(daemon_cmd)
+    daemon_cmd.add_argument("--interval", type=float, default=30.0, help="seconds between checks")
+    daemon_cmd.add_argument("--once", action="store_true", help="check once and exit")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.data_dir:
+        os.environ["EDXDC_DATA_DIR"] = args.data_dir
+    if getattr(args, "journal_dir", "") is None:
+        from journal import default_journal_dir
+        args.journal_dir = str(default_journal_dir())
+
+    if args.command == "daemon":
+        daemon(args)
+        return 0
+    if args.command == "ingest":
+        sink = _open_sink(args)
+        status = ingest(args, sink)
+        if sink is not None:
+            sink.close()
+    else:
+        status = {"aggregate": aggregate, "export": export}[args.command](args)
+    _print(status)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
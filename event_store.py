@@ -0,0 +1,606 @@
+"""
+Columnar on-disk event store
+Events are split into one partition per event type and calendar month,
+and each hot field is stored as its own flat, fixed-width column file:
+
+    <root>/<EventType>/<YYYY-MM>/<column>.col        raw little-endian array
+    <root>/<EventType>/<YYYY-MM>/<column>.dict.json  strings for "str" columns
+    <root>/WATERMARK                                 rows appended so far
+
+String columns are dictionary encoded (int32 codes into a per-partition
+string table). Reads memory-map the column files and hand back
+memoryviews, so a panel aggregate touches only the columns it asks for and
+never deserializes JSON.
+"""
+
+import array
+import json
+import logging
+import mmap
+import os
+import sys
+import threading
+import weakref
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+
+log = logging.getLogger(__name__)
+
+# Column type -> array typecode
+TYPECODES = {
+    "i64": "q",
+    "f64": "d",
+    "str": "i",  # dictionary code
+}
+
+# Hot fields per event type: (column, type, source field)
+# A "rows" entry explodes a list field into one row per element; an "event"
+# entry names the journal event a second table is read from.
+SCHEMA = {
+    "FSDJump": {
+        "columns": [
+            ("SystemAddress", "i64", "SystemAddress"),
+            ("StarSystem", "str", "StarSystem"),
+            ("StarPosX", "f64", ("StarPos", 0)),
+            ("StarPosY", "f64", ("StarPos", 1)),
+            ("StarPosZ", "f64", ("StarPos", 2)),
+            ("JumpDist", "f64", "JumpDist"),
+            ("FuelUsed", "f64", "FuelUsed"),
+        ],
+    },
+    "Location": {
+        "columns": [
+            ("SystemAddress", "i64", "SystemAddress"),
+            ("StarSystem", "str", "StarSystem"),
+            ("StarPosX", "f64", ("StarPos", 0)),
+            ("StarPosY", "f64", ("StarPos", 1)),
+            ("StarPosZ", "f64", ("StarPos", 2)),
+        ],
+    },
+    # Arriving aboard a fleet carrier moves the commander like a jump
+    "CarrierJump": {
+        "columns": [
+            ("SystemAddress", "i64", "SystemAddress"),
+            ("StarSystem", "str", "StarSystem"),
+            ("StarPosX", "f64", ("StarPos", 0)),
+            ("StarPosY", "f64", ("StarPos", 1)),
+            ("StarPosZ", "f64", ("StarPos", 2)),
+        ],
+    },
+    "Docked": {
+        "columns": [
+            ("MarketID", "i64", "MarketID"),
+            ("StationName", "str", "StationName"),
+            ("StarSystem", "str", "StarSystem"),
+            ("SystemAddress", "i64", "SystemAddress"),
+            ("PadsSmall", "i64", ("LandingPads", "Small")),
+            ("PadsMedium", "i64", ("LandingPads", "Medium")),
+            ("PadsLarge", "i64", ("LandingPads", "Large")),
+            ("DistFromStarLS", "f64", "DistFromStarLS"),
+        ],
+    },
+    "ProspectedAsteroid": {
+        "columns": [
+            ("Content", "str", "Content"),
+            ("Remaining", "f64", "Remaining"),
+            ("MotherlodeMaterial", "str", "MotherlodeMaterial"),
+        ],
+    },
+    "ProspectedMaterial": {
+        "event": "ProspectedAsteroid",
+        "rows": "Materials",
+        "columns": [
+            ("Name", "str", ("item", "Name")),
+            ("Proportion", "f64", ("item", "Proportion")),
+        ],
+    },
+    "SupercruiseExit": {
+        "columns": [
+            ("StarSystem", "str", "StarSystem"),
+            ("Body", "str", "Body"),
+            ("BodyType", "str", "BodyType"),
+        ],
+    },
+    "MiningRefined": {
+        "columns": [
+            ("Type", "str", "Type"),
+        ],
+    },
+    "MarketBuy": {
+        "columns": [
+            ("MarketID", "i64", "MarketID"),
+            ("Type", "str", "Type"),
+            ("Count", "i64", "Count"),
+            ("BuyPrice", "i64", "BuyPrice"),
+            ("TotalCost", "i64", "TotalCost"),
+        ],
+    },
+    "MarketSell": {
+        "columns": [
+            ("MarketID", "i64", "MarketID"),
+            ("Type", "str", "Type"),
+            ("Count", "i64", "Count"),
+            ("SellPrice", "i64", "SellPrice"),
+            ("TotalSale", "i64", "TotalSale"),
+            ("AvgPricePaid", "i64", "AvgPricePaid"),
+        ],
+    },
+    "Bounty": {
+        "columns": [
+            ("TotalReward", "i64", "TotalReward"),
+            ("Target", "str", "Target"),
+            ("VictimFaction", "str", "VictimFaction"),
+        ],
+    },
+    "FactionKillBond": {
+        "columns": [
+            ("Reward", "i64", "Reward"),
+            ("AwardingFaction", "str", "AwardingFaction"),
+            ("VictimFaction", "str", "VictimFaction"),
+        ],
+    },
+    "ShipTargeted": {
+        "columns": [
+            ("TargetLocked", "i64", "TargetLocked"),
+            ("ScanStage", "i64", "ScanStage"),
+            ("Ship", "str", "Ship"),
+            ("LegalStatus", "str", "LegalStatus"),
+        ],
+    },
+    "HullDamage": {
+        "columns": [
+            ("Health", "f64", "Health"),
+            ("PlayerPilot", "i64", "PlayerPilot"),
+            ("Fighter", "i64", "Fighter"),
+        ],
+    },
+    "Died": {
+        "columns": [
+            ("KillerName", "str", "KillerName"),
+            ("KillerShip", "str", "KillerShip"),
+        ],
+    },
+    "Interdicted": {
+        "columns": [
+            ("Submitted", "i64", "Submitted"),
+            ("IsPlayer", "i64", "IsPlayer"),
+            ("Interdictor", "str", "Interdictor"),
+        ],
+    },
+    "RepairAll": {
+        "columns": [
+            ("Cost", "i64", "Cost"),
+        ],
+    },
+    "Statistics": {
+        "columns": [
+            ("Wealth", "i64", ("Bank_Account", "Current_Wealth")),
+            ("TimePlayed", "i64", ("Exploration", "Time_Played")),
+        ],
+    },
+    "Rank": {
+        "columns": [
+            ("Trade", "i64", "Trade"),
+        ],
+    },
+    "Progress": {
+        "columns": [
+            ("Trade", "i64", "Trade"),
+        ],
+    },
+    "ColonisationContribution": {
+        "rows": "Contributions",
+        "columns": [
+            ("MarketID", "i64", "MarketID"),
+            ("Commodity", "str", ("item", "Name")),
+            ("Amount", "i64", ("item", "Amount")),
+        ],
+    },
+    "ColonisationConstructionDepot": {
+        "rows": "ResourcesRequired",
+        "columns": [
+            ("MarketID", "i64", "MarketID"),
+            ("Progress", "f64", "ConstructionProgress"),
+            ("Complete", "i64", "ConstructionComplete"),
+            ("Failed", "i64", "ConstructionFailed"),
+            ("Commodity", "str", ("item", "Name")),
+            ("Label", "str", ("item", "Name_Localised")),
+            ("Required", "i64", ("item", "RequiredAmount")),
+            ("Provided", "i64", ("item", "ProvidedAmount")),
+            ("Payment", "i64", ("item", "Payment")),
+        ],
+    },
+    "CargoTransfer": {
+        "rows": "Transfers",
+        "columns": [
+            ("Commodity", "str", ("item", "Type")),
+            ("Count", "i64", ("item", "Count")),
+            ("Direction", "str", ("item", "Direction")),
+        ],
+    },
+}
+
+# Journal events some table is filled from
+STORED_EVENTS = frozenset(spec.get("event", table) for table, spec in SCHEMA.items())
+
+TIMESTAMP_COLUMN = ("timestamp", "i64")
+
+
+def _tables_by_event() -> dict[str, list[tuple[str, dict]]]:
+    tables = defaultdict(list)
+    for table, spec in SCHEMA.items():
+        tables[spec.get("event", table)].append((table, spec))
+    return dict(tables)
+
+
+# Journal event -> the tables filled from it
+TABLES = _tables_by_event()
+
+
+def parse_timestamp(value: str) -> int:
+    """Journal ISO-8601 UTC timestamp to epoch seconds"""
+    try:
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+    except (AttributeError, ValueError):
+        return 0
+
+
+def _extract(event: dict, item, source):
+    if isinstance(source, tuple):
+        key, sub = source
+        if key == "item":
+            return item.get(sub) if isinstance(item, dict) else None
+        value = event.get(key)
+        try:
+            return value[sub]
+        except (TypeError, IndexError, KeyError):
+            return None
+    return event.get(source)
+
+
+def _coerce(value, ctype):
+    if ctype == "str":
+        return value if isinstance(value, str) else ""
+    if value is None:
+        return 0
+    try:
+        return int(value) if ctype == "i64" else float(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class ColumnCollector:
+    """Accumulates events into per-partition Python column lists.
+
+    Cheap to pickle, so ingestion workers build these and the parent process
+    appends them to the store.
+    """
+
+    def __init__(self, tables=None):
+        self.partitions = defaultdict(lambda: defaultdict(list))
+        self.tables = tables  # only fill these tables; None for all of them
+        self._last_timestamp = (None, 0)
+
+    def add(self, event: dict):
+        tables = TABLES.get(event.get("event"))
+        if tables is None:
+            return
+        timestamp = event.get("timestamp", "")
+        month = timestamp[:7] or "unknown"
+        # Bursts of events share a timestamp; skip re-parsing those
+        if self._last_timestamp[0] == timestamp:
+            ts = self._last_timestamp[1]
+        else:
+            ts = parse_timestamp(timestamp)
+            self._last_timestamp = (timestamp, ts)
+        for table, spec in tables:
+            if self.tables is not None and table not in self.tables:
+                continue
+            columns = self.partitions[(table, month)]
+            if "rows" in spec:
+                items = event.get(spec["rows"]) or []
+            else:
+                items = (None,)
+            for item in items:
+                columns["timestamp"].append(ts)
+                for column, ctype, source in spec["columns"]:
+                    columns[column].append(_coerce(_extract(event, item, source), ctype))
+
+    def take(self) -> dict:
+        """Return the collected partitions as plain dicts and reset"""
+        partitions = {key: dict(cols) for key, cols in self.partitions.items()}
+        self.partitions.clear()
+        return partitions
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+def default_data_dir() -> Path:
+    """Root for everything EDxDC persists (store, caches, snapshots)"""
+    override = os.environ.get("EDXDC_DATA_DIR")
+    return Path(override) if override else Path.home() / ".edxdc"
+
+
+def default_store_dir() -> Path:
+    return default_data_dir() / "store"
+
+
+def column_types(event_type: str) -> dict[str, str]:
+    spec = SCHEMA[event_type]
+    types = {TIMESTAMP_COLUMN[0]: TIMESTAMP_COLUMN[1]}
+    types.update({column: ctype for column, ctype, _ in spec["columns"]})
+    return types
+
+
+class Partition:
+    """Read-only, memory-mapped view of one (event type, month) partition.
+
+    Column files stay mapped until close(), or until the partition is used
+    as a context manager and the block ends; a closed partition maps them
+    again on the next column() call.
+    """
+
+    def __init__(self, path: Path, event_type: str, month: str):
+        self.path = path
+        self.event_type = event_type
+        self.month = month
+        self.types = column_types(event_type)
+        self._maps = {}
+        self._mmaps = []
+        self._dicts = {}
+        self.rows = self._count_rows()
+
+    def __len__(self):
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> bool:
+        """Unmap the column files; False if a column view is still in use"""
+        for view in self._maps.values():
+            view.release()
+        self._maps.clear()
+        still_mapped = []
+        for mapped in self._mmaps:
+            try:
+                mapped.close()
+            except BufferError:
+                still_mapped.append(mapped)
+        self._mmaps = still_mapped
+        return not still_mapped
+
+    def _count_rows(self) -> int:
+        return _committed_rows(self.path, self.types)
+
+    def column(self, name: str) -> memoryview:
+        """Zero-copy typed view of a column"""
+        ctype = self.types[name]
+        typecode = TYPECODES[ctype]
+        view = self._maps.get(name)
+        if view is None:
+            view = self._map_column(name, typecode)
+            self._maps[name] = view
+        return view[:self.rows]
+
+    def dictionary(self, name: str) -> list[str]:
+        """String table for a dictionary encoded column"""
+        table = self._dicts.get(name)
+        if table is None:
+            table = _load_dictionary(self.path / f"{name}.dict.json")
+            self._dicts[name] = table
+        return table
+
+    def strings(self, name: str) -> list[str]:
+        """Decoded values of a string column (materialises a list)"""
+        table = self.dictionary(name)
+        return [table[code] for code in self.column(name)]
+
+    def _map_column(self, name: str, typecode: str) -> memoryview:
+        path = self.path / f"{name}.col"
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        if size == 0:
+            return memoryview(array.array(typecode))
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mmaps.append(mapped)
+        view = memoryview(mapped)
+        itemsize = array.array(typecode).itemsize
+        view = view[:len(view) - len(view) % itemsize].cast(typecode)
+        if sys.byteorder != "little":
+            # Column files are little-endian; fall back to a swapped copy
+            swapped = array.array(typecode, view)
+            swapped.byteswap()
+            view = memoryview(swapped)
+        return view
+
+
+def _committed_rows(path: Path, types: dict) -> int:
+    # Columns are appended together; the shortest one is authoritative
+    # should a write have been interrupted.
+    counts = []
+    for column, ctype in types.items():
+        itemsize = array.array(TYPECODES[ctype]).itemsize
+        try:
+            counts.append((path / f"{column}.col").stat().st_size // itemsize)
+        except OSError:
+            counts.append(0)
+    return min(counts) if counts else 0
+
+
+def _load_dictionary(path: Path) -> list[str]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+class EventStore:
+    """Append-only columnar store rooted at a directory"""
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root else default_store_dir()
+        self._tables = {}  # dict path -> (string table, reverse index)
+        # Partitions handed out, unmapped before their files are truncated
+        self._open = weakref.WeakSet()
+        self._open_lock = threading.Lock()
+
+    def close(self):
+        """Unmap every partition this store has handed out"""
+        for partition in self._open_partitions():
+            partition.close()
+
+    def _open_partitions(self, path: Path | None = None) -> list[Partition]:
+        with self._open_lock:
+            return [p for p in self._open if path is None or p.path == path]
+
+    def append(self, events):
+        collector = ColumnCollector()
+        for event in events:
+            collector.add(event)
+        self.append_columns(collector.take())
+
+    def append_columns(self, partitions: dict):
+        """Append ColumnCollector output, keyed by (event type, month)"""
+        rows = last = 0
+        for (event_type, month), columns in sorted(partitions.items()):
+            self._append_partition(event_type, month, columns)
+            timestamps = columns.get(TIMESTAMP_COLUMN[0], ())
+            rows += len(timestamps)
+            last = max(last, max(timestamps, default=0))
+        if rows:
+            self._bump_watermark(rows, last)
+
+    def watermark(self) -> dict:
+        """Total rows appended and the newest event time (epoch seconds).
+
+        Changes whenever data is added, so derived results can be cached
+        against it.
+        """
+        try:
+            with open(self.root / "WATERMARK", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"rows": 0, "last_timestamp": 0}
+
+    def _bump_watermark(self, rows: int, last_timestamp: int):
+        mark = self.watermark()
+        mark["rows"] += rows
+        mark["last_timestamp"] = max(mark["last_timestamp"], last_timestamp)
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / "WATERMARK.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(mark, f)
+        os.replace(tmp, self.root / "WATERMARK")
+
+    def _append_partition(self, event_type, month, columns):
+        path = self.root / event_type / month
+        path.mkdir(parents=True, exist_ok=True)
+        types = column_types(event_type)
+        self._align_columns(path, types)
+        for column, ctype in types.items():
+            values = columns.get(column, [])
+            if ctype == "str":
+                values = self._encode_strings(path / f"{column}.dict.json", values)
+            data = array.array(TYPECODES[ctype], values)
+            if sys.byteorder != "little":
+                data.byteswap()
+            with open(path / f"{column}.col", "ab") as f:
+                data.tofile(f)
+
+    def _align_columns(self, path: Path, types: dict):
+        """Drop the tail of an interrupted append so all columns line up"""
+        rows = _committed_rows(path, types)
+        for column, ctype in types.items():
+            col = path / f"{column}.col"
+            size = rows * array.array(TYPECODES[ctype]).itemsize
+            try:
+                if col.stat().st_size <= size:
+                    continue
+            except OSError:
+                continue
+            # Windows will not shrink a file that is still mapped
+            for partition in self._open_partitions(path):
+                partition.close()
+            try:
+                os.truncate(col, size)
+            except OSError as exc:
+                log.warning("Could not drop the torn tail of %s: %s", col, exc)
+
+    def _encode_strings(self, dict_path: Path, values) -> list[int]:
+        cached = self._tables.get(dict_path)
+        if cached is None:
+            table = _load_dictionary(dict_path)
+            cached = self._tables[dict_path] = (table, {v: c for c, v in enumerate(table)})
+        table, index = cached
+        known = len(table)
+        codes = []
+        for value in values:
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(table)
+                table.append(value)
+            codes.append(code)
+        if len(table) != known:
+            tmp = dict_path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(table, f, ensure_ascii=False)
+            os.replace(tmp, dict_path)
+        return codes
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    def months(self, event_type: str) -> list[str]:
+        base = self.root / event_type
+        if not base.is_dir():
+            return []
+        return sorted(p.name for p in base.iterdir() if p.is_dir())
+
+    def partitions(self, event_type: str, start: str | None = None, end: str | None = None):
+        """Partitions of an event type, optionally limited to a YYYY-MM range"""
+        for month in self.months(event_type):
+            if start and month < start:
+                continue
+            if end and month > end:
+                continue
+            partition = Partition(self.root / event_type / month, event_type, month)
+            with self._open_lock:
+                self._open.add(partition)
+            yield partition
+
+    def count(self, event_type: str, **window) -> int:
+        return sum(p.rows for p in self.partitions(event_type, **window))
+
+    def sum(self, event_type: str, column: str, **window):
+        return sum(sum(p.column(column)) for p in self.partitions(event_type, **window))
+
+    def max(self, event_type: str, column: str, default=0, **window):
+        best = default
+        for p in self.partitions(event_type, **window):
+            col = p.column(column)
+            if len(col):
+                best = max(best, max(col))
+        return best
+
+    def distinct(self, event_type: str, column: str, **window) -> set:
+        values = set()
+        for p in self.partitions(event_type, **window):
+            if p.types[column] == "str":
+                table = p.dictionary(column)
+                values.update(table[code] for code in set(p.column(column)))
+            else:
+                values.update(p.column(column))
+        return values
@@ -0,0 +1,233 @@
+"""
+Materialised feature tables for the prediction models
+Per-day and per-session feature vectors are computed from the event store
+once and kept as fixed-width float64 tables:
+
+    <root>/daily.f64      one row per UTC day with activity
+    <root>/sessions.f64   one row per play session (events < SESSION_GAP apart)
+    <root>/FEATURES.json  store watermark the tables were last brought up to
+
+Only the last row of a table can still change, since a day or session may
+have been in progress at the last update. An update drops that row,
+reads only the events from its start onwards (whole months outside that
+window are never opened) and appends the recomputed rows, so the cost
+follows the new data rather than the history.
+
+Requires NumPy; run from the model trainer, never on the GUI thread.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from event_store import SCHEMA, EventStore, default_data_dir
+
+
+DAY = 86_400
+SESSION_GAP = 1_800  # seconds without events that end a play session
+
+DAILY_COLUMNS = (
+    "day", "events", "active_hours", "jumps", "distance",
+    "trade_profit", "mining_tons", "combat_rewards", "income", "wealth",
+)
+SESSION_COLUMNS = (
+    "start", "end", "hours", "events", "jumps",
+    "trade_profit", "mining_tons", "combat_rewards", "income", "start_hour", "weekday",
+)
+
+
+def default_feature_dir() -> Path:
+    return default_data_dir() / "features"
+
+
+class FeatureTable:
+    """Append-only float64 table whose first column is the row's period start"""
+
+    def __init__(self, path: Path, columns: tuple[str, ...]):
+        self.path = path
+        self.columns = columns
+        self.width = len(columns)
+
+    def rows(self) -> np.ndarray:
+        try:
+            data = np.fromfile(self.path, dtype="<f8")
+        except (OSError, ValueError):
+            data = np.empty(0)
+        return data[:len(data) // self.width * self.width].reshape(-1, self.width)
+
+    def __len__(self):
+        try:
+            return self.path.stat().st_size // (8 * self.width)
+        except OSError:
+            return 0
+
+    def last_key(self) -> float | None:
+        rows = len(self)
+        if not rows:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek((rows - 1) * self.width * 8)
+            return float(np.frombuffer(f.read(8), dtype="<f8")[0])
+
+    def replace_tail(self, keep: int, rows: np.ndarray):
+        """Keep the first ``keep`` rows and append ``rows`` after them"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.truncate(keep * self.width * 8)
+            f.write(np.ascontiguousarray(rows, dtype="<f8").tobytes())
+
+    def column(self, rows: np.ndarray, name: str) -> np.ndarray:
+        return rows[:, self.columns.index(name)]
+
+
+# =============================================================================
+# EVENT LOADING
+# =============================================================================
+
+def _month(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m")
+
+
+def _load(store: EventStore, event_type: str, since: float, *columns: str) -> list[np.ndarray]:
+    """Columns of every event at or after ``since``, reading only the months that can hold them"""
+    parts = list(store.partitions(event_type, start=_month(since) if since else None))
+    if not parts:
+        return [np.empty(0) for _ in ("timestamp", *columns)]
+    data = [np.concatenate([np.asarray(p.column(c), dtype=np.float64) for p in parts])
+            for c in ("timestamp", *columns)]
+    keep = (data[0] >= since) & (data[0] > 0)
+    return [column[keep] for column in data]
+
+
+class Activity:
+    """Timestamped contributions to each feature since a point in time"""
+
+    def __init__(self, store: EventStore, since: float):
+        # Every stored event marks activity; tables read from another event would double count
+        stamps = [_load(store, table, since)[0] for table, spec in SCHEMA.items() if "event" not in spec]
+        self.events = np.sort(np.concatenate(stamps)) if stamps else np.empty(0)
+
+        self.jumps, self.distance = _load(store, "FSDJump", since, "JumpDist")
+        ts, sale, paid, count = _load(store, "MarketSell", since, "TotalSale", "AvgPricePaid", "Count")
+        self.trades, self.profit = ts, sale - paid * count
+        self.refines, = _load(store, "MiningRefined", since)
+        bounty_ts, bounty = _load(store, "Bounty", since, "TotalReward")
+        bond_ts, bond = _load(store, "FactionKillBond", since, "Reward")
+        self.combat, self.rewards = np.concatenate((bounty_ts, bond_ts)), np.concatenate((bounty, bond))
+        wealth_ts, wealth = _load(store, "Statistics", since, "Wealth")
+        order = np.argsort(wealth_ts, kind="stable")
+        self.wealth_ts, self.wealth = wealth_ts[order], wealth[order]
+
+    def totals(self, groups, edges: np.ndarray):
+        """Per-group sums of each contribution; ``groups(ts)`` maps times to row numbers"""
+        size = len(edges)
+
+        def total(ts, weights=None):
+            return np.bincount(groups(ts), weights=weights, minlength=size)[:size].astype(np.float64)
+
+        profit = total(self.trades, self.profit)
+        rewards = total(self.combat, self.rewards)
+        return {
+            "events": total(self.events),
+            "jumps": total(self.jumps),
+            "distance": total(self.jumps, self.distance),
+            "trade_profit": profit,
+            "mining_tons": total(self.refines),
+            "combat_rewards": rewards,
+            "income": profit + rewards,
+        }
+
+
+# =============================================================================
+# FEATURE STORE
+# =============================================================================
+
+class FeatureStore:
+    """Daily and per-session feature tables kept current with the event store"""
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root else default_feature_dir()
+        self.daily = FeatureTable(self.root / "daily.f64", DAILY_COLUMNS)
+        self.sessions = FeatureTable(self.root / "sessions.f64", SESSION_COLUMNS)
+
+    def watermark(self) -> list | None:
+        try:
+            with open(self.root / "FEATURES.json", encoding="utf-8") as f:
+                return json.load(f).get("watermark")
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _save_watermark(self, key: list):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / "FEATURES.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"watermark": key}, f)
+        os.replace(tmp, self.root / "FEATURES.json")
+
+    def update(self, store: EventStore, key: list) -> bool:
+        """Bring both tables up to the store watermark ``key``; False if already there"""
+        if self.watermark() == key:
+            return False
+        self._update_daily(store)
+        self._update_sessions(store)
+        self._save_watermark(key)
+        return True
+
+    def rebuild(self, store: EventStore, key: list):
+        for table in (self.daily, self.sessions):
+            table.replace_tail(0, np.empty((0, table.width)))
+        self._update_daily(store)
+        self._update_sessions(store)
+        self._save_watermark(key)
+
+    def _update_daily(self, store: EventStore):
+        last = self.daily.last_key()
+        since = last if last is not None else 0.0
+        activity = Activity(store, since)
+        days = np.unique(activity.events // DAY * DAY)
+        rows = np.full((len(days), self.daily.width), np.nan)
+        if len(days):
+            groups = lambda ts: np.searchsorted(days, ts // DAY * DAY)
+            columns = activity.totals(groups, days)
+            columns["day"] = days
+            hours = np.unique(activity.events // 3600)
+            columns["active_hours"] = np.bincount(
+                np.searchsorted(days, hours * 3600 // DAY * DAY), minlength=len(days)).astype(np.float64)
+            # Wealth at the last Statistics snapshot of each day
+            wealth = np.full(len(days), np.nan)
+            if len(activity.wealth_ts):
+                day_of = groups(activity.wealth_ts)
+                last_of_day = np.flatnonzero(np.append(day_of[1:] != day_of[:-1], True))
+                wealth[day_of[last_of_day]] = activity.wealth[last_of_day]
+            columns["wealth"] = wealth
+            for i, name in enumerate(DAILY_COLUMNS):
+                rows[:, i] = columns[name]
+        self.daily.replace_tail(len(self.daily) - (last is not None), rows)
+
+    def _update_sessions(self, store: EventStore):
+        last = self.sessions.last_key()
+        since = last if last is not None else 0.0
+        activity = Activity(store, since)
+        stamps = activity.events
+        if len(stamps):
+            breaks = np.flatnonzero(np.diff(stamps) > SESSION_GAP) + 1
+            starts = stamps[np.concatenate(([0], breaks))]
+            ends = stamps[np.concatenate((breaks - 1, [len(stamps) - 1]))]
+        else:
+            starts = ends = np.empty(0)
+        rows = np.full((len(starts), self.sessions.width), np.nan)
+        if len(starts):
+            groups = lambda ts: np.clip(np.searchsorted(starts, ts, side="right") - 1, 0, None)
+            columns = activity.totals(groups, starts)
+            start_times = [datetime.fromtimestamp(ts, timezone.utc) for ts in starts.tolist()]
+            columns.update(
+                start=starts, end=ends, hours=(ends - starts) / 3600,
+                start_hour=np.array([t.hour for t in start_times], np.float64),
+                weekday=np.array([t.weekday() for t in start_times], np.float64),
+            )
+            for i, name in enumerate(SESSION_COLUMNS):
+                rows[:, i] = columns[name]
+        self.sessions.replace_tail(len(self.sessions) - (last is not None), rows)
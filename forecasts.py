@@ -0,0 +1,136 @@
+"""
+Forecast result cache
+Forecasts are keyed by model name, parameters and the timestamp of the
+newest ingested event they were fitted on, and stored one JSON file each
+under <data dir>/cache/forecasts with a small index:
+
+    <root>/<key>.json    one Forecast
+    <root>/index.json    key -> model, params, through, size, last used
+
+The GUI shows the newest cached forecast for a model straight away on
+startup; the trainer (models.py) only fits a new one when no entry exists
+for the current watermark. Total size on disk is bounded by evicting the
+least recently used entries. Only the trainer writes here.
+
+No Qt or NumPy imports here.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from event_store import default_data_dir
+
+
+MAX_CACHE_BYTES = 4 * 1024 * 1024
+
+# Forecasts the prediction panel shows, with the parameters they are fitted with
+FORECASTS = {
+    "wealth": {"horizon_days": 30, "z": 1.96, "history_days": 60},
+    "elite_trade": {"window_days": 90, "z": 1.96},
+}
+
+
+@dataclass
+class Forecast:
+    model: str
+    params: dict
+    through: int                 # newest event timestamp the forecast saw
+    computed_at: int = 0
+    points: list = field(default_factory=list)   # [time, mean, lower, upper]
+    history: list = field(default_factory=list)  # [time, value] leading up to the forecast
+    summary: dict = field(default_factory=dict)
+
+
+def forecast_key(model: str, params: dict, through: int) -> str:
+    raw = json.dumps([model, params, through], sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def _write_json(path: Path, value):
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(value, f)
+    os.replace(tmp, path)
+
+
+class ForecastCache:
+    """Forecasts on disk, least recently used evicted past ``max_bytes``"""
+
+    def __init__(self, root=None, max_bytes: int = MAX_CACHE_BYTES):
+        self.root = Path(root) if root else default_data_dir() / "cache" / "forecasts"
+        self.max_bytes = max_bytes
+        self.index = self._load_index()
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self.root / "index.json", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return index if isinstance(index, dict) else {}
+
+    def _read(self, key: str) -> Forecast | None:
+        try:
+            with open(self.root / f"{key}.json", encoding="utf-8") as f:
+                return Forecast(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            self.index.pop(key, None)
+            return None
+
+    def _touch(self, key: str):
+        self.index[key]["used"] = time.time()
+
+    def get(self, model: str, params: dict, through: int) -> Forecast | None:
+        """The forecast fitted on exactly this data, if cached"""
+        key = forecast_key(model, params, through)
+        if key not in self.index:
+            return None
+        forecast = self._read(key)
+        if forecast is not None:
+            self._touch(key)
+        return forecast
+
+    def latest(self, model: str, params: dict) -> Forecast | None:
+        """The most recent forecast for the model and parameters, however stale"""
+        matches = [(entry["through"], key) for key, entry in self.index.items()
+                   if entry["model"] == model and entry["params"] == params]
+        for _, key in sorted(matches, reverse=True):
+            forecast = self._read(key)
+            if forecast is not None:
+                self._touch(key)
+                return forecast
+        return None
+
+    def put(self, forecast: Forecast):
+        self.root.mkdir(parents=True, exist_ok=True)
+        key = forecast_key(forecast.model, forecast.params, forecast.through)
+        forecast.computed_at = forecast.computed_at or int(time.time())
+        path = self.root / f"{key}.json"
+        _write_json(path, asdict(forecast))
+        self.index[key] = {
+            "model": forecast.model, "params": forecast.params, "through": forecast.through,
+            "size": path.stat().st_size, "used": time.time(),
+        }
+        self._evict(keep=key)
+        _write_json(self.root / "index.json", self.index)
+
+    def _evict(self, keep: str):
+        total = sum(entry["size"] for entry in self.index.values())
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]["used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                (self.root / f"{key}.json").unlink()
+            except OSError:
+                pass
+            total -= entry["size"]
+            del self.index[key]
+
+    def size(self) -> int:
+        return sum(entry["size"] for entry in self.index.values())
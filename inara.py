@@ -0,0 +1,481 @@
+"""
+INARA API client
+Journal events worth sharing are translated to INARA API events and kept
+in an outbox. A single asyncio task sends everything pending, uploads and
+the lookups the GUI asks for alike, as one batched request:
+
+    POST <url>  {"header": {...}, "events": [event, ...]}
+
+Requests are paced by a token bucket, lookup results are cached with a
+per-event TTL, and while INARA cannot be reached the outbox stays on disk
+and is retried with backoff, so uploads survive outages and restarts:
+
+    <root>/outbox.json   uploads not yet accepted, plus the newest journal
+                         timestamp ever queued and the dedup keys of the
+                         events queued in that second, so replays are not
+                         resent
+    <root>/cache.json    lookup results with the time they expire
+
+The event loop runs on its own thread; callers get concurrent futures
+and never wait on the network. The API key comes from
+$EDXDC_INARA_API_KEY, and $EDXDC_INARA_URL points the client at another
+endpoint such as a local mock server.
+
+No Qt imports here.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from pathlib import Path
+
+from event_store import default_data_dir
+from journal import latest_journal, parse_line
+from manifest import event_key
+
+
+INARA_URL = "https://inara.cz/inapi/v1/"
+APP_NAME = "EDxDC"
+APP_VERSION = "1.0"
+
+REQUEST_INTERVAL = 30.0  # seconds per request on average; INARA asks clients to batch, not poll
+REQUEST_BURST = 2
+LOOKUP_DELAY = 0.25      # lookups go out almost at once, picking up anything else pending
+UPLOAD_DELAY = 20.0      # uploads wait this long for company before a request is spent on them
+MAX_BATCH = 100          # events per request
+MAX_OUTBOX = 5_000       # oldest uploads are dropped past this while offline
+RETRY_DELAY = 30.0
+MAX_RETRY_DELAY = 900.0
+RATE_LIMIT_PAUSE = 120.0
+
+# Seconds a lookup result is served from the cache
+LOOKUP_TTL = {
+    "getCommanderProfile": 3_600,
+    "getCommunityGoalsRecent": 900,
+}
+DEFAULT_TTL = 600
+
+# INARA event status codes
+OK, WARNING, NO_DATA, ERROR, TOO_MANY_REQUESTS = 200, 202, 204, 400, 429
+
+RANKS = ("Combat", "Trade", "Explore", "Soldier", "Exobiologist", "CQC", "Federation", "Empire")
+
+
+class InaraError(Exception):
+    """INARA refused a request or an event"""
+
+
+class OfflineError(InaraError):
+    """INARA could not be reached"""
+
+
+def default_inara_dir() -> Path:
+    return default_data_dir() / "inara"
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _write_json(path: Path, value):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(value, f)
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path, default):
+    try:
+        with open(path, encoding="utf-8") as f:
+            value = json.load(f)
+    except (OSError, ValueError):
+        return default
+    return value if isinstance(value, type(default)) else default
+
+
+# =============================================================================
+# JOURNAL TRANSLATION
+# =============================================================================
+
+class JournalTranslator:
+    """Turns journal events into INARA upload events"""
+
+    def __init__(self):
+        self.commander = None
+        self.frontier_id = None
+        self.ranks = {}
+
+    def translate(self, event: dict) -> list[dict]:
+        name = event.get("event")
+        if name in ("Commander", "LoadGame"):
+            self.commander = event.get("Name") or event.get("Commander") or self.commander
+            self.frontier_id = event.get("FID") or self.frontier_id
+        if name == "FSDJump":
+            return [self._event("addCommanderTravelFSDJump", event, {
+                "starsystemName": event.get("StarSystem"),
+                "jumpDistance": event.get("JumpDist"),
+                "starsystemCoords": event.get("StarPos"),
+            })]
+        if name == "Docked":
+            return [self._event("addCommanderTravelDock", event, {
+                "starsystemName": event.get("StarSystem"),
+                "stationName": event.get("StationName"),
+                "marketID": event.get("MarketID"),
+            })]
+        if name == "LoadGame" and "Credits" in event:
+            return [self._event("setCommanderCredits", event, {
+                "commanderCredits": event["Credits"],
+                "commanderLoan": event.get("Loan", 0),
+            })]
+        if name == "Rank":
+            # Progress follows straight away; the two are sent together
+            self.ranks = {rank: event[rank] for rank in RANKS if rank in event}
+            return []
+        if name == "Progress" and self.ranks:
+            ranks = [{"rankName": rank.lower(), "rankValue": value,
+                      "rankProgress": event.get(rank, 0) / 100}
+                     for rank, value in self.ranks.items()]
+            return [self._event("setCommanderRankPilot", event, ranks)]
+        return []
+
+    @staticmethod
+    def _event(name: str, journal_event: dict, data) -> dict:
+        return {"eventName": name,
+                "eventTimestamp": journal_event.get("timestamp") or _now_iso(),
+                "eventData": data}
+
+
+def latest_commander(journal_dir) -> tuple[str | None, str | None]:
+    """Commander name and Frontier ID from the newest journal"""
+    path = latest_journal(journal_dir)
+    if path is None:
+        return None, None
+    translator = JournalTranslator()
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                event = parse_line(line)
+                if event is not None and event.get("event") in ("Commander", "LoadGame"):
+                    translator.translate(event)
+                    break
+    except OSError:
+        pass
+    return translator.commander, translator.frontier_id
+
+
+# =============================================================================
+# RATE LIMITING
+# =============================================================================
+
+class TokenBucket:
+    """``capacity`` requests at once, refilled at ``rate`` per second"""
+
+    def __init__(self, rate: float = 1 / REQUEST_INTERVAL, capacity: int = REQUEST_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Seconds until a request may be sent"""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    async def acquire(self):
+        while (wait := self.delay()) > 0:
+            await asyncio.sleep(wait)
+        self.tokens -= 1
+
+    def pause(self, seconds: float):
+        """Hold every request back for ``seconds``, as after a 429"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+# =============================================================================
+# CLIENT
+# =============================================================================
+
+class InaraClient:
+    """Batched, rate-limited INARA API access on a background event loop"""
+
+    def __init__(self, api_key: str, commander: str | None = None, frontier_id: str | None = None,
+                 url: str = INARA_URL, root=None, bucket: TokenBucket | None = None,
+                 timeout: float = 20.0, upload_delay: float = UPLOAD_DELAY,
+                 retry_delay: float = RETRY_DELAY):
+        self.api_key = api_key
+        self.url = url
+        self.root = Path(root) if root else default_inara_dir()
+        self.bucket = bucket or TokenBucket()
+        self.timeout = timeout
+        self.upload_delay = upload_delay
+        self.min_retry_delay = retry_delay
+        self.translator = JournalTranslator()
+        self.translator.commander = commander
+        self.translator.frontier_id = frontier_id
+
+        saved = _read_json(self.root / "outbox.json", {})
+        self.outbox = saved.get("events", [])
+        self.through = saved.get("through", "")  # newest journal timestamp queued
+        self.through_keys = set(saved.get("through_keys", []))  # dedup keys queued in that second
+        self.cache = _read_json(self.root / "cache.json", {})
+        self.lookups = []  # (event, asyncio future) for the next request
+        self.online = True
+        self.last_sync = None  # epoch of the last request INARA answered
+        self.last_error = None
+        self.requests = 0
+        self.dropped = 0
+
+        self._upload_since = time.monotonic()
+        self._lookup_since = 0.0
+        self._retry_at = 0.0
+        self._retry_delay = retry_delay
+        self.loop = None
+        self._wake = None
+        self._task = None
+        self._thread = None
+
+    @classmethod
+    def from_env(cls, journal_dir=None, **kwargs) -> "InaraClient | None":
+        """A client configured from the environment, or None without an API key"""
+        api_key = os.environ.get("EDXDC_INARA_API_KEY")
+        if not api_key:
+            return None
+        commander, frontier_id = latest_commander(journal_dir) if journal_dir else (None, None)
+        return cls(api_key, commander, frontier_id,
+                   url=os.environ.get("EDXDC_INARA_URL") or INARA_URL, **kwargs)
+
+    @property
+    def commander(self) -> str | None:
+        return self.translator.commander
+
+    # -------------------------------------------------------------------------
+    # Any thread
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        ready = threading.Event()
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            self._wake = asyncio.Event()
+            self._task = self.loop.create_task(self._run())
+            ready.set()
+            try:
+                self.loop.run_until_complete(self._task)
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self.loop.close()
+
+        self._thread = threading.Thread(target=run, name="inara", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop(self, timeout: float = 5.0):
+        if self._thread is None:
+            return
+        self.loop.call_soon_threadsafe(self._task.cancel)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def upload(self, journal_events: list[dict], keys: list[int] | None = None) -> int:
+        """Queue whatever the journal events translate to; returns how many INARA events.
+
+        ``keys`` are the events' manifest.event_key dedup keys, as the
+        JournalTailer reports them; without them keys are derived from the
+        parsed events.
+        """
+        if keys is None:
+            keys = [event_key(json.dumps(event, sort_keys=True).encode("utf-8")) for event in journal_events]
+        events = []
+        for event, key in zip(journal_events, keys):
+            translated = self.translator.translate(event)
+            if not translated:
+                continue
+            # The tailer replays the current journal on start; those were queued last time
+            timestamp = event.get("timestamp", "")
+            if timestamp < self.through or (timestamp == self.through and key in self.through_keys):
+                continue
+            if timestamp > self.through:
+                self.through, self.through_keys = timestamp, set()
+            # Rebound, not mutated: the event loop may be saving the old set
+            self.through_keys = self.through_keys | {key}
+            events.extend(translated)
+        if events:
+            self.loop.call_soon_threadsafe(self._enqueue, events)
+        return len(events)
+
+    def lookup(self, name: str, data: dict | None = None, ttl: float | None = None) -> Future:
+        """Future for a lookup's eventData, answered from the cache while fresh"""
+        data = data or {}
+        entry = self.cache.get(self._cache_key(name, data))
+        if entry is not None and entry["expires"] > time.time():
+            future = Future()
+            future.set_result(entry["data"])
+            return future
+        ttl = LOOKUP_TTL.get(name, DEFAULT_TTL) if ttl is None else ttl
+        return asyncio.run_coroutine_threadsafe(self._lookup(name, data, ttl), self.loop)
+
+    def cached(self, name: str, data: dict | None = None):
+        """Last result for a lookup however old, for showing before a fresh one arrives"""
+        entry = self.cache.get(self._cache_key(name, data or {}))
+        return entry["data"] if entry is not None else None
+
+    def reconnect(self):
+        """Retry now instead of waiting out the backoff"""
+        self.loop.call_soon_threadsafe(self._reconnect)
+
+    def status(self) -> dict:
+        return {"online": self.online, "last_sync": self.last_sync, "queued": len(self.outbox),
+                "requests": self.requests, "dropped": self.dropped, "error": self.last_error}
+
+    @staticmethod
+    def _cache_key(name: str, data: dict) -> str:
+        return f"{name} {json.dumps(data, sort_keys=True)}"
+
+    # -------------------------------------------------------------------------
+    # Event loop thread
+    # -------------------------------------------------------------------------
+
+    def _enqueue(self, events: list[dict]):
+        if not self.outbox:
+            self._upload_since = time.monotonic()
+        self.outbox.extend(events)
+        if len(self.outbox) > MAX_OUTBOX:
+            self.dropped += len(self.outbox) - MAX_OUTBOX
+            del self.outbox[:len(self.outbox) - MAX_OUTBOX]
+        self._save_outbox()
+        self._wake.set()
+
+    async def _lookup(self, name: str, data: dict, ttl: float):
+        future = self.loop.create_future()
+        if not self.lookups:
+            self._lookup_since = time.monotonic()
+        self.lookups.append(({"eventName": name, "eventTimestamp": _now_iso(), "eventData": data,
+                              "ttl": ttl}, future))
+        self._wake.set()
+        return await future
+
+    def _reconnect(self):
+        self._retry_at = 0.0
+        self._retry_delay = self.min_retry_delay
+        self._wake.set()
+
+    def _due(self) -> float | None:
+        """Monotonic time the next request should go out, None if nothing is pending"""
+        due = []
+        if self.lookups:
+            due.append(self._lookup_since + LOOKUP_DELAY)
+        if self.outbox and self.commander:
+            full = len(self.outbox) >= MAX_BATCH
+            due.append(time.monotonic() if full else self._upload_since + self.upload_delay)
+        return max(min(due), self._retry_at) if due else None
+
+    async def _run(self):
+        while True:
+            due = self._due()
+            self._wake.clear()
+            if due is None:
+                await self._wake.wait()
+                continue
+            wait = due - time.monotonic()
+            if wait > 0:
+                # A new lookup may bring the request forward
+                try:
+                    await asyncio.wait_for(self._wake.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.bucket.acquire()
+            await self._send_pending()
+
+    async def _send_pending(self):
+        lookups, self.lookups = self.lookups[:MAX_BATCH], self.lookups[MAX_BATCH:]
+        uploads = self.outbox[:MAX_BATCH - len(lookups)] if self.commander else []
+        events = [{key: value for key, value in event.items() if key != "ttl"} for event, _ in lookups]
+        try:
+            results = await asyncio.to_thread(self._post, events + uploads)
+        except InaraError as exc:
+            self._failed(exc, lookups)
+            return
+
+        self.online = True
+        self.last_error = None
+        self.last_sync = time.time()
+        self.requests += 1
+        self._retry_delay = self.min_retry_delay
+        for (event, future), result in zip(lookups, results):
+            status = result.get("eventStatus", ERROR)
+            if status in (OK, WARNING, NO_DATA):
+                data = result.get("eventData")
+                self.cache[self._cache_key(event["eventName"], event["eventData"])] = {
+                    "expires": time.time() + event["ttl"], "data": data}
+                future.done() or future.set_result(data)
+            else:
+                future.done() or future.set_exception(InaraError(result.get("eventStatusText", status)))
+        for result in results[len(lookups):]:
+            # A rejected upload would be rejected again; drop it and say why
+            if result.get("eventStatus", OK) == ERROR:
+                self.last_error = result.get("eventStatusText", "event rejected")
+        if lookups:
+            _write_json(self.root / "cache.json", self.cache)
+        if uploads:
+            del self.outbox[:len(uploads)]
+            self._upload_since = time.monotonic()
+            self._save_outbox()
+
+    def _save_outbox(self):
+        _write_json(self.root / "outbox.json", {"through": self.through,
+                                                "through_keys": sorted(self.through_keys),
+                                                "events": self.outbox})
+
+    def _failed(self, exc: InaraError, lookups: list):
+        """Keep everything for the next attempt, which waits out a growing backoff"""
+        self.last_error = str(exc)
+        if isinstance(exc, OfflineError):
+            self.online = False
+        self.lookups[:0] = lookups
+        self._retry_at = time.monotonic() + self._retry_delay
+        self._retry_delay = min(self._retry_delay * 2, MAX_RETRY_DELAY)
+
+    def _post(self, events: list[dict]) -> list[dict]:
+        """One API request (blocking, run off the loop); per-event results in order"""
+        header = {"appName": APP_NAME, "appVersion": APP_VERSION, "isBeingDeveloped": False,
+                  "APIkey": self.api_key}
+        if self.commander:
+            header["commanderName"] = self.commander
+        if self.translator.frontier_id:
+            header["commanderFrontierID"] = self.translator.frontier_id
+        body = json.dumps({"header": header, "events": events}).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                reply = json.load(response)
+        except urllib.error.HTTPError as exc:
+            if exc.code == TOO_MANY_REQUESTS:
+                self.bucket.pause(RATE_LIMIT_PAUSE)
+            raise InaraError(f"HTTP {exc.code}") from exc
+        except (OSError, ValueError) as exc:
+            raise OfflineError(str(exc) or type(exc).__name__) from exc
+
+        status = reply.get("header", {}).get("eventStatus", ERROR)
+        if status == TOO_MANY_REQUESTS:
+            self.bucket.pause(RATE_LIMIT_PAUSE)
+        if status not in (OK, WARNING):
+            raise InaraError(reply.get("header", {}).get("eventStatusText") or f"status {status}")
+        results = reply.get("events") or []
+        return results + [{"eventStatus": OK}] * (len(events) - len(results))
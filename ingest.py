@@ -0,0 +1,417 @@
+"""
+Bulk ingestion of historical journals
+Parses a whole journal directory across a process pool, one work unit per
+journal file, and merges the per-file results in chronological file order
+so the outcome never depends on worker scheduling.
+
+Ingesting into a store is idempotent: the store's manifest (manifest.py)
+skips journals that have not changed since they were ingested and resumes
+ones that have grown from where the last run stopped, and workers drop
+any event whose dedup key the store already holds. Workers only know the
+keys stored before the run, so the parent re-reads any file that repeats
+an event merged earlier in the same run; re-running after a restart or
+over copied journals never counts an event twice. Tables added
+to the store schema since the last run are first backfilled from the
+journals already ingested, reading only the events that fill them.
+
+When given an EventStore, workers also build the columnar partitions for
+their file and the parent appends them in the same deterministic order,
+then folds the run's headline aggregates into the ones persisted with the
+store. With a PostgresSink, workers also return their parsed events and the
+parent queues them for batched COPY in the same order; the sink's bounded
+queue throttles the merge to database speed.
+
+Only one ingest writes to a store at a time: the GUI imports new journals
+at startup and the headless daemon may be running against the same data
+directory, so a run holds an OS lock on <store>/INGEST.lock and a second
+one waits for it.
+
+Run with: python ingest.py [JOURNAL_DIR] [-j WORKERS] [--store DIR] [--postgres DSN]
+"""
+
+import argparse
+import array
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+
+from aggregates import RunningAggregates
+from event_store import SCHEMA, ColumnCollector, EventStore
+from journal import default_journal_dir, list_journals, parse_line
+from manifest import DedupKeys, FileEntry, Manifest, content_hash, event_key
+from postgres_sink import PostgresSink
+
+
+# Below this many files the pool start-up costs more than it saves
+MIN_FILES_FOR_POOL = 8
+
+INGEST_LOCK = "INGEST.lock"
+
+
+@dataclass
+class FileSummary:
+    """Result of ingesting a single journal file"""
+
+    path: str
+    events: int = 0
+    bad_lines: int = 0
+    first_timestamp: str | None = None
+    last_timestamp: str | None = None
+    event_counts: Counter = field(default_factory=Counter)
+    aggregates: RunningAggregates = field(default_factory=RunningAggregates)
+    columns: dict | None = None
+    parsed: list | None = None
+    duplicates: int = 0
+    size: int = 0
+    mtime_ns: int = 0
+    start: int = 0   # byte offset reading began at
+    offset: int = 0  # byte offset reading stopped at, a line boundary
+    hash: str = ""   # content hash of the bytes before ``offset``
+    keys: dict = field(default_factory=dict)  # month -> array of new event dedup keys
+
+
+@dataclass
+class IngestResult:
+    """Merged result of a bulk ingest"""
+
+    files: int = 0
+    skipped_files: int = 0
+    events: int = 0
+    duplicates: int = 0
+    backfilled: int = 0  # events read into newly added tables
+    bad_lines: int = 0
+    first_timestamp: str | None = None
+    last_timestamp: str | None = None
+    event_counts: Counter = field(default_factory=Counter)
+    aggregates: RunningAggregates = field(default_factory=RunningAggregates)
+    elapsed: float = 0.0
+
+    @property
+    def events_per_sec(self) -> float:
+        return self.events / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def systems(self) -> set:
+        return self.aggregates.systems
+
+    @property
+    def wealth(self) -> int | None:
+        return self.aggregates.wealth
+
+    @property
+    def time_played(self) -> int | None:
+        return self.aggregates.time_played
+
+    def merge(self, summary: FileSummary):
+        """Fold in one file summary; must be called in chronological order"""
+        self.files += 1
+        self.events += summary.events
+        self.duplicates += summary.duplicates
+        self.bad_lines += summary.bad_lines
+        self.event_counts.update(summary.event_counts)
+        self.aggregates.merge(summary.aggregates)
+        if summary.first_timestamp and not self.first_timestamp:
+            self.first_timestamp = summary.first_timestamp
+        if summary.last_timestamp:
+            self.last_timestamp = summary.last_timestamp
+
+
+# Dedup keys loaded by this process, per store
+_DEDUP = {}
+
+
+def _dedup_keys(root) -> DedupKeys:
+    keys = _DEDUP.get(root)
+    if keys is None:
+        keys = _DEDUP[root] = DedupKeys(root)
+    return keys
+
+
+def summarize_file(path, start: int = 0, prefix_hash: str = "", collect_columns: bool = False,
+                   keep_events: bool = False, dedup_root=None) -> FileSummary:
+    """Work unit: parse one journal file into a FileSummary.
+
+    Reading begins at ``start`` when the bytes before it still hash to
+    ``prefix_hash``, otherwise at the top. With a ``dedup_root`` events
+    already in that store are dropped and the new ones' keys returned.
+    """
+    summary = FileSummary(path=str(path))
+    collector = ColumnCollector() if collect_columns else None
+    parsed = summary.parsed = [] if keep_events else None
+    dedup = _dedup_keys(dedup_root) if dedup_root is not None else None
+    with open(path, "rb") as f:
+        data = f.read()
+        summary.mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+    summary.size = len(data)
+
+    # Stop at the last complete line; a partly written one is read next time
+    end = data.rfind(b"\n") + 1
+    if end < len(data) and parse_line(data[end:]) is not None:
+        end = len(data)
+    if start and (start > end or content_hash(data[:start]) != prefix_hash):
+        start = 0
+    summary.start, summary.offset = start, end
+    if dedup is not None:
+        summary.hash = content_hash(data[:end])
+
+    counts = summary.event_counts
+    aggregates = summary.aggregates
+    for line in data[start:end].splitlines():
+        if not line.strip():
+            continue
+        event = parse_line(line)
+        if event is None:
+            summary.bad_lines += 1
+            continue
+        if dedup is not None:
+            key = event_key(line)
+            month = event.get("timestamp", "")[:7] or "unknown"
+            if key in dedup.month(month):
+                summary.duplicates += 1
+                continue
+            keys = summary.keys.get(month)
+            if keys is None:
+                keys = summary.keys[month] = array.array("Q")
+            keys.append(key)
+
+        summary.events += 1
+        if collector is not None:
+            collector.add(event)
+        if parsed is not None:
+            parsed.append(event)
+        name = event["event"]
+        counts[name] += 1
+        aggregates.update(event)
+        timestamp = event.get("timestamp")
+        if timestamp:
+            if summary.first_timestamp is None:
+                summary.first_timestamp = timestamp
+            summary.last_timestamp = timestamp
+
+    if collector is not None:
+        summary.columns = collector.take()
+    return summary
+
+
+@contextmanager
+def store_lock(root):
+    """Hold the store's ingest lock, waiting while another process has it"""
+    path = Path(root) / INGEST_LOCK
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            while True:
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # gives up after ~10 s
+                    break
+                except OSError:
+                    continue
+        else:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def ingest_directory(journal_dir, workers: int | None = None, progress=None,
+                     store: EventStore | None = None,
+                     sink: PostgresSink | None = None) -> IngestResult:
+    """Ingest every journal in the directory.
+
+    ``workers`` defaults to the CPU count; 1 runs in-process. ``progress``
+    is called as progress(done, total) after each file is merged. With a
+    ``store`` only the new part of each journal is read and its hot
+    columns are appended, under the store's ingest lock; with a ``sink``
+    every new event is written to PostgreSQL before this returns.
+    """
+    with store_lock(store.root) if store is not None else nullcontext():
+        return _ingest_directory(journal_dir, workers, progress, store, sink)
+
+
+def _ingest_directory(journal_dir, workers, progress, store, sink) -> IngestResult:
+    started = time.perf_counter()
+    result = IngestResult()
+    paths = list_journals(journal_dir)
+    plans = [(0, "")] * len(paths)
+    manifest = None
+    retabled = False  # whether the manifest predates the current schema
+    if store is not None:
+        manifest = Manifest(store.root)
+        retabled = manifest.tables != sorted(SCHEMA)
+        result.backfilled = backfill_tables(journal_dir, store, manifest, workers)
+        planned = [(path, manifest.plan(path)) for path in paths]
+        paths = [path for path, plan in planned if plan is not None]
+        plans = [plan for _, plan in planned if plan is not None]
+        result.skipped_files = len(planned) - len(paths)
+        _DEDUP.clear()  # keys loaded by an earlier in-process run may be out of date
+
+    workers = workers or os.cpu_count() or 1
+    work = partial(summarize_file, collect_columns=store is not None, keep_events=sink is not None,
+                   dedup_root=store.root if store is not None else None)
+    starts = [start for start, _ in plans]
+    hashes = [prefix_hash for _, prefix_hash in plans]
+
+    try:
+        if workers <= 1 or len(paths) < MIN_FILES_FOR_POOL:
+            summaries = map(work, paths, starts, hashes)
+            _merge_all(result, summaries, len(paths), progress, store, sink, manifest, work, plans)
+        else:
+            # Small chunks keep the pool balanced when file sizes vary wildly;
+            # map() yields in submission order, which keeps the merge deterministic.
+            chunksize = max(1, len(paths) // (workers * 8))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                summaries = pool.map(work, paths, starts, hashes, chunksize=chunksize)
+                _merge_all(result, summaries, len(paths), progress, store, sink, manifest, work, plans)
+    finally:
+        # Whatever was merged before a failure is recorded, so a rerun resumes after it
+        if manifest is not None and (result.files or retabled):
+            manifest.save()
+
+    if store is not None and result.files:
+        history = RunningAggregates.load(store.root)
+        history.merge(result.aggregates)
+        history.save(store.root)
+    if sink is not None:
+        sink.flush()
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _repeats_run(summary: FileSummary, dedup: DedupKeys) -> bool:
+    """Whether ``summary`` holds events merged earlier in this run, which its worker could not see"""
+    return any(not dedup.month(month).isdisjoint(keys) for month, keys in summary.keys.items())
+
+
+def _merge_all(result, summaries, total, progress, store, sink=None, manifest=None, work=None, plans=None):
+    # The same key set the in-process work units check, grown as files are merged
+    dedup = _dedup_keys(store.root) if store is not None else None
+    plans = plans or [(0, "")] * total
+    for done, (summary, (start, prefix_hash)) in enumerate(zip(summaries, plans), 1):
+        if manifest is not None and _repeats_run(summary, dedup):
+            # A copy of a journal merged before it; read it again against the grown keys
+            summary = work(summary.path, start, prefix_hash)
+        result.merge(summary)
+        if store is not None and summary.columns:
+            store.append_columns(summary.columns)
+        if manifest is not None:
+            dedup.add(summary.keys)
+            entry = FileEntry(summary.size, summary.mtime_ns, summary.offset, summary.hash, summary.events)
+            manifest.record(summary.path, entry, resumed=summary.start > 0)
+        if sink is not None and summary.parsed:
+            sink.put(summary.parsed)
+        if progress:
+            progress(done, total)
+
+
+def backfill_file(path, end: int, events: frozenset) -> list[tuple[int, dict]]:
+    """Work unit: (dedup key, event) of each of ``events`` in the first ``end`` bytes of a journal"""
+    needles = [f'"{name}"'.encode() for name in events]
+    with open(path, "rb") as f:
+        data = f.read(end)
+    found = []
+    for line in data.splitlines():
+        # Most lines are other events; skip them without parsing
+        if not any(needle in line for needle in needles):
+            continue
+        event = parse_line(line)
+        if event is not None and event["event"] in events:
+            found.append((event_key(line), event))
+    return found
+
+
+def backfill_tables(journal_dir, store: EventStore, manifest: Manifest, workers: int | None = None) -> int:
+    """Fill tables the schema gained since ``manifest`` was saved from the journals it lists.
+
+    Returns the number of events read into them. A manifest that predates
+    table tracking is taken to cover every table that has data.
+    """
+    known = manifest.tables
+    if known is None:
+        known = [table for table in SCHEMA if store.months(table)]
+    tables = set(SCHEMA) - set(known)
+    manifest.tables = sorted(SCHEMA)
+    if not tables or not manifest.files:
+        return 0
+
+    events = frozenset(SCHEMA[table].get("event", table) for table in tables)
+    paths = [path for path in list_journals(journal_dir) if path.name in manifest.files]
+    ends = [manifest.files[path.name].offset for path in paths]
+    work = partial(backfill_file, events=events)
+    collector = ColumnCollector(tables)
+    seen = set()
+    backfilled = 0
+
+    def merge(found):
+        nonlocal backfilled
+        for per_file in found:
+            for key, event in per_file:
+                # Copies of a journal hold the same events
+                if key not in seen:
+                    seen.add(key)
+                    collector.add(event)
+                    backfilled += 1
+            store.append_columns(collector.take())
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(paths) < MIN_FILES_FOR_POOL:
+        merge(map(work, paths, ends))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            merge(pool.map(work, paths, ends, chunksize=max(1, len(paths) // (workers * 8))))
+    return backfilled
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk ingest Elite Dangerous journals")
+    parser.add_argument("journal_dir", nargs="?", default=str(default_journal_dir()))
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="worker processes (default: CPU count, 1 = in-process)")
+    parser.add_argument("--store", default=None,
+                        help="event store directory to append columns to")
+    parser.add_argument("--no-store", action="store_true",
+                        help="only summarise, do not write the event store")
+    parser.add_argument("--postgres", metavar="DSN", default=None,
+                        help="also write every event to PostgreSQL in COPY batches")
+    args = parser.parse_args(argv)
+
+    store = None if args.no_store else EventStore(args.store)
+    sink = PostgresSink(args.postgres) if args.postgres else None
+    result = ingest_directory(args.journal_dir, workers=args.workers, store=store, sink=sink)
+    if sink is not None:
+        sink.close()
+
+    print(f"Files:            {result.files:,} ({result.skipped_files:,} unchanged, skipped)")
+    print(f"Events:           {result.events:,} ({result.bad_lines:,} unreadable lines)")
+    if result.duplicates:
+        print(f"Duplicates:       {result.duplicates:,} events already in the store")
+    if result.backfilled:
+        print(f"Backfilled:       {result.backfilled:,} events into newly added tables")
+    print(f"Elapsed:          {result.elapsed:.2f}s")
+    print(f"Throughput:       {result.events_per_sec:,.0f} events/sec")
+    print(f"Systems visited:  {len(result.systems):,}")
+    if result.wealth is not None:
+        print(f"Total wealth:     {result.wealth:,} CR")
+    if result.time_played is not None:
+        print(f"Play time:        {result.time_played / 3600:.1f} hrs")
+    if sink is not None:
+        print(f"PostgreSQL:       {sink.written:,} events in {sink.batches:,} COPY batches")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
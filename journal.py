@@ -0,0 +1,252 @@
+"""
+Elite Dangerous journal access
+Locating journal files, parsing lines and tailing the live journal.
+
+Nothing in here imports Qt so it can be shared with headless tooling.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from manifest import event_key
+
+
+JOURNAL_GLOB = "Journal.*.log"
+# Written last in a journal before the game moves on to a new one
+ROLLOVER_EVENTS = ("Continued", "Shutdown")
+# Seconds an idle tail waits before listing the directory again even though
+# its mtime has not moved (some filesystems update it coarsely)
+RESCAN_INTERVAL = 30.0
+
+
+def default_journal_dir() -> Path:
+    """Default journal location used by the game on Windows"""
+    override = os.environ.get("EDXDC_JOURNAL_DIR")
+    if override:
+        return Path(override)
+    return Path.home() / "Saved Games" / "Frontier Developments" / "Elite Dangerous"
+
+
+def list_journals(journal_dir) -> list[Path]:
+    """All journal files in the directory, oldest first.
+
+    Journal names embed their creation timestamp, so a name sort is
+    chronological for both the old (Journal.YYMMDDhhmmss.01.log) and the
+    new (Journal.YYYY-MM-DDThhmmss.01.log) naming schemes as long as the
+    schemes are not mixed; mtime breaks ties across schemes.
+    """
+    journal_dir = Path(journal_dir)
+    if not journal_dir.is_dir():
+        return []
+    files = [p for p in journal_dir.glob(JOURNAL_GLOB) if p.is_file()]
+    files.sort(key=lambda p: (_name_key(p.name), p.stat().st_mtime))
+    return files
+
+
+def _name_key(name: str) -> str:
+    # Old scheme stamps are 12 digits (YYMMDDhhmmss); normalise them to the
+    # ISO-like new scheme so both sort together.
+    stamp = name[len("Journal."):].split(".", 1)[0]
+    if stamp.isdigit() and len(stamp) == 12:
+        return f"20{stamp[0:2]}-{stamp[2:4]}-{stamp[4:6]}T{stamp[6:12]}"
+    return stamp
+
+
+def latest_journal(journal_dir) -> Path | None:
+    journals = list_journals(journal_dir)
+    return journals[-1] if journals else None
+
+
+def parse_line(line: bytes | str) -> dict | None:
+    """Parse one journal line, returning None for blank or corrupt lines"""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(event, dict) or "event" not in event:
+        return None
+    return event
+
+
+# =============================================================================
+# LIVE TAILING
+# =============================================================================
+
+class JournalTailer:
+    """Incrementally reads newly appended events from the live journal.
+
+    Keeps a (path, byte offset) checkpoint and only ever reads past it.
+    Partial trailing lines (the game writes lines in chunks) are left for
+    the next poll. When the game starts a new journal file the remainder of
+    the old one is drained before switching to the new file at offset 0.
+
+    Listing a directory with years of journals is not free, so the newest
+    journal is only looked for again when the directory's mtime moves,
+    after a rollover event, or once the tail has been idle for
+    RESCAN_INTERVAL; otherwise a poll costs two stats.
+
+    ``keys`` holds the manifest.event_key of each event the last poll
+    returned, in order, so consumers can tell events the store already has.
+    """
+
+    def __init__(self, journal_dir, path=None, offset: int = 0, max_read: int = 1 << 20):
+        self.journal_dir = Path(journal_dir)
+        self.path = Path(path) if path else None
+        self.offset = offset
+        self.max_read = max_read
+        self.keys: list[int] = []
+        self._newest = None
+        self._dir_mtime = None
+        self._scanned = 0.0  # time.monotonic() of the last directory listing
+        self._stale = True   # list the directory on the next poll regardless
+
+    @property
+    def checkpoint(self) -> tuple[str | None, int]:
+        return (str(self.path) if self.path else None, self.offset)
+
+    def seek_to_end(self):
+        """Start tailing from the current end of the newest journal"""
+        self.path = latest_journal(self.journal_dir)
+        self.offset = self.path.stat().st_size if self.path else 0
+
+    def _latest(self, idle: bool) -> Path | None:
+        """Newest journal, listing the directory only when it may have changed"""
+        try:
+            mtime = self.journal_dir.stat().st_mtime_ns
+        except OSError:
+            return None
+        now = time.monotonic()
+        if self._stale or mtime != self._dir_mtime or (idle and now - self._scanned >= RESCAN_INTERVAL):
+            self._newest = latest_journal(self.journal_dir)
+            self._dir_mtime, self._scanned, self._stale = mtime, now, False
+        return self._newest
+
+    def poll(self) -> list[dict]:
+        """Return events appended since the last poll"""
+        events = []
+        self.keys = []
+        if self.path is None:
+            newest = self._latest(idle=True)
+            if newest is None:
+                return events
+            self.path, self.offset = newest, 0
+
+        events.extend(self._read_new())
+        newest = self._latest(idle=not events)
+
+        if newest is not None and newest != self.path:
+            # Game rolled over to a new journal: finish the old one first
+            while True:
+                before = self.offset
+                events.extend(self._read_new())
+                if self.offset == before:
+                    break
+            self.path, self.offset = newest, 0
+            events.extend(self._read_new())
+
+        if any(event["event"] in ROLLOVER_EVENTS for event in events):
+            self._stale = True
+        return events
+
+    def _read_new(self) -> list[dict]:
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return []
+        if size < self.offset:
+            # File was truncated or replaced in place
+            self.offset = 0
+        if size == self.offset:
+            return []
+
+        limit = self.max_read
+        with open(self.path, "rb") as f:
+            while True:
+                f.seek(self.offset)
+                chunk = f.read(min(size - self.offset, limit))
+                end = chunk.rfind(b"\n")
+                if end >= 0 or len(chunk) >= size - self.offset:
+                    break
+                # A single line longer than max_read: keep reading until it ends
+                limit *= 2
+
+        if end < 0:
+            return []
+        self.offset += end + 1
+
+        events = []
+        for line in chunk[:end].split(b"\n"):
+            event = parse_line(line)
+            if event is not None:
+                events.append(event)
+                self.keys.append(event_key(line))
+        return events
+
+
+# =============================================================================
+# DISPLAY
+# =============================================================================
+
+EVENT_ICONS = {
+    "FSDJump": "🚀",
+    "Location": "📍",
+    "FSDTarget": "🎯",
+    "StartJump": "⚡",
+    "NavRoute": "🧭",
+    "NavRouteClear": "⚡",
+    "SupercruiseEntry": "🌌",
+    "SupercruiseExit": "🌌",
+    "Docked": "🛬",
+    "Undocked": "🛫",
+    "Music": "🔊",
+    "Scan": "🌟",
+    "FSSDiscoveryScan": "📡",
+    "ProspectedAsteroid": "⛏️",
+    "MiningRefined": "💎",
+    "MarketBuy": "🛒",
+    "MarketSell": "💰",
+    "Bounty": "💀",
+    "FactionKillBond": "⚔️",
+    "ShipTargeted": "🎯",
+    "HullDamage": "💥",
+    "Died": "☠️",
+    "Interdicted": "🧲",
+    "ColonisationContribution": "🏗️",
+    "ColonisationConstructionDepot": "🏗️",
+}
+
+# Field that best summarises each event type in the live feed
+EVENT_DETAIL = {
+    "FSDJump": "StarSystem",
+    "Location": "StarSystem",
+    "FSDTarget": "Name",
+    "Docked": "StationName",
+    "Undocked": "StationName",
+    "Music": "MusicTrack",
+    "Scan": "BodyName",
+    "ProspectedAsteroid": "Content_Localised",
+    "MiningRefined": "Type_Localised",
+    "MarketBuy": "Type_Localised",
+    "MarketSell": "Type_Localised",
+    "Bounty": "Target_Localised",
+    "ShipTargeted": "Ship_Localised",
+    "SupercruiseEntry": "StarSystem",
+    "SupercruiseExit": "Body",
+}
+
+
+def format_event(event: dict) -> str:
+    """Single-line live feed representation of an event"""
+    name = event.get("event", "?")
+    icon = EVENT_ICONS.get(name, "•")
+    clock = event.get("timestamp", "")[11:19] or "--:--:--"
+    text = f"{icon} [{clock}] {name}"
+    detail = event.get(EVENT_DETAIL.get(name, ""))
+    if detail:
+        text += f" → {detail}"
+    return text
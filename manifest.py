@@ -0,0 +1,134 @@
+"""
+Ingest manifest and event dedup keys
+Records which journal files an event store holds and how much of each,
+so ingesting the same directory again only reads what is new:
+
+    <store>/MANIFEST.json         file name -> size, mtime, bytes ingested, hash of those bytes
+    <store>/DEDUP/<YYYY-MM>.keys  64-bit key of every stored event, by month
+
+A file whose size and mtime match its entry is skipped without being
+opened, so an unchanged directory costs one stat per file. A file that
+has grown is resumed from its recorded offset, provided the bytes before
+it still hash the same. Anything else is read from the start, and each
+event is checked against the keys of its month, so a rewritten journal,
+or one copied from another machine under a new mtime or name, never
+counts an event twice.
+
+The manifest also lists the event store tables it was built with, so
+tables added to the schema later can be backfilled from journals that
+are otherwise skipped.
+
+No Qt imports here.
+"""
+
+import array
+import hashlib
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+
+MANIFEST_FILE = "MANIFEST.json"
+DEDUP_DIR = "DEDUP"
+
+
+@dataclass
+class FileEntry:
+    size: int
+    mtime_ns: int
+    offset: int  # bytes ingested, always at a line boundary
+    hash: str    # content hash of those bytes
+    events: int = 0
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def event_key(line: bytes) -> int:
+    """Dedup key of a raw journal line, which carries its timestamp, event type and content"""
+    return int.from_bytes(hashlib.blake2b(line.strip(), digest_size=8).digest(), "little")
+
+
+class Manifest:
+    """Journal files already in a store, keyed by file name"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.files = {}
+        self.tables = None  # event store tables filled so far; None if not recorded
+        try:
+            with open(self.root / MANIFEST_FILE, encoding="utf-8") as f:
+                saved = json.load(f)
+            self.files = {name: FileEntry(**entry) for name, entry in saved["files"].items()}
+            self.tables = saved.get("tables")
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+
+    def plan(self, path: Path) -> tuple[int, str] | None:
+        """Where to start reading ``path`` and the hash expected before it; None to skip"""
+        entry = self.files.get(path.name)
+        if entry is None:
+            return 0, ""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if stat.st_size == entry.size and stat.st_mtime_ns == entry.mtime_ns:
+            return None
+        if stat.st_size >= entry.offset:
+            return entry.offset, entry.hash
+        return 0, ""
+
+    def record(self, path, entry: FileEntry, resumed: bool = False):
+        """Note how far ``path`` has been ingested; ``resumed`` if it carried on from its entry"""
+        previous = self.files.get(Path(path).name)
+        if resumed and previous is not None:
+            entry.events += previous.events
+        self.files[Path(path).name] = entry
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / "MANIFEST.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            saved = {"files": {name: asdict(entry) for name, entry in sorted(self.files.items())}}
+            if self.tables is not None:
+                saved["tables"] = sorted(self.tables)
+            json.dump(saved, f)
+        os.replace(tmp, self.root / MANIFEST_FILE)
+
+
+class DedupKeys:
+    """Event keys of a store, one month loaded at a time on first use"""
+
+    def __init__(self, root):
+        self.dir = Path(root) / DEDUP_DIR
+        self.months = {}
+
+    def month(self, month: str) -> set[int]:
+        keys = self.months.get(month)
+        if keys is None:
+            data = array.array("Q")
+            try:
+                with open(self.dir / f"{month}.keys", "rb") as f:
+                    data.frombytes(f.read())
+            except OSError:
+                pass
+            if sys.byteorder != "little":
+                data.byteswap()
+            keys = self.months[month] = set(data)
+        return keys
+
+    def add(self, keys: dict[str, array.array]):
+        """Append newly stored keys, by month"""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        for month, values in keys.items():
+            if month in self.months:
+                self.months[month].update(values)
+            data = array.array("Q", values)
+            if sys.byteorder != "little":
+                data.byteswap()
+            with open(self.dir / f"{month}.keys", "ab") as f:
+                data.tofile(f)
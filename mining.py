@@ -0,0 +1,318 @@
+"""
+Mining analytics
+Prospector, refinery and sale events loaded as flat NumPy arrays and
+grouped per hotspot, where a hotspot is a (ring, material) pair and the
+ring is the one the commander last dropped into. Bulk loading assigns
+every event its ring with one searchsorted over the SupercruiseExit times
+and does all group-bys with bincount; live events are then folded in one
+at a time.
+
+Each hotspot keeps a fixed-bin histogram of the material's proportion in
+every prospected rock. It is a mergeable streaming quantile sketch, so
+rankings by median and p90 yield stay current without rescanning rocks.
+
+Requires NumPy; the GUI imports this lazily off the GUI thread.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from aggregates import MINING_EVENTS
+from event_store import EventStore, parse_timestamp
+from prices import commodity_key
+
+
+MAX_GAP = 300          # seconds between mining events still counted as time spent mining
+SKETCH_BINS = 200      # proportion histogram bins over 0-100 %, i.e. 0.5 % resolution
+CONTENT_LEVELS = ("High", "Medium", "Low")
+MINING_BODIES = ("PlanetaryRing", "AsteroidCluster")
+UNKNOWN_RING = ""
+
+
+def content_level(content: str) -> str:
+    """"$AsteroidMaterialContent_High;" -> "High" """
+    for level in CONTENT_LEVELS:
+        if level in content:
+            return level
+    return ""
+
+
+def _bins(values) -> np.ndarray:
+    bins = (np.asarray(values, dtype=np.float64) * (SKETCH_BINS / 100.0)).astype(np.int64)
+    return np.clip(bins, 0, SKETCH_BINS - 1)
+
+
+class ProportionSketch:
+    """Streaming quantiles of a 0-100 % proportion as a fixed-bin histogram"""
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self, counts: np.ndarray | None = None):
+        self.counts = np.zeros(SKETCH_BINS, np.int64) if counts is None else counts
+        self.total = int(self.counts.sum())
+
+    def __len__(self):
+        return self.total
+
+    def add(self, proportion: float):
+        self.counts[_bins(proportion)] += 1
+        self.total += 1
+
+    def merge(self, other: "ProportionSketch"):
+        self.counts += other.counts
+        self.total += other.total
+
+    def quantile(self, q: float) -> float:
+        """Proportion below which a fraction ``q`` of rocks fall (bin midpoint)"""
+        if not self.total:
+            return 0.0
+        rank = min(int(q * self.total), self.total - 1)
+        bin_ = int(np.searchsorted(np.cumsum(self.counts), rank, side="right"))
+        return (bin_ + 0.5) * 100.0 / SKETCH_BINS
+
+
+@dataclass
+class Hotspot:
+    ring: str
+    material: str
+    prospected: int = 0   # rocks containing the material
+    refined: int = 0      # tons refined
+    sketch: ProportionSketch = field(default_factory=ProportionSketch)
+
+
+@dataclass(frozen=True)
+class HotspotRank:
+    ring: str
+    material: str
+    prospected: int
+    refined: int
+    tons_per_hour: float
+    credits_per_hour: float
+    median: float
+    p90: float
+
+
+@dataclass
+class Prospect:
+    """The last prospected asteroid"""
+    ring: str
+    content: str
+    materials: list[tuple[str, float]]
+    motherlode: str = ""
+    remaining: float = 100.0
+
+
+class MiningStats:
+    """Hotspot, mineral and content-level statistics over all mining events"""
+
+    def __init__(self):
+        self.hotspots: dict[tuple[str, str], Hotspot] = {}
+        self.ring_seconds: dict[str, float] = {}
+        self.content = dict.fromkeys(CONTENT_LEVELS, 0)
+        self.refined: dict[str, int] = {}
+        self.sales: dict[str, tuple[int, int]] = {}  # commodity -> (credits, tons) sold
+        self.seconds = 0.0
+        self.ring = UNKNOWN_RING
+        self.last_mining = 0
+        self.last_prospect: Prospect | None = None
+
+    def hotspot(self, ring: str, material: str) -> Hotspot:
+        spot = self.hotspots.get((ring, material))
+        if spot is None:
+            spot = self.hotspots[(ring, material)] = Hotspot(ring, material)
+        return spot
+
+    # -------------------------------------------------------------------------
+    # Live updates
+    # -------------------------------------------------------------------------
+
+    def update(self, event: dict):
+        """Fold in one journal event; anything outside MINING_EVENTS is ignored"""
+        name = event.get("event")
+        if name not in MINING_EVENTS:
+            return
+        if name == "SupercruiseExit":
+            self.ring = event.get("Body", "") if event.get("BodyType") in MINING_BODIES else UNKNOWN_RING
+        elif name == "MarketSell":
+            key = commodity_key(event.get("Type", ""))
+            credits, tons = self.sales.get(key, (0, 0))
+            self.sales[key] = (credits + event.get("TotalSale", 0), tons + event.get("Count", 0))
+        elif name == "ProspectedAsteroid":
+            self._advance(parse_timestamp(event.get("timestamp", "")))
+            level = content_level(event.get("Content", ""))
+            if level:
+                self.content[level] += 1
+            materials = []
+            for item in event.get("Materials") or []:
+                material = commodity_key(item.get("Name", ""))
+                proportion = float(item.get("Proportion", 0.0))
+                spot = self.hotspot(self.ring, material)
+                spot.prospected += 1
+                spot.sketch.add(proportion)
+                materials.append((material, proportion))
+            self.last_prospect = Prospect(
+                self.ring, level, sorted(materials, key=lambda m: -m[1]),
+                commodity_key(event.get("MotherlodeMaterial", "")), float(event.get("Remaining", 100.0)),
+            )
+        elif name == "MiningRefined":
+            self._advance(parse_timestamp(event.get("timestamp", "")))
+            material = commodity_key(event.get("Type", ""))
+            self.refined[material] = self.refined.get(material, 0) + 1
+            self.hotspot(self.ring, material).refined += 1
+
+    def _advance(self, ts: int):
+        gap = ts - self.last_mining
+        if 0 < gap <= MAX_GAP:
+            self.seconds += gap
+            self.ring_seconds[self.ring] = self.ring_seconds.get(self.ring, 0.0) + gap
+        self.last_mining = max(self.last_mining, ts)
+
+    # -------------------------------------------------------------------------
+    # Results
+    # -------------------------------------------------------------------------
+
+    def value_per_ton(self, material: str) -> float:
+        """Average price the commander has sold the material for"""
+        credits, tons = self.sales.get(material, (0, 0))
+        return credits / tons if tons else 0.0
+
+    def mined_value(self) -> float:
+        return sum(tons * self.value_per_ton(material) for material, tons in self.refined.items())
+
+    def credits_per_hour(self) -> float:
+        return self.mined_value() * 3600 / self.seconds if self.seconds else 0.0
+
+    def minerals(self) -> list[tuple[str, int, float]]:
+        """(material, tons refined, value) by value, then tons"""
+        rows = [(m, tons, tons * self.value_per_ton(m)) for m, tons in self.refined.items()]
+        return sorted(rows, key=lambda row: (-row[2], -row[1]))
+
+    def content_shares(self) -> dict[str, float]:
+        total = sum(self.content.values())
+        return {level: count / total if total else 0.0 for level, count in self.content.items()}
+
+    def ranking(self, limit: int | None = 10) -> list[HotspotRank]:
+        """Hotspots by credits per hour, then by median proportion"""
+        ranks = []
+        for spot in self.hotspots.values():
+            if not spot.refined and len(spot.sketch) < 2:
+                continue
+            hours = self.ring_seconds.get(spot.ring, 0.0) / 3600
+            tons_per_hour = spot.refined / hours if hours else 0.0
+            ranks.append(HotspotRank(
+                spot.ring, spot.material, spot.prospected, spot.refined, tons_per_hour,
+                tons_per_hour * self.value_per_ton(spot.material),
+                spot.sketch.quantile(0.5), spot.sketch.quantile(0.9),
+            ))
+        ranks.sort(key=lambda r: (-r.credits_per_hour, -r.median))
+        return ranks[:limit] if limit is not None else ranks
+
+
+# =============================================================================
+# BULK LOADING
+# =============================================================================
+
+def _columns(store: EventStore, event_type: str, *columns: str) -> list[np.ndarray]:
+    parts = list(store.partitions(event_type))
+    if not parts:
+        return [np.empty(0, np.int64) for _ in columns]
+    return [np.concatenate([np.asarray(p.column(c)) for p in parts]) for c in columns]
+
+
+def _codes(store: EventStore, event_type: str, column: str, vocab: dict, key=commodity_key) -> np.ndarray:
+    """String column as codes into ``vocab`` (name -> code, extended in place)"""
+    codes = []
+    for part in store.partitions(event_type):
+        table = part.dictionary(column)
+        remap = np.array([vocab.setdefault(key(name), len(vocab)) for name in table] or [0], np.int64)
+        codes.append(remap[np.asarray(part.column(column), np.int64)])
+    return np.concatenate(codes) if codes else np.empty(0, np.int64)
+
+
+def _group_sum(codes: np.ndarray, size: int, weights=None) -> np.ndarray:
+    return np.bincount(codes, weights=weights, minlength=size)[:size]
+
+
+def load_mining(store: EventStore) -> MiningStats:
+    """MiningStats over every mining event in the store"""
+    stats = MiningStats()
+    rings, materials, levels, body_types = {UNKNOWN_RING: 0}, {}, {}, {}
+
+    # Ring or belt the commander dropped into at each supercruise exit, in time order
+    exit_ts, = _columns(store, "SupercruiseExit", "timestamp")
+    exit_rings = _codes(store, "SupercruiseExit", "Body", rings, key=str)
+    exit_types = _codes(store, "SupercruiseExit", "BodyType", body_types, key=str)
+    in_ring = np.isin(exit_types, [body_types[t] for t in MINING_BODIES if t in body_types])
+    exit_rings = np.where(in_ring, exit_rings, rings[UNKNOWN_RING])
+    order = np.argsort(exit_ts, kind="stable")
+    exit_ts, exit_rings = exit_ts[order], exit_rings[order]
+
+    def ring_at(ts: np.ndarray) -> np.ndarray:
+        if not len(exit_ts):
+            return np.zeros(len(ts), np.int64)
+        position = np.searchsorted(exit_ts, ts, side="right") - 1
+        return np.where(position >= 0, exit_rings[np.maximum(position, 0)], rings[UNKNOWN_RING])
+
+    rock_ts, remaining = _columns(store, "ProspectedAsteroid", "timestamp", "Remaining")
+    rock_levels = _codes(store, "ProspectedAsteroid", "Content", levels, key=content_level)
+    motherlodes = _codes(store, "ProspectedAsteroid", "MotherlodeMaterial", materials)
+    mat_ts, proportion = _columns(store, "ProspectedMaterial", "timestamp", "Proportion")
+    mat_codes = _codes(store, "ProspectedMaterial", "Name", materials)
+    refined_ts, = _columns(store, "MiningRefined", "timestamp")
+    refined_codes = _codes(store, "MiningRefined", "Type", materials)
+    sold_codes = _codes(store, "MarketSell", "Type", materials)
+    sale, sold = _columns(store, "MarketSell", "TotalSale", "Count")
+    ring_names, names = list(rings), list(materials)
+    n = max(len(names), 1)
+
+    level_counts = _group_sum(rock_levels, len(levels))
+    for level, code in levels.items():
+        if level:
+            stats.content[level] = int(level_counts[code])
+    refined_tons = _group_sum(refined_codes, len(names))
+    stats.refined = {names[m]: int(tons) for m, tons in enumerate(refined_tons) if tons}
+    credits, tons = _group_sum(sold_codes, len(names), sale), _group_sum(sold_codes, len(names), sold)
+    stats.sales = {names[m]: (int(credits[m]), int(tons[m])) for m in np.flatnonzero(tons)}
+
+    # Time spent mining: gaps between consecutive prospects/refines, charged to the later one's ring
+    mining_ts = np.concatenate((rock_ts, refined_ts)).astype(np.int64)
+    order = np.argsort(mining_ts, kind="stable")
+    mining_ts = mining_ts[order]
+    mining_rings = ring_at(mining_ts)
+    gaps = np.diff(mining_ts)
+    counted = (gaps > 0) & (gaps <= MAX_GAP)
+    ring_seconds = _group_sum(mining_rings[1:][counted], len(ring_names), gaps[counted])
+    stats.ring_seconds = {ring_names[r]: float(ring_seconds[r]) for r in np.flatnonzero(ring_seconds)}
+    stats.seconds = float(gaps[counted].sum())
+
+    # Hotspots: group prospected proportions and refined tons by ring * n + material
+    mat_spots = ring_at(mat_ts) * n + mat_codes
+    refined_spots = ring_at(refined_ts) * n + refined_codes
+    spots = np.unique(np.concatenate((mat_spots, refined_spots)))
+    mat_index = np.searchsorted(spots, mat_spots)
+    prospected = _group_sum(mat_index, len(spots))
+    refined = _group_sum(np.searchsorted(spots, refined_spots), len(spots))
+    sketches = _group_sum(mat_index * SKETCH_BINS + _bins(proportion), len(spots) * SKETCH_BINS)
+    sketches = sketches.reshape(len(spots), SKETCH_BINS)
+    for i, spot in enumerate(spots.tolist()):
+        ring, material = ring_names[spot // n], names[spot % n]
+        stats.hotspots[(ring, material)] = Hotspot(
+            ring, material, int(prospected[i]), int(refined[i]), ProportionSketch(sketches[i].copy()),
+        )
+
+    # Where things stand, so live events carry on from here
+    if len(exit_rings):
+        stats.ring = ring_names[exit_rings[-1]]
+    if len(mining_ts):
+        stats.last_mining = int(mining_ts[-1])
+    if len(rock_ts):
+        last = int(np.argmax(rock_ts))
+        rows = np.flatnonzero(mat_ts == rock_ts[last])
+        level_names = list(levels)
+        stats.last_prospect = Prospect(
+            ring_names[ring_at(rock_ts[last:last + 1])[0]], level_names[rock_levels[last]],
+            sorted(((names[mat_codes[r]], float(proportion[r])) for r in rows), key=lambda m: -m[1]),
+            names[motherlodes[last]] if names else "", float(remaining[last]),
+        )
+    return stats
@@ -0,0 +1,375 @@
+"""
+Incrementally trained prediction models
+Every model here is a ridge regression kept as its sufficient statistics
+(X'X, X'y, y'y and the row count), so training on new feature rows only
+adds their outer products and the result is exactly what a full retrain
+over all rows would give. Only sealed rows are trained on; the last daily
+and session row may still grow and is held back until the next one starts.
+
+    wealth          daily wealth ~ trend + weekly seasonality
+    income          daily income ~ trend + weekly seasonality
+    session_income  session income ~ length + start hour + weekday
+    session_mining  tons refined per session, same inputs
+
+Model state lives in <data dir>/models/MODELS.json together with how many
+feature rows each table has contributed and the store watermark trained
+up to. After training, any forecast in forecasts.FORECASTS not yet cached
+for the newest event timestamp is fitted and put in the ForecastCache.
+The GUI runs this module as a subprocess so training never touches its
+threads:
+
+Features, models and forecasts live in the data directory of the store
+trained on: --data-dir, else the parent of --store, else the default.
+
+Run with: python models.py [--data-dir DIR] [--store DIR] [--full]
+
+It prints one JSON line with the model status and predictions.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from event_store import EventStore, default_data_dir
+from features import DAY, FeatureStore
+from forecasts import FORECASTS, Forecast, ForecastCache
+from queries import watermark_key
+
+
+MODELS_VERSION = 1
+RIDGE_ALPHA = 1e-3
+TREND_SCALE = 365 * DAY  # trend input in years since the first day
+ELITE_RANK = 8  # trade rank of Elite; Progress is percent towards the next rank
+
+
+def default_model_dir() -> Path:
+    return default_data_dir() / "models"
+
+
+class RidgeModel:
+    """Ridge regression fitted from running sums, with prediction intervals"""
+
+    def __init__(self, width: int, alpha: float = RIDGE_ALPHA):
+        self.xtx = np.zeros((width, width))
+        self.xty = np.zeros(width)
+        self.yty = 0.0
+        self.n = 0
+        self.alpha = alpha
+        self._solved = None
+
+    def partial_fit(self, x: np.ndarray, y: np.ndarray):
+        keep = np.isfinite(y) & np.isfinite(x).all(axis=1)
+        x, y = x[keep], y[keep]
+        self.xtx += x.T @ x
+        self.xty += x.T @ y
+        self.yty += float(y @ y)
+        self.n += len(y)
+        self._solved = None
+
+    def _solve(self):
+        if self._solved is None:
+            # The intercept column is left unpenalised
+            penalty = self.alpha * np.eye(len(self.xty)) * max(1.0, np.trace(self.xtx) / len(self.xty))
+            penalty[0, 0] = 0.0
+            inverse = np.linalg.pinv(self.xtx + penalty)
+            coef = inverse @ self.xty
+            sse = self.yty - 2 * coef @ self.xty + coef @ self.xtx @ coef
+            dof = max(self.n - len(coef), 1)
+            self._solved = (coef, inverse, max(sse, 0.0) / dof)
+        return self._solved
+
+    def predict(self, x: np.ndarray, z: float = 1.96):
+        """Point predictions and the ``z``-sigma prediction interval half-width"""
+        coef, inverse, variance = self._solve()
+        leverage = np.einsum("ij,jk,ik->i", x, inverse, x)
+        return x @ coef, z * np.sqrt(variance * (1 + np.maximum(leverage, 0)))
+
+    def to_dict(self) -> dict:
+        return {"xtx": self.xtx.tolist(), "xty": self.xty.tolist(), "yty": self.yty,
+                "n": self.n, "alpha": self.alpha}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RidgeModel":
+        model = cls(len(data["xty"]), data["alpha"])
+        model.xtx = np.asarray(data["xtx"], dtype=np.float64)
+        model.xty = np.asarray(data["xty"], dtype=np.float64)
+        model.yty = float(data["yty"])
+        model.n = int(data["n"])
+        return model
+
+
+# =============================================================================
+# DESIGN MATRICES
+# =============================================================================
+
+def _cyclic(values: np.ndarray, period: float) -> list[np.ndarray]:
+    angle = 2 * math.pi * values / period
+    return [np.sin(angle), np.cos(angle)]
+
+
+def daily_design(days: np.ndarray, origin: float) -> np.ndarray:
+    """Intercept, trend and weekly seasonality for each day start"""
+    weekday = (days // DAY + 3) % 7  # 1970-01-01 was a Thursday
+    return np.column_stack([np.ones(len(days)), (days - origin) / TREND_SCALE,
+                            *_cyclic(weekday, 7)])
+
+
+def session_design(hours: np.ndarray, start_hour: np.ndarray, weekday: np.ndarray) -> np.ndarray:
+    """Intercept, session length and daily/weekly cycles for each session"""
+    return np.column_stack([np.ones(len(hours)), hours,
+                            *_cyclic(start_hour, 24), *_cyclic(weekday, 7)])
+
+
+DAILY_MODELS = {"wealth": "wealth", "income": "income"}
+SESSION_MODELS = {"session_income": "income", "session_mining": "mining_tons"}
+
+
+# =============================================================================
+# TRAINING
+# =============================================================================
+
+class ModelSet:
+    """The models, how much of each feature table they have seen, and when"""
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root else default_model_dir()
+        self.state = self._load()
+        self.models = {name: RidgeModel.from_dict(data) for name, data in self.state["models"].items()}
+
+    def _load(self) -> dict:
+        try:
+            with open(self.root / "MODELS.json", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") == MODELS_VERSION:
+                return state
+        except (OSError, ValueError, AttributeError):
+            pass
+        return self._fresh()
+
+    @staticmethod
+    def _fresh() -> dict:
+        return {"version": MODELS_VERSION, "models": {}, "rows": {"daily": 0, "sessions": 0},
+                "origin": None, "watermark": None, "trained_at": None, "predictions": {}}
+
+    def reset(self):
+        self.state = self._fresh()
+        self.models = {}
+
+    def save(self):
+        self.state["models"] = {name: model.to_dict() for name, model in self.models.items()}
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / "MODELS.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.root / "MODELS.json")
+
+    def model(self, name: str, width: int) -> RidgeModel:
+        if name not in self.models:
+            self.models[name] = RidgeModel(width)
+        return self.models[name]
+
+    def train(self, features: FeatureStore) -> int:
+        """Fold in the feature rows sealed since the last run; returns how many"""
+        rows = self.state["rows"]
+        daily = features.daily.rows()
+        sessions = features.sessions.rows()
+        new = 0
+
+        sealed = daily[rows["daily"]:len(daily) - 1]
+        if len(sealed):
+            if self.state["origin"] is None:
+                self.state["origin"] = float(daily[0, 0])
+            x = daily_design(features.daily.column(sealed, "day"), self.state["origin"])
+            for name, column in DAILY_MODELS.items():
+                self.model(name, x.shape[1]).partial_fit(x, features.daily.column(sealed, column))
+            rows["daily"] += len(sealed)
+            new += len(sealed)
+
+        sealed = sessions[rows["sessions"]:len(sessions) - 1]
+        if len(sealed):
+            column = lambda name: features.sessions.column(sealed, name)
+            x = session_design(column("hours"), column("start_hour"), column("weekday"))
+            for name, target in SESSION_MODELS.items():
+                self.model(name, x.shape[1]).partial_fit(x, column(target))
+            rows["sessions"] += len(sealed)
+            new += len(sealed)
+
+        self.state["predictions"] = self.predict(features, daily, sessions)
+        return new
+
+    def predict(self, features: FeatureStore, daily: np.ndarray, sessions: np.ndarray) -> dict:
+        """Headline predictions shown on the PredictionPanel"""
+        predictions = {}
+        if "income" in self.models and self.models["income"].n and len(daily):
+            last = daily[-1, 0]
+            days = last + DAY * np.arange(1, 31)
+            income, _ = self.models["income"].predict(daily_design(days, self.state["origin"]))
+            predictions["income_30d"] = float(np.maximum(income, 0).sum())
+        if "session_mining" in self.models and self.models["session_mining"].n and len(sessions):
+            # A typical-length session starting at the hour this commander usually starts
+            hours = float(np.median(features.sessions.column(sessions, "hours")))
+            start_hour = float(np.median(features.sessions.column(sessions, "start_hour")))
+            weekday = float((time.time() // DAY + 3) % 7)
+            x = session_design(np.array([hours]), np.array([start_hour]), np.array([weekday]))
+            for name in SESSION_MODELS:
+                value, spread = self.models[name].predict(x)
+                predictions[name] = [float(max(value[0], 0)), float(spread[0])]
+            predictions["session_hours"] = hours
+        if len(sessions):
+            # Income per hour played by session start hour
+            start_hour = features.sessions.column(sessions, "start_hour").astype(np.int64)
+            income = np.bincount(start_hour, features.sessions.column(sessions, "income"), minlength=24)
+            hours = np.bincount(start_hour, features.sessions.column(sessions, "hours"), minlength=24)
+            rate = np.divide(income, hours, out=np.zeros(24), where=hours > 0.25)
+            predictions["best_hours"] = [[int(h), float(rate[h])] for h in np.argsort(-rate)[:3] if rate[h] > 0]
+        return predictions
+
+    def status(self) -> dict:
+        return {key: self.state[key] for key in ("watermark", "trained_at", "rows", "predictions")}
+
+
+# =============================================================================
+# FORECASTS
+# =============================================================================
+
+def _columns(store: EventStore, event_type: str, *columns: str) -> list[np.ndarray]:
+    parts = list(store.partitions(event_type))
+    if not parts:
+        return [np.empty(0, np.int64) for _ in columns]
+    return [np.concatenate([np.asarray(p.column(c)) for p in parts]) for c in columns]
+
+
+def wealth_forecast(models: ModelSet, features: FeatureStore, through: int, params: dict) -> Forecast | None:
+    """Daily wealth for the next ``horizon_days`` with a ``z``-sigma prediction band"""
+    model = models.models.get("wealth")
+    daily = features.daily.rows()
+    if model is None or model.n < 3 or not len(daily):
+        return None
+    days = features.daily.column(daily, "day")
+    wealth = features.daily.column(daily, "wealth")
+    known = np.isfinite(wealth)
+    history_start = days[-1] - params["history_days"] * DAY
+    history = [[float(d), float(w)] for d, w in zip(days[known], wealth[known]) if d >= history_start]
+
+    future = days[-1] + DAY * np.arange(1, params["horizon_days"] + 1)
+    mean, spread = model.predict(daily_design(future, models.state["origin"]), params["z"])
+    # Anchor the forecast on the last known wealth rather than the fitted level
+    if known.any():
+        offset = wealth[known][-1] - model.predict(daily_design(days[known][-1:], models.state["origin"]))[0][0]
+        mean = mean + offset
+    points = [[float(d), float(m), float(m - s), float(m + s)] for d, m, s in zip(future, mean, spread)]
+    return Forecast("wealth", params, through, points=points, history=history,
+                    summary={"final": points[-1][1], "lower": points[-1][2], "upper": points[-1][3]})
+
+
+def elite_forecast(store: EventStore, through: int, params: dict) -> Forecast | None:
+    """Days until Elite trade rank from the recent trend of rank + progress"""
+    rank_ts, ranks = _columns(store, "Rank", "timestamp", "Trade")
+    progress_ts, progress = _columns(store, "Progress", "timestamp", "Trade")
+    if not len(rank_ts) or not len(progress_ts):
+        return None
+    order = np.argsort(rank_ts, kind="stable")
+    rank_ts, ranks = rank_ts[order], ranks[order]
+    at = np.searchsorted(rank_ts, progress_ts, side="right") - 1
+    keep = at >= 0
+    ts = progress_ts[keep].astype(np.float64)
+    score = ranks[at[keep]] + progress[keep] / 100.0
+    order = np.argsort(ts, kind="stable")
+    ts, score = ts[order], score[order]
+    if not len(ts):
+        return None
+
+    current = float(score[-1])
+    summary = {"score": current, "days": None, "low": None, "high": None}
+    if current >= ELITE_RANK:
+        summary["days"] = 0.0
+        return Forecast("elite_trade", params, through, summary=summary)
+
+    recent = ts >= ts[-1] - params["window_days"] * DAY
+    x, y = (ts[recent] - ts[-1]) / DAY, score[recent]
+    history = [[float(t), float(v)] for t, v in zip(ts[recent], y)]
+    if len(np.unique(x)) < 3:
+        return Forecast("elite_trade", params, through, history=history, summary=summary)
+    (slope, level), cov = np.polyfit(x, y, 1, cov=True)
+    slope_se = float(np.sqrt(max(cov[0, 0], 0.0)))
+    if slope <= 0:
+        return Forecast("elite_trade", params, through, history=history, summary=summary)
+
+    remaining = ELITE_RANK - level
+    fast, slow = slope + params["z"] * slope_se, slope - params["z"] * slope_se
+    summary.update(days=float(remaining / slope), low=float(remaining / fast),
+                   high=float(remaining / slow) if slow > 0 else None)
+    horizon = ts[-1] + DAY * np.arange(0, int(np.ceil(summary["days"])) + 1)
+    steps = (horizon - ts[-1]) / DAY
+    points = [[float(t), float(level + slope * d), float(level + slow * d), float(level + fast * d)]
+              for t, d in zip(horizon, steps)]
+    return Forecast("elite_trade", params, through, points=points, history=history, summary=summary)
+
+
+def update_forecasts(store: EventStore, models: ModelSet, features: FeatureStore,
+                     cache: ForecastCache, through: int) -> list[str]:
+    """Fit and cache every forecast not yet cached for ``through``; returns the refitted names"""
+    fitted = []
+    for name, params in FORECASTS.items():
+        if cache.get(name, params, through) is not None:
+            continue
+        if name == "wealth":
+            forecast = wealth_forecast(models, features, through, params)
+        else:
+            forecast = elite_forecast(store, through, params)
+        if forecast is not None:
+            cache.put(forecast)
+            fitted.append(name)
+    return fitted
+
+
+def train(store: EventStore, features: FeatureStore | None = None, models: ModelSet | None = None,
+          full: bool = False, cache: ForecastCache | None = None) -> dict:
+    """Bring features, models and cached forecasts up to the store's watermark"""
+    features = features or FeatureStore()
+    models = models or ModelSet()
+    cache = cache or ForecastCache()
+    mark = store.watermark()
+    key = watermark_key(mark)
+    started = time.perf_counter()
+    new_rows = 0
+    if full:
+        features.rebuild(store, key)
+        models.reset()
+    if full or models.state["watermark"] != key:
+        features.update(store, key)
+        new_rows = models.train(features)
+        models.state["watermark"] = key
+        models.state["trained_at"] = int(time.time())
+        models.save()
+    status = models.status()
+    status["new_rows"] = new_rows
+    status["forecasts"] = update_forecasts(store, models, features, cache, mark["last_timestamp"])
+    status["elapsed"] = time.perf_counter() - started
+    return status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update the EDxDC feature store and prediction models")
+    parser.add_argument("--data-dir", default=None,
+                        help="where features, models and forecasts live (default: the parent of --store, "
+                             "else $EDXDC_DATA_DIR or ~/.edxdc)")
+    parser.add_argument("--store", default=None, help="event store directory (default: <data dir>/store)")
+    parser.add_argument("--full", action="store_true", help="rebuild features and retrain from scratch")
+    args = parser.parse_args(argv)
+    data_dir = args.data_dir or (Path(args.store).resolve().parent if args.store else None)
+    if data_dir:
+        os.environ["EDXDC_DATA_DIR"] = str(data_dir)
+    status = train(EventStore(args.store), full=args.full)
+    print(json.dumps(status))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
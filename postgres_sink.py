@@ -0,0 +1,253 @@
+"""
+Batched PostgreSQL event sink
+Parsed journal events are queued and written by a few background writer
+threads, each batch as one COPY ... FROM STDIN and one commit:
+
+    edxdc_events(timestamp timestamptz, event text, data jsonb)
+
+A writer commits when its batch reaches BATCH_SIZE rows or when the queue
+has been idle for IDLE_COMMIT seconds, so a bulk backfill runs in large
+batches while a live session still lands within a second. The queue is
+bounded: put() blocks (backfill backpressure) and offer() refuses rather
+than block the GUI thread. Batches that fail on the connection are
+retried on a fresh pooled connection, never dropped; a batch the server
+rejects for its data is bisected and the offending rows are appended to
+postgres_rejected.jsonl in the data directory.
+
+The GUI writes live events here when $EDXDC_POSTGRES_DSN is set, and
+ingest.py --postgres DSN backfills a journal directory. Requires psycopg 3
+(pip install "psycopg[binary]"); without it, or without a DSN, the rest
+of EDxDC runs as before.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import psycopg
+except ImportError:
+    psycopg = None
+
+from event_store import default_data_dir
+
+
+BATCH_SIZE = 5_000
+MAX_QUEUED = 100_000    # events waiting for a writer before put() blocks
+IDLE_COMMIT = 0.5       # seconds without new events before a partial batch is committed
+POOL_SIZE = 2
+RETRY_DELAY = 2.0
+
+DEAD_LETTER_FILE = "postgres_rejected.jsonl"
+
+TABLE = "edxdc_events"
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS {table} (
+    timestamp timestamptz NOT NULL,
+    event text NOT NULL,
+    data jsonb NOT NULL
+);
+CREATE INDEX IF NOT EXISTS {table}_event_timestamp ON {table} (event, timestamp);
+"""
+COPY_SQL = "COPY {table} (timestamp, event, data) FROM STDIN"
+
+
+def default_dsn() -> str | None:
+    return os.environ.get("EDXDC_POSTGRES_DSN") or None
+
+
+class ConnectionPool:
+    """A few long-lived connections handed out one at a time"""
+
+    def __init__(self, dsn: str, size: int = POOL_SIZE):
+        self.dsn = dsn
+        self._idle = queue.LifoQueue()
+        self._slots = threading.Semaphore(size)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; it is discarded instead of returned if the block raises"""
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = psycopg.connect(self.dsn)
+            try:
+                yield conn
+            except BaseException:
+                conn.close()
+                raise
+            if conn.closed:
+                return
+            self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class PostgresSink:
+    """Bounded queue of events drained by writer threads in COPY batches"""
+
+    def __init__(self, dsn: str, writers: int = POOL_SIZE, batch_size: int = BATCH_SIZE,
+                 max_queued: int = MAX_QUEUED, idle_commit: float = IDLE_COMMIT,
+                 table: str = TABLE, dead_letter=None):
+        if psycopg is None:
+            raise RuntimeError('PostgreSQL output needs psycopg 3: pip install "psycopg[binary]"')
+        self.pool = ConnectionPool(dsn, writers)
+        self.table = table
+        self.dead_letter = Path(dead_letter) if dead_letter else default_data_dir() / DEAD_LETTER_FILE
+        # Errors no retry can fix: the rows themselves are bad
+        self._rejects = (psycopg.DataError, psycopg.IntegrityError)
+        self.batch_size = batch_size
+        self.idle_commit = idle_commit
+        self.queue = queue.Queue(maxsize=max_queued)
+        self.written = 0
+        self.batches = 0
+        self.refused = 0
+        self.rejected = 0
+        self.last_error = None
+        self._schema_ready = False
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        # Nothing connects until the first batch, so creating a sink never blocks the caller
+        self._threads = [threading.Thread(target=self._run, name=f"pg-writer-{i}", daemon=True)
+                         for i in range(writers)]
+        for thread in self._threads:
+            thread.start()
+
+    # -------------------------------------------------------------------------
+    # Producers
+    # -------------------------------------------------------------------------
+
+    def put(self, events, timeout: float | None = None):
+        """Queue events, blocking while the queue is full"""
+        for event in events:
+            self.queue.put(event, timeout=timeout)
+
+    def offer(self, events) -> int:
+        """Queue what fits without blocking; returns how many were refused"""
+        refused = 0
+        for event in events:
+            try:
+                self.queue.put_nowait(event)
+            except queue.Full:
+                refused += 1
+        if refused:
+            with self._lock:
+                self.refused += refused
+        return refused
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued event has been committed; False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float | None = None) -> bool:
+        """Flush and stop the writers; with a timeout, unwritten events are abandoned"""
+        flushed = self.flush(timeout)
+        self._stopping.set()
+        if flushed:
+            for thread in self._threads:
+                thread.join()
+        self.pool.close()
+        return flushed
+
+    @property
+    def pending(self) -> int:
+        return self.queue.qsize()
+
+    # -------------------------------------------------------------------------
+    # Writers
+    # -------------------------------------------------------------------------
+
+    def _take_batch(self) -> list[dict]:
+        """Up to batch_size events; returns early once the queue goes idle"""
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get(timeout=self.idle_commit))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._take_batch()
+            if not batch:
+                continue
+            chunks = [batch]
+            while chunks and not self._stopping.is_set():
+                chunk = chunks.pop()
+                try:
+                    self._write(chunk)
+                except self._rejects as exc:
+                    # Bisect until the rows the server refuses are isolated
+                    if len(chunk) == 1:
+                        self._reject(chunk[0], exc)
+                    else:
+                        middle = len(chunk) // 2
+                        chunks += [chunk[middle:], chunk[:middle]]
+                    continue
+                except Exception as exc:
+                    # Keep the rows and try again on a fresh connection
+                    self.last_error = str(exc).strip() or type(exc).__name__
+                    chunks.append(chunk)
+                    self._stopping.wait(RETRY_DELAY)
+                    continue
+                with self._lock:
+                    self.written += len(chunk)
+                    self.batches += 1
+                self.last_error = None
+            # Whatever is left once stopping is abandoned, as close() documents
+            for _ in batch:
+                self.queue.task_done()
+
+    def _reject(self, event: dict, exc: Exception):
+        with self._lock:
+            self.rejected += 1
+            try:
+                self.dead_letter.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.dead_letter, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"error": str(exc).strip() or type(exc).__name__,
+                                        "event": event}, ensure_ascii=False) + "\n")
+            except OSError:
+                pass
+
+    def _write(self, batch: list[dict]):
+        with self.pool.connection() as conn:
+            if not self._schema_ready:
+                conn.execute(SCHEMA_SQL.format(table=self.table))
+            with conn.cursor() as cur:
+                with cur.copy(COPY_SQL.format(table=self.table)) as copy:
+                    for event in batch:
+                        copy.write_row((event.get("timestamp"), event.get("event", ""),
+                                        json.dumps(event, ensure_ascii=False)))
+            conn.commit()
+        self._schema_ready = True
+
+    def status(self) -> str:
+        """One-line state for the status footer"""
+        if self.last_error:
+            return f"PostgreSQL: Error, retrying ({self.pending:,} queued)"
+        if self.pending:
+            return f"PostgreSQL: Writing ({self.pending:,} queued)"
+        if not self.batches:
+            return "PostgreSQL: Waiting for events"
+        if self.rejected:
+            return f"PostgreSQL: Connected · {self.written:,} events, {self.rejected:,} rejected"
+        return f"PostgreSQL: Connected · {self.written:,} events"
+
@@ -0,0 +1,320 @@
+"""
+Market price history
+Every Market.json the game writes is one snapshot of a station's
+commodity prices. Most prices barely move between visits, so snapshots
+are stored as fixed-width int32 rows holding only what changed since the
+station's previous snapshot, with a full keyframe every few snapshots to
+bound how far a lookup has to replay:
+
+    <root>/snapshots.dat       int32 rows: commodity, buy, sell, stock, demand
+    <root>/snapshots.idx       int64 records: market, timestamp, first row, rows, keyframe
+    <root>/commodities.json    interned commodity names, id = position
+    <root>/stations.json       market id -> station and system name
+
+The index is small and loaded whole; it is grouped per station into
+sorted timestamp lists, so (station, commodity, time) lookups bisect to a
+snapshot and replay at most KEYFRAME_INTERVAL deltas. The latest state of
+each station is cached once built and kept current on append.
+
+No Qt imports here.
+"""
+
+import array
+import json
+import os
+import sys
+import threading
+from bisect import bisect_right
+from pathlib import Path
+from typing import NamedTuple
+
+from event_store import default_data_dir, parse_timestamp
+
+
+KEYFRAME_INTERVAL = 16
+ROW_WIDTH = 5     # commodity id, buy, sell, stock, demand
+INDEX_WIDTH = 5   # market id, timestamp, first row, row count, keyframe flag
+REMOVED = -1      # buy price of a row marking a commodity no longer listed
+
+
+class Price(NamedTuple):
+    buy: int
+    sell: int
+    stock: int
+    demand: int
+
+
+def default_price_dir() -> Path:
+    return default_data_dir() / "prices"
+
+
+def commodity_key(name: str) -> str:
+    """Journal commodity symbol, e.g. "$Gold_Name;" and "Gold" -> "gold" """
+    name = name.strip().lower()
+    if name.startswith("$") and name.endswith("_name;"):
+        name = name[1:-6]
+    return name
+
+
+def _read_array(path: Path, typecode: str, start: int = 0, count: int | None = None) -> array.array:
+    try:
+        with open(path, "rb") as f:
+            return _read_from(f, typecode, start, count)
+    except OSError:
+        return array.array(typecode)
+
+
+def _read_from(f, typecode: str, start: int = 0, count: int | None = None) -> array.array:
+    data = array.array(typecode)
+    f.seek(start * data.itemsize)
+    raw = f.read() if count is None else f.read(count * data.itemsize)
+    data.frombytes(raw[:len(raw) - len(raw) % data.itemsize])
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data
+
+
+def _append_array(path: Path, data: array.array):
+    if sys.byteorder != "little":
+        data = array.array(data.typecode, data)
+        data.byteswap()
+    with open(path, "ab") as f:
+        data.tofile(f)
+
+
+def _write_json(path: Path, value):
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+class PriceStore:
+    """Delta-encoded Market.json history for every station visited.
+
+    The GUI thread records snapshots while worker jobs read them; writing
+    and every lookup take a lock so readers never see a half-added one.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root else default_price_dir()
+        self.commodities = self._load_json("commodities.json", [])
+        self._ids = {name: i for i, name in enumerate(self.commodities)}
+        self.stations = {int(k): v for k, v in self._load_json("stations.json", {}).items()}
+        self._index = _read_array(self.root / "snapshots.idx", "q")
+        self._index = self._index[:len(self._index) - len(self._index) % INDEX_WIDTH]
+        try:
+            self._rows = (self.root / "snapshots.dat").stat().st_size // (4 * ROW_WIDTH)
+        except OSError:
+            self._rows = 0
+        # market id -> ([timestamps], [snapshot numbers]) in time order
+        self._by_station = {}
+        for snap in range(len(self._index) // INDEX_WIDTH):
+            market, ts = self._index[snap * INDEX_WIDTH], self._index[snap * INDEX_WIDTH + 1]
+            times, snaps = self._by_station.setdefault(market, ([], []))
+            times.append(ts)
+            snaps.append(snap)
+        self._latest = {}
+        self._lock = threading.RLock()
+
+    def _load_json(self, name: str, default):
+        try:
+            with open(self.root / name, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return default
+
+    def __len__(self):
+        return len(self._index) // INDEX_WIDTH
+
+    def markets(self) -> list[int]:
+        with self._lock:
+            return list(self._by_station)
+
+    def last_market(self) -> int | None:
+        """Station of the most recently recorded snapshot"""
+        with self._lock:
+            return self._index[-INDEX_WIDTH] if len(self._index) else None
+
+    def intern(self, name: str) -> int:
+        key = commodity_key(name)
+        cid = self._ids.get(key)
+        if cid is None:
+            cid = self._ids[key] = len(self.commodities)
+            self.commodities.append(key)
+        return cid
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    def add_snapshot(self, market_id: int, timestamp: int, prices: dict[str, Price],
+                     station: str = "", system: str = "") -> bool:
+        """Record a station's prices; False if it is not newer than the last one"""
+        with self._lock:
+            return self._add_snapshot(market_id, timestamp, prices, station, system)
+
+    def _add_snapshot(self, market_id, timestamp, prices, station, system) -> bool:
+        times, snaps = self._by_station.get(market_id, ([], []))
+        if times and timestamp <= times[-1]:
+            return False
+        known = len(self.commodities)
+        state = {self.intern(name): tuple(price) for name, price in prices.items()}
+        previous = self.latest_ids(market_id)
+        keyframe = len(snaps) % KEYFRAME_INTERVAL == 0
+
+        rows = array.array("i")
+        if keyframe:
+            for cid, price in sorted(state.items()):
+                rows.extend((cid, *price))
+        else:
+            for cid, price in sorted(state.items()):
+                if previous.get(cid) != price:
+                    rows.extend((cid, *price))
+            for cid in sorted(previous.keys() - state.keys()):
+                rows.extend((cid, REMOVED, 0, 0, 0))
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        record = array.array("q", (market_id, timestamp, self._rows, len(rows) // ROW_WIDTH, int(keyframe)))
+        _append_array(self.root / "snapshots.dat", rows)
+        _append_array(self.root / "snapshots.idx", record)
+        self._rows += len(rows) // ROW_WIDTH
+        snap = len(self)
+        self._index.extend(record)
+        times, snaps = self._by_station.setdefault(market_id, ([], []))
+        times.append(timestamp)
+        snaps.append(snap)
+        self._latest[market_id] = state
+
+        if len(self.commodities) != known:
+            _write_json(self.root / "commodities.json", self.commodities)
+        names = {"station": station, "system": system}
+        if station and self.stations.get(market_id) != names:
+            self.stations[market_id] = names
+            _write_json(self.root / "stations.json", {str(k): v for k, v in self.stations.items()})
+        return True
+
+    def add_market_json(self, market: dict) -> bool:
+        """Record a parsed Market.json"""
+        market_id = market.get("MarketID")
+        timestamp = parse_timestamp(market.get("timestamp", ""))
+        if not market_id or not timestamp:
+            return False
+        prices = {
+            item.get("Name", ""): Price(
+                int(item.get("BuyPrice", 0)), int(item.get("SellPrice", 0)),
+                int(item.get("Stock", 0)), int(item.get("Demand", 0)),
+            )
+            for item in market.get("Items") or []
+            if item.get("Name")
+        }
+        return self.add_snapshot(market_id, timestamp, prices,
+                                 market.get("StationName", ""), market.get("StarSystem", ""))
+
+    def add_market_file(self, path) -> bool:
+        try:
+            with open(path, "rb") as f:
+                market = json.loads(f.read())
+        except (OSError, ValueError):
+            return False
+        return isinstance(market, dict) and self.add_market_json(market)
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    def _record(self, snap: int) -> tuple[int, int, int, int, int]:
+        return tuple(self._index[snap * INDEX_WIDTH:(snap + 1) * INDEX_WIDTH])
+
+    def _replay(self, market_id: int, last: int, first: int | None = None, visit=None) -> dict[int, tuple]:
+        """State after the station's ``last``-th snapshot.
+
+        Replays from the keyframe at or before ``first`` (default ``last``),
+        calling ``visit(timestamp, state)`` for every snapshot from ``first``.
+        """
+        _, snaps = self._by_station[market_id]
+        first = last if first is None else first
+        start = first
+        while start > 0 and not self._record(snaps[start])[4]:
+            start -= 1
+        try:
+            dat = open(self.root / "snapshots.dat", "rb")
+        except OSError:
+            return {}
+        state = {}
+        with dat:
+            for i in range(start, last + 1):
+                _, ts, row, count, keyframe = self._record(snaps[i])
+                rows = _read_from(dat, "i", row * ROW_WIDTH, count * ROW_WIDTH)
+                if keyframe:
+                    state = {}
+                for r in range(0, len(rows), ROW_WIDTH):
+                    cid = rows[r]
+                    if rows[r + 1] == REMOVED:
+                        state.pop(cid, None)
+                    else:
+                        state[cid] = tuple(rows[r + 1:r + ROW_WIDTH])
+                if visit is not None and i >= first:
+                    visit(ts, state)
+        return state
+
+    def latest_ids(self, market_id: int) -> dict[int, tuple]:
+        with self._lock:
+            state = self._latest.get(market_id)
+            if state is None:
+                times, _ = self._by_station.get(market_id, ([], []))
+                state = self._replay(market_id, len(times) - 1) if times else {}
+                self._latest[market_id] = state
+            return state
+
+    def _named(self, state: dict[int, tuple]) -> dict[str, Price]:
+        return {self.commodities[cid]: Price(*price) for cid, price in state.items()}
+
+    def latest(self, market_id: int) -> dict[str, Price]:
+        return self._named(self.latest_ids(market_id))
+
+    def snapshot_times(self, market_id: int) -> list[int]:
+        with self._lock:
+            return list(self._by_station.get(market_id, ([], []))[0])
+
+    def at(self, market_id: int, timestamp: int) -> dict[str, Price]:
+        """Prices as last seen at or before ``timestamp``"""
+        with self._lock:
+            times, _ = self._by_station.get(market_id, ([], []))
+            position = bisect_right(times, timestamp) - 1
+            if position < 0:
+                return {}
+            if position == len(times) - 1:
+                return self.latest(market_id)
+            return self._named(self._replay(market_id, position))
+
+    def previous(self, market_id: int) -> dict[str, Price]:
+        """Prices as of the visit before the latest one"""
+        with self._lock:
+            times, _ = self._by_station.get(market_id, ([], []))
+            return self._named(self._replay(market_id, len(times) - 2)) if len(times) > 1 else {}
+
+    def price(self, market_id: int, commodity: str, timestamp: int | None = None) -> Price | None:
+        prices = self.latest(market_id) if timestamp is None else self.at(market_id, timestamp)
+        return prices.get(commodity_key(commodity))
+
+    def history(self, market_id: int, commodity: str, start: int | None = None,
+                end: int | None = None) -> list[tuple[int, Price]]:
+        """(timestamp, price) at each snapshot in [start, end] listing the commodity"""
+        points = []
+
+        def visit(ts, state):
+            if cid in state:
+                points.append((ts, Price(*state[cid])))
+
+        with self._lock:
+            cid = self._ids.get(commodity_key(commodity))
+            times, _ = self._by_station.get(market_id, ([], []))
+            if cid is None or not times:
+                return []
+            first = bisect_right(times, start - 1) if start is not None else 0
+            last = bisect_right(times, end) - 1 if end is not None else len(times) - 1
+            if last < first:
+                return []
+            self._replay(market_id, last, first, visit)
+        return points
@@ -0,0 +1,172 @@
+"""
+Historical aggregate queries
+Named queries over the EventStore that back the MetricCards, plus a
+persistent result cache keyed by query name and store watermark. The UI
+shows the cached value straight away and only recomputes a query when the
+watermark shows the store has grown since it was cached.
+
+No Qt imports here; the GUI runs these on its worker pool.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Callable
+
+from event_store import EventStore, default_data_dir
+from prices import commodity_key
+
+
+def format_credits(amount: float) -> str:
+    """Compact credit amount, e.g. 5.16B CR"""
+    for threshold, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if abs(amount) >= threshold:
+            return f"{amount / threshold:.2f}{suffix} CR"
+    return f"{amount:,.0f} CR"
+
+
+def format_count(amount: float) -> str:
+    return f"{amount:,.0f}"
+
+
+@dataclass(frozen=True)
+class Query:
+    name: str
+    compute: Callable[[EventStore], object]
+    format: Callable[[object], str] = str
+
+
+QUERIES: dict[str, Query] = {}
+
+
+def query(name: str, format=format_count):
+    def register(fn):
+        QUERIES[name] = Query(name, fn, format)
+        return fn
+    return register
+
+
+def watermark_key(mark: dict) -> list:
+    return [mark.get("rows", 0), mark.get("last_timestamp", 0)]
+
+
+# =============================================================================
+# QUERIES
+# =============================================================================
+
+def _mined_types(store: EventStore) -> set[str]:
+    # Refined types are "$painite_name;" where sales say "painite"
+    return {commodity_key(name) for name in store.distinct("MiningRefined", "Type")}
+
+
+def _sales_by_type(store: EventStore, types: set[str] | None = None) -> dict[str, int]:
+    totals = {}
+    for part in store.partitions("MarketSell"):
+        table = part.dictionary("Type")
+        for code, sale in zip(part.column("Type"), part.column("TotalSale")):
+            name = commodity_key(table[code])
+            if types is None or name in types:
+                totals[name] = totals.get(name, 0) + sale
+    return totals
+
+
+# Events whose SystemAddress counts as a visit; RunningAggregates keys its
+# live system set the same way so the two counts agree
+VISITED_EVENTS = ("FSDJump", "Location")
+
+
+@query("analysis.systems_visited")
+def systems_visited(store):
+    visited = set().union(*(store.distinct(name, "SystemAddress") for name in VISITED_EVENTS))
+    visited.discard(0)  # missing address
+    return len(visited)
+
+
+@query("mining.total_mined", format=lambda v: f"{v:,} units")
+def total_mined(store):
+    return store.count("MiningRefined")
+
+
+@query("mining.profit", format=format_credits)
+def mining_profit(store):
+    return sum(_sales_by_type(store, _mined_types(store)).values())
+
+
+@query("mining.best_mineral", format=lambda v: (v or "---").title())
+def best_mineral(store):
+    sales = _sales_by_type(store, _mined_types(store))
+    return max(sales, key=sales.get) if sales else ""
+
+
+@query("hauling.trade_profit", format=format_credits)
+def trade_profit(store):
+    profit = 0
+    for part in store.partitions("MarketSell"):
+        for sale, paid, count in zip(part.column("TotalSale"), part.column("AvgPricePaid"),
+                                     part.column("Count")):
+            profit += sale - paid * count
+    return profit
+
+
+@query("hauling.commodities")
+def commodities_traded(store):
+    return store.sum("MarketSell", "Count") + store.sum("MarketBuy", "Count")
+
+
+@query("hauling.markets")
+def markets_visited(store):
+    return len(store.distinct("MarketSell", "MarketID") | store.distinct("MarketBuy", "MarketID"))
+
+
+@query("hauling.best_trade", format=format_credits)
+def best_trade(store):
+    return store.max("MarketSell", "TotalSale")
+
+
+@query("combat.bounty_profit", format=format_credits)
+def bounty_profit(store):
+    return store.sum("Bounty", "TotalReward")
+
+
+@query("combat.bounties")
+def bounties_claimed(store):
+    return store.count("Bounty")
+
+
+# =============================================================================
+# RESULT CACHE
+# =============================================================================
+
+class ResultCache:
+    """Last computed value of each query with the watermark it was computed at"""
+
+    def __init__(self, path=None):
+        self.path = path or default_data_dir() / "cache" / "aggregates.json"
+        self._entries = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, name: str):
+        """Last cached value for a query regardless of freshness, or None"""
+        entry = self._entries.get(name)
+        return entry["value"] if entry else None
+
+    def is_fresh(self, name: str, mark: dict) -> bool:
+        entry = self._entries.get(name)
+        return bool(entry) and entry["watermark"] == watermark_key(mark)
+
+    def put(self, name: str, mark: dict, value):
+        self._entries[name] = {"watermark": watermark_key(mark), "value": value}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp, self.path)
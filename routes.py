@@ -0,0 +1,491 @@
+"""
+Trade route optimizer
+Builds a profit table over every pair of known markets within reach and
+searches it for the best multi-hop routes and loops.
+
+    1. Stations that fit the ship's pad size are taken in blocks, the
+       ones with the most profitable possible load first. One vectorised
+       pass per block over (sources x their most promising commodities x
+       stations within ``max_leg_ly``) picks the best commodity per
+       destination: unit profit times the units the hold, the source
+       stock and the destination demand allow. From a start market only
+       the stations the search reaches in ``max_hops`` legs are
+       evaluated, each when the search first reaches it.
+    2. Only the ``fanout`` best of those trades per station, by credits
+       per second, are kept as edges.
+    3. A beam search over the edges extends routes hop by hop, ranking
+       them by credits per hour. Steps 1 and 3 stop at ``time_budget``,
+       so a cut-off build has left out the least promising stations.
+
+Prices come from whatever the commander has seen locally: market trades
+in the event store plus the Market.json history in prices.PriceStore.
+
+Requires NumPy; the GUI imports this lazily off the GUI thread.
+"""
+
+import heapq
+import math
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from event_store import EventStore
+from prices import PriceStore, commodity_key
+
+
+PAD_SIZES = {"S": 1, "M": 2, "L": 3}
+
+BLOCK_CELLS = 1 << 20  # (source, commodity, destination) cells per vectorised block
+
+
+@dataclass
+class MarketData:
+    """Latest known prices per station as dense (stations x commodities) arrays.
+
+    A zero buy price means the station does not sell the commodity, a zero
+    sell price that it does not buy it. Unknown stock/demand is infinite.
+    """
+
+    market_ids: np.ndarray
+    names: list[str]
+    positions: np.ndarray  # (n, 3) ly, NaN when the system was never visited
+    pads: np.ndarray       # largest landing pad, 1-3
+    commodities: list[str]
+    buy: np.ndarray
+    sell: np.ndarray
+    stock: np.ndarray
+    demand: np.ndarray
+
+    def __len__(self):
+        return len(self.market_ids)
+
+    def station(self, market_id: int) -> int | None:
+        hits = np.flatnonzero(self.market_ids == market_id)
+        return int(hits[0]) if len(hits) else None
+
+
+class MarketBuilder:
+    """Collects station metadata and prices, newest observation wins"""
+
+    def __init__(self):
+        self.stations = {}  # market id -> {"name", "position", "pad"}
+        self.prices = {}    # (market id, commodity) -> [buy, sell, stock, demand]
+
+    def station(self, market_id: int, name: str = "", position=None, pad: int | None = None):
+        entry = self.stations.setdefault(market_id, {"name": "", "position": None, "pad": 3})
+        if name:
+            entry["name"] = name
+        if position is not None:
+            entry["position"] = position
+        if pad is not None:
+            entry["pad"] = pad
+
+    def price(self, market_id: int, commodity: str, buy=None, sell=None, stock=None, demand=None):
+        self.station(market_id)
+        entry = self.prices.setdefault((market_id, commodity_key(commodity)),
+                                       [0.0, 0.0, math.inf, math.inf])
+        for i, value in enumerate((buy, sell, stock, demand)):
+            if value is not None:
+                entry[i] = float(value)
+
+    def build(self) -> MarketData:
+        ids = sorted(self.stations)
+        row = {market_id: i for i, market_id in enumerate(ids)}
+        commodities = sorted({commodity for _, commodity in self.prices})
+        col = {name: i for i, name in enumerate(commodities)}
+        shape = (len(ids), len(commodities))
+        buy, sell = np.zeros(shape, np.float32), np.zeros(shape, np.float32)
+        stock, demand = np.full(shape, np.inf, np.float32), np.full(shape, np.inf, np.float32)
+        for (market_id, commodity), (b, s, st, d) in self.prices.items():
+            i, j = row[market_id], col[commodity]
+            buy[i, j], sell[i, j], stock[i, j], demand[i, j] = b, s, st, d
+        positions = np.full((len(ids), 3), np.nan)
+        for i, market_id in enumerate(ids):
+            if self.stations[market_id]["position"] is not None:
+                positions[i] = self.stations[market_id]["position"]
+        return MarketData(
+            market_ids=np.array(ids, dtype=np.int64),
+            names=[self.stations[m]["name"] or str(m) for m in ids],
+            positions=positions,
+            pads=np.array([self.stations[m]["pad"] for m in ids], dtype=np.int8),
+            commodities=commodities,
+            buy=buy, sell=sell, stock=stock, demand=demand,
+        )
+
+
+# =============================================================================
+# ROUTE SEARCH
+# =============================================================================
+
+@dataclass
+class RouteOptions:
+    cargo: int = 256
+    jump_range: float = 25.0
+    pad: int = 3
+    max_hops: int = 4
+    top_n: int = 10
+    beam_width: int = 64
+    fanout: int = 12
+    candidates: int = 8  # commodities evaluated per source station
+    max_leg_ly: float | None = None  # default: 20 jumps
+    jump_seconds: float = 50.0
+    dock_seconds: float = 150.0
+    time_budget: float = 0.5
+
+
+@dataclass
+class Leg:
+    source: str
+    dest: str
+    commodity: str
+    units: int
+    unit_profit: float
+    profit: float
+    distance: float
+    jumps: int
+
+
+@dataclass
+class Route:
+    legs: list[Leg] = field(default_factory=list)
+    profit: float = 0.0
+    seconds: float = 0.0
+
+    @property
+    def credits_per_hour(self) -> float:
+        return self.profit / self.seconds * 3600 if self.seconds else 0.0
+
+    @property
+    def is_loop(self) -> bool:
+        return len(self.legs) > 1 and self.legs[0].source == self.legs[-1].dest
+
+    @property
+    def jumps(self) -> int:
+        return sum(leg.jumps for leg in self.legs)
+
+    def describe(self) -> str:
+        return " → ".join([self.legs[0].source] + [leg.dest for leg in self.legs])
+
+
+@dataclass
+class Edges:
+    """Best single-commodity trade for every reachable station pair"""
+
+    src: np.ndarray
+    dst: np.ndarray
+    commodity: np.ndarray
+    units: np.ndarray
+    unit_profit: np.ndarray
+    profit: np.ndarray
+    distance: np.ndarray
+    jumps: np.ndarray
+    seconds: np.ndarray
+
+
+class EdgeBuilder:
+    """Edges out of blocks of source stations, one vectorised block at a time.
+
+    Each source is evaluated over the ``candidates`` commodities with the
+    best optimistic margin there (best sell price anywhere minus the local
+    buy price) against every station within ``max_leg_ly``, and only its
+    ``fanout`` best trades by credits per second are kept. ``bound`` is
+    the most any one load out of a station could make, so sources can be
+    taken most promising first. Built edges are numbered in the order they
+    were added and their src, dst, profit and seconds are mirrored in
+    plain lists for the search loop.
+    """
+
+    def __init__(self, data: MarketData, options: RouteOptions):
+        self.data = data
+        self.options = options
+        self.stations = np.flatnonzero((data.pads >= options.pad) & ~np.isnan(data.positions).any(axis=1))
+        self.rows = {station: row for row, station in enumerate(self.stations.tolist())}
+        self.max_leg = options.max_leg_ly or options.jump_range * 20
+        self.pts = data.positions[self.stations]
+        self.norms = (self.pts ** 2).sum(axis=1)
+        # Commodity-major, eligible stations only, so a block is one gather
+        self.sell = np.ascontiguousarray(data.sell[self.stations].T)
+        self.demand = np.ascontiguousarray(np.minimum(data.demand[self.stations].T, options.cargo))
+        best_sell = self.sell.max(axis=1) if len(self.stations) else np.zeros(len(data.commodities))
+        buy, stock = data.buy[self.stations], data.stock[self.stations]
+        margin = np.where(buy > 0, best_sell - buy, 0)
+        k = min(options.candidates, len(data.commodities))
+        self.cand = np.argpartition(-margin, k - 1, axis=1)[:, :k] if k else np.empty((len(buy), 0), np.int64)
+        # A candidate without a positive margin costs infinity, so it never trades
+        margin = np.take_along_axis(margin, self.cand, axis=1)
+        self.buy = np.where(margin > 0, np.take_along_axis(buy, self.cand, axis=1), np.inf).astype(np.float32)
+        self.load = np.minimum(np.take_along_axis(stock, self.cand, axis=1), options.cargo).astype(np.float32)
+        self.bound = (np.maximum(margin, 0) * self.load).max(axis=1) if k else np.zeros(len(self.stations))
+        self.block = max(1, BLOCK_CELLS // max(k * len(self.stations), 1))
+        self.columns = {name: [] for name in Edges.__dataclass_fields__}
+        self.src, self.dst, self.profit, self.seconds = [], [], [], []
+
+    def __len__(self):
+        return len(self.src)
+
+    def expand(self, station: int) -> list[int]:
+        """Add the edges out of ``station``; returns their numbers, best credits per second first"""
+        row = self.rows.get(station)
+        if row is None:
+            return []
+        first = len(self.src)
+        self.expand_rows(np.array([row]))
+        return list(range(first, len(self.src)))
+
+    def expand_rows(self, rows: np.ndarray):
+        """Add the edges out of the eligible stations at ``rows``, source by source"""
+        options = self.options
+        dist = np.sqrt(np.maximum(self.norms[rows, None] + self.norms - 2 * self.pts[rows] @ self.pts.T, 0))
+        near = dist <= self.max_leg
+        near[np.arange(len(rows)), rows] = False
+        cols = np.flatnonzero(near.any(axis=0))
+        if not len(cols) or not self.cand.shape[1]:
+            return
+        # Gathering the reachable destinations only pays when they are few
+        subset = 2 * len(cols) < len(self.stations)
+        if subset:
+            dist, near = dist[:, cols], near[:, cols]
+        else:
+            cols = np.arange(len(self.stations))
+
+        # Profit of the best candidate per (source, destination), one candidate at a time
+        profit = np.zeros(near.shape, np.float32)
+        for k in range(self.cand.shape[1]):
+            cand = self.cand[rows, k]
+            prices, demand = self.sell[cand], self.demand[cand]
+            if subset:
+                prices, demand = prices[:, cols], demand[:, cols]
+            np.maximum(profit, self.trade(rows[:, None], k, prices, demand), out=profit)
+        profit *= near
+        jumps = np.maximum(np.ceil(dist / options.jump_range), 1)
+        seconds = jumps * options.jump_seconds + options.dock_seconds
+
+        rate = profit / seconds
+        top = np.broadcast_to(np.arange(len(cols)), rate.shape)
+        if len(cols) > options.fanout:
+            top = np.argpartition(-rate, options.fanout, axis=1)[:, :options.fanout]
+        top = np.take_along_axis(top, np.argsort(-np.take_along_axis(rate, top, axis=1), axis=1, kind="stable"),
+                                 axis=1)
+        keep = np.take_along_axis(profit, top, axis=1) > 0
+        b, c = np.nonzero(keep)[0], top[keep]
+
+        # Which candidate it was, for the kept trades only
+        src, dst = rows[b], cols[c]
+        totals = [self.trade(src, k, self.sell[self.cand[src, k], dst], self.demand[self.cand[src, k], dst])
+                  for k in range(self.cand.shape[1])]
+        k = np.argmax(totals, axis=0)
+        cand = self.cand[src, k]
+        columns = self.columns
+        columns["src"].append(self.stations[src])
+        columns["dst"].append(self.stations[dst])
+        columns["commodity"].append(cand)
+        columns["units"].append(np.minimum(self.demand[cand, dst], self.load[src, k]))
+        columns["unit_profit"].append(self.sell[cand, dst] - self.buy[src, k])
+        columns["profit"].append(profit[b, c])
+        columns["distance"].append(dist[b, c])
+        columns["jumps"].append(jumps[b, c].astype(np.int64))
+        columns["seconds"].append(seconds[b, c])
+        self.src.extend(columns["src"][-1].tolist())
+        self.dst.extend(columns["dst"][-1].tolist())
+        self.profit.extend(columns["profit"][-1].tolist())
+        self.seconds.extend(columns["seconds"][-1].tolist())
+
+    def trade(self, rows, k: int, prices, demand):
+        """Profit of a full load of the ``k``-th candidate from ``rows`` sold at ``prices``"""
+        # Where the destination does not buy, the price is 0 and so is the profit
+        return np.maximum(prices - self.buy[rows, k], 0) * np.minimum(demand, self.load[rows, k])
+
+    def edges(self) -> Edges:
+        return Edges(**{
+            name: np.concatenate(parts) if parts else np.empty(0)
+            for name, parts in self.columns.items()
+        })
+
+
+def build_edges(data: MarketData, options: RouteOptions, deadline: float | None = None) -> Edges:
+    """Edges out of every station that fits the ship's pad size (see EdgeBuilder).
+
+    Sources go in blocks, highest ``bound`` first, and stations that cannot
+    make a profit are skipped. Once ``deadline`` (a perf_counter value)
+    passes the build stops with the edges of the most promising stations.
+    """
+    builder = EdgeBuilder(data, options)
+    order = np.argsort(-builder.bound, kind="stable")
+    order = order[builder.bound[order] > 0]
+    for start in range(0, len(order), builder.block):
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        builder.expand_rows(order[start:start + builder.block])
+    return builder.edges()
+
+
+def _adjacency(edges: Edges, fanout: int) -> dict[int, list[int]]:
+    """Best ``fanout`` outgoing edges per station by credits per second"""
+    rate = edges.profit / edges.seconds
+    order = np.lexsort((-rate, edges.src))
+    adjacency = {}
+    for e in order.tolist():
+        out = adjacency.setdefault(int(edges.src[e]), [])
+        if len(out) < fanout:
+            out.append(e)
+    return adjacency
+
+
+class _LazyAdjacency(dict):
+    """Station -> outgoing edge numbers, expanded by an EdgeBuilder on first lookup until ``deadline``"""
+
+    def __init__(self, builder: EdgeBuilder, deadline: float):
+        super().__init__()
+        self.builder = builder
+        self.deadline = deadline
+
+    def get(self, station, default=()):
+        out = super().get(station)
+        if out is None:
+            if time.perf_counter() > self.deadline:
+                return default
+            out = self[station] = self.builder.expand(station)
+        return out
+
+
+def _route(data: MarketData, edges: Edges, path: tuple[int, ...]) -> Route:
+    route = Route()
+    for e in path:
+        route.legs.append(Leg(
+            source=data.names[edges.src[e]], dest=data.names[edges.dst[e]],
+            commodity=data.commodities[edges.commodity[e]], units=int(edges.units[e]),
+            unit_profit=float(edges.unit_profit[e]), profit=float(edges.profit[e]),
+            distance=float(edges.distance[e]), jumps=int(edges.jumps[e]),
+        ))
+        route.profit += float(edges.profit[e])
+        route.seconds += float(edges.seconds[e])
+    return route
+
+
+def find_routes(data: MarketData, options: RouteOptions | None = None,
+                start_market: int | None = None) -> list[Route]:
+    """Top routes by credits per hour, from ``start_market`` when given.
+
+    Routes never revisit a station except to close a loop back to their
+    start. The search returns what it has when ``time_budget`` runs out.
+    """
+    options = options or RouteOptions()
+    deadline = time.perf_counter() + options.time_budget
+    start = data.station(start_market) if start_market is not None else None
+    if start_market is not None and start is None:
+        return []
+
+    if start is None:
+        # Any station may begin a route, so every one needs its edges up front
+        edges = build_edges(data, options, deadline)
+        adjacency = _adjacency(edges, options.fanout)
+        profit, seconds = edges.profit.tolist(), edges.seconds.tolist()
+        src, dst = edges.src.tolist(), edges.dst.tolist()
+        first = np.argsort(-(edges.profit / edges.seconds))[:options.beam_width].tolist()
+    else:
+        # Only stations the beam reaches from the start need edges; build them on first visit
+        builder = EdgeBuilder(data, options)
+        adjacency = _LazyAdjacency(builder, deadline)
+        profit, seconds, src, dst = builder.profit, builder.seconds, builder.src, builder.dst
+        first = adjacency.get(start, [])
+    if not first:
+        return []
+
+    # state: (profit, seconds, edge path, visited stations)
+    beam = [(profit[e], seconds[e], (e,), {src[e], dst[e]}) for e in first]
+    best = []  # min-heap of (credits per second, edge path)
+    seen = set()
+
+    def offer(p, t, path):
+        if path in seen:
+            return
+        seen.add(path)
+        item = (p / t, path)
+        if len(best) < options.top_n:
+            heapq.heappush(best, item)
+        elif item > best[0]:
+            heapq.heapreplace(best, item)
+
+    for _ in range(options.max_hops - 1):
+        nxt = []
+        for p, t, path, visited in beam:
+            offer(p, t, path)
+            origin = src[path[0]]
+            for e in adjacency.get(dst[path[-1]], ()):
+                target = dst[e]
+                if target == origin:
+                    offer(p + profit[e], t + seconds[e], path + (e,))
+                elif target not in visited:
+                    nxt.append((p + profit[e], t + seconds[e], path + (e,), visited | {target}))
+        if time.perf_counter() > deadline or not nxt:
+            break
+        beam = heapq.nlargest(options.beam_width, nxt, key=lambda s: s[0] / s[1])
+    else:
+        for p, t, path, _ in beam:
+            offer(p, t, path)
+
+    if start is not None:
+        edges = builder.edges()
+    return [_route(data, edges, path) for _, path in sorted(best, reverse=True)]
+
+
+# =============================================================================
+# LOCAL PRICE DATA
+# =============================================================================
+
+def load_markets(store: EventStore, prices: PriceStore | None = None, systems=None,
+                 docked=()) -> MarketData:
+    """Latest locally observed prices for every market the commander has used.
+
+    Trade prices from the event store are overlaid with the latest full
+    Market.json snapshot per station from ``prices``. ``systems`` is a
+    spatial.SystemIndex for station positions; it is built from the store
+    when not given. ``docked`` are Docked events newer than the store,
+    e.g. from this session.
+    """
+    if systems is None:
+        from spatial import load_index
+        systems = load_index(store)
+    builder = MarketBuilder()
+
+    for part in store.partitions("Docked"):
+        names = part.dictionary("StationName")
+        for market_id, code, address, medium, large in zip(
+                part.column("MarketID"), part.column("StationName"), part.column("SystemAddress"),
+                part.column("PadsMedium"), part.column("PadsLarge")):
+            if market_id:
+                pad = 3 if large else 2 if medium else 1
+                builder.station(market_id, names[code], systems.position_of(address), pad)
+    for event in docked:
+        if not event.get("MarketID"):
+            continue
+        pads = event.get("LandingPads") or {}
+        pad = 3 if pads.get("Large") else 2 if pads.get("Medium") else 1 if pads else None
+        builder.station(event.get("MarketID"), event.get("StationName", ""),
+                        systems.position_of(event.get("SystemAddress")), pad)
+
+    # Trades in time order so the newest price per market and commodity wins
+    trades = []
+    for event_type, price_column in (("MarketBuy", "BuyPrice"), ("MarketSell", "SellPrice")):
+        for part in store.partitions(event_type):
+            names = part.dictionary("Type")
+            for ts, market_id, code, price in zip(part.column("timestamp"), part.column("MarketID"),
+                                                  part.column("Type"), part.column(price_column)):
+                trades.append((ts, event_type, market_id, names[code], price))
+    for _, event_type, market_id, commodity, price in sorted(trades):
+        if event_type == "MarketBuy":
+            builder.price(market_id, commodity, buy=price)
+        else:
+            builder.price(market_id, commodity, sell=price)
+
+    if prices is not None:
+        for market_id in prices.markets():
+            builder.station(market_id, prices.stations.get(market_id, {}).get("station", ""))
+            for commodity, price in prices.latest(market_id).items():
+                builder.price(
+                    market_id, commodity,
+                    buy=price.buy if price.stock else 0, sell=price.sell if price.demand else 0,
+                    stock=price.stock, demand=price.demand,
+                )
+    return builder.build()
@@ -0,0 +1,114 @@
+"""
+Dashboard snapshot for cold start
+The last state the dashboard showed, saved while the GUI runs and on
+exit, so the next launch can fill its cards, history charts and status
+indicators before a single query, series load or journal read finishes:
+
+    cards   MetricCard query name -> [value text, subtitle text]
+    series  TimeSeriesChart series name -> [[x, ...], [y, ...]]
+    status  RealTimePanel indicator key -> text (ship, location)
+
+Everything is stored display-ready and charts keep only a head of their
+series, decimated to HEAD_COLUMNS, so restoring is one small JSON read
+and needs no NumPy. The GUI treats the snapshot as a first guess: each
+value is replaced as soon as its query, series or live event comes in.
+A file written with another SNAPSHOT_VERSION is ignored.
+
+No Qt imports here.
+"""
+
+import json
+import os
+import time
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from event_store import default_data_dir
+
+
+SNAPSHOT_VERSION = 1
+HEAD_COLUMNS = 800  # pixel columns a saved series head is decimated to
+
+
+class SeriesHead:
+    """Decimated series that stands in for a timeseries.DecimationPyramid until it loads"""
+
+    def __init__(self, x: list[float], y: list[float]):
+        self.x = x
+        self.y = y
+
+    def __len__(self):
+        return len(self.x)
+
+    @property
+    def extent(self) -> tuple[float, float, float, float]:
+        if not self.x:
+            return 0.0, 1.0, 0.0, 1.0
+        return self.x[0], self.x[-1], min(self.y), max(self.y)
+
+    def view(self, x0: float, x1: float, pixels: int, method: str = "minmax"):
+        """Saved points in the visible range [x0, x1]; already coarse, so never decimated again"""
+        lo = max(bisect_left(self.x, x0) - 1, 0)
+        hi = min(bisect_right(self.x, x1) + 1, len(self.x))
+        return self.x[lo:hi], self.y[lo:hi]
+
+
+def series_head(pyramid) -> list[list[float]]:
+    """Whole-range view of a loaded pyramid as plain lists"""
+    if not len(pyramid):
+        return [[], []]
+    x0, x1, _, _ = pyramid.extent
+    xs, ys = pyramid.view(x0, x1, HEAD_COLUMNS)
+    return [xs.tolist(), ys.tolist()]
+
+
+class DashboardSnapshot:
+    """What the dashboard last showed, read once at startup"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else default_data_dir() / "cache" / "dashboard.json"
+        self.cards = {}
+        self.series = {}
+        self.status = {}
+        self.saved_at = None
+        self._written = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(saved, dict) or saved.get("version") != SNAPSHOT_VERSION:
+            return
+        self.cards = saved.get("cards") or {}
+        self.series = saved.get("series") or {}
+        self.status = saved.get("status") or {}
+        self.saved_at = saved.get("saved_at")
+        self._written = self._content()
+
+    def _content(self) -> str:
+        return json.dumps({"cards": self.cards, "series": self.series, "status": self.status},
+                          sort_keys=True)
+
+    def head(self, name: str) -> SeriesHead | None:
+        saved = self.series.get(name)
+        if not saved or len(saved) != 2 or len(saved[0]) != len(saved[1]):
+            return None
+        return SeriesHead(*saved)
+
+    def save(self) -> bool:
+        """Write the snapshot if anything changed since the last write"""
+        content = self._content()
+        if content == self._written:
+            return False
+        self.saved_at = time.time()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": SNAPSHOT_VERSION, "saved_at": self.saved_at, "cards": self.cards,
+                       "series": self.series, "status": self.status}, f)
+        os.replace(tmp, self.path)
+        self._written = content
+        return True
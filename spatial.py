@@ -0,0 +1,321 @@
+"""
+Spatial index of visited systems
+StarPos of every FSDJump/Location goes into a static KD-tree with
+per-node bounding boxes, centroids and counts. Radius and k-nearest
+queries prune whole subtrees by box distance, and clusters() walks the
+tree for a map view: subtrees outside the view are skipped, subtrees
+smaller than one map cell collapse to a single weighted dot, and what is
+left is merged to at most one dot per cell, so what gets drawn is bounded
+by the map size rather than the number of systems.
+
+Systems arriving live go to a small pending buffer that is scanned
+linearly and folded into the tree once it grows past a fraction of it.
+
+Requires NumPy; the GUI imports this lazily off the GUI thread.
+"""
+
+import heapq
+import threading
+
+import numpy as np
+
+from event_store import EventStore
+
+
+LEAF_SIZE = 32
+REBUILD_FRACTION = 0.05
+REBUILD_MIN = 256
+
+# Map axes: galactic X across, Z up (towards the core)
+MAP_AXES = (0, 2)
+
+LANDMARKS = {
+    "Sol": (0.0, 0.0, 0.0),
+    "Sgr A*": (25.21875, -20.90625, 25899.96875),
+}
+
+
+class KDTree:
+    """Static KD-tree over an (n, 3) array, nodes stored as flat arrays"""
+
+    def __init__(self, points):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.order = np.arange(len(points))
+        starts, ends, lows, highs, lefts, rights = [], [], [], [], [], []
+
+        def build(start, end):
+            node = len(starts)
+            idx = self.order[start:end]
+            pts = points[idx]
+            starts.append(start)
+            ends.append(end)
+            lows.append(pts.min(axis=0))
+            highs.append(pts.max(axis=0))
+            lefts.append(-1)
+            rights.append(-1)
+            if end - start > LEAF_SIZE:
+                dim = int((highs[node] - lows[node]).argmax())
+                mid = (start + end) // 2
+                self.order[start:end] = idx[np.argpartition(pts[:, dim], mid - start)]
+                lefts[node] = build(start, mid)
+                rights[node] = build(mid, end)
+            return node
+
+        if len(points):
+            build(0, len(points))
+        self.points = points[self.order]  # leaf ranges are contiguous here
+        self.start = np.array(starts, dtype=np.int64)
+        self.end = np.array(ends, dtype=np.int64)
+        self.low = np.array(lows).reshape(-1, 3)
+        self.high = np.array(highs).reshape(-1, 3)
+        self.left = np.array(lefts, dtype=np.int64)
+        self.right = np.array(rights, dtype=np.int64)
+        sums = np.concatenate(([[0.0, 0.0, 0.0]], np.cumsum(self.points, axis=0)))
+        self.count = self.end - self.start
+        self.centroid = (sums[self.end] - sums[self.start]) / np.maximum(self.count, 1)[:, None]
+
+    def __len__(self):
+        return len(self.points)
+
+    def _box_dist2(self, node: int, point) -> float:
+        gap = np.maximum(np.maximum(self.low[node] - point, point - self.high[node]), 0.0)
+        return float(gap @ gap)
+
+    def radius(self, center, r: float) -> np.ndarray:
+        """Original indices of all points within ``r`` of ``center``"""
+        if not len(self.points):
+            return np.empty(0, dtype=np.int64)
+        center = np.asarray(center, dtype=np.float64)
+        r2 = r * r
+        # Breadth-first, one tree level per step, all nodes of a level at once
+        whole, leaves = [], []
+        frontier = np.zeros(1, dtype=np.int64)
+        while len(frontier):
+            gap = np.maximum(np.maximum(self.low[frontier] - center, center - self.high[frontier]), 0.0)
+            frontier = frontier[(gap * gap).sum(axis=1) <= r2]
+            far = np.maximum(np.abs(self.low[frontier] - center), np.abs(self.high[frontier] - center))
+            inside = (far * far).sum(axis=1) <= r2
+            whole.append(frontier[inside])
+            frontier = frontier[~inside]
+            leaf = self.left[frontier] < 0
+            leaves.append(frontier[leaf])
+            frontier = frontier[~leaf]
+            frontier = np.concatenate((self.left[frontier], self.right[frontier]))
+        whole, leaves = np.concatenate(whole), np.concatenate(leaves)
+        edge = _ranges(self.start[leaves], self.end[leaves])
+        d2 = ((self.points[edge] - center) ** 2).sum(axis=1)
+        return self.order[np.concatenate((_ranges(self.start[whole], self.end[whole]), edge[d2 <= r2]))]
+
+    def nearest(self, point, k: int = 1) -> list[tuple[float, int]]:
+        """Up to ``k`` (distance, original index) pairs, closest first"""
+        if not len(self.points):
+            return []
+        point = np.asarray(point, dtype=np.float64)
+        best = []  # max-heap of (-d2, index)
+        queue = [(0.0, 0)]
+        while queue:
+            d2, node = heapq.heappop(queue)
+            if len(best) == k and d2 > -best[0][0]:
+                break
+            if self.left[node] < 0:
+                pts = self.points[self.start[node]:self.end[node]]
+                for i, pd2 in enumerate(((pts - point) ** 2).sum(axis=1).tolist()):
+                    if len(best) < k:
+                        heapq.heappush(best, (-pd2, self.start[node] + i))
+                    elif pd2 < -best[0][0]:
+                        heapq.heapreplace(best, (-pd2, self.start[node] + i))
+                continue
+            for child in (self.left[node], self.right[node]):
+                heapq.heappush(queue, (self._box_dist2(child, point), child))
+        return [(float(np.sqrt(-d2)), int(self.order[i])) for d2, i in sorted(best, reverse=True)]
+
+    def clusters(self, view: tuple[float, float, float, float], cell: float):
+        """Dots to draw for the map rectangle ``view`` = (x0, x1, z0, z1).
+
+        Returns (xs, zs, counts) with at most one dot per ``cell`` square.
+        Subtrees whose map footprint fits in one cell contribute their
+        centroid without being descended into.
+        """
+        if not len(self.points):
+            return _bin_cells(np.empty(0), np.empty(0), np.empty(0), cell)
+        ax, az = MAP_AXES
+        x0, x1, z0, z1 = view
+        # Breadth-first, one tree level per step, all nodes of a level at once
+        nodes, leaves = [], []
+        frontier = np.zeros(1, dtype=np.int64)
+        while len(frontier):
+            lo, hi = self.low[frontier], self.high[frontier]
+            frontier = frontier[(hi[:, ax] >= x0) & (lo[:, ax] <= x1) & (hi[:, az] >= z0) & (lo[:, az] <= z1)]
+            lo, hi = self.low[frontier], self.high[frontier]
+            small = np.maximum(hi[:, ax] - lo[:, ax], hi[:, az] - lo[:, az]) <= cell
+            nodes.append(frontier[small])
+            frontier = frontier[~small]
+            leaf = self.left[frontier] < 0
+            leaves.append(frontier[leaf])
+            frontier = frontier[~leaf]
+            frontier = np.concatenate((self.left[frontier], self.right[frontier]))
+        nodes = np.concatenate(nodes)
+        leaves = np.concatenate(leaves)
+
+        pts = self.points[_ranges(self.start[leaves], self.end[leaves])]
+        inside = (pts[:, ax] >= x0) & (pts[:, ax] <= x1) & (pts[:, az] >= z0) & (pts[:, az] <= z1)
+        xs = np.concatenate((self.centroid[nodes, ax], pts[inside, ax]))
+        zs = np.concatenate((self.centroid[nodes, az], pts[inside, az]))
+        weights = np.concatenate((self.count[nodes], np.ones(int(inside.sum()))))
+        return _bin_cells(xs, zs, weights, cell)
+
+
+def _ranges(starts, ends) -> np.ndarray:
+    """Concatenation of arange(s, e) for every pair, without a Python loop"""
+    lengths = ends - starts
+    if not lengths.sum():
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return np.arange(lengths.sum()) + offsets
+
+
+def _bin_cells(xs, zs, weights, cell: float):
+    """Merge dots sharing a ``cell`` grid square into their weighted centroid"""
+    if not len(xs):
+        return xs, zs, weights
+    keys = np.floor(xs / cell).astype(np.int64) * (1 << 32) + np.floor(zs / cell).astype(np.int64)
+    _, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse, weights)
+    return (np.bincount(inverse, weights * xs) / counts,
+            np.bincount(inverse, weights * zs) / counts,
+            counts)
+
+
+class SystemIndex:
+    """Visited systems by position: a KD-tree plus a buffer of live arrivals.
+
+    add() runs on the GUI thread while route jobs call position_of() on the
+    worker pool, so the two share a lock.
+    """
+
+    def __init__(self, addresses=(), names=(), positions=()):
+        self.addresses = list(addresses)
+        self.names = list(names)
+        self._slots = {address: i for i, address in enumerate(self.addresses)}
+        self._positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        self._pending = []  # (index, position) added since the last build
+        self.current = None
+        self.tree = KDTree(self._positions)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def position_of(self, address: int):
+        """Last known StarPos of a system address, or None"""
+        with self._lock:
+            index = self._slots.get(address)
+            return None if index is None else self.position(index)
+
+    def position(self, index: int):
+        if index < len(self._positions):
+            return self._positions[index]
+        return self._pending[index - len(self._positions)][1]
+
+    def add(self, address: int, name: str, position) -> int:
+        """Record a visit and make it the current system"""
+        with self._lock:
+            index = self._slots.get(address)
+            if index is None:
+                index = len(self.addresses)
+                self._slots[address] = index
+                self.addresses.append(address)
+                self.names.append(name)
+                self._pending.append((index, np.asarray(position, dtype=np.float64)))
+                if len(self._pending) > max(REBUILD_MIN, REBUILD_FRACTION * len(self.tree)):
+                    self._rebuild()
+            self.current = index
+            return index
+
+    def _rebuild(self):
+        self._positions = np.vstack([self._positions] + [pos for _, pos in self._pending])
+        self._pending.clear()
+        self.tree = KDTree(self._positions)
+
+    def _pending_array(self):
+        return np.array([pos for _, pos in self._pending]).reshape(-1, 3)
+
+    def radius(self, center, r: float) -> list[int]:
+        found = self.tree.radius(center, r).tolist()
+        if self._pending:
+            d2 = ((self._pending_array() - np.asarray(center)) ** 2).sum(axis=1)
+            found.extend(self._pending[i][0] for i in np.flatnonzero(d2 <= r * r))
+        return found
+
+    def nearest(self, point, k: int = 1) -> list[tuple[float, int]]:
+        found = self.tree.nearest(point, k)
+        if self._pending:
+            d = np.sqrt(((self._pending_array() - np.asarray(point)) ** 2).sum(axis=1))
+            found.extend((float(dist), self._pending[i][0]) for i, dist in enumerate(d.tolist()))
+            found.sort()
+        return found[:k]
+
+    def clusters(self, view, cell: float):
+        xs, zs, counts = self.tree.clusters(view, cell)
+        if self._pending:
+            ax, az = MAP_AXES
+            pts = self._pending_array()
+            x0, x1, z0, z1 = view
+            inside = (pts[:, ax] >= x0) & (pts[:, ax] <= x1) & (pts[:, az] >= z0) & (pts[:, az] <= z1)
+            xs, zs, counts = _bin_cells(
+                np.concatenate((xs, pts[inside, ax])),
+                np.concatenate((zs, pts[inside, az])),
+                np.concatenate((counts, np.ones(int(inside.sum())))),
+                cell,
+            )
+        return xs, zs, counts
+
+    def extent(self) -> tuple[float, float, float, float]:
+        """(x0, x1, z0, z1) map bounds of everything indexed"""
+        ax, az = MAP_AXES
+        pts = np.vstack((self._positions, self._pending_array()))
+        if not len(pts):
+            return -1.0, 1.0, -1.0, 1.0
+        return pts[:, ax].min(), pts[:, ax].max(), pts[:, az].min(), pts[:, az].max()
+
+    def neighbours(self, radius: float) -> tuple[int, tuple[float, str] | None]:
+        """Visited systems within ``radius`` of the current one, and the nearest of them"""
+        if self.current is None:
+            return 0, None
+        here = self.position(self.current)
+        count = sum(1 for i in self.radius(here, radius) if i != self.current)
+        for dist, i in self.nearest(here, 2):
+            if i != self.current:
+                return count, (dist, self.names[i])
+        return count, None
+
+    def landmark_distances(self) -> dict[str, float]:
+        """Light years from the current system to each of LANDMARKS"""
+        if self.current is None:
+            return {}
+        here = self.position(self.current)
+        return {name: float(np.linalg.norm(here - np.asarray(pos))) for name, pos in LANDMARKS.items()}
+
+
+def load_index(store: EventStore) -> SystemIndex:
+    """Every visited system with its last known position, current = latest visit"""
+    latest = {}
+    for event_type in ("FSDJump", "Location"):
+        for part in store.partitions(event_type):
+            names = part.dictionary("StarSystem")
+            columns = [np.asarray(part.column(c)) for c in ("SystemAddress", "timestamp", "StarPosX",
+                                                             "StarPosY", "StarPosZ")]
+            codes = np.asarray(part.column("StarSystem"))
+            for address, ts, x, y, z, code in zip(*(c.tolist() for c in columns), codes.tolist()):
+                if address and ts >= latest.get(address, (-1,))[0]:
+                    latest[address] = (ts, names[code], (x, y, z))
+
+    visits = sorted(latest.items(), key=lambda item: item[1][0])
+    index = SystemIndex(
+        [address for address, _ in visits],
+        [name for _, (_, name, _) in visits],
+        [pos for _, (_, _, pos) in visits],
+    )
+    if visits:
+        index.current = len(visits) - 1
+    return index
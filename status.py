@@ -0,0 +1,130 @@
+"""
+Companion status files
+The game keeps Status.json, Cargo.json and NavRoute.json next to the
+journal and rewrites Status.json several times a second. StatusWatcher
+re-parses a file only when its (mtime, size) stamp moves and reports just
+the derived values that changed, so a UI polling it at a fixed frame rate
+coalesces every write in between into one update.
+"""
+
+import json
+from pathlib import Path
+
+from prices import commodity_key
+
+
+STATUS_FILES = ("Status.json", "Cargo.json", "NavRoute.json")
+
+# Status.json Flags bits, in the order they decide the displayed activity
+FLAG_ACTIVITIES = (
+    (1 << 0, "Docked"),
+    (1 << 1, "Landed"),
+    (1 << 26, "In SRV"),
+    (1 << 25, "In Fighter"),
+    (1 << 30, "Hyperspace"),
+    (1 << 4, "Supercruise"),
+    (1 << 17, "FSD Charging"),
+)
+FLAGS2_ON_FOOT = 1 << 0
+
+
+def activity_from_flags(flags: int, flags2: int = 0) -> str:
+    if flags2 & FLAGS2_ON_FOOT:
+        return "On Foot"
+    for bit, name in FLAG_ACTIVITIES:
+        if flags & bit:
+            return name
+    return "Normal Space" if flags else "Main Menu"
+
+
+def derive_status(data: dict) -> dict:
+    state = {"game_status": "CONNECTED"}
+    if "Flags" in data:
+        state["activity"] = activity_from_flags(data.get("Flags", 0), data.get("Flags2", 0))
+    fuel = data.get("Fuel")
+    if isinstance(fuel, dict):
+        state["fuel_main"] = round(fuel.get("FuelMain", 0.0), 2)
+        state["fuel_reservoir"] = round(fuel.get("FuelReservoir", 0.0), 2)
+    if "Cargo" in data:
+        state["cargo_tons"] = int(data["Cargo"])
+    if data.get("Destination"):
+        state["destination"] = data["Destination"].get("Name", "")
+    return state
+
+
+def derive_cargo(data: dict) -> dict:
+    inventory = data.get("Inventory") or []
+    items = tuple(sorted(
+        (item.get("Name_Localised") or item.get("Name", ""), item.get("Count", 0))
+        for item in inventory
+    ))
+    derived = {
+        "cargo_tons": int(data.get("Count", sum(count for _, count in items))),
+        "cargo_items": items,
+    }
+    # Tons per commodity symbol in the ship's hold, for matching against
+    # colonization requirements; an SRV's hold is listed under "SRV"
+    if data.get("Vessel", "Ship") == "Ship":
+        tons = {}
+        for item in inventory:
+            name = commodity_key(item.get("Name", ""))
+            if name:
+                tons[name] = tons.get(name, 0) + item.get("Count", 0)
+        derived["cargo_commodities"] = tuple(sorted(tons.items()))
+    return derived
+
+
+def derive_navroute(data: dict) -> dict:
+    route = data.get("Route") or []
+    return {
+        "route_jumps": max(len(route) - 1, 0),
+        "route_target": route[-1].get("StarSystem", "") if route else "",
+    }
+
+
+DERIVERS = {
+    "Status.json": derive_status,
+    "Cargo.json": derive_cargo,
+    "NavRoute.json": derive_navroute,
+}
+
+
+class StatusWatcher:
+    """Polls the companion files and returns only changed derived values"""
+
+    def __init__(self, journal_dir):
+        self.journal_dir = Path(journal_dir)
+        self.state = {}
+        self._stamps = {}
+
+    def poll(self) -> dict:
+        changes = {}
+        for name in STATUS_FILES:
+            derived = self._read_if_changed(name)
+            if not derived:
+                continue
+            for key, value in derived.items():
+                if self.state.get(key) != value:
+                    self.state[key] = value
+                    changes[key] = value
+        return changes
+
+    def _read_if_changed(self, name: str) -> dict | None:
+        path = self.journal_dir / name
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        if self._stamps.get(name) == stamp:
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError):
+            # Caught mid-rewrite; leave the stamp so the next poll retries
+            return None
+        self._stamps[name] = stamp
+        if not isinstance(data, dict) or not data:
+            return None
+        return DERIVERS[name](data)
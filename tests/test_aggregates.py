@@ -0,0 +1,27 @@
+"""Live aggregates agree with the historical queries"""
+
+import json
+
+from event_store import EventStore
+from ingest import ingest_directory
+from queries import systems_visited
+
+
+def test_live_systems_match_systems_visited(tmp_path):
+    journals = tmp_path / "j"
+    journals.mkdir()
+    events = [
+        {"event": "Location", "StarSystem": "Sol", "SystemAddress": 10477373803},
+        {"event": "FSDJump", "StarSystem": "Alpha Centauri", "SystemAddress": 1},
+        {"event": "FSDJump", "StarSystem": "Sol", "SystemAddress": 10477373803},
+        {"event": "CarrierJump", "StarSystem": "Barnard's Star", "SystemAddress": 2},
+        {"event": "Location", "StarSystem": "Nameless"},  # no address
+    ]
+    with open(journals / "Journal.2024-01-01T000000.01.log", "w", encoding="utf-8") as out:
+        for i, event in enumerate(events):
+            out.write(json.dumps({"timestamp": f"2024-01-01T00:00:{i:02d}Z", **event}) + "\n")
+
+    store = EventStore(tmp_path / "store")
+    result = ingest_directory(journals, workers=1, store=store)
+    assert result.systems == {1, 10477373803}
+    assert len(result.systems) == systems_visited(store)
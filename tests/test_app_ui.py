@@ -0,0 +1,143 @@
+"""AggregationService wiring of live events to the cards"""
+
+import json
+
+import pytest
+
+from event_store import EventStore
+from ingest import ingest_directory
+from manifest import event_key
+
+
+@pytest.fixture
+def service(qapp, tmp_path, monkeypatch):
+    monkeypatch.setenv("EDXDC_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("EDXDC_JOURNAL_DIR", str(tmp_path / "journal"))
+    from app_ui import AggregationService
+    return AggregationService(EventStore())
+
+
+def test_live_cards_update_without_history(service):
+    from PySide6.QtWidgets import QVBoxLayout, QWidget
+    from app_ui import MetricCard
+
+    page = QWidget()
+    card = MetricCard("TOTAL MINED", "—", query="mining.total_mined")
+    QVBoxLayout(page).addWidget(card)
+    page.show()
+    service.bind(page)
+    assert not service.total.events
+
+    service.on_live_events([{"timestamp": "2024-01-01T00:00:00Z", "event": "MiningRefined", "Type": "gold"}], [1])
+    assert card.value_lbl.text() == "1 units"
+    assert card.subtitle_lbl.text() == "↑ 1 this session"
+
+
+def test_startup_import_feeds_the_cards(service, tmp_path, qapp):
+    import time
+
+    from PySide6.QtWidgets import QVBoxLayout, QWidget
+    from app_ui import MetricCard
+
+    lines = [json.dumps({"timestamp": f"2024-01-01T00:00:{i:02d}Z", "event": "MiningRefined", "Type": "gold"})
+             for i in range(3)]
+    journals = tmp_path / "journal"
+    journals.mkdir()
+    (journals / "Journal.2024-01-01T000000.01.log").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    page = QWidget()
+    card = MetricCard("TOTAL MINED", "—", query="mining.total_mined")
+    QVBoxLayout(page).addWidget(card)
+    page.show()
+    service.bind(page)
+    service.start_ingest()
+    # The tailer reads the last journal line while the import runs, plus one the import will not see
+    live = json.dumps({"timestamp": "2024-01-01T00:00:09Z", "event": "MiningRefined", "Type": "gold"})
+    service.on_live_events([json.loads(lines[-1]), json.loads(live)],
+                           [event_key(lines[-1].encode()), event_key(live.encode())])
+
+    deadline = time.monotonic() + 10
+    while service.ingesting:
+        assert time.monotonic() < deadline
+        qapp.processEvents()
+        time.sleep(0.01)
+    qapp.processEvents()
+    assert service.history.mined == 3
+    assert card.value_lbl.text() == "4 units"
+
+
+def _split_store(service, tmp_path, events: list[dict], stored: int) -> list[tuple[dict, int]]:
+    """Ingest the first ``stored`` events as a concurrent ingest would; (event, key) of them all"""
+    lines = [json.dumps(event) for event in events]
+    journals = tmp_path / "split"
+    journals.mkdir()
+    (journals / "Journal.2024-01-01T000000.01.log").write_text(
+        "".join(line + "\n" for line in lines[:stored]), encoding="utf-8")
+    ingest_directory(journals, workers=1, store=service.store)
+    return [(event, event_key(line.encode())) for event, line in zip(events, lines)]
+
+
+def test_mining_replay_keeps_same_second_events(service, tmp_path):
+    from mining import MiningStats, load_mining
+
+    second = "2024-01-01T00:00:05Z"
+    live = _split_store(service, tmp_path, [
+        {"timestamp": second, "event": "MiningRefined", "Type": "gold"},
+        {"timestamp": second, "event": "MiningRefined", "Type": "silver"},
+    ], stored=1)
+    for event, key in live:
+        service.track_mining(event, key)
+    service.on_mining_ready(service.store.watermark(), load_mining(service.store))
+
+    expected = MiningStats()
+    for event, _ in live:
+        expected.update(event)
+    assert service.mining.refined == expected.refined
+
+
+def test_combat_replay_keeps_same_second_events(service, tmp_path):
+    from combat import CombatStats, load_combat
+
+    second = "2024-01-01T00:00:05Z"
+    live = _split_store(service, tmp_path, [
+        {"timestamp": "2024-01-01T00:00:00Z", "event": "FSDJump", "StarSystem": "Sol", "SystemAddress": 1,
+         "StarPos": [0.0, 0.0, 0.0]},
+        {"timestamp": second, "event": "Bounty", "TotalReward": 1_000},
+        {"timestamp": second, "event": "Bounty", "TotalReward": 2_000},
+    ], stored=2)
+    for event, key in live:
+        service.track_combat(event, key)
+    service.on_combat_ready(service.store.watermark(), load_combat(service.store))
+
+    expected = CombatStats()
+    for event, _ in live:
+        expected.update(event)
+    assert service.combat.systems["Sol"].kills == expected.systems["Sol"].kills == 2
+    assert service.combat.systems["Sol"].bounty_credits == 3_000
+
+
+def test_colonization_replay_keeps_same_second_events(service, tmp_path):
+    from colonization import ColonizationTracker, load_colonization
+
+    second = "2024-01-01T00:00:05Z"
+    live = _split_store(service, tmp_path, [
+        {"timestamp": "2024-01-01T00:00:00Z", "event": "Docked", "MarketID": 9001,
+         "StationName": "Site", "StarSystem": "Sol"},
+        {"timestamp": "2024-01-01T00:00:01Z", "event": "ColonisationConstructionDepot", "MarketID": 9001,
+         "ConstructionProgress": 0.0, "ConstructionComplete": False, "ConstructionFailed": False,
+         "ResourcesRequired": [{"Name": "$steel_name;", "Name_Localised": "Steel", "RequiredAmount": 1000,
+                                "ProvidedAmount": 0, "Payment": 1000}]},
+        {"timestamp": second, "event": "ColonisationContribution", "MarketID": 9001,
+         "Contributions": [{"Name": "$steel_name;", "Amount": 100}]},
+        {"timestamp": second, "event": "ColonisationContribution", "MarketID": 9001,
+         "Contributions": [{"Name": "$steel_name;", "Amount": 200}]},
+    ], stored=3)
+    for event, key in live:
+        service.track_colonization(event, key)
+    service.on_colonization_ready(service.store.watermark(), load_colonization(service.store))
+
+    expected = ColonizationTracker()
+    for event, _ in live:
+        expected.update(event)
+    assert service.colonization.needed == expected.needed == {"steel": {9001: 700}}
+    assert service.colonization.docked == 9001
@@ -0,0 +1,61 @@
+"""Colonisation history rebuilt from the store matches the live tracker"""
+
+import json
+
+from colonization import ColonizationTracker, load_colonization
+from event_store import EventStore
+from ingest import ingest_directory
+
+
+def _depot(timestamp: str, provided: int) -> dict:
+    return {"timestamp": timestamp, "event": "ColonisationConstructionDepot", "MarketID": 9001,
+            "ConstructionProgress": provided / 1000, "ConstructionComplete": False,
+            "ConstructionFailed": False,
+            "ResourcesRequired": [{"Name": "$steel_name;", "Name_Localised": "Steel", "RequiredAmount": 1000,
+                                   "ProvidedAmount": provided, "Payment": 1000}]}
+
+
+def test_same_second_contribution_is_counted_once(tmp_path):
+    events = [
+        {"timestamp": "2024-01-01T00:00:00Z", "event": "Docked", "MarketID": 9001,
+         "StationName": "Site", "StarSystem": "Sol"},
+        _depot("2024-01-01T00:00:01Z", 0),
+        # The game logs the contribution, then a snapshot that already counts it
+        {"timestamp": "2024-01-01T00:00:05Z", "event": "ColonisationContribution", "MarketID": 9001,
+         "Contributions": [{"Name": "$steel_name;", "Amount": 200}]},
+        _depot("2024-01-01T00:00:05Z", 200),
+    ]
+    journals = tmp_path / "j"
+    journals.mkdir()
+    with open(journals / "Journal.2024-01-01T000000.01.log", "w", encoding="utf-8") as out:
+        out.writelines(json.dumps(event) + "\n" for event in events)
+    store = EventStore(tmp_path / "store")
+    ingest_directory(journals, workers=1, store=store)
+
+    live = ColonizationTracker()
+    for event in events:
+        live.update(event)
+    bulk = load_colonization(store)
+    assert live.needed == bulk.needed == {"steel": {9001: 800}}
+
+
+def test_carrier_jump_sets_the_system(tmp_path):
+    events = [
+        {"timestamp": "2024-01-01T00:00:00Z", "event": "CarrierJump", "StarSystem": "Achenar",
+         "SystemAddress": 2, "StarPos": [67.5, -119.5, 24.8]},
+        {"timestamp": "2024-01-01T00:00:01Z", "event": "Docked", "MarketID": 9001, "StationName": "Site"},
+        _depot("2024-01-01T00:00:02Z", 0),
+    ]
+    journals = tmp_path / "j"
+    journals.mkdir()
+    with open(journals / "Journal.2024-01-01T000000.01.log", "w", encoding="utf-8") as out:
+        out.writelines(json.dumps(event) + "\n" for event in events)
+    store = EventStore(tmp_path / "store")
+    ingest_directory(journals, workers=1, store=store)
+
+    live = ColonizationTracker()
+    for event in events:
+        live.update(event)
+    bulk = load_colonization(store)
+    assert live.system == bulk.system == "Achenar"
+    assert live.positions == bulk.positions
@@ -0,0 +1,30 @@
+"""Combat history rebuilt from the store matches the live stats"""
+
+import json
+
+from combat import CombatStats, load_combat
+from event_store import EventStore
+from ingest import ingest_directory
+
+
+def test_carrier_jump_moves_the_commander(tmp_path):
+    events = [
+        {"timestamp": "2024-01-01T00:00:00Z", "event": "Location", "StarSystem": "Sol", "SystemAddress": 1,
+         "StarPos": [0.0, 0.0, 0.0]},
+        {"timestamp": "2024-01-01T00:01:00Z", "event": "CarrierJump", "StarSystem": "Achenar", "SystemAddress": 2,
+         "StarPos": [67.5, -119.5, 24.8]},
+        {"timestamp": "2024-01-01T00:02:00Z", "event": "Bounty", "TotalReward": 1_000},
+    ]
+    journals = tmp_path / "j"
+    journals.mkdir()
+    with open(journals / "Journal.2024-01-01T000000.01.log", "w", encoding="utf-8") as out:
+        out.writelines(json.dumps(event) + "\n" for event in events)
+    store = EventStore(tmp_path / "store")
+    ingest_directory(journals, workers=1, store=store)
+
+    live = CombatStats()
+    for event in events:
+        live.update(event)
+    bulk = load_combat(store)
+    assert live.systems["Achenar"].kills == bulk.systems["Achenar"].kills == 1
+    assert "Sol" not in bulk.systems or bulk.systems["Sol"].kills == 0
@@ -0,0 +1,80 @@
+"""Column alignment after an interrupted append"""
+
+import logging
+import os
+
+import event_store
+from event_store import EventStore
+
+
+def _jump(i: int) -> dict:
+    return {
+        "timestamp": f"2024-01-01T00:00:{i:02d}Z", "event": "FSDJump",
+        "StarSystem": f"System {i}", "SystemAddress": i + 1,
+        "StarPos": [float(i), 0.0, 0.0], "JumpDist": 10.0, "FuelUsed": 1.0,
+    }
+
+
+def test_append_after_interrupted_write_keeps_rows_aligned(tmp_path):
+    store = EventStore(tmp_path)
+    store.append([_jump(0), _jump(1)])
+
+    # Simulate a crash part-way through an append: only some columns grew
+    partition = next(store.partitions("FSDJump"))
+    with open(partition.path / "SystemAddress.col", "ab") as f:
+        f.write(b"\x07" * partition.column("SystemAddress").itemsize)
+    assert len(next(store.partitions("FSDJump"))) == 2
+
+    store.append([_jump(2)])
+    partition = next(store.partitions("FSDJump"))
+    assert len(partition) == 3
+    assert partition.strings("StarSystem") == ["System 0", "System 1", "System 2"]
+    assert list(partition.column("SystemAddress")) == [1, 2, 3]
+
+
+def _tear(store: EventStore):
+    """Grow one column of the FSDJump partition as a crash mid-append would"""
+    partition = next(store.partitions("FSDJump"))
+    with open(partition.path / "SystemAddress.col", "ab") as f:
+        f.write(b"\x07" * partition.column("SystemAddress").itemsize)
+    partition.close()
+
+
+def test_torn_partition_is_unmapped_before_truncating(tmp_path, monkeypatch):
+    store = EventStore(tmp_path)
+    store.append([_jump(0), _jump(1)])
+    _tear(store)
+    reader = next(store.partitions("FSDJump"))
+    assert list(reader.column("SystemAddress")) == [1, 2]
+
+    mapped = []
+    truncate = os.truncate
+    monkeypatch.setattr(event_store.os, "truncate",
+                        lambda path, size: (mapped.append(list(reader._mmaps)), truncate(path, size)))
+    store.append([_jump(2)])
+    assert mapped and mapped[0] == []
+    # The reader maps the columns again on its next look
+    assert list(reader.column("SystemAddress")) == [1, 2]
+
+
+def test_failed_truncation_is_logged(tmp_path, monkeypatch, caplog):
+    store = EventStore(tmp_path)
+    store.append([_jump(0)])
+    _tear(store)
+
+    def refuse(path, size):
+        raise PermissionError(13, "The requested operation cannot be performed on a mapped file")
+
+    monkeypatch.setattr(event_store.os, "truncate", refuse)
+    with caplog.at_level(logging.WARNING, logger="event_store"):
+        store.append([_jump(1)])
+    assert "SystemAddress.col" in caplog.text
+
+
+def test_partition_closes_as_a_context_manager(tmp_path):
+    store = EventStore(tmp_path)
+    store.append([_jump(0)])
+    with next(store.partitions("FSDJump")) as partition:
+        assert list(partition.column("SystemAddress")) == [1]
+        maps = list(partition._mmaps)
+    assert maps and all(m.closed for m in maps)
@@ -0,0 +1,169 @@
+"""InaraClient against a mock INARA API on localhost"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import inara
+from inara import InaraClient, TokenBucket
+
+
+class MockInara:
+    """A local INARA endpoint that records each request and can be told to answer 429"""
+
+    def __init__(self, port: int = 0):
+        self.requests = []  # (monotonic time, [event names]) per request
+        self.throttle = 0   # answer this many more requests with HTTP 429
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                names = [event["eventName"] for event in body["events"]]
+                mock.requests.append((time.monotonic(), names))
+                if mock.throttle:
+                    mock.throttle -= 1
+                    self.send_error(429)
+                    return
+                events = [{"eventStatus": 200, "eventData": {"asked": event["eventData"]}}
+                          for event in body["events"]]
+                reply = json.dumps({"header": {"eventStatus": 200}, "events": events}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(reply)))
+                self.end_headers()
+                self.wfile.write(reply)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.port = self.server.server_port
+        self.url = f"http://127.0.0.1:{self.port}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def uploaded(self) -> list[str]:
+        return [name for _, names in self.requests for name in names if not name.startswith("get")]
+
+
+@pytest.fixture
+def mock():
+    server = MockInara()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def make_client(tmp_path):
+    clients = []
+
+    def make(url, **kwargs):
+        kwargs = {"commander": "Test", "root": tmp_path / "inara", "upload_delay": 0.05,
+                  "retry_delay": 0.05, "bucket": TokenBucket(rate=50.0, capacity=5), **kwargs}
+        client = InaraClient("test-key", url=url, **kwargs)
+        client.start()
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.stop()
+
+
+def wait_for(condition, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def jumps(count: int, start: int = 0) -> list[dict]:
+    return [{"timestamp": f"3300-01-01T00:{(start + i) // 60:02d}:{(start + i) % 60:02d}Z",
+             "event": "FSDJump", "StarSystem": f"System {start + i}", "JumpDist": 10.0,
+             "StarPos": [0.0, 0.0, float(start + i)]} for i in range(count)]
+
+
+def test_uploads_and_lookups_share_one_request(mock, make_client):
+    client = make_client(mock.url, upload_delay=0.5)
+    assert client.upload(jumps(5)) == 5
+    profile = client.lookup("getCommanderProfile", {"searchName": "Test"}).result(10)
+    assert profile == {"asked": {"searchName": "Test"}}
+    wait_for(lambda: not client.outbox)
+    assert len(mock.requests) == 1
+    assert sorted(mock.requests[0][1]) == ["addCommanderTravelFSDJump"] * 5 + ["getCommanderProfile"]
+
+
+def test_login_events_in_one_second_are_all_queued(mock, make_client):
+    client = make_client(mock.url)
+    second = "3300-01-01T00:00:00Z"
+    login = [
+        {"timestamp": second, "event": "Commander", "Name": "Test", "FID": "F1"},
+        {"timestamp": second, "event": "Rank", "Combat": 3, "Trade": 5},
+        {"timestamp": second, "event": "Progress", "Combat": 40, "Trade": 10},
+        {"timestamp": second, "event": "LoadGame", "Commander": "Test", "Credits": 1_000, "Loan": 0},
+    ]
+    assert client.upload(login, [1, 2, 3, 4]) == 2
+    wait_for(lambda: len(mock.uploaded) == 2)
+    assert mock.uploaded == ["setCommanderRankPilot", "setCommanderCredits"]
+    # The tailer replaying the same lines queues nothing
+    assert client.upload(login, [1, 2, 3, 4]) == 0
+
+
+def test_requests_are_paced_by_the_bucket(mock, make_client):
+    client = make_client(mock.url, bucket=TokenBucket(rate=5.0, capacity=1))
+    for i in range(3):
+        client.lookup("getCommanderProfile", {"searchName": f"Test {i}"}).result(10)
+    times = [at for at, _ in mock.requests]
+    assert len(times) == 3
+    assert all(later - earlier >= 0.18 for earlier, later in zip(times, times[1:]))
+
+
+def test_429_pauses_requests(mock, make_client, monkeypatch):
+    monkeypatch.setattr(inara, "RATE_LIMIT_PAUSE", 0.5)
+    client = make_client(mock.url)
+    mock.throttle = 1
+    client.lookup("getCommanderProfile", {"searchName": "Test"}).result(10)
+    (throttled, _), (answered, _) = mock.requests
+    assert answered - throttled >= 0.5
+
+
+def test_lookups_are_served_from_cache_until_they_expire(mock, make_client):
+    client = make_client(mock.url)
+    first = client.lookup("getCommunityGoalsRecent", ttl=0.3).result(10)
+    assert client.lookup("getCommunityGoalsRecent").result(1) == first
+    assert len(mock.requests) == 1
+    time.sleep(0.4)
+    client.lookup("getCommunityGoalsRecent").result(10)
+    assert len(mock.requests) == 2
+
+
+def test_outbox_survives_outage_and_restart(mock, make_client):
+    port, url = mock.port, mock.url
+    mock.stop()
+    client = make_client(url)
+    client.upload(jumps(20))
+    wait_for(lambda: not client.online)
+    client.stop()
+
+    # Restarted while INARA is still down: the outbox comes back from disk
+    client = make_client(url, retry_delay=60.0)
+    assert len(client.outbox) == 20
+    assert client.upload(jumps(20)) == 0  # the journal replay is not queued twice
+    wait_for(lambda: not client.online)
+
+    server = MockInara(port)
+    try:
+        client.reconnect()
+        wait_for(lambda: not client.outbox, timeout=5.0)
+        assert mock.uploaded == [] and server.uploaded == ["addCommanderTravelFSDJump"] * 20
+        assert client.online
+    finally:
+        server.stop()
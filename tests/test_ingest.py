@@ -0,0 +1,42 @@
+"""Ingest idempotence over copied journals"""
+
+import json
+import shutil
+
+import pytest
+
+from event_store import EventStore
+from ingest import ingest_directory
+
+
+def _write_journals(journal_dir, files: int = 10, per_file: int = 60):
+    journal_dir.mkdir()
+    for f in range(files):
+        with open(journal_dir / f"Journal.2024-01-{f + 1:02d}T000000.01.log", "w", encoding="utf-8") as out:
+            for i in range(per_file):
+                system = f"System {f * per_file + i}"
+                out.write(json.dumps({
+                    "timestamp": f"2024-01-{f + 1:02d}T{i // 60:02d}:{i % 60:02d}:00Z", "event": "FSDJump",
+                    "StarSystem": system, "SystemAddress": f * per_file + i + 1,
+                    "StarPos": [float(i), 0.0, float(f)], "JumpDist": 10.0, "FuelUsed": 1.0,
+                }) + "\n")
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_copied_journal_counts_once(tmp_path, workers):
+    journals = tmp_path / "j"
+    _write_journals(journals)
+    plain = ingest_directory(journals, workers=workers, store=EventStore(tmp_path / "plain"))
+
+    copied = tmp_path / "j2"
+    shutil.copytree(journals, copied)
+    shutil.copy(copied / "Journal.2024-01-01T000000.01.log", copied / "Journal.2024-01-01T000000.01 - Copy.log")
+    store = EventStore(tmp_path / "copied")
+    result = ingest_directory(copied, workers=workers, store=store)
+
+    assert result.events == plain.events == 600
+    assert result.duplicates == 60
+    assert store.count("FSDJump") == 600
+    assert len(result.systems) == len(plain.systems)
+    history = json.loads((store.root / "AGGREGATES.json").read_text(encoding="utf-8"))
+    assert history == json.loads((tmp_path / "plain" / "AGGREGATES.json").read_text(encoding="utf-8"))
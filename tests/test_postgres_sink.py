@@ -0,0 +1,47 @@
+"""PostgresSink against a real server; set EDXDC_POSTGRES_DSN to run"""
+
+import json
+import uuid
+
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+from postgres_sink import PostgresSink, default_dsn
+
+
+def _events(count: int) -> list[dict]:
+    return [{"timestamp": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}Z", "event": "FSDJump",
+             "StarSystem": f"System {i}"} for i in range(count)]
+
+
+@pytest.mark.skipif(not default_dsn(), reason="EDXDC_POSTGRES_DSN is not set")
+def test_bad_rows_are_set_aside(tmp_path):
+    table = f"edxdc_test_{uuid.uuid4().hex[:8]}"
+    events = _events(100)
+    events[37] = {"timestamp": "not a time", "event": "FSDJump"}
+    events[80] = {"event": "FSDJump"}  # NULL timestamp
+    sink = PostgresSink(default_dsn(), batch_size=50, idle_commit=0.1, table=table,
+                        dead_letter=tmp_path / "rejected.jsonl")
+    try:
+        sink.put(events)
+        assert sink.close(timeout=30)
+        assert (sink.written, sink.rejected) == (98, 2)
+        rejected = [json.loads(line)["event"] for line in open(tmp_path / "rejected.jsonl", encoding="utf-8")]
+        assert sorted(rejected, key=len) == [events[80], events[37]]
+        with psycopg.connect(default_dsn()) as conn:
+            assert conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0] == 98
+    finally:
+        with psycopg.connect(default_dsn()) as conn:
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+def test_writers_stop_while_server_is_unreachable(tmp_path):
+    sink = PostgresSink("postgresql://127.0.0.1:1/edxdc?connect_timeout=1", idle_commit=0.1,
+                        dead_letter=tmp_path / "rejected.jsonl")
+    sink.put(_events(10))
+    assert not sink.close(timeout=0.5)
+    for thread in sink._threads:
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+    assert sink.written == 0
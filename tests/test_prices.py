@@ -0,0 +1,93 @@
+"""Delta-encoded price history reads back what was recorded"""
+
+from prices import KEYFRAME_INTERVAL, Price, PriceStore
+
+
+MARKET = 3228342528
+T0 = 1_700_000_000
+
+
+def _prices(visit: int) -> dict[str, Price]:
+    """Gold moves every visit, Silver every third, Tritium drops out and comes back"""
+    prices = {
+        "$gold_name;": Price(9000 + visit, 9500 + visit, 100 - visit, 0),
+        "Silver": Price(4000 + visit // 3, 4300, 50, 0),
+    }
+    if visit % 5 != 4:
+        prices["Tritium"] = Price(50_000, 52_000, 0, 1000)
+    return prices
+
+
+def _store(root) -> PriceStore:
+    store = PriceStore(root)
+    for visit in range(2 * KEYFRAME_INTERVAL + 3):
+        assert store.add_snapshot(MARKET, T0 + 60 * visit, _prices(visit), "Jameson Memorial", "Shinrarta Dezhra")
+    return store
+
+
+def _keyed(prices: dict[str, Price]) -> dict[str, Price]:
+    return {name.strip("$").removesuffix("_name;").lower(): price for name, price in prices.items()}
+
+
+def test_every_snapshot_reads_back_across_keyframes(tmp_path):
+    store = _store(tmp_path)
+    reopened = PriceStore(tmp_path)
+    visits = 2 * KEYFRAME_INTERVAL + 3
+    assert len(reopened) == visits
+    assert reopened.snapshot_times(MARKET) == [T0 + 60 * visit for visit in range(visits)]
+    for visit in range(visits):
+        expected = _keyed(_prices(visit))
+        assert store.at(MARKET, T0 + 60 * visit) == expected
+        # Between visits the earlier one still holds
+        assert reopened.at(MARKET, T0 + 60 * visit + 59) == expected
+    assert reopened.latest(MARKET) == _keyed(_prices(visits - 1))
+    assert reopened.last_market() == MARKET
+    assert reopened.stations[MARKET] == {"station": "Jameson Memorial", "system": "Shinrarta Dezhra"}
+
+
+def test_removed_commodity_is_gone_until_listed_again(tmp_path):
+    store = _store(tmp_path)
+    assert "tritium" not in store.at(MARKET, T0 + 60 * 4)
+    assert "tritium" in store.at(MARKET, T0 + 60 * 5)
+    assert store.price(MARKET, "Tritium", T0 + 60 * 9) is None
+    assert store.price(MARKET, "$tritium_name;", T0 + 60 * 10) == Price(50_000, 52_000, 0, 1000)
+
+
+def test_lookups_outside_the_history(tmp_path):
+    store = _store(tmp_path)
+    assert store.at(MARKET, T0 - 1) == {}
+    assert store.at(42, T0) == {}
+    assert store.price(MARKET, "Painite") is None
+    assert store.previous(42) == {}
+    assert not store.add_snapshot(MARKET, T0, _prices(0))
+
+
+def test_previous_is_the_visit_before_the_latest(tmp_path):
+    store = _store(tmp_path)
+    last = 2 * KEYFRAME_INTERVAL + 2
+    assert store.previous(MARKET) == _keyed(_prices(last - 1))
+    single = PriceStore(tmp_path / "single")
+    single.add_snapshot(MARKET, T0, _prices(0))
+    assert single.previous(MARKET) == {}
+
+
+def test_history_range_is_inclusive(tmp_path):
+    store = _store(tmp_path)
+    visits = 2 * KEYFRAME_INTERVAL + 3
+    gold = store.history(MARKET, "Gold")
+    assert [ts for ts, _ in gold] == [T0 + 60 * visit for visit in range(visits)]
+    assert gold[KEYFRAME_INTERVAL + 1][1] == Price(9000 + KEYFRAME_INTERVAL + 1, 9500 + KEYFRAME_INTERVAL + 1,
+                                                   100 - KEYFRAME_INTERVAL - 1, 0)
+
+    window = store.history(MARKET, "Gold", T0 + 60 * 14, T0 + 60 * 18)
+    assert [ts for ts, _ in window] == [T0 + 60 * visit for visit in range(14, 19)]
+    between = store.history(MARKET, "Gold", T0 + 60 * 14 + 1, T0 + 60 * 18 - 1)
+    assert [ts for ts, _ in between] == [T0 + 60 * visit for visit in range(15, 18)]
+
+    # Snapshots without the commodity are skipped
+    tritium = store.history(MARKET, "Tritium", T0, T0 + 60 * 9)
+    assert [ts for ts, _ in tritium] == [T0 + 60 * visit for visit in range(10) if visit % 5 != 4]
+
+    assert store.history(MARKET, "Gold", T0 + 60 * 18, T0 + 60 * 14) == []
+    assert store.history(MARKET, "Painite") == []
+    assert store.history(42, "Gold") == []
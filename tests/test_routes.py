@@ -0,0 +1,42 @@
+"""A route search cut short by its time budget still finds the best route"""
+
+import itertools
+from types import SimpleNamespace
+
+import numpy as np
+
+import routes
+from routes import MarketData, RouteOptions, build_edges, find_routes
+
+
+def _markets(stations: int = 400, commodities: int = 40) -> MarketData:
+    rng = np.random.default_rng(7)
+    shape = (stations, commodities)
+    return MarketData(
+        market_ids=np.arange(1, stations + 1, dtype=np.int64),
+        names=[f"Station {i}" for i in range(stations)],
+        positions=rng.normal(0, 150, (stations, 3)),
+        pads=np.full(stations, 3, np.int8),
+        commodities=[f"commodity{j}" for j in range(commodities)],
+        buy=np.where(rng.random(shape) < 0.3, rng.uniform(100, 5000, shape), 0).astype(np.float32),
+        sell=np.where(rng.random(shape) < 0.6, rng.uniform(100, 5500, shape), 0).astype(np.float32),
+        stock=rng.uniform(0, 2000, shape).astype(np.float32),
+        demand=rng.uniform(0, 2000, shape).astype(np.float32),
+    )
+
+
+def test_truncated_run_keeps_the_top_route(monkeypatch):
+    data = _markets()
+    options = RouteOptions(time_budget=3)
+    full = find_routes(data, RouteOptions(time_budget=3600))
+
+    # Ten sources a block and a clock that ticks once per look: the build
+    # gets three blocks, 30 of the 400 stations
+    monkeypatch.setattr(routes, "BLOCK_CELLS", 10 * options.candidates * len(data))
+    monkeypatch.setattr(routes, "time", SimpleNamespace(perf_counter=itertools.count().__next__))
+    truncated = find_routes(data, options)
+
+    monkeypatch.setattr(routes, "time", SimpleNamespace(perf_counter=itertools.count().__next__))
+    assert len(build_edges(data, options, deadline=3).src) < len(build_edges(data, options).src)
+    assert truncated[0].describe() == full[0].describe()
+    assert truncated[0].profit == full[0].profit
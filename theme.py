@@ -0,0 +1,449 @@
+"""
+Application theme
+The whole dark theme as one stylesheet, compiled once and applied at the
+application level. Widgets opt into rules through their objectName and
+the "accent" dynamic property instead of carrying their own stylesheets,
+so Qt parses the sheet once rather than once per widget.
+
+No Qt imports here; apply_theme() takes the QApplication instance.
+"""
+
+from functools import lru_cache
+from string import Template
+
+
+PALETTE = {
+    "window": "#0a0a1a",
+    "nav": "#0d0d1a",
+    "panel": "#12122a",
+    "surface": "#1a1a2e",
+    "card": "#1e1e3a",
+    "indicator": "#252540",
+    "hover": "#1a1a3a",
+    "hover_tab": "#202040",
+    "selected": "#252550",
+    "border": "#3a3a5a",
+    "border_light": "#4a4a6a",
+    "border_nav": "#2a2a4a",
+    "separator": "#222",
+    "handle_hover": "#4a4a7a",
+    "text": "#ccc",
+    "text_nav": "#aaa",
+    "text_dim": "#888",
+    "text_faint": "#666",
+    "text_bright": "#fff",
+    "primary": "#00d4ff",
+    "ok": "#00ff88",
+    "warn": "#ffaa00",
+    "tab_selected": "#ffd700",
+}
+
+# Accent colours selectable per widget with setProperty("accent", name)
+ACCENTS = {
+    "cyan": "#00d4ff",
+    "green": "#00ff88",
+    "orange": "#ff9f00",
+    "purple": "#bf00ff",
+    "gold": "#ffd700",
+    "platinum": "#e5e4e2",
+    "red": "#ff4444",
+    "blue": "#00aaff",
+    "amber": "#ffaa00",
+}
+
+_ACCENT_BY_COLOR = {color: name for name, color in ACCENTS.items()}
+
+
+def accent_name(color: str) -> str | None:
+    """Accent name for a hex colour, or None if it is not a theme accent"""
+    return _ACCENT_BY_COLOR.get(color.lower())
+
+
+_BASE = Template("""
+QMainWindow {
+    background-color: $window;
+}
+QWidget {
+    font-family: 'Segoe UI', sans-serif;
+}
+QScrollBar:vertical {
+    background-color: $surface;
+    width: 10px;
+    border-radius: 5px;
+}
+QScrollBar::handle:vertical {
+    background-color: $border;
+    border-radius: 5px;
+    min-height: 30px;
+}
+QScrollBar::handle:vertical:hover {
+    background-color: $handle_hover;
+}
+QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+    height: 0;
+}
+QScrollBar:horizontal {
+    background-color: $surface;
+    height: 10px;
+    border-radius: 5px;
+}
+QScrollBar::handle:horizontal {
+    background-color: $border;
+    border-radius: 5px;
+    min-width: 30px;
+}
+
+/* ---- Shared widgets ---------------------------------------------------- */
+
+PlaceholderWidget {
+    background-color: $surface;
+    border: 1px solid $border_light;
+    border-radius: 8px;
+}
+QLabel#placeholderTitle {
+    color: $primary;
+    background: transparent;
+    border: none;
+}
+QLabel#placeholderDesc {
+    color: $text_dim;
+    background: transparent;
+    border: none;
+}
+
+StatusIndicator {
+    background-color: $indicator;
+    border: 1px solid $border;
+    border-radius: 6px;
+    padding: 8px;
+}
+QLabel#statusLabel {
+    color: $text_dim;
+    font-size: 10px;
+    background: transparent;
+    border: none;
+}
+QLabel#statusValue {
+    color: $ok;
+    font-size: 16px;
+    font-weight: bold;
+    background: transparent;
+    border: none;
+}
+
+GaugeWidget, TimeSeriesChart, ForecastChart, SystemMap {
+    background-color: $surface;
+    border: 1px solid $border_light;
+    border-radius: 8px;
+}
+QProgressBar#gauge {
+    background-color: $window;
+    border: 1px solid $border;
+    border-radius: 4px;
+    min-height: 14px;
+    max-height: 14px;
+}
+QProgressBar#gauge::chunk {
+    background-color: $ok;
+    border-radius: 3px;
+}
+
+MetricCard {
+    background-color: $card;
+    border-radius: 8px;
+}
+QLabel#cardTitle {
+    color: $text_nav;
+    font-size: 11px;
+    background: transparent;
+    border: none;
+}
+QLabel#cardValue {
+    font-size: 24px;
+    font-weight: bold;
+    background: transparent;
+    border: none;
+}
+QLabel#cardSubtitle {
+    color: $text_faint;
+    font-size: 10px;
+    background: transparent;
+    border: none;
+}
+
+RouteOptimizer, ResultTable {
+    background-color: $surface;
+    border: 1px solid $border_light;
+    border-radius: 8px;
+}
+QTableWidget#resultTable {
+    background-color: $window;
+    alternate-background-color: $panel;
+    color: $text;
+    gridline-color: $separator;
+    border: 1px solid $border;
+    border-radius: 4px;
+}
+QTableWidget#resultTable QHeaderView::section {
+    background-color: $indicator;
+    color: $text_dim;
+    border: none;
+    padding: 4px;
+}
+QSpinBox#control, QDoubleSpinBox#control, QComboBox#control {
+    background-color: $window;
+    color: $text;
+    border: 1px solid $border;
+    border-radius: 4px;
+    padding: 2px 6px;
+}
+QPushButton#control {
+    background-color: $selected;
+    color: $primary;
+    border: 1px solid $border_light;
+    border-radius: 4px;
+    padding: 4px 12px;
+}
+QPushButton#control:hover {
+    background-color: $hover_tab;
+}
+
+/* ---- Panels ------------------------------------------------------------ */
+
+QFrame#feedPanel {
+    background-color: $panel;
+    border-radius: 8px;
+}
+QLabel#feedTitle {
+    color: $primary;
+    font-weight: bold;
+    padding: 10px;
+}
+QListView#eventFeed {
+    background-color: $window;
+    border: none;
+    color: $text;
+    font-family: 'Consolas';
+}
+QListView#eventFeed::item {
+    padding: 8px;
+    border-bottom: 1px solid $separator;
+}
+QListView#eventFeed::item:hover {
+    background-color: $hover;
+}
+
+QFrame#panelHeader {
+    background-color: $surface;
+    border-radius: 8px;
+    padding: 15px;
+}
+QFrame#aiHeader {
+    background-color: $surface;
+    border-radius: 8px;
+    padding: 10px;
+}
+QLabel#headerIcon {
+    font-size: 48px;
+}
+QLabel#aiIcon {
+    font-size: 24px;
+}
+QLabel#headerTitle {
+    color: $primary;
+    font-size: 20px;
+    font-weight: bold;
+}
+QLabel#sectionTitle {
+    color: $primary;
+    font-size: 18px;
+    font-weight: bold;
+}
+QLabel#aiTitle {
+    color: $primary;
+    font-weight: bold;
+    font-size: 14px;
+}
+QLabel#headerSubtitle {
+    color: $text_dim;
+    font-size: 11px;
+}
+QLabel#headerId {
+    color: $text_dim;
+    font-size: 12px;
+}
+QLabel#fieldLabel {
+    color: $text_dim;
+    font-size: 10px;
+}
+QLabel#fieldValue {
+    color: $ok;
+    font-size: 14px;
+    font-weight: bold;
+}
+QLabel#contribValue {
+    color: $ok;
+    font-size: 20px;
+    font-weight: bold;
+}
+QLabel#repFaction {
+    font-size: 11px;
+}
+QLabel#repValue {
+    color: $text_bright;
+    font-size: 11px;
+    font-weight: bold;
+}
+QLabel#modelStatus {
+    color: $ok;
+    font-weight: bold;
+}
+QLabel#modelStatus[state="training"] {
+    color: $primary;
+}
+QLabel#modelStatus[state="stale"] {
+    color: $warn;
+}
+QLabel#modelStatus[state="empty"] {
+    color: $text_dim;
+}
+QLabel#syncStatus {
+    color: $ok;
+}
+QLabel#syncStatus[state="syncing"] {
+    color: $primary;
+}
+QLabel#syncStatus[state="offline"] {
+    color: $warn;
+}
+QLabel#syncStatus[state="off"] {
+    color: $text_dim;
+}
+
+QTabWidget#subTabs::pane, QTabWidget#infoTabs::pane {
+    border: 1px solid $border;
+    border-radius: 8px;
+    background-color: $panel;
+}
+QTabWidget#subTabs > QTabBar::tab, QTabWidget#infoTabs > QTabBar::tab {
+    background-color: $surface;
+    color: $text_dim;
+    padding: 8px 20px;
+    margin-right: 2px;
+    border-top-left-radius: 6px;
+    border-top-right-radius: 6px;
+}
+QTabWidget#infoTabs > QTabBar::tab {
+    padding: 10px 25px;
+}
+QTabWidget#subTabs > QTabBar::tab:selected {
+    background-color: $selected;
+    color: $tab_selected;
+}
+QTabWidget#infoTabs > QTabBar::tab:selected {
+    background-color: $selected;
+    color: $primary;
+}
+QTabWidget#subTabs > QTabBar::tab:hover:!selected,
+QTabWidget#infoTabs > QTabBar::tab:hover:!selected {
+    background-color: $hover_tab;
+}
+
+/* ---- Main window ------------------------------------------------------- */
+
+QFrame#navPanel {
+    background-color: $nav;
+    border-right: 1px solid $border_nav;
+}
+QFrame#navHeader {
+    background-color: $panel;
+    padding: 15px;
+}
+QLabel#appTitle {
+    color: $primary;
+    font-size: 16px;
+    font-weight: bold;
+    letter-spacing: 2px;
+}
+QLabel#appSubtitle {
+    color: $text_faint;
+    font-size: 10px;
+}
+QTreeWidget#navTree {
+    background-color: transparent;
+    border: none;
+    color: $text_nav;
+    font-size: 12px;
+}
+QTreeWidget#navTree::item {
+    padding: 12px 15px;
+    border-radius: 0;
+}
+QTreeWidget#navTree::item:hover {
+    background-color: $hover;
+}
+QTreeWidget#navTree::item:selected {
+    background-color: $selected;
+    color: $primary;
+    border-left: 3px solid $primary;
+}
+QTreeWidget#navTree::branch {
+    background-color: transparent;
+}
+QFrame#navFooter {
+    background-color: $panel;
+    padding: 10px;
+}
+QLabel#statusDot {
+    color: $ok;
+    font-size: 8px;
+}
+QLabel#statusDot[state="offline"] {
+    color: $text_dim;
+}
+QLabel#statusText {
+    color: $text_dim;
+    font-size: 10px;
+}
+QLabel#dbStatus {
+    color: $text_faint;
+    font-size: 9px;
+}
+QStackedWidget#contentStack {
+    background-color: $window;
+}
+QScrollArea#panelScroll {
+    border: none;
+    background-color: $window;
+}
+QScrollArea#panelScroll > QWidget > QWidget,
+QTabWidget#subTabs > QStackedWidget > QWidget,
+QTabWidget#infoTabs > QStackedWidget > QWidget {
+    background-color: $window;
+}
+""")
+
+_ACCENT_RULES = Template("""
+MetricCard[accent="$name"] {
+    border-left: 4px solid $color;
+}
+QLabel[accent="$name"] {
+    color: $color;
+}
+""")
+
+
+@lru_cache(maxsize=None)
+def compile_stylesheet() -> str:
+    """The complete application stylesheet"""
+    parts = [_BASE.substitute(PALETTE)]
+    for name, color in ACCENTS.items():
+        parts.append(_ACCENT_RULES.substitute(name=name, color=color))
+    return "".join(parts)
+
+
+def apply_theme(app):
+    """Install the compiled stylesheet on the application, once"""
+    sheet = compile_stylesheet()
+    if app.styleSheet() != sheet:
+        app.setStyleSheet(sheet)
@@ -0,0 +1,153 @@
+"""
+Time-series decimation for the history charts
+Years of per-event values can run to millions of points, far more than a
+chart has pixels. DecimationPyramid keeps the raw arrays plus a stack of
+min/max pre-decimated levels so any zoom level can be answered from the
+coarsest level that still has enough resolution, and view() only decimates
+the visible slice down to roughly two points per pixel column.
+
+Requires NumPy; the GUI imports this lazily off the GUI thread.
+"""
+
+import numpy as np
+
+from event_store import EventStore
+
+
+LEVEL_GROUP = 8          # raw points folded into each min/max pair per level
+MIN_LEVEL_POINTS = 4096  # stop building levels below this size
+
+
+def _minmax_groups(x: np.ndarray, y: np.ndarray, group: int):
+    """Replace every ``group`` consecutive points by their min and max, in order"""
+    full = len(x) // group * group
+    xs = x[:full].reshape(-1, group)
+    ys = y[:full].reshape(-1, group)
+    rows = np.arange(len(ys))
+    imin = ys.argmin(axis=1)
+    imax = ys.argmax(axis=1)
+    first = np.minimum(imin, imax)
+    second = np.maximum(imin, imax)
+    out_x = np.column_stack((xs[rows, first], xs[rows, second])).ravel()
+    out_y = np.column_stack((ys[rows, first], ys[rows, second])).ravel()
+    if full < len(x):
+        out_x = np.concatenate((out_x, x[full:]))
+        out_y = np.concatenate((out_y, y[full:]))
+    return out_x, out_y
+
+
+def minmax_decimate(x: np.ndarray, y: np.ndarray, x0: float, x1: float, buckets: int):
+    """Min and max of each of ``buckets`` equal-width x buckets over [x0, x1].
+
+    Each non-empty bucket yields two points at its first sample's x, so
+    spikes survive at any zoom. This is per-pixel-column decimation.
+    """
+    if len(x) <= 2 * buckets:
+        return x, y
+    edges = np.searchsorted(x, np.linspace(x0, x1, buckets + 1)[:-1])
+    starts = np.unique(np.clip(edges, 0, len(x) - 1))
+    lows = np.minimum.reduceat(y, starts)
+    highs = np.maximum.reduceat(y, starts)
+    bx = np.repeat(x[starts], 2)
+    by = np.column_stack((lows, highs)).ravel()
+    return bx, by
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int):
+    """Largest-Triangle-Three-Buckets downsampling to ``threshold`` points"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+    out = np.empty(threshold, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    bounds = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    a = 0
+    for i in range(threshold - 2):
+        start, end = bounds[i], max(bounds[i + 1], bounds[i] + 1)
+        nxt_start, nxt_end = bounds[i + 1], bounds[i + 2] if i + 2 < len(bounds) else n
+        nxt_end = max(nxt_end, nxt_start + 1)
+        avg_x = x[nxt_start:nxt_end].mean()
+        avg_y = y[nxt_start:nxt_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        out[i + 1] = a
+    return x[out], y[out]
+
+
+class DecimationPyramid:
+    """Raw series plus progressively coarser min/max levels"""
+
+    def __init__(self, x, y):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if len(x) > 1 and np.any(np.diff(x) < 0):
+            order = np.argsort(x, kind="stable")
+            x, y = x[order], y[order]
+        self.levels = [(x, y)]
+        while len(self.levels[-1][0]) > MIN_LEVEL_POINTS:
+            self.levels.append(_minmax_groups(*self.levels[-1], LEVEL_GROUP))
+
+    def __len__(self):
+        return len(self.levels[0][0])
+
+    @property
+    def extent(self) -> tuple[float, float, float, float]:
+        """(x_min, x_max, y_min, y_max) of the whole series"""
+        x = self.levels[0][0]
+        if not len(x):
+            return 0.0, 1.0, 0.0, 1.0
+        # Min/max levels keep the extremes, so the coarsest one is enough for y
+        y = self.levels[-1][1]
+        return float(x[0]), float(x[-1]), float(y.min()), float(y.max())
+
+    def view(self, x0: float, x1: float, pixels: int, method: str = "minmax"):
+        """Points to draw for the visible range [x0, x1] at ``pixels`` width"""
+        target = max(pixels, 2) * 2
+        # Coarsest level with enough points in range; the loop ends on the raw one
+        for x, y in reversed(self.levels):
+            lo = max(np.searchsorted(x, x0) - 1, 0)
+            hi = min(np.searchsorted(x, x1, side="right") + 1, len(x))
+            if hi - lo >= target:
+                break
+        x, y = x[lo:hi], y[lo:hi]
+        if method == "lttb":
+            return lttb(x, y, target)
+        return minmax_decimate(x, y, x0, x1, max(pixels, 2))
+
+
+# =============================================================================
+# SERIES LOADERS
+# =============================================================================
+
+def _concat(store: EventStore, event_type: str, *columns: str):
+    parts = list(store.partitions(event_type))
+    if not parts:
+        return [np.empty(0) for _ in columns]
+    return [np.concatenate([np.asarray(p.column(c)) for p in parts]) for c in columns]
+
+
+def wealth_series(store: EventStore):
+    """Current wealth at every Statistics snapshot"""
+    ts, wealth = _concat(store, "Statistics", "timestamp", "Wealth")
+    keep = wealth > 0
+    return ts[keep], wealth[keep]
+
+
+def profit_series(store: EventStore):
+    """Cumulative market profit after every sale"""
+    ts, sale, paid, count = _concat(store, "MarketSell", "timestamp", "TotalSale", "AvgPricePaid", "Count")
+    order = np.argsort(ts, kind="stable")
+    profit = (sale - paid * count)[order]
+    return ts[order], np.cumsum(profit)
+
+
+SERIES = {
+    "analysis.wealth": wealth_series,
+    "hauling.profit": profit_series,
+}
+
+
+def load_pyramid(store: EventStore, name: str) -> DecimationPyramid:
+    return DecimationPyramid(*SERIES[name](store))